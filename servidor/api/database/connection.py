@@ -1,8 +1,10 @@
 from typing import Callable
-from sqlalchemy import text
+from functools import wraps
+from sqlalchemy import text, event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.exc import OperationalError, ArgumentError
 from api.database.database_models.models import Base
+from api.database.query_stats import before_cursor_execute, after_cursor_execute
 from api.utils.constants.error_strings import DATABASE_ERROR
 from api.utils.functions.env_config import CONFIG
 
@@ -16,6 +18,10 @@ try:
 except (OperationalError, ArgumentError) as exc:
     raise ConnectionError(DATABASE_ERROR.format(exc=exc))
 
+# se cuentan las sentencias, su duración y sus filas en cada petición
+event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
 async def create_tables():
     """Crea las tablas en la base de datos."""
 
@@ -43,6 +49,7 @@ async def close_connection():
 def execute_database(func: Callable) -> Callable:
     """Crea recursos en la base de datos."""
 
+    @wraps(func)
     async def wrapper(*args, **kwargs):
         """Función envoltorio."""
 
@@ -90,4 +90,35 @@ class JobConstraint:
     ADDRESS_FK = "job_address_id_fk"
     COMPANY_FK = "job_company_id_fk"
     SECTOR_FK = "job_sector_id_fk"
-    LEVEL_EDUCATION_FK = "job_education_level_id_fk"
\ No newline at end of file
+    LEVEL_EDUCATION_FK = "job_education_level_id_fk"
+    PUBLICATION_DATE_ID_INDEX = "job_publication_date_id_index"
+    SEARCH_VECTOR_INDEX = "job_search_vector_index"
+
+class JobKeywordConstraint:
+    JOB_KEYWORD_PK = "job_keyword_pk"
+    WORD_PATTERN_INDEX = "job_keyword_word_pattern_index"
+
+class JobSearchDocConstraint:
+    JOB_SEARCH_DOC_PK = "job_search_doc_pk"
+    JOB_FK = "job_search_doc_job_id_fk"
+    PUBLICATION_DATE_ID_INDEX = "job_search_doc_publication_date_job_id_index"
+    PROVINCE_INDEX = "job_search_doc_province_index"
+    SECTOR_INDEX = "job_search_doc_sector_id_index"
+    LANGUAGE_IDS_INDEX = "job_search_doc_language_ids_index"
+    SEARCH_VECTOR_INDEX = "job_search_doc_search_vector_index"
+
+class CandidateSearchProfileConstraint:
+    CANDIDATE_SEARCH_PROFILE_PK = "candidate_search_profile_pk"
+    CANDIDATE_FK = "candidate_search_profile_candidate_id_fk"
+    PROVINCE_INDEX = "candidate_search_profile_province_index"
+    POSTAL_CODE_INDEX = "candidate_search_profile_postal_code_index"
+    EXPERIENCE_MONTHS_INDEX = "candidate_search_profile_experience_months_index"
+    SECTOR_EXPERIENCE_INDEX = "candidate_search_profile_sector_experience_months_index"
+    LANGUAGE_LEVELS_INDEX = "candidate_search_profile_language_levels_index"
+    EDUCATION_LEVEL_INDEX = "candidate_search_profile_education_level_value_index"
+    EDUCATION_SECTOR_INDEX = "candidate_search_profile_education_sector_levels_index"
+    SKILLS_INDEX = "candidate_search_profile_skills_index"
+    AVAILABILITY_INDEX = "candidate_search_profile_availability_index"
+
+class ScheduledTaskConstraint:
+    SCHEDULED_TASK_PK = "scheduled_task_pk"
\ No newline at end of file
@@ -7,6 +7,7 @@ class UserStringLen:
     
 class CandidateStringLen:
     skills = 50
+    curriculum_key = 64
 
 class CompanyStringLen:
     tin = 9
@@ -41,4 +42,7 @@ class AddressStringLen:
 class JobStringLen:
     title = 50
     description = 200
-    skills = CandidateStringLen.skills
\ No newline at end of file
+    skills = CandidateStringLen.skills
+
+class ScheduledTaskStringLen:
+    name = 100
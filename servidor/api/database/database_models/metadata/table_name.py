@@ -14,4 +14,8 @@ JOB_EDUCATION = "job_education"
 SECTOR_EDUCATION = "sector_education"
 CANDIDATE_EDUCATION = "candidate_education"
 CANDIDATE_LANGUAGE = "candidate_language"
-JOB_LANGUAGE = "job_language"
\ No newline at end of file
+JOB_LANGUAGE = "job_language"
+JOB_KEYWORD = "job_keyword"
+JOB_SEARCH_DOC = "job_search_doc"
+CANDIDATE_SEARCH_PROFILE = "candidate_search_profile"
+SCHEDULED_TASK = "scheduled_task"
\ No newline at end of file
@@ -1 +0,0 @@
-JOB_KEYWORDS_VIEW_NAME = "job_keywords_view"
\ No newline at end of file
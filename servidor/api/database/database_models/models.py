@@ -1,16 +1,16 @@
 from typing import Optional
 from uuid import uuid4, UUID
-from datetime import date, timedelta
-from sqlalchemy.dialects.postgresql import UUID as SQL_UUID, ARRAY, INTERVAL
-from sqlalchemy import ForeignKey, PrimaryKeyConstraint, Enum, String, Integer, CheckConstraint, UniqueConstraint, text, Date, LargeBinary
+from datetime import date, datetime, timedelta
+from sqlalchemy.dialects.postgresql import UUID as SQL_UUID, ARRAY, INTERVAL, TSVECTOR, JSONB
+from sqlalchemy import ForeignKey, PrimaryKeyConstraint, Enum, String, Integer, CheckConstraint, UniqueConstraint, Index, Computed, text, Date, DateTime, Float, LargeBinary
 from sqlalchemy.orm import Mapped, DeclarativeBase, relationship, mapped_column, deferred
 from sqlalchemy.ext.hybrid import hybrid_property
 from api.database.database_models.metadata.table_name import *
 from api.database.database_models.metadata.constraint_name import *
 from api.database.database_models.metadata.string_length import *
-from api.models.metadata.constants import MONTHS_TO_DAYS_MULTIPLIER
+from api.models.metadata.constants import MONTHS_TO_DAYS_MULTIPLIER, TEXT_SEARCH_CONFIG
 from api.models.enums.models import UserType, WorkSchedule
-from api.security.hash_crypt import encrypt_string
+from api.security.hash_crypt import encrypt_string, HashedString
 
 class Base(DeclarativeBase):
     pass
@@ -271,9 +271,9 @@ class User(Base):
 
     @password.setter
     def password(self, password):
-        """Encripta la contrasena y la guarda."""
+        """Encripta la contrasena y la guarda. Si ya se ha encriptado en el pool de procesos, se guarda directamente."""
 
-        self._password = encrypt_string(password)
+        self._password = password if isinstance(password, HashedString) else encrypt_string(password)
 
     @hybrid_property
     def email(self):
@@ -323,7 +323,8 @@ class Candidate(Base):
     - user_id: Campo que representa la clave foránea de la tabla user.
     - skills: Campo que representa las habilidades del candidato.
     - availability: Campo que representa la disponibilidad del candidato.
-    - curriculum: Campo que representa el currículum del candidato.
+    - curriculum: Campo que representa el currículum del candidato guardado en la base de datos. Solo lo tienen los candidatos que no se han migrado al almacén de archivos.
+    - curriculum_key: Campo que representa la clave del currículum del candidato en el almacén de archivos.
     
     Relaciones:
     - user: Relación con la tabla user.
@@ -339,6 +340,7 @@ class Candidate(Base):
     skills: Mapped[list[str]] = mapped_column(ARRAY(String(CandidateStringLen.skills)))
     availability: Mapped[list[WorkSchedule]] = mapped_column(ARRAY(Enum(WorkSchedule)))
     curriculum: Mapped[Optional[bytes]] = deferred(mapped_column(LargeBinary))
+    curriculum_key: Mapped[Optional[str]] = mapped_column(String(CandidateStringLen.curriculum_key))
 
     user: Mapped["User"] = relationship(back_populates="candidate", uselist=False, lazy="noload")
     education_list: Mapped[list["CandidateEducation"]] = relationship(back_populates="candidate", lazy="noload")
@@ -786,6 +788,12 @@ class Address(Base):
         self._province = province.lower()
 
 
+# expresión del vector de búsqueda de las ofertas de trabajo. El título tiene más peso que la descripción.
+JOB_SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')"
+)
+
 class Job(Base):
     """
     Modelo de la tabla job.
@@ -804,6 +812,7 @@ class Job(Base):
     - address_id: Campo que representa la clave foránea de la tabla address.
     - company_id: Campo que representa la clave foránea de la tabla company.
     - sector_id: Campo que representa la clave foránea de la tabla sector.
+    - search_vector: Campo generado con el vector de búsqueda de texto completo del título y la descripción.
 
     Relaciones:
     - company: Relación con la tabla company.
@@ -827,6 +836,7 @@ class Job(Base):
     company_id: Mapped[UUID] = mapped_column(ForeignKey(f"{COMPANY}.user_id", name=JobConstraint.COMPANY_FK, ondelete="CASCADE"))
     sector_id: Mapped[UUID] = mapped_column(ForeignKey(f"{SECTOR}.id", name=JobConstraint.SECTOR_FK))
     active: Mapped[bool]
+    search_vector: Mapped[Optional[str]] = deferred(mapped_column(TSVECTOR, Computed(JOB_SEARCH_VECTOR_EXPRESSION, persisted=True)))
     
     company: Mapped["Company"] = relationship(back_populates="job_list", lazy="noload")
     candidates_list: Mapped[list["JobCandidate"]] = relationship(back_populates="job", lazy="noload")
@@ -837,6 +847,8 @@ class Job(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint("id", name=JobConstraint.JOB_PK),
+        Index(JobConstraint.PUBLICATION_DATE_ID_INDEX, publication_date.desc(), id.desc()),
+        Index(JobConstraint.SEARCH_VECTOR_INDEX, search_vector, postgresql_using="gin"),
     )
 
     @hybrid_property
@@ -873,4 +885,152 @@ class Job(Base):
     def required_experience(self, months_experience: int):
         """Guarda los meses de experiencia requeridos."""
 
-        self._required_experience = timedelta(weeks=months_experience * MONTHS_TO_DAYS_MULTIPLIER)
\ No newline at end of file
+        self._required_experience = timedelta(weeks=months_experience * MONTHS_TO_DAYS_MULTIPLIER)
+
+class JobKeyword(Base):
+    """
+    Modelo de la tabla job_keyword.
+
+    Esta tabla representa las palabras de los títulos y descripciones de las ofertas de trabajo junto al número de veces que aparecen.
+    Se mantiene actualizada con un trigger sobre la tabla job en cada inserción, actualización y borrado.
+
+    Campos:
+    - word: Campo que representa la palabra.
+    - count: Campo que representa el número de apariciones de la palabra.
+    """
+
+    __tablename__ = JOB_KEYWORD
+
+    word: Mapped[str] = mapped_column(String(JobStringLen.description))
+    count: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(word, name=JobKeywordConstraint.JOB_KEYWORD_PK),
+        Index(JobKeywordConstraint.WORD_PATTERN_INDEX, word, postgresql_ops={"word": "text_pattern_ops"}),
+    )
+
+class JobSearchDoc(Base):
+    """
+    Modelo de la tabla job_search_doc.
+
+    Esta tabla representa el documento de búsqueda de cada oferta de trabajo, con los datos de la oferta y de sus relaciones
+    por los que se filtran las ofertas, para filtrarlas sin unir sus tablas.
+    Se mantiene actualizada con triggers sobre las tablas job, job_language, job_education, address, sector, education y education_level.
+
+    Campos:
+    - job_id: Campo que representa la clave primaria de la tabla y la clave foránea de la tabla job.
+    - province: Campo que representa la provincia de la dirección de la oferta.
+    - sector_id: Campo que representa el id del sector de la oferta.
+    - sector_category: Campo que representa la categoría del sector de la oferta.
+    - education_qualification: Campo que representa la cualificación de la formación requerida.
+    - education_level_value: Campo que representa el valor del nivel de la formación requerida.
+    - language_ids: Campo que representa los ids de los idiomas requeridos.
+    - skills: Campo que representa las habilidades requeridas.
+    - work_schedule: Campo que representa el horario de trabajo.
+    - active: Campo que representa si la oferta está activa.
+    - publication_date: Campo que representa la fecha de publicación.
+    - search_vector: Campo que representa el vector de búsqueda de texto completo del título y la descripción.
+    """
+
+    __tablename__ = JOB_SEARCH_DOC
+
+    job_id: Mapped[UUID] = mapped_column(ForeignKey(f"{JOB}.id", name=JobSearchDocConstraint.JOB_FK, ondelete="CASCADE"))
+    province: Mapped[str] = mapped_column(String(AddressStringLen.province))
+    sector_id: Mapped[UUID] = mapped_column(SQL_UUID)
+    sector_category: Mapped[str] = mapped_column(String(SectorStringLen.category))
+    education_qualification: Mapped[Optional[str]] = mapped_column(String(EducationStringLen.qualification))
+    education_level_value: Mapped[Optional[int]]
+    language_ids: Mapped[list[UUID]] = mapped_column(ARRAY(SQL_UUID))
+    skills: Mapped[list[str]] = mapped_column(ARRAY(String(JobStringLen.skills)))
+    work_schedule: Mapped[WorkSchedule] = mapped_column(Enum(WorkSchedule))
+    active: Mapped[bool]
+    publication_date: Mapped[date] = mapped_column(Date)
+    search_vector: Mapped[Optional[str]] = deferred(mapped_column(TSVECTOR))
+
+    __table_args__ = (
+        PrimaryKeyConstraint(job_id, name=JobSearchDocConstraint.JOB_SEARCH_DOC_PK),
+        Index(JobSearchDocConstraint.PUBLICATION_DATE_ID_INDEX, publication_date.desc(), job_id.desc()),
+        Index(JobSearchDocConstraint.PROVINCE_INDEX, province),
+        Index(JobSearchDocConstraint.SECTOR_INDEX, sector_id),
+        Index(JobSearchDocConstraint.LANGUAGE_IDS_INDEX, language_ids, postgresql_using="gin"),
+        Index(JobSearchDocConstraint.SEARCH_VECTOR_INDEX, search_vector, postgresql_using="gin"),
+    )
+
+class CandidateSearchProfile(Base):
+    """
+    Modelo de la tabla candidate_search_profile.
+
+    Esta tabla representa el perfil de búsqueda de cada candidato, con los datos del candidato y de sus relaciones
+    por los que se filtran los candidatos, para filtrarlos sin unir sus tablas ni sumar sus experiencias en cada consulta.
+    Se mantiene actualizada con triggers sobre las tablas candidate, user, address, experience, candidate_language,
+    candidate_education, language_level, education, education_level y sector_education.
+
+    Los campos JSONB usan como clave el id del sector o del idioma, por lo que se filtran con los índices GIN.
+
+    Campos:
+    - candidate_id: Campo que representa la clave primaria de la tabla y la clave foránea de la tabla candidate.
+    - province: Campo que representa la provincia de la dirección del candidato.
+    - postal_code: Campo que representa el código postal de la dirección del candidato.
+    - skills: Campo que representa las habilidades del candidato.
+    - availability: Campo que representa la disponibilidad del candidato.
+    - experience_months: Campo que representa los meses de experiencia totales del candidato, con los días como fracción de mes.
+    - sector_experience_months: Campo que representa los meses de experiencia del candidato en cada sector.
+    - language_levels: Campo que representa el valor del nivel máximo del candidato en cada idioma.
+    - education_level_value: Campo que representa el valor del nivel de formación más alto del candidato.
+    - education_sector_levels: Campo que representa el valor del nivel de formación más alto del candidato en cada sector.
+    - education_qualifications: Campo que representa las cualificaciones de las formaciones del candidato.
+    """
+
+    __tablename__ = CANDIDATE_SEARCH_PROFILE
+
+    candidate_id: Mapped[UUID] = mapped_column(ForeignKey(f"{CANDIDATE}.user_id", name=CandidateSearchProfileConstraint.CANDIDATE_FK, ondelete="CASCADE"))
+    province: Mapped[str] = mapped_column(String(AddressStringLen.province))
+    postal_code: Mapped[int] = mapped_column(Integer)
+    skills: Mapped[list[str]] = mapped_column(ARRAY(String(CandidateStringLen.skills)))
+    availability: Mapped[list[WorkSchedule]] = mapped_column(ARRAY(Enum(WorkSchedule)))
+    experience_months: Mapped[float] = mapped_column(Float)
+    sector_experience_months: Mapped[dict[str, float]] = mapped_column(JSONB)
+    language_levels: Mapped[dict[str, int]] = mapped_column(JSONB)
+    education_level_value: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    education_sector_levels: Mapped[dict[str, int]] = mapped_column(JSONB)
+    education_qualifications: Mapped[list[str]] = mapped_column(ARRAY(String(EducationStringLen.qualification)))
+
+    __table_args__ = (
+        PrimaryKeyConstraint(candidate_id, name=CandidateSearchProfileConstraint.CANDIDATE_SEARCH_PROFILE_PK),
+        Index(CandidateSearchProfileConstraint.PROVINCE_INDEX, province),
+        Index(CandidateSearchProfileConstraint.POSTAL_CODE_INDEX, postal_code),
+        Index(CandidateSearchProfileConstraint.EXPERIENCE_MONTHS_INDEX, experience_months),
+        Index(CandidateSearchProfileConstraint.SECTOR_EXPERIENCE_INDEX, sector_experience_months, postgresql_using="gin"),
+        Index(CandidateSearchProfileConstraint.LANGUAGE_LEVELS_INDEX, language_levels, postgresql_using="gin"),
+        Index(CandidateSearchProfileConstraint.EDUCATION_LEVEL_INDEX, education_level_value),
+        Index(CandidateSearchProfileConstraint.EDUCATION_SECTOR_INDEX, education_sector_levels, postgresql_using="gin"),
+        Index(CandidateSearchProfileConstraint.SKILLS_INDEX, skills, postgresql_using="gin"),
+        Index(CandidateSearchProfileConstraint.AVAILABILITY_INDEX, availability, postgresql_using="gin"),
+    )
+
+class ScheduledTask(Base):
+    """
+    Modelo de la tabla scheduled_task.
+
+    Esta tabla representa el registro de las ejecuciones de las tareas programadas.
+    Solo el proceso líder de las tareas programadas escribe en ella.
+
+    Campos:
+    - name: Campo que representa el nombre de la tarea.
+    - last_started_at: Campo que representa la fecha de inicio de la última ejecución.
+    - last_success_at: Campo que representa la fecha de fin de la última ejecución correcta.
+    - last_duration: Campo que representa la duración en segundos de la última ejecución.
+    - last_error: Campo que representa el error de la última ejecución si ha fallado.
+    """
+
+    __tablename__ = SCHEDULED_TASK
+
+    name: Mapped[str] = mapped_column(String(ScheduledTaskStringLen.name))
+    last_started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_success_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    last_duration: Mapped[float] = mapped_column(Float)
+    last_error: Mapped[Optional[str]]
+
+    __table_args__ = (
+        PrimaryKeyConstraint(name, name=ScheduledTaskConstraint.SCHEDULED_TASK_PK),
+    )
\ No newline at end of file
@@ -0,0 +1,514 @@
+from api.database.database_models.models import Job, JobKeyword, JobSearchDoc, JobLanguage, JobEducation, Address, Sector, Education, EducationLevel
+from api.database.database_models.models import Candidate, CandidateSearchProfile, User, Experience, CandidateLanguage, CandidateEducation, LanguageLevel, SectorEducation
+from api.database.connection import execute_database
+
+class JobKeywordsTrigger:
+    """Clase para crear el trigger que mantiene actualizado el recuento de palabras clave de las ofertas de trabajo."""
+
+    FUNCTION_NAME = "update_job_keywords"
+    TRIGGER_NAME = "job_keywords_trigger"
+
+    @staticmethod
+    def _get_words_sql(record: str) -> str:
+        """Devuelve la expresión que separa en palabras el título y la descripción de una versión (OLD|NEW) de la oferta."""
+
+        TITLE_NAME = str(Job.title).split(".")[1]
+        DESC_NAME = str(Job.description).split(".")[1]
+
+        return f"regexp_split_to_array(TRIM({record}.{TITLE_NAME}), '\\s+') || regexp_split_to_array(TRIM({record}.{DESC_NAME}), '\\s+')"
+
+    @classmethod
+    def _create_job_keywords_function(cls) -> str:
+        """
+        Crea la función del trigger. Calcula la diferencia de apariciones de cada palabra entre la versión anterior y la nueva de la oferta
+        y la aplica sobre la tabla de palabras clave. Las palabras que dejan de aparecer se eliminan.
+        En las inserciones OLD es NULL y en los borrados NEW es NULL, por lo que no aportan palabras.
+        """
+
+        TABLE_NAME = JobKeyword.__tablename__
+        WORD_NAME = str(JobKeyword.word).split(".")[1]
+        COUNT_NAME = str(JobKeyword.count).split(".")[1]
+
+        function_sql = f"""
+            CREATE OR REPLACE FUNCTION {cls.FUNCTION_NAME}()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO {TABLE_NAME} ({WORD_NAME}, {COUNT_NAME})
+                SELECT word, SUM(change)
+                FROM (
+                    SELECT UNNEST({cls._get_words_sql("OLD")}) AS word, -1 AS change
+                    UNION ALL
+                    SELECT UNNEST({cls._get_words_sql("NEW")}) AS word, 1 AS change
+                ) AS words
+                WHERE word <> ''
+                GROUP BY word
+                HAVING SUM(change) <> 0
+                ORDER BY word
+                ON CONFLICT ({WORD_NAME}) DO UPDATE SET {COUNT_NAME} = {TABLE_NAME}.{COUNT_NAME} + EXCLUDED.{COUNT_NAME};
+
+                IF TG_OP <> 'INSERT' THEN
+                    DELETE FROM {TABLE_NAME} WHERE {WORD_NAME} = ANY({cls._get_words_sql("OLD")}) AND {COUNT_NAME} <= 0;
+                END IF;
+
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+
+        return function_sql
+
+    @classmethod
+    def _create_job_keywords_trigger(cls) -> tuple[str]:
+        """Crea el trigger sobre la tabla job. Solo se ejecuta en las actualizaciones que modifican el título o la descripción."""
+
+        TABLE_NAME = Job.__tablename__
+        TITLE_NAME = str(Job.title).split(".")[1]
+        DESC_NAME = str(Job.description).split(".")[1]
+
+        trigger_sql = (
+            cls._create_job_keywords_function(),
+            f"""
+            CREATE OR REPLACE TRIGGER {cls.TRIGGER_NAME}
+            AFTER INSERT OR DELETE OR UPDATE OF {TITLE_NAME}, {DESC_NAME} ON {TABLE_NAME}
+            FOR EACH ROW EXECUTE FUNCTION {cls.FUNCTION_NAME}();
+            """
+        )
+
+        return trigger_sql
+
+    @classmethod
+    def _fill_job_keywords(cls) -> str:
+        """Rellena la tabla de palabras clave con las ofertas existentes si está vacía, por ejemplo al crearla en una base de datos con datos."""
+
+        TABLE_NAME = JobKeyword.__tablename__
+        WORD_NAME = str(JobKeyword.word).split(".")[1]
+        COUNT_NAME = str(JobKeyword.count).split(".")[1]
+        JOB_TABLE_NAME = Job.__tablename__
+
+        return f"""
+            INSERT INTO {TABLE_NAME} ({WORD_NAME}, {COUNT_NAME})
+            SELECT word, COUNT(*)
+            FROM (SELECT UNNEST({cls._get_words_sql(JOB_TABLE_NAME)}) AS word FROM {JOB_TABLE_NAME}) AS words
+            WHERE word <> '' AND NOT EXISTS (SELECT 1 FROM {TABLE_NAME})
+            GROUP BY word
+            ON CONFLICT ({WORD_NAME}) DO NOTHING;
+        """
+
+
+def _get_column_name(column) -> str:
+    """Devuelve el nombre de la columna de un atributo del modelo."""
+
+    return str(column).split(".")[1]
+
+
+class JobSearchDocTrigger:
+    """
+    Clase para crear los triggers que mantienen actualizado el documento de búsqueda de las ofertas de trabajo.
+    Cada trigger obtiene las ofertas afectadas por el cambio y vuelve a calcular su documento con la misma función.
+    """
+
+    FUNCTION_NAME = "refresh_job_search_doc"
+
+    @classmethod
+    def _create_refresh_function(cls) -> str:
+        """
+        Crea la función que calcula el documento de búsqueda de las ofertas indicadas a partir de sus tablas y lo guarda.
+        Las ofertas que no existen, por ejemplo al eliminarlas, no se guardan. Su documento se elimina en cascada.
+
+        Antes de calcularlo se bloquean las filas de las ofertas, por lo que dos transacciones que cambian la misma oferta
+        lo calculan una después de otra y la segunda lee los cambios de la primera. Se usa FOR NO KEY UPDATE, que no espera
+        al bloqueo KEY SHARE de las claves foráneas de las relaciones, para no bloquearse con la transacción que actualiza la oferta.
+        """
+
+        TABLE_NAME = JobSearchDoc.__tablename__
+        JOB_TABLE_NAME = Job.__tablename__
+        ADDRESS_TABLE_NAME = Address.__tablename__
+        SECTOR_TABLE_NAME = Sector.__tablename__
+        JOB_EDUCATION_TABLE_NAME = JobEducation.__tablename__
+        EDUCATION_TABLE_NAME = Education.__tablename__
+        EDUCATION_LEVEL_TABLE_NAME = EducationLevel.__tablename__
+        JOB_LANGUAGE_TABLE_NAME = JobLanguage.__tablename__
+
+        # columnas del documento y su valor en las tablas de la oferta
+        columns = {
+            JobSearchDoc.job_id: f"{JOB_TABLE_NAME}.{_get_column_name(Job.id)}",
+            JobSearchDoc.province: f"{ADDRESS_TABLE_NAME}.{_get_column_name(Address.province)}",
+            JobSearchDoc.sector_id: f"{SECTOR_TABLE_NAME}.{_get_column_name(Sector.id)}",
+            JobSearchDoc.sector_category: f"{SECTOR_TABLE_NAME}.{_get_column_name(Sector.category)}",
+            JobSearchDoc.education_qualification: f"{EDUCATION_TABLE_NAME}.{_get_column_name(Education.qualification)}",
+            JobSearchDoc.education_level_value: f"{EDUCATION_LEVEL_TABLE_NAME}.{_get_column_name(EducationLevel.value)}",
+            JobSearchDoc.language_ids: f"""ARRAY(
+                SELECT {_get_column_name(JobLanguage.language_id)} FROM {JOB_LANGUAGE_TABLE_NAME}
+                WHERE {JOB_LANGUAGE_TABLE_NAME}.{_get_column_name(JobLanguage.job_id)} = {JOB_TABLE_NAME}.{_get_column_name(Job.id)}
+            )""",
+            JobSearchDoc.skills: f"{JOB_TABLE_NAME}.{_get_column_name(Job.skills)}",
+            JobSearchDoc.work_schedule: f"{JOB_TABLE_NAME}.{_get_column_name(Job.work_schedule)}",
+            JobSearchDoc.active: f"{JOB_TABLE_NAME}.{_get_column_name(Job.active)}",
+            JobSearchDoc.publication_date: f"{JOB_TABLE_NAME}.{_get_column_name(Job.publication_date)}",
+            JobSearchDoc.search_vector: f"{JOB_TABLE_NAME}.{_get_column_name(Job.search_vector)}",
+        }
+
+        names = [_get_column_name(column) for column in columns]
+        JOB_ID_NAME = _get_column_name(JobSearchDoc.job_id)
+
+        function_sql = f"""
+            CREATE OR REPLACE FUNCTION {cls.FUNCTION_NAME}(job_ids UUID[])
+            RETURNS VOID AS $$
+            BEGIN
+                PERFORM 1 FROM {JOB_TABLE_NAME} WHERE {_get_column_name(Job.id)} = ANY(job_ids) ORDER BY {_get_column_name(Job.id)} FOR NO KEY UPDATE;
+
+                INSERT INTO {TABLE_NAME} ({", ".join(names)})
+                SELECT {", ".join(columns.values())}
+                FROM {JOB_TABLE_NAME}
+                JOIN {ADDRESS_TABLE_NAME} ON {ADDRESS_TABLE_NAME}.{_get_column_name(Address.id)} = {JOB_TABLE_NAME}.{_get_column_name(Job.address_id)}
+                JOIN {SECTOR_TABLE_NAME} ON {SECTOR_TABLE_NAME}.{_get_column_name(Sector.id)} = {JOB_TABLE_NAME}.{_get_column_name(Job.sector_id)}
+                LEFT JOIN {JOB_EDUCATION_TABLE_NAME} ON {JOB_EDUCATION_TABLE_NAME}.{_get_column_name(JobEducation.job_id)} = {JOB_TABLE_NAME}.{_get_column_name(Job.id)}
+                LEFT JOIN {EDUCATION_TABLE_NAME} ON {EDUCATION_TABLE_NAME}.{_get_column_name(Education.id)} = {JOB_EDUCATION_TABLE_NAME}.{_get_column_name(JobEducation.education_id)}
+                LEFT JOIN {EDUCATION_LEVEL_TABLE_NAME} ON {EDUCATION_LEVEL_TABLE_NAME}.{_get_column_name(EducationLevel.id)} = {EDUCATION_TABLE_NAME}.{_get_column_name(Education.level_id)}
+                WHERE {JOB_TABLE_NAME}.{_get_column_name(Job.id)} = ANY(job_ids)
+                ON CONFLICT ({JOB_ID_NAME}) DO UPDATE SET {", ".join(f"{name} = EXCLUDED.{name}" for name in names if name != JOB_ID_NAME)};
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+
+        return function_sql
+
+    @classmethod
+    def _get_sources(cls) -> tuple[tuple[str, str, str]]:
+        """
+        Devuelve las tablas que forman el documento de búsqueda. De cada una, los eventos del trigger
+        y la expresión con los ids de las ofertas afectadas por el cambio de una fila (OLD|NEW).
+        En las inserciones OLD es NULL y en los borrados NEW es NULL, por lo que no aportan ofertas.
+        """
+
+        JOB_ID_NAME = _get_column_name(Job.id)
+        JOB_TABLE_NAME = Job.__tablename__
+        JOB_EDUCATION_TABLE_NAME = JobEducation.__tablename__
+        EDUCATION_TABLE_NAME = Education.__tablename__
+
+        job_columns = ", ".join(_get_column_name(column) for column in (
+            Job.title, Job.description, Job.skills, Job.work_schedule, Job.active, Job.publication_date, Job.address_id, Job.sector_id
+        ))
+
+        # ofertas de una relación con la oferta, si cambia la oferta de la fila se actualizan la anterior y la nueva
+        job_relation_ids = f"ARRAY[OLD.{_get_column_name(JobLanguage.job_id)}, NEW.{_get_column_name(JobLanguage.job_id)}]"
+
+        # ofertas con la formación de la fila
+        education_job_ids = (
+            f"SELECT {_get_column_name(JobEducation.job_id)} FROM {JOB_EDUCATION_TABLE_NAME} "
+            f"WHERE {_get_column_name(JobEducation.education_id)} = NEW.{_get_column_name(Education.id)}"
+        )
+
+        # ofertas con una formación del nivel de la fila
+        education_level_job_ids = (
+            f"SELECT {JOB_EDUCATION_TABLE_NAME}.{_get_column_name(JobEducation.job_id)} FROM {JOB_EDUCATION_TABLE_NAME} "
+            f"JOIN {EDUCATION_TABLE_NAME} ON {EDUCATION_TABLE_NAME}.{_get_column_name(Education.id)} = {JOB_EDUCATION_TABLE_NAME}.{_get_column_name(JobEducation.education_id)} "
+            f"WHERE {EDUCATION_TABLE_NAME}.{_get_column_name(Education.level_id)} = NEW.{_get_column_name(EducationLevel.id)}"
+        )
+
+        return (
+            (JOB_TABLE_NAME, f"INSERT OR UPDATE OF {job_columns}", f"ARRAY[NEW.{JOB_ID_NAME}]"),
+            (JobLanguage.__tablename__, "INSERT OR UPDATE OR DELETE", job_relation_ids),
+            (JOB_EDUCATION_TABLE_NAME, "INSERT OR UPDATE OR DELETE", job_relation_ids),
+            (Address.__tablename__, f"UPDATE OF {_get_column_name(Address.province)}",
+             f"ARRAY(SELECT {JOB_ID_NAME} FROM {JOB_TABLE_NAME} WHERE {_get_column_name(Job.address_id)} = NEW.{_get_column_name(Address.id)})"),
+            (Sector.__tablename__, f"UPDATE OF {_get_column_name(Sector.category)}",
+             f"ARRAY(SELECT {JOB_ID_NAME} FROM {JOB_TABLE_NAME} WHERE {_get_column_name(Job.sector_id)} = NEW.{_get_column_name(Sector.id)})"),
+            (EDUCATION_TABLE_NAME, f"UPDATE OF {_get_column_name(Education.qualification)}, {_get_column_name(Education.level_id)}", f"ARRAY({education_job_ids})"),
+            (EducationLevel.__tablename__, f"UPDATE OF {_get_column_name(EducationLevel.value)}", f"ARRAY({education_level_job_ids})"),
+        )
+
+    @classmethod
+    def _create_job_search_doc_triggers(cls) -> tuple[str]:
+        """Crea la función que actualiza el documento de búsqueda y un trigger por cada tabla que lo forma."""
+
+        trigger_sql = [cls._create_refresh_function()]
+
+        for table_name, events, job_ids in cls._get_sources():
+            function_name = f"update_job_search_doc_from_{table_name}"
+
+            trigger_sql.append(f"""
+                CREATE OR REPLACE FUNCTION {function_name}()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    PERFORM {cls.FUNCTION_NAME}({job_ids});
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """)
+            trigger_sql.append(f"""
+                CREATE OR REPLACE TRIGGER {table_name}_job_search_doc_trigger
+                AFTER {events} ON {table_name}
+                FOR EACH ROW EXECUTE FUNCTION {function_name}();
+            """)
+
+        return tuple(trigger_sql)
+
+    @classmethod
+    def _fill_job_search_doc(cls) -> str:
+        """Crea el documento de búsqueda de las ofertas que no lo tienen, por ejemplo al crear la tabla en una base de datos con datos."""
+
+        TABLE_NAME = JobSearchDoc.__tablename__
+        JOB_TABLE_NAME = Job.__tablename__
+        JOB_ID_NAME = _get_column_name(Job.id)
+
+        return f"""
+            SELECT {cls.FUNCTION_NAME}(ARRAY(
+                SELECT {JOB_ID_NAME} FROM {JOB_TABLE_NAME}
+                WHERE NOT EXISTS (SELECT 1 FROM {TABLE_NAME} WHERE {_get_column_name(JobSearchDoc.job_id)} = {JOB_TABLE_NAME}.{JOB_ID_NAME})
+            ));
+        """
+
+
+class CandidateSearchProfileTrigger:
+    """
+    Clase para crear los triggers que mantienen actualizado el perfil de búsqueda de los candidatos.
+    Cada trigger obtiene los candidatos afectados por el cambio y vuelve a calcular su perfil con la misma función.
+    """
+
+    FUNCTION_NAME = "refresh_candidate_search_profile"
+
+    @staticmethod
+    def _get_months_sql(interval: str) -> str:
+        """
+        Devuelve la expresión que convierte un intervalo en meses, con los días como fracción de mes.
+        PostgreSQL compara los intervalos contando 30 días por mes, por lo que comparar los meses equivale a comparar los intervalos.
+        """
+
+        return f"(EXTRACT(YEAR FROM {interval}) * 12 + EXTRACT(MONTH FROM {interval}) + EXTRACT(DAY FROM {interval}) / 30.0)::FLOAT"
+
+    @classmethod
+    def _create_refresh_function(cls) -> str:
+        """
+        Crea la función que calcula el perfil de búsqueda de los candidatos indicados a partir de sus tablas y lo guarda.
+        Los candidatos que no existen, por ejemplo al eliminarlos, no se guardan. Su perfil se elimina en cascada.
+        Como en el documento de búsqueda de las ofertas, las filas de los candidatos se bloquean antes de calcularlo
+        para que dos cambios del mismo candidato no guarden un perfil calculado con datos anteriores.
+        """
+
+        TABLE_NAME = CandidateSearchProfile.__tablename__
+        CANDIDATE_TABLE_NAME = Candidate.__tablename__
+        USER_TABLE_NAME = User.__tablename__
+        ADDRESS_TABLE_NAME = Address.__tablename__
+        EXPERIENCE_TABLE_NAME = Experience.__tablename__
+        CANDIDATE_LANGUAGE_TABLE_NAME = CandidateLanguage.__tablename__
+        LANGUAGE_LEVEL_TABLE_NAME = LanguageLevel.__tablename__
+        CANDIDATE_EDUCATION_TABLE_NAME = CandidateEducation.__tablename__
+        EDUCATION_TABLE_NAME = Education.__tablename__
+        EDUCATION_LEVEL_TABLE_NAME = EducationLevel.__tablename__
+        SECTOR_EDUCATION_TABLE_NAME = SectorEducation.__tablename__
+
+        CANDIDATE_ID = f"{CANDIDATE_TABLE_NAME}.{_get_column_name(Candidate.user_id)}"
+
+        # duración de cada experiencia, las experiencias sin fecha de fin siguen en curso
+        duration = (
+            f"age(COALESCE({EXPERIENCE_TABLE_NAME}.{_get_column_name(Experience.end_date)}, CURRENT_DATE), "
+            f"{EXPERIENCE_TABLE_NAME}.{_get_column_name(Experience.start_date)})"
+        )
+        experience_where = f"WHERE {EXPERIENCE_TABLE_NAME}.{_get_column_name(Experience.candidate_id)} = {CANDIDATE_ID}"
+
+        # formaciones del candidato con su nivel
+        education_from = (
+            f"FROM {CANDIDATE_EDUCATION_TABLE_NAME} "
+            f"JOIN {EDUCATION_TABLE_NAME} ON {EDUCATION_TABLE_NAME}.{_get_column_name(Education.id)} = {CANDIDATE_EDUCATION_TABLE_NAME}.{_get_column_name(CandidateEducation.education_id)} "
+            f"JOIN {EDUCATION_LEVEL_TABLE_NAME} ON {EDUCATION_LEVEL_TABLE_NAME}.{_get_column_name(EducationLevel.id)} = {EDUCATION_TABLE_NAME}.{_get_column_name(Education.level_id)}"
+        )
+        education_where = f"WHERE {CANDIDATE_EDUCATION_TABLE_NAME}.{_get_column_name(CandidateEducation.candidate_id)} = {CANDIDATE_ID}"
+        EDUCATION_LEVEL_VALUE = f"{EDUCATION_LEVEL_TABLE_NAME}.{_get_column_name(EducationLevel.value)}"
+
+        SECTOR_ID_NAME = _get_column_name(Experience.sector_id)
+        LANGUAGE_ID_NAME = _get_column_name(CandidateLanguage.language_id)
+
+        # columnas del perfil y su valor en las tablas del candidato
+        columns = {
+            CandidateSearchProfile.candidate_id: CANDIDATE_ID,
+            CandidateSearchProfile.province: f"{ADDRESS_TABLE_NAME}.{_get_column_name(Address.province)}",
+            CandidateSearchProfile.postal_code: f"{ADDRESS_TABLE_NAME}.{_get_column_name(Address.postal_code)}",
+            CandidateSearchProfile.skills: f"{CANDIDATE_TABLE_NAME}.{_get_column_name(Candidate.skills)}",
+            CandidateSearchProfile.availability: f"{CANDIDATE_TABLE_NAME}.{_get_column_name(Candidate.availability)}",
+            CandidateSearchProfile.experience_months: f"""COALESCE((
+                SELECT {cls._get_months_sql(f"SUM({duration})")} FROM {EXPERIENCE_TABLE_NAME} {experience_where}
+            ), 0)""",
+            CandidateSearchProfile.sector_experience_months: f"""COALESCE((
+                SELECT jsonb_object_agg({SECTOR_ID_NAME}, months) FROM (
+                    SELECT {EXPERIENCE_TABLE_NAME}.{SECTOR_ID_NAME}, {cls._get_months_sql(f"SUM({duration})")} AS months
+                    FROM {EXPERIENCE_TABLE_NAME} {experience_where}
+                    GROUP BY {EXPERIENCE_TABLE_NAME}.{SECTOR_ID_NAME}
+                ) AS sector_experience
+            ), '{{}}')""",
+            CandidateSearchProfile.language_levels: f"""COALESCE((
+                SELECT jsonb_object_agg({LANGUAGE_ID_NAME}, level_value) FROM (
+                    SELECT {CANDIDATE_LANGUAGE_TABLE_NAME}.{LANGUAGE_ID_NAME}, MAX({LANGUAGE_LEVEL_TABLE_NAME}.{_get_column_name(LanguageLevel.value)}) AS level_value
+                    FROM {CANDIDATE_LANGUAGE_TABLE_NAME}
+                    JOIN {LANGUAGE_LEVEL_TABLE_NAME} ON {LANGUAGE_LEVEL_TABLE_NAME}.{_get_column_name(LanguageLevel.id)} = {CANDIDATE_LANGUAGE_TABLE_NAME}.{_get_column_name(CandidateLanguage.level_id)}
+                    WHERE {CANDIDATE_LANGUAGE_TABLE_NAME}.{_get_column_name(CandidateLanguage.candidate_id)} = {CANDIDATE_ID}
+                    GROUP BY {CANDIDATE_LANGUAGE_TABLE_NAME}.{LANGUAGE_ID_NAME}
+                ) AS language_levels
+            ), '{{}}')""",
+            CandidateSearchProfile.education_level_value: f"(SELECT MAX({EDUCATION_LEVEL_VALUE}) {education_from} {education_where})",
+            CandidateSearchProfile.education_sector_levels: f"""COALESCE((
+                SELECT jsonb_object_agg({SECTOR_ID_NAME}, level_value) FROM (
+                    SELECT {SECTOR_EDUCATION_TABLE_NAME}.{_get_column_name(SectorEducation.sector_id)}, MAX({EDUCATION_LEVEL_VALUE}) AS level_value
+                    {education_from}
+                    JOIN {SECTOR_EDUCATION_TABLE_NAME} ON {SECTOR_EDUCATION_TABLE_NAME}.{_get_column_name(SectorEducation.education_id)} = {EDUCATION_TABLE_NAME}.{_get_column_name(Education.id)}
+                    {education_where}
+                    GROUP BY {SECTOR_EDUCATION_TABLE_NAME}.{_get_column_name(SectorEducation.sector_id)}
+                ) AS education_sector_levels
+            ), '{{}}')""",
+            CandidateSearchProfile.education_qualifications: f"ARRAY(SELECT {EDUCATION_TABLE_NAME}.{_get_column_name(Education.qualification)} {education_from} {education_where})",
+        }
+
+        names = [_get_column_name(column) for column in columns]
+        CANDIDATE_ID_NAME = _get_column_name(CandidateSearchProfile.candidate_id)
+
+        function_sql = f"""
+            CREATE OR REPLACE FUNCTION {cls.FUNCTION_NAME}(candidate_ids UUID[])
+            RETURNS VOID AS $$
+            BEGIN
+                PERFORM 1 FROM {CANDIDATE_TABLE_NAME} WHERE {CANDIDATE_ID} = ANY(candidate_ids) ORDER BY {CANDIDATE_ID} FOR NO KEY UPDATE;
+
+                INSERT INTO {TABLE_NAME} ({", ".join(names)})
+                SELECT {", ".join(columns.values())}
+                FROM {CANDIDATE_TABLE_NAME}
+                JOIN "{USER_TABLE_NAME}" ON "{USER_TABLE_NAME}".{_get_column_name(User.id)} = {CANDIDATE_ID}
+                JOIN {ADDRESS_TABLE_NAME} ON {ADDRESS_TABLE_NAME}.{_get_column_name(Address.id)} = "{USER_TABLE_NAME}".{_get_column_name(User.address_id)}
+                WHERE {CANDIDATE_ID} = ANY(candidate_ids)
+                ON CONFLICT ({CANDIDATE_ID_NAME}) DO UPDATE SET {", ".join(f"{name} = EXCLUDED.{name}" for name in names if name != CANDIDATE_ID_NAME)};
+            END;
+            $$ LANGUAGE plpgsql;
+        """
+
+        return function_sql
+
+    @classmethod
+    def _get_sources(cls) -> tuple[tuple[str, str, str]]:
+        """
+        Devuelve las tablas que forman el perfil de búsqueda. De cada una, los eventos del trigger
+        y la expresión con los ids de los candidatos afectados por el cambio de una fila (OLD|NEW).
+        En las inserciones OLD es NULL y en los borrados NEW es NULL, por lo que no aportan candidatos.
+        Los usuarios que no son candidatos no tienen fila en la tabla candidate, por lo que la función no les crea un perfil.
+        """
+
+        USER_TABLE_NAME = User.__tablename__
+        CANDIDATE_ID_NAME = _get_column_name(Experience.candidate_id)
+        CANDIDATE_EDUCATION_TABLE_NAME = CandidateEducation.__tablename__
+        EDUCATION_TABLE_NAME = Education.__tablename__
+
+        candidate_columns = ", ".join(_get_column_name(column) for column in (Candidate.skills, Candidate.availability))
+        address_columns = ", ".join(_get_column_name(column) for column in (Address.province, Address.postal_code))
+
+        # candidatos de una relación con el candidato, si cambia el candidato de la fila se actualizan el anterior y el nuevo
+        candidate_relation_ids = f"ARRAY[OLD.{CANDIDATE_ID_NAME}, NEW.{CANDIDATE_ID_NAME}]"
+
+        # candidatos con la formación de la fila
+        education_candidate_ids = (
+            f"SELECT {CANDIDATE_ID_NAME} FROM {CANDIDATE_EDUCATION_TABLE_NAME} "
+            f"WHERE {_get_column_name(CandidateEducation.education_id)} = NEW.{_get_column_name(Education.id)}"
+        )
+
+        # candidatos con una formación del nivel de la fila
+        education_level_candidate_ids = (
+            f"SELECT {CANDIDATE_EDUCATION_TABLE_NAME}.{CANDIDATE_ID_NAME} FROM {CANDIDATE_EDUCATION_TABLE_NAME} "
+            f"JOIN {EDUCATION_TABLE_NAME} ON {EDUCATION_TABLE_NAME}.{_get_column_name(Education.id)} = {CANDIDATE_EDUCATION_TABLE_NAME}.{_get_column_name(CandidateEducation.education_id)} "
+            f"WHERE {EDUCATION_TABLE_NAME}.{_get_column_name(Education.level_id)} = NEW.{_get_column_name(EducationLevel.id)}"
+        )
+
+        # candidatos con la formación de la fila de sectores, anterior o nueva
+        sector_education_candidate_ids = (
+            f"SELECT {CANDIDATE_ID_NAME} FROM {CANDIDATE_EDUCATION_TABLE_NAME} "
+            f"WHERE {_get_column_name(CandidateEducation.education_id)} IN "
+            f"(OLD.{_get_column_name(SectorEducation.education_id)}, NEW.{_get_column_name(SectorEducation.education_id)})"
+        )
+
+        return (
+            (Candidate.__tablename__, f"INSERT OR UPDATE OF {candidate_columns}", f"ARRAY[NEW.{_get_column_name(Candidate.user_id)}]"),
+            (USER_TABLE_NAME, f"UPDATE OF {_get_column_name(User.address_id)}", f"ARRAY[NEW.{_get_column_name(User.id)}]"),
+            (Address.__tablename__, f"UPDATE OF {address_columns}",
+             f"ARRAY(SELECT {_get_column_name(User.id)} FROM \"{USER_TABLE_NAME}\" WHERE {_get_column_name(User.address_id)} = NEW.{_get_column_name(Address.id)})"),
+            (Experience.__tablename__, "INSERT OR UPDATE OR DELETE", candidate_relation_ids),
+            (CandidateLanguage.__tablename__, "INSERT OR UPDATE OR DELETE", candidate_relation_ids),
+            (CANDIDATE_EDUCATION_TABLE_NAME, "INSERT OR UPDATE OR DELETE", candidate_relation_ids),
+            (LanguageLevel.__tablename__, f"UPDATE OF {_get_column_name(LanguageLevel.value)}",
+             f"ARRAY(SELECT {CANDIDATE_ID_NAME} FROM {CandidateLanguage.__tablename__} WHERE {_get_column_name(CandidateLanguage.level_id)} = NEW.{_get_column_name(LanguageLevel.id)})"),
+            (EDUCATION_TABLE_NAME, f"UPDATE OF {_get_column_name(Education.qualification)}, {_get_column_name(Education.level_id)}", f"ARRAY({education_candidate_ids})"),
+            (EducationLevel.__tablename__, f"UPDATE OF {_get_column_name(EducationLevel.value)}", f"ARRAY({education_level_candidate_ids})"),
+            (SectorEducation.__tablename__, "INSERT OR UPDATE OR DELETE", f"ARRAY({sector_education_candidate_ids})"),
+        )
+
+    @classmethod
+    def _create_candidate_search_profile_triggers(cls) -> tuple[str]:
+        """Crea la función que actualiza el perfil de búsqueda y un trigger por cada tabla que lo forma."""
+
+        trigger_sql = [cls._create_refresh_function()]
+
+        for table_name, events, candidate_ids in cls._get_sources():
+            function_name = f"update_candidate_search_profile_from_{table_name}"
+
+            trigger_sql.append(f"""
+                CREATE OR REPLACE FUNCTION {function_name}()
+                RETURNS TRIGGER AS $$
+                BEGIN
+                    PERFORM {cls.FUNCTION_NAME}({candidate_ids});
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """)
+            # la tabla user es una palabra reservada, por lo que el nombre de la tabla se escribe entre comillas
+            trigger_sql.append(f"""
+                CREATE OR REPLACE TRIGGER {table_name}_candidate_search_profile_trigger
+                AFTER {events} ON "{table_name}"
+                FOR EACH ROW EXECUTE FUNCTION {function_name}();
+            """)
+
+        return tuple(trigger_sql)
+
+    @classmethod
+    def _fill_candidate_search_profile(cls) -> str:
+        """Crea el perfil de búsqueda de los candidatos que no lo tienen, por ejemplo al crear la tabla en una base de datos con datos."""
+
+        TABLE_NAME = CandidateSearchProfile.__tablename__
+        CANDIDATE_TABLE_NAME = Candidate.__tablename__
+        CANDIDATE_ID_NAME = _get_column_name(Candidate.user_id)
+
+        return f"""
+            SELECT {cls.FUNCTION_NAME}(ARRAY(
+                SELECT {CANDIDATE_ID_NAME} FROM {CANDIDATE_TABLE_NAME}
+                WHERE NOT EXISTS (SELECT 1 FROM {TABLE_NAME} WHERE {_get_column_name(CandidateSearchProfile.candidate_id)} = {CANDIDATE_TABLE_NAME}.{CANDIDATE_ID_NAME})
+            ));
+        """
+
+    @classmethod
+    def _refresh_current_experience(cls) -> str:
+        """
+        Vuelve a calcular el perfil de búsqueda de los candidatos con experiencias en curso,
+        cuya duración aumenta cada día sin que cambie ninguna fila.
+        """
+
+        return f"""
+            SELECT {cls.FUNCTION_NAME}(ARRAY(
+                SELECT DISTINCT {_get_column_name(Experience.candidate_id)} FROM {Experience.__tablename__}
+                WHERE {_get_column_name(Experience.end_date)} IS NULL
+            ));
+        """
+
+
+# funciones para crear todos los triggers de la base de datos
+
+@execute_database
+def create_database_triggers() -> tuple[str]:
+    """Devuelve una lista con los triggers para crear en la base de datos."""
+
+    return (
+        *JobKeywordsTrigger._create_job_keywords_trigger(),
+        JobKeywordsTrigger._fill_job_keywords(),
+        *JobSearchDocTrigger._create_job_search_doc_triggers(),
+        JobSearchDocTrigger._fill_job_search_doc(),
+        *CandidateSearchProfileTrigger._create_candidate_search_profile_triggers(),
+        CandidateSearchProfileTrigger._fill_candidate_search_profile(),
+    )
+
+@execute_database
+def refresh_candidate_search_profiles() -> tuple[str]:
+    """Devuelve la sentencia que actualiza la experiencia en curso de los perfiles de búsqueda de los candidatos. Se ejecuta como tarea programada."""
+
+    return (CandidateSearchProfileTrigger._refresh_current_experience(),)
@@ -0,0 +1,62 @@
+from api.database.database_models.models import Job, Candidate, JOB_SEARCH_VECTOR_EXPRESSION
+from api.database.database_models.metadata.string_length import CandidateStringLen
+from api.database.database_models.metadata.constraint_name import JobConstraint
+from api.database.connection import execute_database
+
+class JobSearchUpdate:
+    """Clase para añadir a una tabla de ofertas de trabajo ya existente las columnas e índices de búsqueda."""
+
+    @staticmethod
+    def _add_job_search_columns() -> tuple[str]:
+        """Añade el vector de búsqueda y los índices de búsqueda y paginación si no existen."""
+
+        TABLE_NAME = Job.__tablename__
+        SEARCH_VECTOR_NAME = str(Job.search_vector).split(".")[1]
+        PUBLICATION_DATE_NAME = str(Job.publication_date).split(".")[1]
+        ID_NAME = str(Job.id).split(".")[1]
+
+        update_sql = (
+            f"ALTER TABLE {TABLE_NAME} ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_NAME} TSVECTOR GENERATED ALWAYS AS ({JOB_SEARCH_VECTOR_EXPRESSION}) STORED;",
+            f"CREATE INDEX IF NOT EXISTS {JobConstraint.SEARCH_VECTOR_INDEX} ON {TABLE_NAME} USING GIN ({SEARCH_VECTOR_NAME});",
+            f"CREATE INDEX IF NOT EXISTS {JobConstraint.PUBLICATION_DATE_ID_INDEX} ON {TABLE_NAME} ({PUBLICATION_DATE_NAME} DESC, {ID_NAME} DESC);"
+        )
+
+        return update_sql
+
+
+class JobKeywordsUpdate:
+    """Clase para eliminar la vista materializada de palabras clave, sustituida por la tabla job_keyword."""
+
+    @staticmethod
+    def _drop_job_keywords_view() -> str:
+        """Elimina la vista materializada de palabras clave si existe."""
+
+        VIEW_NAME = "job_keywords_view"
+
+        return f"DROP MATERIALIZED VIEW IF EXISTS {VIEW_NAME};"
+
+
+class CandidateCurriculumUpdate:
+    """Clase para añadir a una tabla de candidatos ya existente la clave del currículum en el almacén de archivos."""
+
+    @staticmethod
+    def _add_curriculum_key_column() -> str:
+        """Añade la columna de la clave del currículum si no existe."""
+
+        TABLE_NAME = Candidate.__tablename__
+        CURRICULUM_KEY_NAME = str(Candidate.curriculum_key).split(".")[1]
+
+        return f"ALTER TABLE {TABLE_NAME} ADD COLUMN IF NOT EXISTS {CURRICULUM_KEY_NAME} VARCHAR({CandidateStringLen.curriculum_key});"
+
+
+# funciones para actualizar las tablas ya existentes de la base de datos
+
+@execute_database
+def update_database_tables() -> tuple[str]:
+    """Devuelve una lista con las sentencias para actualizar las tablas existentes en la base de datos."""
+
+    return (
+        *JobSearchUpdate._add_job_search_columns(),
+        JobKeywordsUpdate._drop_job_keywords_view(),
+        CandidateCurriculumUpdate._add_curriculum_key_column(),
+    )
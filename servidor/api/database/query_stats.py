@@ -0,0 +1,217 @@
+import re
+from time import perf_counter
+from functools import lru_cache
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator
+from api.utils.constants.error_strings import SLOW_QUERY, N_PLUS_ONE_QUERY
+from api.utils.functions.env_config import CONFIG
+
+# parámetros de las sentencias, con su conversión de tipo si la tienen, y listas de parámetros, como las de IN, que cambian de tamaño según la petición
+_PARAM = r"\$\d+(?:::\w+(?:\[\])?)?"
+_PARAMS_LIST_REGEX = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_PARAM_REGEX = re.compile(_PARAM)
+
+class RequestStats:
+    """Contadores de las sentencias SQL ejecutadas durante una petición."""
+
+    __slots__ = ("statements", "db_time", "rows", "shapes", "scope")
+
+    def __init__(self, scope: dict | None = None) -> None:
+        """
+        Inicializa los contadores a cero.
+
+        Args:
+        - scope (dict | None): Scope ASGI de la petición, se usa para obtener su ruta.
+        """
+
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.shapes: dict[str, int] = {}
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        """Método y plantilla de la ruta de la petición. FastAPI guarda la ruta en el scope al encontrar el endpoint."""
+
+        if not self.scope:
+            return "-"
+
+        route = getattr(self.scope.get("route"), "path", self.scope.get("path"))
+
+        return f"{self.scope.get('method')} {route}"
+
+    def get_repeated_shapes(self, threshold: int) -> dict[str, int]:
+        """
+        Devuelve las formas de sentencia que se han repetido al menos el número de veces indicado, lo que suele indicar un problema N+1.
+
+        Args:
+        - threshold (int): Número mínimo de repeticiones.
+
+        Returns:
+        - dict[str, int]: Las formas de sentencia y sus repeticiones.
+        """
+
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+class QueryRecorder:
+    """Guarda los contadores de las peticiones atendidas mientras está activo. Se usa en las pruebas."""
+
+    def __init__(self) -> None:
+        """Inicializa el grabador sin peticiones."""
+
+        self.requests: list[RequestStats] = []
+
+    @property
+    def statements(self) -> int:
+        """Número total de sentencias de las peticiones grabadas."""
+
+        return sum(stats.statements for stats in self.requests)
+
+    @property
+    def shapes(self) -> dict[str, int]:
+        """Repeticiones de cada forma de sentencia en las peticiones grabadas."""
+
+        shapes = {}
+        for stats in self.requests:
+            for shape, count in stats.shapes.items():
+                shapes[shape] = shapes.get(shape, 0) + count
+
+        return shapes
+
+
+# contadores de la petición que se está atendiendo, las sentencias fuera de una petición no se cuentan
+_CURRENT_REQUEST: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+# grabador activo, las peticiones atendidas en su contexto se le añaden al terminar
+_CURRENT_RECORDER: ContextVar[QueryRecorder | None] = ContextVar("current_recorder", default=None)
+
+
+@lru_cache(maxsize=1024)
+def get_statement_shape(statement: str) -> str:
+    """
+    Devuelve la forma de una sentencia, es decir, la sentencia sin valores.
+    Las listas de parámetros se reducen a uno para que IN con distinto número de valores tenga la misma forma.
+
+    Args:
+    - statement (str): Sentencia SQL.
+
+    Returns:
+    - str: La forma de la sentencia.
+    """
+
+    statement = _PARAMS_LIST_REGEX.sub("(?)", statement)
+    statement = _PARAM_REGEX.sub("?", statement)
+
+    return " ".join(statement.split())
+
+def _print_log(message: str, **extra_message_info) -> None:
+    """Guarda un aviso en el log de errores."""
+
+    # import en esta línea para evitar circular imports
+    from api.utils.functions.management_utils import print_log, LogLevel
+
+    print_log(message, LogLevel.WARNING, **extra_message_info)
+
+def start_request_stats(scope: dict | None = None) -> tuple[RequestStats, Token]:
+    """
+    Empieza a contar las sentencias SQL de la petición actual.
+    SQLAlchemy propaga el contexto de la petición a los eventos del motor, por lo que las sentencias se suman a sus contadores.
+
+    Args:
+    - scope (dict | None): Scope ASGI de la petición.
+
+    Returns:
+    - tuple[RequestStats, Token]: Los contadores de la petición y el token para dejar de contar.
+    """
+
+    stats = RequestStats(scope)
+    return stats, _CURRENT_REQUEST.set(stats)
+
+def stop_request_stats(token: Token) -> None:
+    """
+    Deja de contar las sentencias SQL de la petición actual.
+    Si alguna forma de sentencia se ha repetido N_PLUS_ONE_THRESHOLD veces o más, se guarda un aviso en el log.
+
+    Args:
+    - token (Token): Token devuelto por start_request_stats.
+    """
+
+    stats = _CURRENT_REQUEST.get()
+    _CURRENT_REQUEST.reset(token)
+
+    if stats is None:
+        return
+
+    recorder = _CURRENT_RECORDER.get()
+    if recorder is not None:
+        recorder.requests.append(stats)
+
+    for shape, count in stats.get_repeated_shapes(CONFIG.N_PLUS_ONE_THRESHOLD).items():
+        _print_log(N_PLUS_ONE_QUERY, route=stats.route, count=count, statement=shape)
+
+def get_request_stats() -> RequestStats | None:
+    """Devuelve los contadores de la petición actual o None si no se está atendiendo una petición."""
+
+    return _CURRENT_REQUEST.get()
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """
+    Graba los contadores de las peticiones atendidas dentro del bloque.
+
+    Returns:
+    - Iterator[QueryRecorder]: El grabador con las peticiones.
+    """
+
+    recorder = QueryRecorder()
+    token = _CURRENT_RECORDER.set(recorder)
+
+    try:
+        yield recorder
+    finally:
+        _CURRENT_RECORDER.reset(token)
+
+
+# eventos del motor de la base de datos, se registran en connection.py
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Guarda el instante en que empieza la sentencia en su contexto de ejecución, que se descarta con la sentencia
+    aunque falle. Las sentencias internas del motor no tienen contexto y lo guardan en la conexión, sustituyendo al anterior.
+    """
+
+    if context is not None:
+        context._query_start = perf_counter()
+    else:
+        conn.info["query_start"] = perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    Suma la sentencia, su duración y sus filas a los contadores de la petición actual.
+    Si la sentencia dura SLOW_QUERY_THRESHOLD segundos o más, se guarda un aviso en el log con la ruta de la petición.
+    """
+
+    start = context._query_start if context is not None else conn.info.pop("query_start")
+    elapsed = perf_counter() - start
+    stats = _CURRENT_REQUEST.get()
+
+    if elapsed >= CONFIG.SLOW_QUERY_THRESHOLD:
+        _print_log(SLOW_QUERY, route=stats.route if stats else "-", duration=elapsed, statement=get_statement_shape(statement))
+
+    if stats is None:
+        return
+
+    # el adaptador de asyncpg descarga todas las filas al ejecutar y solo indica rowcount en las modificaciones
+    rows = cursor.rowcount
+    if rows < 0:
+        rows = len(getattr(cursor, "_rows", None) or ())
+
+    shape = get_statement_shape(statement)
+
+    stats.statements += 1
+    stats.db_time += elapsed
+    stats.rows += rows
+    stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
@@ -0,0 +1,209 @@
+import logging
+from json import dumps
+from queue import Empty
+from time import monotonic
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler, SMTPHandler, QueueListener
+from api.utils.constants.info_strings import ALERTS_SUPPRESSED
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatea cada registro de log como un objeto JSON en una sola línea."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Devuelve el registro como una línea JSON con la fecha, el logger, el nivel y el mensaje.
+
+        Args:
+        - record (LogRecord): Registro de log.
+
+        Returns:
+        - str: Línea JSON del registro.
+        """
+
+        log = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+
+        # si el registro tiene una excepción, se añade su traza
+        if record.exc_info:
+            log["exc"] = self.formatException(record.exc_info)
+
+        return dumps(log, ensure_ascii=False, default=str)
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    Manejador que escribe los registros en un archivo rotativo por lotes.
+    Los registros se acumulan en memoria y se escriben juntos cuando se llena el lote, cuando pasa el intervalo de escritura
+    o cuando llega un registro de error, reduciendo el número de escrituras en disco.
+    """
+
+    def __init__(self, filename: str, maxBytes: int = 0, backupCount: int = 0, capacity: int = 100, flush_interval: float = 1.0, encoding: str = "utf-8", **kwargs) -> None:
+        """
+        Inicializa el manejador.
+
+        Args:
+        - filename (str): Ruta del archivo de log.
+        - maxBytes (int): Tamaño máximo del archivo antes de rotarlo. Si es 0 no se rota.
+        - backupCount (int): Número de archivos rotados que se conservan.
+        - capacity (int): Número de registros que forman un lote.
+        - flush_interval (float): Segundos máximos que un registro puede esperar en memoria.
+        - encoding (str): Codificación del archivo.
+        """
+
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, **kwargs)
+
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.buffer: list[str] = []
+        self._last_flush = monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Añade el registro al lote y lo escribe si se cumple alguna condición de escritura."""
+
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+
+        if len(self.buffer) >= self.capacity or record.levelno >= logging.ERROR or monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe en el archivo los registros acumulados, rotándolo antes si el lote no cabe."""
+
+        self.acquire()
+
+        try:
+            if self.buffer:
+                data = self.terminator.join(self.buffer) + self.terminator
+                self.buffer = []
+
+                if self.stream is None:
+                    self.stream = self._open()
+
+                # se rota el archivo si al escribir el lote se supera el tamaño máximo
+                if self.maxBytes > 0:
+                    self.stream.seek(0, 2)
+                    if self.stream.tell() > 0 and self.stream.tell() + len(data) >= self.maxBytes:
+                        self.doRollover()
+
+                self.stream.write(data)
+
+            if self.stream:
+                self.stream.flush()
+
+            self._last_flush = monotonic()
+
+        except Exception:
+            self.handleError(None)
+
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Escribe los registros pendientes y cierra el archivo."""
+
+        self.flush()
+        super().close()
+
+
+class DeduplicatingSMTPHandler(SMTPHandler):
+    """
+    Manejador que envía las alertas por correo sin repetir la misma alerta dentro de una ventana de tiempo.
+    Dos alertas se consideran iguales si tienen el mismo logger, nivel y primera línea del mensaje.
+    Las alertas suprimidas se cuentan y se indican en la siguiente alerta que se envía.
+    """
+
+    def __init__(self, *args, dedup_seconds: int = 300, **kwargs) -> None:
+        """
+        Inicializa el manejador.
+
+        Args:
+        - args: Argumentos de SMTPHandler.
+        - dedup_seconds (int): Segundos durante los que no se repite una alerta.
+        - kwargs: Argumentos de SMTPHandler.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.dedup_seconds = dedup_seconds
+        self._last_sent: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def _get_key(self, record: logging.LogRecord) -> str:
+        """Devuelve la clave que identifica las alertas iguales."""
+
+        message = record.getMessage()
+        first_line = message.splitlines()[0] if message else ""
+
+        return f"{record.name}:{record.levelno}:{first_line}"
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Envía la alerta si no se ha enviado una igual dentro de la ventana de tiempo."""
+
+        key = self._get_key(record)
+        now = monotonic()
+
+        # si se ha enviado una alerta igual hace poco, se suprime
+        if now - self._last_sent.get(key, -self.dedup_seconds) < self.dedup_seconds:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+
+        # se eliminan las alertas antiguas para que no crezca la memoria
+        self._last_sent = {sent_key: sent for sent_key, sent in self._last_sent.items() if now - sent < self.dedup_seconds}
+        self._last_sent[key] = now
+
+        # si se han suprimido alertas iguales, se indica en el mensaje
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            record.msg = f"{record.getMessage()}\n\n{ALERTS_SUPPRESSED.format(count=suppressed)}"
+            record.args = None
+
+        super().emit(record)
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Escucha la cola de logs en un hilo propio y envía los registros a los manejadores.
+    Cuando la cola está vacía durante el intervalo de escritura, pide a los manejadores que escriban los registros pendientes.
+    """
+
+    def __init__(self, queue, *handlers: logging.Handler, flush_interval: float = 1.0) -> None:
+        """
+        Inicializa el escuchador.
+
+        Args:
+        - queue (Queue): Cola de registros.
+        - handlers (Handler): Manejadores que procesan los registros.
+        - flush_interval (float): Segundos sin registros tras los que se escriben los pendientes.
+        """
+
+        super().__init__(queue, *handlers, respect_handler_level=True)
+
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        """Obtiene el siguiente registro de la cola, escribiendo los pendientes mientras espera."""
+
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except Empty:
+                if not block:
+                    raise
+
+                for handler in self.handlers:
+                    handler.flush()
+
+    def stop(self) -> None:
+        """Detiene el hilo después de procesar los registros de la cola y escribe los pendientes."""
+
+        super().stop()
+
+        for handler in self.handlers:
+            handler.flush()
@@ -1,9 +1,85 @@
 import logging.config, logging
+from queue import SimpleQueue
+from logging.handlers import QueueHandler, SMTPHandler
 from api.loggs.load_config import config_data
+from api.loggs.handlers import BatchingQueueListener
+from api.utils.functions.env_config import CONFIG
 
 # Carga la configuración de logs
 logging.config.dictConfig(config_data)
 
 # Se obtienen los loggers de la aplicación
 INFO_LOGGER = logging.getLogger("app_info")
-ERROR_LOGGER = logging.getLogger("app_error")
\ No newline at end of file
+ERROR_LOGGER = logging.getLogger("app_error")
+
+
+class LogListenerManager:
+    """
+    Manejador de la escritura de logs en segundo plano.
+
+    Al iniciarse, los manejadores de los loggers de la aplicación se sustituyen por una cola y un hilo por logger
+    procesa los registros, por lo que registrar un log solo añade el registro a la cola.
+    Las alertas por correo tienen su propia cola y su propio hilo para que el envío no retrase la escritura de los archivos.
+    Se inicia en cada worker de la API. Sin iniciarse, por ejemplo en la línea de comandos, los logs se escriben directamente.
+    """
+
+    LOGGERS: tuple[logging.Logger] = (INFO_LOGGER, ERROR_LOGGER)
+
+    _listeners: list[BatchingQueueListener] = []
+    _handlers: dict[str, list[logging.Handler]] = {}
+
+    @classmethod
+    def _start_listener(cls, *handlers: logging.Handler) -> QueueHandler:
+        """
+        Inicia un hilo que procesa los registros de una cola con los manejadores indicados.
+
+        Args:
+        - handlers (Handler): Manejadores que procesan los registros.
+
+        Returns:
+        - QueueHandler: Manejador que añade los registros a la cola.
+        """
+
+        queue = SimpleQueue()
+        listener = BatchingQueueListener(queue, *handlers, flush_interval=CONFIG.LOG_FLUSH_INTERVAL)
+        listener.start()
+
+        cls._listeners.append(listener)
+
+        return QueueHandler(queue)
+
+    @classmethod
+    def start(cls) -> None:
+        """Sustituye los manejadores de los loggers de la aplicación por colas procesadas en segundo plano."""
+
+        if cls._listeners:
+            return
+
+        for logger in cls.LOGGERS:
+            handlers = logger.handlers[:]
+            cls._handlers[logger.name] = handlers
+
+            # las alertas por correo se envían desde su propio hilo
+            alert_handlers = [handler for handler in handlers if isinstance(handler, SMTPHandler)]
+            file_handlers = [handler for handler in handlers if not isinstance(handler, SMTPHandler)]
+
+            for alert_handler in alert_handlers:
+                alert_queue_handler = cls._start_listener(alert_handler)
+                alert_queue_handler.setLevel(alert_handler.level)
+                file_handlers.append(alert_queue_handler)
+
+            logger.handlers = [cls._start_listener(*file_handlers)]
+
+    @classmethod
+    def stop(cls) -> None:
+        """Procesa los registros pendientes, detiene los hilos y restaura los manejadores originales."""
+
+        for logger in cls.LOGGERS:
+            if logger.name in cls._handlers:
+                logger.handlers = cls._handlers.pop(logger.name)
+
+        # los hilos se detienen en orden inverso para que las colas de alertas reciban todos los registros antes de detenerse
+        for listener in reversed(cls._listeners):
+            listener.stop()
+
+        cls._listeners = []
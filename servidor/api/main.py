@@ -9,10 +9,19 @@ from api.utils.constants.info_strings import SERVER_STARTED, SERVER_STOPPED
 from api.database.connection import create_tables, close_connection, OperationalError, ArgumentError
 from api.utils.functions.exception_handlers import HTTPExceptionWithBackgroundTask, RequestValidationError, DatabaseException, ResourceNotFoundException, RequestContentTypeError
 from api.utils.functions.exception_handlers import http_exception_background_task_handler, request_validation_exception_handler, unknown_exception_handler, database_exception_handler, request_content_type_exception_handler
-from api.database.database_views import create_database_views, refresh_database_views
-from api.database.database_models.view_models import create_all_views_instances
 from api.database.database_functions import create_database_functions
+from api.database.database_updates import update_database_tables
+from api.database.database_triggers import create_database_triggers, refresh_candidate_search_profiles
 from api.utils.functions.schedule_tasks import AsyncSchedulerManager
+from api.utils.functions.reference_cache import ReferenceCache
+from api.utils.functions.job_search_cache import JobSearchCache
+from api.utils.functions.entity_cache import EntityCache
+from api.utils.functions.curriculum_storage import delete_orphan_curricula
+from api.utils.functions.request_metrics import RequestMetrics, MetricsMiddleware
+from api.utils.functions.conditional_cache import ConditionalCacheMiddleware
+from api.utils.functions.single_flight import SingleFlightMiddleware
+from api.security.hash_crypt import HashPool
+from api.loggs.loggers import LogListenerManager
 
 
 
@@ -28,22 +37,34 @@ async def lifespan(app: FastAPI):
     Función asincrónica que maneja el ciclo de vida de la aplicación.
 
     Realiza las siguientes tareas:
+    - Inicia la escritura de logs en segundo plano.
     - Crea las funciones de la base de datos.
     - Crea las tablas en la base de datos.
+    - Actualiza las tablas ya existentes en la base de datos.
+    - Crea los triggers de la base de datos.
+    - Inicia las tareas programadas, que solo se ejecutan en el worker líder.
     - En modo de desarrollo, crea datos de prueba.
+    - Carga la caché de catálogos.
+    - Inicia el pool de procesos que encripta las contraseñas.
+    - Inicia el guardado de las métricas de las peticiones.
     - Imprime un mensaje de inicio del servidor.
     - Espera hasta que se cierre la aplicación.
     - En modo de desarrollo, elimina las tablas de la base de datos.
-    - Cierra la conexión con la base de datos.
+    - Guarda las métricas finales, cierra la caché de catálogos y la conexión con la base de datos.
     - Imprime un mensaje de parada del servidor.
+    - Escribe los logs pendientes y detiene la escritura de logs en segundo plano.
     """
+    # se inicia la escritura de logs en segundo plano
+    LogListenerManager.start()
+
     try:
-        # se intenta crear las funciones, tablas, vistas y tareas programadas de la base de datos
+        # se intenta crear las funciones, tablas, triggers y tareas programadas de la base de datos
         await create_database_functions()
         await create_tables()
-        await create_database_views()
-        await create_all_views_instances()
-        AsyncSchedulerManager.add_job(refresh_database_views, 'interval', minutes=CONFIG.SCHEDULER_INTERVAL)
+        await update_database_tables()
+        await create_database_triggers()
+        AsyncSchedulerManager.add_job(refresh_candidate_search_profiles, "interval", hours=CONFIG.SCHEDULER_INTERVAL)
+        AsyncSchedulerManager.add_job(delete_orphan_curricula, "interval", hours=CONFIG.SCHEDULER_INTERVAL)
         AsyncSchedulerManager.start()
 
     except (OperationalError, ArgumentError) as exc:
@@ -54,6 +75,15 @@ async def lifespan(app: FastAPI):
     if CONFIG.DEVELOPMENT:
         await create_test_data()
 
+    # se carga la caché de catálogos y se empieza a escuchar sus cambios
+    await ReferenceCache.start()
+
+    # se inicia el pool de procesos de las contraseñas
+    HashPool.start()
+
+    # se inicia el guardado periódico de las métricas de las peticiones del worker
+    RequestMetrics.start()
+
     # se imprime un log de inicio del servidor
     print_log(SERVER_STARTED, LogLevel.INFO)
 
@@ -63,11 +93,22 @@ async def lifespan(app: FastAPI):
     if CONFIG.DEVELOPMENT:
         await drop_tables()
 
-    AsyncSchedulerManager.shutdown()
+    # se detienen las tareas programadas
+    await AsyncSchedulerManager.shutdown()
+    # se detiene el pool de procesos de las contraseñas
+    HashPool.shutdown()
+    # se guardan las métricas finales del worker
+    await RequestMetrics.stop()
+    # se deja de escuchar los cambios de los catálogos, de las ofertas y de las entidades
+    await ReferenceCache.stop()
+    await JobSearchCache.stop()
+    await EntityCache.stop()
     # se cierra la conexión con la base de datos
     await close_connection()
     # se imprime un log de parada del servidor
     print_log(SERVER_STOPPED, LogLevel.INFO)
+    # se escriben los logs pendientes
+    LogListenerManager.stop()
 
 # se crea la aplicación
 app = FastAPI(lifespan=lifespan)
@@ -86,6 +127,16 @@ app.include_router(candidate_education.candidate_education_route)
 app.include_router(company.company_route)
 app.include_router(job.job_route)
 app.include_router(job_candidate.job_candidate_route)
+app.include_router(metrics.metrics_route)
+
+# se calcula el ETag de las respuestas de las rutas públicas que no conocen la versión de sus datos
+app.add_middleware(ConditionalCacheMiddleware)
+
+# se agrupan las peticiones GET idénticas simultáneas de las rutas con la dependencia single_flight
+app.add_middleware(SingleFlightMiddleware)
+
+# se miden todas las peticiones por ruta
+app.add_middleware(MetricsMiddleware)
 
 # se añaden los manejadores de excepciones
 app.add_exception_handler(HTTPExceptionWithBackgroundTask, http_exception_background_task_handler)
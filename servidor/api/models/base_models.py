@@ -199,6 +199,8 @@ class QueryParams(BaseModel):
     joins: list[dict[str, Any]] = Field(default=[])
     where: list[Any] = Field(default=[])
     options: list[Any] = Field(default=[])
+    keyset: list[Any] = Field(default=[])
+    paginate_ids: bool = Field(default=False)
 
     fields: list[Any]
     scalar: bool
@@ -1,12 +1,24 @@
 from enum import Enum
-from sqlalchemy.orm import joinedload, contains_eager, defaultload
+from sqlalchemy.orm import joinedload, defaultload, selectinload
 from fastapi.exceptions import RequestValidationError
-from api.database.database_models.models import Sector, Address, EducationLevel, Language, LanguageLevel, Candidate, CandidateLanguage
-from api.database.database_models.models import CandidateEducation, Experience, Education, SectorEducation, JobCandidate, Job, User, Company
+from api.database.database_models.models import Sector, Address, Language, LanguageLevel, Candidate
+from api.database.database_models.models import CandidateEducation, Education, JobCandidate, Job, User, Company
 from api.utils.constants.error_strings import INVALID_EXTRA_FIELDS
 
 # ENUMS ENDPOINTS #
 
+class JobSort(str, Enum):
+    """Enum que representa los posibles órdenes de las ofertas de trabajo."""
+
+    RECENT = "recent"
+    RELEVANCE = "relevance"
+
+class LanguageMatch(str, Enum):
+    """Enum que representa cómo se combinan los idiomas del filtro de ofertas de trabajo."""
+
+    ALL = "all"
+    ANY = "any"
+
 class ExtraFields(str, Enum):
     """Enum base para los campos extra de las tablas."""
 
@@ -128,102 +140,18 @@ class CandidateFieldsValues:
         }
     
     @classmethod
-    def get_join_table(cls):
-        """Retorna los valores de los joins y options de la tabla candidate. Se utiliza para los filtros."""
-
-        values = {
-            CandidateExtraField.LANGUAGE: {
-                            "joins":
-                                (
-                                    {
-                                        "target": CandidateLanguage,
-                                        "onclause": Candidate.user_id == CandidateLanguage.candidate_id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": LanguageLevel,
-                                        "onclause": CandidateLanguage.language_level_id == LanguageLevel.id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": Language,
-                                        "onclause": CandidateLanguage.language_id == Language.id,
-                                        "isouter": True
-                                    }
-                                ),
-                            "options": (contains_eager(Candidate.language_list).contains_eager(CandidateLanguage.language),
-                                        defaultload(Candidate.language_list).contains_eager(CandidateLanguage.language_level))
-            },
-
-            CandidateExtraField.EXPERIENCE:{ 
-                            "joins":
-                                (
-                                    {
-                                        "target": Experience,
-                                        "onclause": Candidate.user_id == Experience.candidate_id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": Sector,
-                                        "onclause": Experience.sector_id == Sector.id,
-                                        "isouter": True
-                                    }
-                                ),
-                            "options": (contains_eager(Candidate.experience_list).contains_eager(Experience.sector),)
-            },
-
-            CandidateExtraField.EDUCATION:{
-                            "joins":
-                                (
-                                    {
-                                        "target": CandidateEducation,
-                                        "onclause": Candidate.user_id == CandidateEducation.candidate_id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": Education,
-                                        "onclause": CandidateEducation.education_id == Education.id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": EducationLevel,
-                                        "onclause": Education.level_id == EducationLevel.id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": SectorEducation,
-                                        "onclause": SectorEducation.education_id == Education.id,
-                                        "isouter": True
-                                    },
-                                    {
-                                        "target": Sector,
-                                        "onclause": SectorEducation.sector_id == Sector.id,
-                                        "isouter": True
-                                    }
-                                ),
-                            "options": (contains_eager(Candidate.education_list).contains_eager(CandidateEducation.education).contains_eager(Education.level),
-                                        defaultload(Candidate.education_list).defaultload(CandidateEducation.education).contains_eager(Education.sector).contains_eager(SectorEducation.sector))
-            },
-
-            CandidateExtraField.APPLIED_JOBS: {
-                                "joins": 
-                                    (
-                                        {
-                                            "target": JobCandidate,
-                                            "onclause": Candidate.user_id == JobCandidate.candidate_id,
-                                            "isouter": True
-                                        },
-                                        {
-                                            "target": Job,
-                                            "onclause": JobCandidate.job_id == Job.id,
-                                            "isouter": True
-                                        }
-                                    ),
-                                "options": (contains_eager(Candidate.applied_jobs_list).contains_eager(JobCandidate.job),)
-            }
-        }
+    def get_page_values(cls):
+        """
+        Retorna un diccionario con las opciones de carga de los campos extra de la tabla candidate para las páginas de candidatos.
+        Cada lista se carga con una consulta para todos los candidatos de la página en lugar de multiplicar sus filas con un join.
+        """
 
-        return values
+        return {
+            CandidateExtraField.LANGUAGE: selectinload(Candidate.language_list),
+            CandidateExtraField.EXPERIENCE: selectinload(Candidate.experience_list),
+            CandidateExtraField.EDUCATION: selectinload(Candidate.education_list),
+            CandidateExtraField.APPLIED_JOBS: selectinload(Candidate.applied_jobs_list)
+        }
     
 class CandidateExtraField(ExtraFields):
     """Enum que representa los campos de la tabla candidate."""
@@ -240,13 +168,13 @@ class CandidateExtraField(ExtraFields):
         return CandidateFieldsValues.get_values()
     
     @classmethod
-    def get_join_table(cls, field: str):
-        """Retorna un diccionario con los joins y options de la tabla candidate. Se utiliza para los filtros."""
+    def get_page_value(cls, field: str):
+        """Retorna la opción de carga del campo extra para las páginas de candidatos. Se utiliza para los filtros."""
 
-        values = CandidateFieldsValues.get_join_table()
+        values = CandidateFieldsValues.get_page_values()
 
         if field not in values:
-            return RequestValidationError(INVALID_EXTRA_FIELDS.format(field=field))
+            raise RequestValidationError(INVALID_EXTRA_FIELDS.format(field=field))
         
         return values[field]
         
@@ -265,13 +193,13 @@ class JobCandidateExtraField(ExtraFields):
         return CandidateFieldsValues.get_values()
     
     @classmethod
-    def get_join_table(cls, field: str):
-        """Retorna un diccionario con los joins y options de la tabla candidate. Se utiliza para los filtros."""
+    def get_page_value(cls, field: str):
+        """Retorna la opción de carga del campo extra para las páginas de candidatos. Se utiliza para los filtros."""
 
-        values = CandidateFieldsValues.get_join_table()
+        values = CandidateFieldsValues.get_page_values()
 
         if field not in values:
-            return RequestValidationError(INVALID_EXTRA_FIELDS.format(field=field))
+            raise RequestValidationError(INVALID_EXTRA_FIELDS.format(field=field))
         
         return values[field]
         
\ No newline at end of file
@@ -1,2 +1,8 @@
 MONTHS_TO_DAYS_MULTIPLIER = 4.35
-DAYS_TO_MONTHS_DIVIDER = 30.4167
\ No newline at end of file
+DAYS_TO_MONTHS_DIVIDER = 30.4167
+
+# configuración de búsqueda de texto completo de postgres usada en las ofertas de trabajo
+TEXT_SEARCH_CONFIG = "spanish"
+
+# días de antigüedad a partir de los cuales el impulso por frescura de una oferta se reduce a la mitad
+RELEVANCE_FRESHNESS_DAYS = 30
\ No newline at end of file
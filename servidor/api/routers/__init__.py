@@ -9,4 +9,5 @@ from .candidate_language import candidate_language_route
 from .candidate_education import candidate_education_route
 from .company import company_route
 from .job import job_route
-from .job_candidate import job_candidate_route
\ No newline at end of file
+from .job_candidate import job_candidate_route
+from .metrics import metrics_route
\ No newline at end of file
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Response
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 from api.database.database_models.models import Address
 from api.database.connection import get_session
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, ADDRESS_ID, ADDRESS_POSTAL_CODE, ADDRESS_EXTRA_FIELD, DEFAULT_LIMIT, DEFAULT_OFFSET, ADDRESS_PROVINCE_KEYWORD
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, ADDRESS_ID, ADDRESS_POSTAL_CODE, ADDRESS_EXTRA_FIELD, DEFAULT_LIMIT, DEFAULT_OFFSET, ADDRESS_PROVINCE_KEYWORD
 from api.security.permissions import PermissionsManager
 from api.models.read_models import ReadAddress, ReadAddressComplete, ReadAddressNoStreet
 from api.models.create_models import CreateAddress
@@ -12,8 +12,9 @@ from api.models.update_models import UpdateAddress
 from api.models.partial_update_models import PartialUpdateAddress
 from api.models.enums.endpoints import AddressExtraField
 from api.utils.functions.management_utils import endpoint_request_log
-from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id
+from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id, set_next_cursor_header
 from api.utils.functions.models_utils import update_model
+from api.utils.functions.conditional_cache import ADDRESS_CACHE
 
 address_route = APIRouter(prefix="/addresses", tags=["addresses"], dependencies=[Depends(endpoint_request_log)])
 
@@ -62,25 +63,32 @@ async def get_addresses(*,
 
 @address_route.get("/admin/", response_model=list[ReadAddressComplete], response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_addresses_admin(*,
+                    response: Response,
                     session: Annotated[AsyncSession, Depends(get_session)], 
                     limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                     offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                    cursor: Annotated[str | None, CURSOR] = None,
                     extra_fields: Annotated[set[AddressExtraField], ADDRESS_EXTRA_FIELD] = ()) -> Address:
     """
     Obtiene todas las direcciones de la base de datos y las devuelve. Solo para administradores. Devuelve los campos extra especificados.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
     Se debe ser administrador para poder acceder a este endpoint.
     
     Args:
+    - response (Response): La respuesta del endpoint.
     - session (AsyncSession): La sesión de la base de datos.
     - limit (int): El límite de direcciones a devolver. Por defecto es 20.
     - offset (int): El número de direcciones a omitir. Por defecto es 0.
+    - cursor (str, optional): El cursor de la página a obtener. Por defecto es None.
     - extra_fields (set[AddressExtraField]): Los campos extra de la dirección que se quieren obtener. Por defecto es ().
             
     Returns:
     - list[Address]: La lista de direcciones.
     """
 
-    addresses: list[Address] = await get_database_records(session, Address, options=[AddressExtraField.get_field_value(field) for field in extra_fields], limit=limit, offset=offset, unique=True)
+    addresses, next_cursor = await get_database_records(session, Address, options=[AddressExtraField.get_field_value(field) for field in extra_fields], limit=limit, offset=offset, unique=True, keyset=Address.id, cursor=cursor, response_model=ReadAddressComplete)
+
+    set_next_cursor_header(response, next_cursor)
 
     return addresses
 
@@ -102,12 +110,12 @@ async def get_address_admin(*,
     - Address: La dirección.
     """
 
-    address: Address = await get_record_by_id(session, Address, address_id, options=[AddressExtraField.get_field_value(field) for field in extra_fields])
+    address: Address = await get_record_by_id(session, Address, address_id, options=[AddressExtraField.get_field_value(field) for field in extra_fields], response_model=ReadAddressComplete)
 
     return address
 
 
-@address_route.get("/postal-code/{address_postal_code}/", response_model=ReadAddressNoStreet)
+@address_route.get("/postal-code/{address_postal_code}/", response_model=ReadAddressNoStreet, dependencies=[Depends(ADDRESS_CACHE)])
 async def get_address_by_postal_code(*,
                     session: Annotated[AsyncSession, Depends(get_session)], 
                     address_postal_code: Annotated[int, ADDRESS_POSTAL_CODE]) -> Address:
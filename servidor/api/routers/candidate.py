@@ -1,41 +1,50 @@
 from uuid import UUID
 from typing import Annotated
-from fastapi import APIRouter, Depends, status, UploadFile
+from fastapi import APIRouter, Depends, Request, status, UploadFile
 from fastapi.responses import Response
+from sqlalchemy import or_
 from sqlalchemy.orm import noload, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.database.connection import get_session
-from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id
+from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id, set_next_cursor_header, get_entity_response
 from api.security.permissions import PermissionsManager
+from api.security.hash_crypt import encrypt_passwords
 from api.database.database_models.models import Candidate, User, JobCandidate, Job, Address
 from api.models.enums.models import UserType
 from api.models.read_models import ReadCandidate, ReadCandidateComplete, ReadCandidateMinimal, ReadJobMinimal
 from api.models.create_models import CreateCandidate
 from api.models.update_models import UpdateCandidate
 from api.models.partial_update_models import PartialUpdateCandidate
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, DEFAULT_LIMIT, DEFAULT_OFFSET, USER_ID, CANDIDATE_EXTRA_FIELD, CV_PARAM
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, DEFAULT_LIMIT, DEFAULT_OFFSET, USER_ID, CANDIDATE_EXTRA_FIELD, CV_PARAM
 from api.utils.constants.error_strings import INVALID_FILE_TYPE
 from api.utils.functions.management_utils import endpoint_request_log
 from api.utils.functions.models_utils import update_model, get_address_from_db
 from api.utils.functions.candidate_filter import get_candidate_filter_params, CandidateExtraField
 from api.utils.exceptions import RequestContentTypeError
+from api.utils.functions.curriculum_storage import get_curriculum_response, read_upload_chunks
+from api.storage.blob_storage import get_blob_storage
 
 candidate_route = APIRouter(prefix="/candidates", tags=["candidates"], dependencies=[Depends(endpoint_request_log)])
 
 @candidate_route.get("/", response_model_exclude_defaults=True, response_model=list[ReadCandidateMinimal|ReadCandidateComplete], dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_candidates(
+                        response: Response,
                         session: Annotated[AsyncSession, Depends(get_session)],
                         candidate_params: Annotated[dict, Depends(get_candidate_filter_params)],
                         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
-                        offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[Candidate]:
+                        offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                        cursor: Annotated[str | None, CURSOR] = None) -> list[Candidate]:
     """
     Obtiene una lista de candidatos según los parámetros especificados.
     Se debe ser administrador.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
 
     Args:
+    - response (Response): Respuesta del endpoint.
     - session (AsyncSession): Sesión de base de datos.
     - limit (int, optional): Límite de resultados a devolver. Por defecto es DEFAULT_LIMIT.
     - offset (int, optional): Desplazamiento de resultados. Por defecto es DEFAULT_OFFSET.
+    - cursor (str, optional): Cursor de la página a obtener. Por defecto es None.
     - candidate_params (dict): Parámetros de búsqueda de candidatos.
 
     Returns:
@@ -43,31 +52,38 @@ async def get_candidates(
     """
     fields = candidate_params.pop("fields")
      
-    list_candidates: list[Candidate] = await get_database_records(session, *fields, **candidate_params, limit=limit, offset=offset)
+    list_candidates, next_cursor = await get_database_records(session, *fields, **candidate_params, limit=limit, offset=offset, keyset=Candidate.user_id, cursor=cursor)
+
+    set_next_cursor_header(response, next_cursor)
     
     return list_candidates
 
 @candidate_route.get("/applied-jobs/{candidate_id}/", response_model=list[ReadJobMinimal], dependencies=[Depends(PermissionsManager.is_candidate_resource_owner)])
 async def get_candidate_applied_jobs(
+                                    response: Response,
                                     session: Annotated[AsyncSession, Depends(get_session)], 
                                     candidate_id: Annotated[UUID, USER_ID],
                                     limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
-                                    offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,) -> list[tuple]:
+                                    offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                                    cursor: Annotated[str | None, CURSOR] = None) -> list[tuple]:
     """
     Obtiene los trabajos a los que un candidato ha aplicado.
     Se debe ser el propietario del recurso o un administrador.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
     
     Args:
+    - response: Respuesta del endpoint.
     - session: Sesión de base de datos.
     - candidate_id: ID del usuario candidato.
     - limit: Límite de resultados a devolver (opcional, valor por defecto: DEFAULT_LIMIT).
     - offset: Desplazamiento de resultados (opcional, valor por defecto: DEFAULT_OFFSET).
+    - cursor: Cursor de la página a obtener (opcional, valor por defecto: None).
     
     Returns:
     - Lista de trabajos a los que el candidato ha aplicado.
     """
     
-    applied_jobs: list[tuple] = await get_database_records(session, Job.id, Job.title, Job.description, Address.province, limit=limit, offset=offset, 
+    applied_jobs, next_cursor = await get_database_records(session, Job.id, Job.title, Job.description, Address.province, limit=limit, offset=offset, cursor=cursor, 
                                                                   joins=(
                                                                     {
                                                                         "target": JobCandidate,
@@ -78,17 +94,21 @@ async def get_candidate_applied_jobs(
                                                                         "onclause": Address.id == Job.address_id,
                                                                     }
                                                                   ),
-                                                                  where=JobCandidate.candidate_id == candidate_id, order_by=JobCandidate.inscription_date.desc(), scalar=False)
+                                                                  where=JobCandidate.candidate_id == candidate_id, keyset=(JobCandidate.inscription_date, Job.id), scalar=False)
+
+    set_next_cursor_header(response, next_cursor)
+
     return applied_jobs
 
 @candidate_route.get("/{candidate_id}/", response_model=ReadCandidateComplete, response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_candidate_resource_owner)])
 async def get_candidate(
                         session: Annotated[AsyncSession, Depends(get_session)], 
                         candidate_id: Annotated[UUID, USER_ID],
-                        extra_fields: Annotated[set[CandidateExtraField], CANDIDATE_EXTRA_FIELD] = ()) -> Candidate:
+                        extra_fields: Annotated[set[CandidateExtraField], CANDIDATE_EXTRA_FIELD] = ()) -> Candidate | Response:
     """
     Obtiene un candidato según su id.
     Se debe ser el propietario del recurso o un administrador.
+    Si no se piden campos adicionales, el candidato se obtiene de EntityCache si está guardado.
     
     Args:
     - session (AsyncSession): Sesión de base de datos.
@@ -104,6 +124,10 @@ async def get_candidate(
     # anadimos la informacion del usuario y su direccion
     options.append(joinedload(Candidate.user).joinedload(User.address))
 
+    # la caché solo guarda el candidato sin campos adicionales
+    if not extra_fields:
+        return await get_entity_response(session, Candidate, candidate_id, options=options)
+
     candidate: Candidate = await get_record_by_id(session, Candidate, candidate_id, options=options)
 
     return candidate
@@ -129,7 +153,7 @@ async def create_candidate(
     address = await get_address_from_db(session, new_candidate.user.address)
 
     # creamos el usuario anadiento la direccion
-    user = User(**new_candidate.user.model_dump(), user_type=UserType.CANDIDATE, address=address)
+    user = User(**await encrypt_passwords(new_candidate.user.model_dump()), user_type=UserType.CANDIDATE, address=address)
 
     # creamos el candidato anadiendo el usuario
     candidate = Candidate(**new_candidate.model_dump(exclude="user"), user=user)
@@ -161,7 +185,7 @@ async def update_candidate(
     
     candidate: Candidate = await get_record_by_id(session, Candidate, candidate_id, options=joinedload(Candidate.user).joinedload(User.address))
 
-    update_model(candidate, update_candidate.model_dump())
+    update_model(candidate, await encrypt_passwords(update_candidate.model_dump()))
 
     # cambiamos la direccion por la nueva de la base de datos
     candidate.user.address = await get_address_from_db(session, update_candidate.user.address)
@@ -191,7 +215,7 @@ async def update_candidate(
     
     candidate: Candidate = await get_record_by_id(session, Candidate, candidate_id, options=joinedload(Candidate.user).joinedload(User.address))
 
-    update_model(candidate, update_candidate.model_dump(exclude_unset=True))
+    update_model(candidate, await encrypt_passwords(update_candidate.model_dump(exclude_unset=True)))
 
     # si se ha especificado la direccion, la cambiamos por la nueva de la base de datos
     if update_candidate.user and update_candidate.user.address:
@@ -224,13 +248,16 @@ async def delete_candidate(
 
 @candidate_route.get("/{candidate_id}/curriculum/", status_code=status.HTTP_200_OK, response_class=Response, dependencies=[Depends(PermissionsManager.is_candidate_resource_owner)])
 async def get_candidate_curriculum(
+                                    request: Request,
                                     session: Annotated[AsyncSession, Depends(get_session)], 
                                     candidate_id: Annotated[UUID, USER_ID]) -> Response:
     """
-    Obtiene el currículum de un candidato de la base de datos.
+    Obtiene el currículum de un candidato del almacén de archivos.
+    Se envía por fragmentos y admite las cabeceras Range e If-None-Match.
     Se debe ser el propietario del recurso o un administrador.
 
     Args:
+    - request: Petición HTTP.
     - session: Sesión de base de datos.
     - candidate_id: ID del usuario candidato.
 
@@ -238,17 +265,21 @@ async def get_candidate_curriculum(
     - Response: Currículum del candidato.
     """
 
-    cv_candidate = await get_database_records(session, Candidate.curriculum, where=Candidate.user_id == candidate_id, result_list=False, dependencies=[Depends(PermissionsManager.is_candidate_resource_owner)])
+    # solo se obtienen los candidatos que tienen currículum, en el almacén de archivos o en la base de datos si no se ha migrado
+    where = (Candidate.user_id == candidate_id, or_(Candidate.curriculum_key.is_not(None), Candidate.curriculum.is_not(None)))
+
+    cv_record = await get_database_records(session, Candidate.curriculum_key, Candidate.curriculum, where=where, result_list=False, scalar=False)
 
-    return Response(cv_candidate, media_type='application/pdf')
+    return await get_curriculum_response(request, cv_record)
 
-@candidate_route.post("/{candidate_id}/curriculum/", status_code=status.HTTP_204_NO_CONTENT)
+@candidate_route.post("/{candidate_id}/curriculum/", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(PermissionsManager.is_candidate_resource_owner)])
 async def upload_candidate_curriculum(
                                     session: Annotated[AsyncSession, Depends(get_session)], 
                                     candidate_id: Annotated[UUID, USER_ID],
                                     curriculum: Annotated[UploadFile, CV_PARAM]) -> None:
     """
-    Sube el currículum de un candidato a la base de datos.
+    Sube el currículum de un candidato al almacén de archivos y guarda su clave en la base de datos.
+    El archivo se guarda por fragmentos y no puede superar CV_MAX_SIZE bytes.
     Se debe ser el propietario del recurso o un administrador.
 
     Args:
@@ -258,6 +289,7 @@ async def upload_candidate_curriculum(
 
     Raise:
     - RequestContentTypeError: Si el tipo de archivo no es pdf.
+    - HTTPException: Si el archivo supera el tamaño máximo.
     """
 
     if curriculum.content_type != "application/pdf":
@@ -265,7 +297,9 @@ async def upload_candidate_curriculum(
     
     candidate: Candidate = await get_record_by_id(session, Candidate, candidate_id)
 
-    candidate.curriculum = await curriculum.read()
+    candidate.curriculum_key = await get_blob_storage().save_stream(read_upload_chunks(curriculum))
+    # se vacía el currículum de la base de datos por si no se había migrado
+    candidate.curriculum = None
 
     await secure_commit(session)
 
@@ -274,8 +308,9 @@ async def delete_candidate_curriculum(
                                     session: Annotated[AsyncSession, Depends(get_session)], 
                                     candidate_id: Annotated[UUID, USER_ID]) -> None:
     """
-    Elimina el currículum de un candidato de la base de datos.
+    Elimina el currículum de un candidato.
     Se debe ser el propietario del recurso o un administrador.
+    El archivo se elimina del almacén en la tarea programada de currículums huérfanos, ya que otro candidato puede usar el mismo archivo.
 
     Args:
     - session: Sesión de base de datos.
@@ -284,6 +319,7 @@ async def delete_candidate_curriculum(
     
     candidate: Candidate = await get_record_by_id(session, Candidate, candidate_id)
 
+    candidate.curriculum_key = None
     candidate.curriculum = None
 
     await secure_commit(session)
\ No newline at end of file
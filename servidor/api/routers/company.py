@@ -1,18 +1,19 @@
 from uuid import UUID
 from typing import Annotated
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.database.connection import get_session
-from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id
+from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id, set_next_cursor_header, get_entity_response
 from api.security.permissions import PermissionsManager
+from api.security.hash_crypt import encrypt_passwords
 from api.database.database_models.models import Company, User, Job, Address
 from api.models.enums.models import UserType
 from api.models.read_models import ReadCompany, ReadCompanyComplete, ReadJobMinimal
 from api.models.create_models import CreateCompany
 from api.models.update_models import UpdateCompany
 from api.models.partial_update_models import PartialUpdateCompany
-from api.utils.constants.endpoints_params import DEFAULT_LIMIT, DEFAULT_OFFSET, USER_ID, COMPANIES_GET_JOBS
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, DEFAULT_LIMIT, DEFAULT_OFFSET, USER_ID, COMPANIES_GET_JOBS
 from api.utils.functions.management_utils import endpoint_request_log
 from api.utils.functions.models_utils import update_model, get_address_from_db
 
@@ -20,18 +21,23 @@ company_route = APIRouter(prefix="/companies", tags=["companies"], dependencies=
 
 @company_route.get("/", response_model=list[ReadCompanyComplete], response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_companies(
+                        response: Response,
                         session: Annotated[AsyncSession, Depends(get_session)], 
-                        limit: Annotated[int, DEFAULT_LIMIT] = DEFAULT_LIMIT,
-                        offset: Annotated[int, DEFAULT_OFFSET] = DEFAULT_OFFSET,
+                        limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
+                        offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                        cursor: Annotated[str | None, CURSOR] = None,
                         get_jobs: Annotated[bool, COMPANIES_GET_JOBS] = False) -> list[Company]:
     """
     Obtiene una lista de empresas.
     Se debe ser administrador para poder acceder a este endpoint.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
 
     Args:
+    - response: Respuesta del endpoint (Response).
     - session: Sesión de base de datos (AsyncSession).
     - limit: Límite de resultados a devolver (int, opcional).
     - offset: Desplazamiento de resultados (int, opcional).
+    - cursor: Cursor de la página a obtener (str, opcional).
     - get_jobs: Indica si se deben incluir los trabajos asociados a las empresas (bool, opcional).
 
     Returns:
@@ -45,7 +51,9 @@ async def get_companies(
     if get_jobs:
         options.append(joinedload(Company.job_list))
     
-    companies: list[Company] = await get_database_records(session, Company, limit=limit, offset=offset, unique=True, options=options)
+    companies, next_cursor = await get_database_records(session, Company, limit=limit, offset=offset, unique=True, options=options, keyset=Company.user_id, cursor=cursor, response_model=ReadCompanyComplete)
+
+    set_next_cursor_header(response, next_cursor)
 
     return companies
 
@@ -53,10 +61,11 @@ async def get_companies(
 async def get_company(
                         session: Annotated[AsyncSession, Depends(get_session)], 
                         company_id: Annotated[UUID, USER_ID],
-                        get_jobs: Annotated[bool, COMPANIES_GET_JOBS]=False) -> Company:
+                        get_jobs: Annotated[bool, COMPANIES_GET_JOBS]=False) -> Company | Response:
     """
     Obtiene una empresa.
     Se debe ser el propietario del recurso o un administrador.
+    Si no se piden sus ofertas, la empresa se obtiene de EntityCache si está guardada.
 
     Args:
     - session: Sesión de base de datos (AsyncSession).
@@ -69,10 +78,13 @@ async def get_company(
 
     # anadimos la informacion de usuario y direccion
     options = [joinedload(Company.user).joinedload(User.address)]
+
+    # la caché solo guarda la empresa sin sus ofertas
+    if not get_jobs:
+        return await get_entity_response(session, Company, company_id, options=options)
     
     # si se quiere obtener la lista de ofertas de trabajo asociadas a las empresas anadimos la relacion
-    if get_jobs:
-        options.append(joinedload(Company.job_list))
+    options.append(joinedload(Company.job_list))
     
     companies: Company = await get_record_by_id(session, Company, company_id, options=options)
 
@@ -98,7 +110,7 @@ async def create_company(
     address = await get_address_from_db(session, new_company.user.address)
 
     # creamos el usuario anadiendo la direccion
-    user = User(**new_company.user.model_dump(), user_type=UserType.COMPANY, address=address)
+    user = User(**await encrypt_passwords(new_company.user.model_dump()), user_type=UserType.COMPANY, address=address)
 
     # creamos la empresa anadiendo el usuario
     company_db = Company(**new_company.model_dump(exclude="user"), user=user)
@@ -130,7 +142,7 @@ async def update_company(
 
     company: Company = await get_record_by_id(session, Company, company_id, options=joinedload(Company.user).joinedload(User.address))
 
-    update_model(company, update_company.model_dump())
+    update_model(company, await encrypt_passwords(update_company.model_dump()))
 
     # cambiamos la direccion obteniendo la direccion de la base de datos
     company.user.address = await get_address_from_db(session, update_company.user.address)
@@ -160,7 +172,7 @@ async def partial_update_company(
 
     company: Company = await get_record_by_id(session, Company, company_id, options=joinedload(Company.user).joinedload(User.address))
 
-    update_model(company, update_company.model_dump(exclude_unset=True))
+    update_model(company, await encrypt_passwords(update_company.model_dump(exclude_unset=True)))
 
     # si se especificado  la direccion la cambiamos obteniendo la direccion de la base de datos
     if update_company.user and update_company.user.address:
@@ -191,13 +203,31 @@ async def delete_company(
 
 @company_route.get("/{company_id}/jobs/", response_model=list[ReadJobMinimal], response_model_exclude_none=True, dependencies=[Depends(PermissionsManager.is_company_resource_owner)])
 async def get_company_jobs(
+                            response: Response,
                             session: Annotated[AsyncSession, Depends(get_session)],
                             company_id: Annotated[UUID, USER_ID],
-                            limit: Annotated[int, DEFAULT_LIMIT] = DEFAULT_LIMIT,
-                            offset: Annotated[int, DEFAULT_OFFSET] = DEFAULT_OFFSET) -> None:
-    
+                            limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
+                            offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                            cursor: Annotated[str | None, CURSOR] = None) -> list[tuple]:
+    """
+    Obtiene las ofertas de trabajo de una empresa ordenadas por fecha de publicación.
+    Se debe ser el propietario del recurso o un administrador.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
+
+    Args:
+    - response: Respuesta del endpoint (Response).
+    - session: Sesión de base de datos (AsyncSession).
+    - company_id: ID de la empresa (UUID).
+    - limit: Límite de resultados a devolver (int, opcional).
+    - offset: Desplazamiento de resultados (int, opcional).
+    - cursor: Cursor de la página a obtener (str, opcional).
 
-    jobs: list[tuple] = await get_database_records(session, Job.id, Job.title, Job.description, Address.province, limit=limit, offset=offset, 
+    Returns:
+    - Lista de ofertas de trabajo de la empresa (list[tuple]).
+    """
+
+
+    jobs, next_cursor = await get_database_records(session, Job.id, Job.title, Job.description, Address.province, limit=limit, offset=offset, cursor=cursor, 
                                                                   joins=(
                                                                     {
                                                                         "target": Company,
@@ -208,5 +238,8 @@ async def get_company_jobs(
                                                                         "onclause": Address.id == Job.address_id,
                                                                     }
                                                                   ),
-                                                                  where=Job.company_id == company_id, order_by=Job.publication_date.desc(), scalar=False)
+                                                                  where=Job.company_id == company_id, keyset=(Job.publication_date, Job.id), scalar=False)
+
+    set_next_cursor_header(response, next_cursor)
+
     return jobs
\ No newline at end of file
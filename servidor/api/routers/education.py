@@ -1,38 +1,37 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
 from typing import Annotated
 from sqlalchemy.orm import joinedload, noload
 from api.database.database_models.models import Education, EducationLevel, SectorEducation
 from api.database.connection import get_session
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, EDUCATION_ID, DEFAULT_LIMIT, DEFAULT_OFFSET, EDUCATION_LEVEL_ID, GET_EDUCATION, EDUCATION_EXTRA_FIELD, EDUCATION_NAME_KEYWORD, EDUCATION_LEVEL_NAME_KEYWORD, EDUCATION_NAME_KEYWORD_QUERY
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, EDUCATION_ID, DEFAULT_LIMIT, DEFAULT_OFFSET, EDUCATION_LEVEL_ID, GET_EDUCATION, EDUCATION_EXTRA_FIELD, EDUCATION_NAME_KEYWORD, EDUCATION_LEVEL_NAME_KEYWORD, EDUCATION_NAME_KEYWORD_QUERY
 from api.security.permissions import PermissionsManager
 from api.models.read_models import ReadLevel, ReadLevelEducation, ReadEducationComplete, ReadEducationWithUses
 from api.models.create_models import CreateEducation, CreateLevel
 from api.models.update_models import UpdateEducation, UpdateLevel
 from api.models.partial_update_models import PartialUpdateEducation, PartialUpdateLevel
 from api.utils.functions.management_utils import endpoint_request_log
-from api.utils.functions.database_utils import secure_commit, get_record_by_id, get_database_records
+from api.utils.functions.database_utils import secure_commit, get_record_by_id, get_database_records, set_next_cursor_header, get_cached_records, get_cached_record_by_id
 from api.utils.functions.models_utils import update_model
 from api.models.enums.endpoints import EducationExtraField
+from api.utils.functions.conditional_cache import CATALOG_CACHE
 
 education_route = APIRouter(prefix="/educations", tags=["educations"], dependencies=[Depends(endpoint_request_log)])
 
 # GET METHODS #
 @education_route.get("/", response_model=list[ReadEducationComplete], response_model_exclude_none=True, dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_educations(*,
-                        session: Annotated[AsyncSession, Depends(get_session)],
                         qualification_keyword: Annotated[str, EDUCATION_NAME_KEYWORD_QUERY] = None,
                         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[Education]:
     
     """
-    Obtiene todas las formaciones con su nivel de formación y sector si lo tiene.
+    Obtiene todas las formaciones con su nivel de formación y sector si lo tiene desde la caché de catálogos.
     Permite buscar por palabra clave en el nombre de la formación.
     Se debe estar logueado para poder acceder a este endpoint.
     
     Args:
-        session (AsyncSession): La sesión de la base de datos.
         qualification_keyword (str, optional): La palabra clave para buscar en el nombre de la formación. Por defecto es None.
         limit (int, optional): El límite de registros devueltos. Por defecto es DEFAULT_LIMIT.
         offset (int, optional): Permite omitir un número específico de registros en el conjunto de resultados. Por defecto es DEFAULT_OFFSET.
@@ -42,25 +41,23 @@ async def get_educations(*,
     """
     where = None
     if qualification_keyword:
-        where = Education.qualification.startswith(qualification_keyword)
+        where = lambda education: education.qualification.startswith(qualification_keyword)
 
-    educations = await get_database_records(session, Education, limit=limit, offset=offset, where=where)
+    educations = await get_cached_records(Education, limit=limit, offset=offset, where=where)
 
     return educations
 
 
-@education_route.get("/qualification/{qualification_keyword}/", response_model=list[str])
+@education_route.get("/qualification/{qualification_keyword}/", response_model=list[str], dependencies=[Depends(CATALOG_CACHE)])
 async def get_educations_qualification(*,
-                        session: Annotated[AsyncSession, Depends(get_session)],
                         qualification_keyword: Annotated[str, EDUCATION_NAME_KEYWORD],
                         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[str]:
     
     """
-    Devuelve una lista de nombres de formaciones que contienen la palabra clave en su nombre.
+    Devuelve una lista de nombres de formaciones que contienen la palabra clave en su nombre desde la caché de catálogos.
 
     Args:
-        session (AsyncSession): La sesión de la base de datos.
         qualification_keyword (str): La palabra clave para buscar en el nombre de la formación.
         limit (int, optional): El límite de registros devueltos. Por defecto es DEFAULT_LIMIT.
         offset (int, optional): Permite omitir un número específico de registros en el conjunto de resultados. Por defecto es DEFAULT_OFFSET.
@@ -69,20 +66,19 @@ async def get_educations_qualification(*,
         list[str]: La lista de formaciones.
     """
 
-    educations = await get_database_records(session, Education.qualification, where=Education.qualification.startswith(qualification_keyword), limit=limit, offset=offset, order_by=Education.qualification.desc())
+    educations = await get_cached_records(Education, field=lambda education: education.qualification, where=lambda education: education.qualification.startswith(qualification_keyword),
+                                          limit=limit, offset=offset, order_by=lambda qualification: qualification, desc=True)
     return educations
 
-@education_route.get("/education-levels/", response_model=list[ReadLevel])
+@education_route.get("/education-levels/", response_model=list[ReadLevel], dependencies=[Depends(CATALOG_CACHE)])
 async def get_education_levels(*,
-                            session: Annotated[AsyncSession, Depends(get_session)],
                             name_keyword: Annotated[str, EDUCATION_LEVEL_NAME_KEYWORD] = None,
                             limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                             offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[EducationLevel]:
     """
-    Obtiene todos los niveles de formación.
+    Obtiene todos los niveles de formación desde la caché de catálogos.
 
     Args:
-        session (AsyncSession): La sesión de la base de datos.
         name_keyword (str, optional): La palabra clave para buscar en el nombre del nivel de formación. Defaults to None.
         limit (int, optional): El límite de registros devueltos. Defaults to DEFAULT_LIMIT.
         offset (int, optional): Permite omitir un número específico de registros en el conjunto de resultados. Defaults to DEFAULT_OFFSET.
@@ -93,33 +89,41 @@ async def get_education_levels(*,
 
     where = None
     if name_keyword:
-        where = EducationLevel.name.startswith(name_keyword)
+        where = lambda level: level.name.startswith(name_keyword)
     
-    education_levels = await get_database_records(session, EducationLevel, where=where, limit=limit, offset=offset, order_by=EducationLevel.value.asc())
+    education_levels = await get_cached_records(EducationLevel, where=where, limit=limit, offset=offset, order_by=lambda level: level.value)
     return education_levels
 
 @education_route.get("/admin/", response_model=list[ReadEducationWithUses], response_model_exclude_none=True, response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_educations_with_candidates(*,
+                        response: Response,
                         session: Annotated[AsyncSession, Depends(get_session)], 
                         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                        cursor: Annotated[str | None, CURSOR] = None,
                         extra_fields: Annotated[set[EducationExtraField], EDUCATION_EXTRA_FIELD]) -> list[Education]:
     
     """
     Obtiene una lista de todas las educaciones con sus candidatos asociados.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
     Se debe ser administrador para poder acceder a este endpoint.
 
     Args:
+        response (Response): Respuesta del endpoint.
         session (AsyncSession): Sesión de base de datos.
         limit (int, optional): Límite de resultados. Defaults to DEFAULT_LIMIT.
         offset (int, optional): Desplazamiento de resultados. Defaults to DEFAULT_OFFSET.
+        cursor (str, optional): Cursor de la página a obtener. Defaults to None.
         extra_fields (set[EducationExtraField]): Campos extra que se quieren obtener.
 
     Returns:
         list[Education]: Lista de educaciones con sus candidatos asociados.
     """
 
-    educations = await get_database_records(session, Education, options=[EducationExtraField.get_field_value(field) for field in extra_fields], limit=limit, offset=offset, unique = True)
+    educations, next_cursor = await get_database_records(session, Education, options=[EducationExtraField.get_field_value(field) for field in extra_fields], limit=limit, offset=offset, unique = True, keyset=Education.id, cursor=cursor, response_model=ReadEducationWithUses)
+
+    set_next_cursor_header(response, next_cursor)
+
     return educations
 
 
@@ -144,14 +148,13 @@ async def get_education_levels(*,
     """
     options = joinedload(EducationLevel.education_list) if get_educations else None
     
-    education_levels = await get_database_records(session, EducationLevel, limit=limit, offset=offset, options=options, order_by=EducationLevel.value.asc(), unique=True)
+    education_levels = await get_database_records(session, EducationLevel, limit=limit, offset=offset, options=options, order_by=EducationLevel.value.asc(), unique=True, response_model=ReadLevelEducation)
 
     return education_levels
 
 
 @education_route.get("/admin/education-levels/{education_level_id}/", response_model=ReadLevelEducation, response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_education_levels(*,
-                            session: Annotated[AsyncSession, Depends(get_session)], 
                             education_level_id: Annotated[UUID, EDUCATION_LEVEL_ID],
                             get_educations: Annotated[bool, GET_EDUCATION] = False) -> EducationLevel:
     """
@@ -168,7 +171,7 @@ async def get_education_levels(*,
     """
     options = joinedload(EducationLevel.education_list) if get_educations else None
     
-    education_level: EducationLevel = await get_record_by_id(session, EducationLevel, education_level_id, options=options)
+    education_level: EducationLevel = await get_record_by_id(session, EducationLevel, education_level_id, options=options, response_model=ReadLevelEducation)
 
     return education_level
 
@@ -180,18 +183,17 @@ async def get_education_levels(*,
                             session: Annotated[AsyncSession, Depends(get_session)], 
                             education_level_id: Annotated[UUID, EDUCATION_LEVEL_ID]) -> EducationLevel:
     """
-    Obtiene un nivel de formación por su ID.
+    Obtiene un nivel de formación por su ID desde la caché de catálogos.
     Se debe estar logueado para poder acceder a este endpoint.
 
     Args:
-        session (AsyncSession): Sesión de base de datos.
         education_level_id (UUID): ID del nivel de formación.
 
     Returns:
         EducationLevel: El nivel de formación solicitado.
     """
     
-    education_level: EducationLevel = await get_record_by_id(session, EducationLevel, education_level_id)
+    education_level: EducationLevel = await get_cached_record_by_id(EducationLevel, education_level_id)
 
     return education_level
 
@@ -215,28 +217,26 @@ async def get_education_with_candidates(*,
         Education: Educación con sus candidatos.
     """
 
-    education: Education = await get_record_by_id(session, Education, education_id, options=[EducationExtraField.get_field_value(field) for field in extra_fields])
+    education: Education = await get_record_by_id(session, Education, education_id, options=[EducationExtraField.get_field_value(field) for field in extra_fields], response_model=ReadEducationWithUses)
 
     return education
 
 
 @education_route.get("/{education_id}/", response_model=ReadEducationComplete, response_model_exclude_none=True, dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_education(*,
-                        session: Annotated[AsyncSession, Depends(get_session)], 
                         education_id: Annotated[UUID, EDUCATION_ID]) -> Education:
     """
-    Obtiene una formación por su ID.
+    Obtiene una formación por su ID desde la caché de catálogos.
     Se debe estar logueado para poder acceder a este endpoint.
 
     Args:
-        session (AsyncSession): La sesión de base de datos.
         education_id (UUID): El ID de la formación.
 
     Returns:
         Education: La formación encontrada.
     """
 
-    education: Education = await get_record_by_id(session, Education, education_id)
+    education: Education = await get_cached_record_by_id(Education, education_id)
 
     return education
 
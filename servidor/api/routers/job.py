@@ -1,94 +1,131 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from typing import Annotated
 from uuid import UUID, uuid4
 from sqlalchemy.orm import noload
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.database.connection import get_session
-from api.utils.functions.database_utils import secure_commit, get_database_records
+from api.utils.functions.database_utils import secure_commit, get_database_records, set_next_cursor_header, get_entity_response
 from api.utils.functions.models_utils import update_model, get_address_from_db
 from api.security.permissions import PermissionsManager
-from api.database.database_models.models import Job, JobEducation, JobLanguage, Address, Education
+from api.database.database_models.models import Job, JobEducation, JobLanguage, JobKeyword, Address, Education
 from api.models.read_models import ReadJobComplete, ReadJobRelationLanguage, ReadJobCompleteWithUsers, ReadJobMinimal, ReadEducation
 from api.models.create_models import CreateJob, CreateJobLanguage
 from api.models.update_models import UpdateJob
 from api.models.partial_update_models import PartialUpdateJob
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, DEFAULT_LIMIT, DEFAULT_OFFSET, JOB_EXTRA_FIELD, LANGUAGE_ID, LANGUAGE_LEVEL_ID_BODY, JOB_KEYWORD, JOB_ID
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, DEFAULT_LIMIT, DEFAULT_OFFSET, JOB_EXTRA_FIELD, LANGUAGE_ID, LANGUAGE_LEVEL_ID_BODY, JOB_KEYWORD, JOB_ID
 from api.utils.functions.management_utils import endpoint_request_log
 from api.utils.functions.models_utils import GetJob
 from api.models.enums.endpoints import JobExtraField
-from api.utils.functions.job_filter import get_job_filter_params
-from api.database.database_models.view_models import JobKeywordModel
+from api.utils.functions.job_filter import get_job_filter_params, get_job_search_key
+from api.utils.functions.job_search_cache import JobSearchCache
+from api.utils.functions.conditional_cache import JOB_CACHE, JOB_KEYWORD_CACHE
+from api.utils.functions.single_flight import single_flight
+from api.utils.functions.fast_json import FastJSONResponse, get_read_model, render_records
 
 job_route = APIRouter(prefix="/jobs", tags=["jobs"], dependencies=[Depends(endpoint_request_log)])
 
 # GET #
 
-@job_route.get("/", response_model=list[ReadJobComplete|ReadJobMinimal], response_model_exclude_none=True)
+@job_route.get("/", response_model=list[ReadJobComplete|ReadJobMinimal], response_model_exclude_none=True, dependencies=[Depends(single_flight)])
 async def get_jobs(
                 session: Annotated[AsyncSession, Depends(get_session)],
                 job_params: Annotated[dict, Depends(get_job_filter_params)],
+                search_key: Annotated[tuple | None, Depends(get_job_search_key)],
                 limit: Annotated[int, LIMIT] = DEFAULT_LIMIT, 
-                offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[Job]:
+                offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                cursor: Annotated[str | None, CURSOR] = None) -> Response:
     """
     Obtiene todas las ofertas de trabajo.
-    Se puede usar sin autenticación.
+    Se puede usar sin autenticación. Los resultados de las búsquedas anónimas se guardan en JobSearchCache ya convertidos a JSON.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
+    La respuesta se genera con render_records en lugar de con response_model, que solo se usa para la documentación.
 
     Args:
     - session: Sesión de base de datos.
     - job_params: Parámetros de filtrado de las ofertas de trabajo.
+    - search_key: Clave de la búsqueda en la caché o None si no se guarda.
     - limit: Cantidad de registros a obtener.
     - offset: Cantidad de registros a saltar.
+    - cursor: Cursor de la página a obtener.
 
     Return:
-    - Lista de ofertas de trabajo.
+    - Lista de ofertas de trabajo en JSON.
     """
-    fields = job_params.pop("fields")
+    cache_key = (search_key, limit, offset, cursor) if search_key is not None else None
 
-    jobs: list[Job] = await get_database_records(session, *fields, **job_params, limit=limit, offset=offset, order_by=Job.publication_date.desc())
+    # si la búsqueda está en la caché no se consulta la base de datos
+    cached = await JobSearchCache.get(cache_key) if cache_key else None
 
-    return jobs
+    if cached:
+        content, next_cursor = cached
+
+    else:
+        fields = job_params.pop("fields")
+        cache_version = JobSearchCache.get_version()
+
+        jobs, next_cursor = await get_database_records(session, *fields, **job_params, limit=limit, offset=offset, cursor=cursor)
+
+        # se conoce el modelo de lectura de las ofertas por los campos consultados, así no se valida con la unión de modelos
+        content = render_records(jobs, get_read_model(fields, ReadJobComplete, ReadJobMinimal), exclude_none=True)
+
+        if cache_key:
+            JobSearchCache.set(cache_key, (content, next_cursor), cache_version)
+
+    response = FastJSONResponse(content)
+    set_next_cursor_header(response, next_cursor)
+
+    return response
 
 @job_route.get("/admin/", response_model=list[ReadJobCompleteWithUsers], response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_jobs_admin(
+                response: Response,
                 session: Annotated[AsyncSession, Depends(get_session)], 
                 limit: Annotated[int, LIMIT] = DEFAULT_LIMIT, 
                 offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                cursor: Annotated[str | None, CURSOR] = None,
                 extra_fields: Annotated[set[JobExtraField], JOB_EXTRA_FIELD] = ()) -> list[Job]:
     """
     Obtiene todas las ofertas de trabajo para administradores.
     Se debe ser administrador.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
 
     Args:
+    - response: Respuesta del endpoint.
     - session: Sesión de base de datos.
     - limit: Cantidad de registros a obtener.
     - offset: Cantidad de registros a saltar.
+    - cursor: Cursor de la página a obtener.
     - extra_fields: Campos adicionales de la oferta de trabajo.
 
     Return:
     - Lista de ofertas de trabajo.
     """
 
-    jobs: list[Job] = await get_database_records(session, Job, options=[JobExtraField.get_field_value(field) for field in extra_fields], unique=True, limit=limit, offset=offset, order_by=Job.publication_date.desc())
+    jobs, next_cursor = await get_database_records(session, Job, options=[JobExtraField.get_field_value(field) for field in extra_fields], unique=True, limit=limit, offset=offset, keyset=(Job.publication_date, Job.id), cursor=cursor, response_model=ReadJobCompleteWithUsers)
+
+    set_next_cursor_header(response, next_cursor)
 
     return jobs
 
-@job_route.get("/{job_id}/", response_model=ReadJobComplete, response_model_exclude_defaults=True)
+@job_route.get("/{job_id}/", response_model=ReadJobComplete, response_model_exclude_defaults=True, dependencies=[Depends(JOB_CACHE), Depends(single_flight)])
 async def get_job_by_id(
-                    job: Annotated[Job, Depends(GetJob())]) -> Job:
+                    session: Annotated[AsyncSession, Depends(get_session)],
+                    job_id: Annotated[UUID, JOB_ID]) -> Response:
     """
     Obtiene una oferta de trabajo por su ID.
-    Se puede usar sin autenticación.
+    Se puede usar sin autenticación. La oferta se obtiene de EntityCache si está guardada.
 
     Args:
-    - job: Oferta de trabajo a obtener.
+    - session: Sesión de base de datos.
+    - job_id: ID de la oferta de trabajo.
 
     Return:
     - La oferta de trabajo.
     """
 
-    return job
+    return await get_entity_response(session, Job, job_id)
 
-@job_route.get("/{job_id}/education/", response_model=ReadEducation, response_model_exclude_defaults=True)
+@job_route.get("/{job_id}/education/", response_model=ReadEducation, response_model_exclude_defaults=True, dependencies=[Depends(single_flight)])
 async def get_job_education_by_id(
                     session: Annotated[AsyncSession, Depends(get_session)], 
                     job_id: Annotated[UUID, JOB_ID]) -> Education:
@@ -115,10 +152,10 @@ async def get_job_education_by_id(
                                                                         "onclause": Job.id == JobEducation.job_id,
                                                                     }
                                                                   ),
-                                                                  where=Job.id == job_id, result_list=False)
+                                                                  where=Job.id == job_id, result_list=False, response_model=ReadEducation)
     return education
 
-@job_route.get("/{job_id}/languages/", response_model=list[ReadJobRelationLanguage], response_model_exclude_defaults=True)
+@job_route.get("/{job_id}/languages/", response_model=list[ReadJobRelationLanguage], response_model_exclude_defaults=True, dependencies=[Depends(single_flight)])
 async def get_job_languages_by_id(
                     session: Annotated[AsyncSession, Depends(get_session)], 
                     job_id: Annotated[UUID, JOB_ID],
@@ -138,10 +175,10 @@ async def get_job_languages_by_id(
     - Los idiomas requeridos.
     """
 
-    job_languages: list[JobLanguage] = await get_database_records(session, JobLanguage, limit=limit, offset=offset, where=JobLanguage.job_id == job_id, unique=True)
+    job_languages: list[JobLanguage] = await get_database_records(session, JobLanguage, limit=limit, offset=offset, where=JobLanguage.job_id == job_id, unique=True, response_model=ReadJobRelationLanguage)
     return job_languages
 
-@job_route.get("/{job_id}/languages/{language_id}/", response_model=ReadJobRelationLanguage, response_model_exclude_defaults=True)
+@job_route.get("/{job_id}/languages/{language_id}/", response_model=ReadJobRelationLanguage, response_model_exclude_defaults=True, dependencies=[Depends(single_flight)])
 async def get_job_languages_by_id(
                     session: Annotated[AsyncSession, Depends(get_session)], 
                     job_id: Annotated[UUID, JOB_ID],
@@ -159,10 +196,10 @@ async def get_job_languages_by_id(
     - El idioma requerido.
     """
 
-    job_language: JobLanguage = await get_database_records(session, JobLanguage, where=(JobLanguage.job_id == job_id, JobLanguage.language_id == language_id), result_list=False, unique=True)
+    job_language: JobLanguage = await get_database_records(session, JobLanguage, where=(JobLanguage.job_id == job_id, JobLanguage.language_id == language_id), result_list=False, unique=True, response_model=ReadJobRelationLanguage)
     return job_language
 
-@job_route.get("/keywords/{keyword}/", response_model=list[str])
+@job_route.get("/keywords/{keyword}/", response_model=list[str], dependencies=[Depends(JOB_KEYWORD_CACHE)])
 async def get_jobs_keywords(
                             session: Annotated[AsyncSession, Depends(get_session)],
                             keyword: Annotated[str, JOB_KEYWORD],
@@ -170,6 +207,7 @@ async def get_jobs_keywords(
                             offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[str]:
     """
     Obtiene una lista de palabras clave relacionadas con ofertas de trabajo que comienzan con la palabra clave dada.
+    Las palabras se ordenan por el número de apariciones en las ofertas, que se actualiza con cada cambio en las ofertas.
     
     Args:
     - session: Sesión de base de datos.
@@ -181,9 +219,7 @@ async def get_jobs_keywords(
     - Lista de palabras clave relacionadas con trabajos.
     """
     
-    view_table = JobKeywordModel.get_view()
-
-    keywords = await get_database_records(session, view_table.c.word, where=view_table.c.word.startswith(keyword), order_by=view_table.c.count.desc(), limit=limit, offset=offset)
+    keywords = await get_database_records(session, JobKeyword.word, where=JobKeyword.word.startswith(keyword), order_by=(JobKeyword.count.desc(), JobKeyword.word), limit=limit, offset=offset)
 
     return keywords
 
@@ -1,18 +1,21 @@
 from uuid import UUID
 from typing import Annotated
-from fastapi import APIRouter, Depends, status, Response
+from fastapi import APIRouter, Depends, Request, status, Response
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.utils.functions.models_utils import GetJob
 from sqlalchemy.orm import joinedload, noload
 from api.database.connection import get_session
 from api.utils.functions.management_utils import endpoint_request_log
-from api.utils.functions.database_utils import secure_commit, get_database_records
+from api.utils.functions.database_utils import secure_commit, get_database_records, set_next_cursor_header
 from api.security.permissions import PermissionsManager
 from api.database.database_models.models import Job, JobCandidate, Candidate, User, Experience, CandidateLanguage, CandidateEducation
 from api.models.read_models import ReadCandidateRelationJob, ReadCandidateComplete, ReadCandidateMinimal, ReadExperienceComplete, ReadCandidateRelationLanguage, ReadCandidateRelationEducation
 from api.utils.exceptions import DatabaseException
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, USER_ID, DEFAULT_LIMIT, DEFAULT_OFFSET, JOB_ID, CANDIDATE_EXTRA_FIELD
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, USER_ID, DEFAULT_LIMIT, DEFAULT_OFFSET, JOB_ID, CANDIDATE_EXTRA_FIELD
 from api.utils.functions.candidate_filter import get_candidate_applied, JobCandidateExtraField
+from api.utils.functions.curriculum_storage import get_curriculum_response
+from api.utils.functions.fast_json import FastJSONResponse, get_read_model, render_records
 
 
 job_candidate_route = APIRouter(prefix="/jobs/candidates", tags=["jobs"], dependencies=[Depends(endpoint_request_log)])
@@ -24,25 +27,35 @@ async def get_job_candidates(
                             session: Annotated[AsyncSession, Depends(get_session)],
                             candidate_params: Annotated[dict, Depends(get_candidate_applied)],
                             limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
-                            offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[Candidate]:
+                            offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                            cursor: Annotated[str | None, CURSOR] = None) -> Response:
     """
     Obtiene los candidatos que aplicaron a una oferta específica.
     Se debe ser el propietario del recurso o un administrador.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
+    La respuesta se genera con render_records en lugar de con response_model, que solo se usa para la documentación.
 
     Args:
     - session (AsyncSession): Sesión de base de datos.
     - candidate_params (dict): Parámetros de filtrado de candidatos.
     - limit (int): Cantidad de registros a obtener.
     - offset (int): Registro desde el cual se empieza a obtener.
+    - cursor (str): Cursor de la página a obtener.
 
     Returns:
-    - list[JobCandidate]: Lista de objetos que representan la relación entre la oferta y el candidato.
+    - Response: Lista en JSON de los candidatos que aplicaron a la oferta.
     """
     fields = candidate_params.pop("fields")
 
-    job_candidates = await get_database_records(session, *fields, **candidate_params, limit=limit, offset=offset)
+    job_candidates, next_cursor = await get_database_records(session, *fields, **candidate_params, limit=limit, offset=offset, cursor=cursor)
 
-    return job_candidates
+    # se conoce el modelo de lectura de los candidatos por los campos consultados, así no se valida con la unión de modelos
+    content = render_records(job_candidates, get_read_model(fields, ReadCandidateComplete, ReadCandidateMinimal), exclude_defaults=True)
+
+    response = FastJSONResponse(content)
+    set_next_cursor_header(response, next_cursor)
+
+    return response
 
 @job_candidate_route.get("/{job_id}/{candidate_id}/", response_model_exclude_defaults=True, response_model=ReadCandidateComplete, dependencies=[Depends(PermissionsManager.is_job_resource_owner)])
 async def get_job_candidate(
@@ -202,20 +215,23 @@ async def get_job_candidate(
 
 @job_candidate_route.get("/{job_id}/{candidate_id}/curriculum/", response_class=Response, dependencies=[Depends(PermissionsManager.is_job_resource_owner_noload)])
 async def get_job_candidate_cv(
+                            request: Request,
                             session: Annotated[AsyncSession, Depends(get_session)],
                             job: Annotated[Job, Depends(GetJob(False))], 
                             candidate_id: Annotated[UUID, USER_ID]) -> Response:
     """
     Obtiene el currículum de un candidato que ha aplicado a una oferta específica.
+    Se envía por fragmentos y admite las cabeceras Range e If-None-Match.
     Se debe ser el propietario del recurso o un administrador.
 
     Args:
+    - request (Request): Petición HTTP.
     - session (AsyncSession): Sesión de base de datos.
     - job (Job): Oferta de la oferta a la que se desea aplicar.
     - candidate_id (UUID): ID del candidato que aplica a la oferta.
 
     Returns:
-    - int: Cantidad de veces que el candidato ha aplicado a la oferta.
+    - Response: Currículum del candidato.
     """
 
     # hacemos join a la tabla de JobCandidate para poder filtrar por la oferta y el candidato
@@ -225,14 +241,16 @@ async def get_job_candidate_cv(
     }
 
     # añadimos un filtro para que solo se obtengan los registros que coincidan con la oferta y el candidato
+    # solo se obtienen los candidatos que tienen currículum, en el almacén de archivos o en la base de datos si no se ha migrado
     where = (
         Candidate.user_id == candidate_id,
-        JobCandidate.job_id == job.id
+        JobCandidate.job_id == job.id,
+        or_(Candidate.curriculum_key.is_not(None), Candidate.curriculum.is_not(None))
     )
 
-    candidate_cv = await get_database_records(session, Candidate.curriculum, joins=joins, where=where, result_list=False)
+    cv_record = await get_database_records(session, Candidate.curriculum_key, Candidate.curriculum, joins=joins, where=where, result_list=False, scalar=False)
 
-    return Response(candidate_cv, media_type='application/pdf')
+    return await get_curriculum_response(request, cv_record)
 
 
 
@@ -1,36 +1,35 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Annotated
 from api.database.database_models.models import Language, LanguageLevel
 from api.database.connection import get_session
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, DEFAULT_LIMIT, DEFAULT_OFFSET, LANGUAGE_ID, LANGUAGE_LEVEL_ID, LANGUAGE_EXTRA_FIELD, LANGUAGE_LEVEL_EXTRA_FIELD, LANGUAGE_NAME_KEYWORD, LANGUAGE_LEVEL_NAME_KEYWORD, LANGUAGE_NAME_KEYWORD_QUERY
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, DEFAULT_LIMIT, DEFAULT_OFFSET, LANGUAGE_ID, LANGUAGE_LEVEL_ID, LANGUAGE_EXTRA_FIELD, LANGUAGE_LEVEL_EXTRA_FIELD, LANGUAGE_NAME_KEYWORD, LANGUAGE_LEVEL_NAME_KEYWORD, LANGUAGE_NAME_KEYWORD_QUERY
 from api.security.permissions import PermissionsManager
 from api.models.read_models import ReadLevel, ReadLevelLanguage, ReadLanguage, ReadLanguageComplete
 from api.models.create_models import CreateLanguage, CreateLevel
 from api.models.update_models import UpdateLanguage, UpdateLevel
 from api.models.partial_update_models import PartialUpdateLevel
 from api.utils.functions.management_utils import endpoint_request_log
-from api.utils.functions.database_utils import secure_commit, get_record_by_id, get_database_records
+from api.utils.functions.database_utils import secure_commit, get_record_by_id, get_database_records, set_next_cursor_header, get_cached_records, get_cached_record_by_id
 from api.utils.functions.models_utils import update_model
 from api.models.enums.endpoints import LanguageExtraField, LanguageLevelExtraField
+from api.utils.functions.conditional_cache import CATALOG_CACHE
 
 language_route = APIRouter(prefix="/languages", tags=["languages"], dependencies=[Depends(endpoint_request_log)])
 
 # GET METHODS #
 @language_route.get("/", response_model=list[ReadLanguage], dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_languages(*,
-                        session: AsyncSession = Depends(get_session),
                         name_keyword: Annotated[str, LANGUAGE_NAME_KEYWORD_QUERY] = None,
                         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[Language]:
     
     """
-    Obtener todos los idiomas.
+    Obtener todos los idiomas desde la caché de catálogos.
     Solo para usuarios logueados.
 
     Args:
-    - session (AsyncSession, optional): Conexion a la base de datos. Defaults to Depends(get_session).
     - name_keyword (str, optional): Palabras clave para buscar en el nombre del idioma. Defaults to None.
     - limit (int, optional): Numero de registros a mostrar. Defaults to DEFAULT_LIMIT.
     - offset (int, optional): Numero de registros a saltar. Defaults to DEFAULT_OFFSET.
@@ -41,24 +40,22 @@ async def get_languages(*,
 
     where = None
     if name_keyword:
-        where = Language.name.startswith(name_keyword)
+        where = lambda language: language.name.startswith(name_keyword)
 
-    languages: list[Language] = await get_database_records(session, Language, limit=limit, offset=offset, where=where)
+    languages: list[Language] = await get_cached_records(Language, limit=limit, offset=offset, where=where)
 
     return languages
 
-@language_route.get("/language-name/{name_keyword}/", response_model=list[str])
+@language_route.get("/language-name/{name_keyword}/", response_model=list[str], dependencies=[Depends(CATALOG_CACHE)])
 async def get_languages(*,
-                        session: AsyncSession = Depends(get_session),
                         name_keyword: Annotated[str, LANGUAGE_NAME_KEYWORD],
                         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[str]:
     
     """
-    Obtener todos los nombres de los idiomas que contengan las palabras clave.
+    Obtener todos los nombres de los idiomas que contengan las palabras clave desde la caché de catálogos.
 
     Args:
-    - session (AsyncSession, optional): Conexion a la base de datos. Defaults to Depends(get_session).
     - name_keyword (str): Palabras clave para buscar en el nombre del idioma.
     - limit (int, optional): Numero de registros a mostrar. Defaults to DEFAULT_LIMIT.
     - offset (int, optional): Numero de registros a saltar. Defaults to DEFAULT_OFFSET.
@@ -67,21 +64,20 @@ async def get_languages(*,
     - list[Language]: Lista de idiomas
     """
 
-    languages: list[str] = await get_database_records(session, Language.name, limit=limit, offset=offset, where=Language.name.startswith(name_keyword), order_by=Language.name.desc())
+    languages: list[str] = await get_cached_records(Language, field=lambda language: language.name, limit=limit, offset=offset,
+                                                    where=lambda language: language.name.startswith(name_keyword), order_by=lambda name: name, desc=True)
     return languages
 
-@language_route.get("/language-levels/", response_model=list[ReadLevel])
+@language_route.get("/language-levels/", response_model=list[ReadLevel], dependencies=[Depends(CATALOG_CACHE)])
 async def get_language_levels(*,
-                                session: AsyncSession = Depends(get_session),
                                 language_level_keyword: Annotated[str, LANGUAGE_LEVEL_NAME_KEYWORD] = None,
                                 limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                                 offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[LanguageLevel]:
         
     """
-    Obtener todos los niveles de idiomas
+    Obtener todos los niveles de idiomas desde la caché de catálogos.
 
     Args:
-    - session (AsyncSession, optional): Conexion a la base de datos. Defaults to Depends(get_session).
     - language_level_keyword (str, optional): Palabras clave para buscar en el nombre del nivel de idioma. Defaults to None.
     - limit (int, optional): Numero de registros a mostrar. Defaults to DEFAULT_LIMIT.
     - offset (int, optional): Numero de registros a saltar. Defaults to DEFAULT_OFFSET.
@@ -92,35 +88,42 @@ async def get_language_levels(*,
 
     where = None
     if language_level_keyword:
-        where = LanguageLevel.name.startswith(language_level_keyword)
+        where = lambda level: level.name.startswith(language_level_keyword)
 
 
-    levels: list[LanguageLevel] = await get_database_records(session, LanguageLevel, where=where, limit=limit, offset=offset, order_by=LanguageLevel.value)
+    levels: list[LanguageLevel] = await get_cached_records(LanguageLevel, where=where, limit=limit, offset=offset, order_by=lambda level: level.value)
 
     return levels
 
 
 @language_route.get("/admin/", response_model=list[ReadLanguageComplete], response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_languages_complete(*,
+                                response: Response,
                                 session: AsyncSession = Depends(get_session),
                                 limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
                                 offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                                cursor: Annotated[str | None, CURSOR] = None,
                                 extra_fields: Annotated[set[LanguageExtraField], LANGUAGE_EXTRA_FIELD] = ()) -> list[Language]:
     
     """
     Obtener todos los idiomas con sus relaciones. 
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
     Solo para administradores
 
     Args:
+    - response (Response): La respuesta del endpoint.
     - session (AsyncSession, optional): Conexion a la base de datos. Defaults to Depends(get_session).
     - limit (int, optional): Numero de registros a mostrar. Defaults to DEFAULT_LIMIT.
     - offset (int, optional): Numero de registros a saltar. Defaults to DEFAULT_OFFSET.
+    - cursor (str, optional): El cursor de la página a obtener. Por defecto es None.
 
     Returns:
     - list[Language]: Lista de idiomas
     """
 
-    languages: list[Language] = await get_database_records(session, Language, limit=limit, offset=offset, options=[LanguageExtraField.get_field_value(field) for field in extra_fields], unique=True)
+    languages, next_cursor = await get_database_records(session, Language, limit=limit, offset=offset, options=[LanguageExtraField.get_field_value(field) for field in extra_fields], unique=True, keyset=Language.id, cursor=cursor, response_model=ReadLanguageComplete)
+
+    set_next_cursor_header(response, next_cursor)
     return languages
 
 @language_route.get("/admin/language-levels/", response_model=list[ReadLevelLanguage], response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
@@ -143,7 +146,7 @@ async def get_language_levels_complete(*,
     - list[LanguageLevel]: Lista de niveles de idiomas.
     """
 
-    levels: list[LanguageLevel] = await get_database_records(session, LanguageLevel, limit=limit, offset=offset, options=[LanguageLevelExtraField.get_field_value(field) for field in extra_fields], order_by=LanguageLevel.value, unique=True)
+    levels: list[LanguageLevel] = await get_database_records(session, LanguageLevel, limit=limit, offset=offset, options=[LanguageLevelExtraField.get_field_value(field) for field in extra_fields], order_by=LanguageLevel.value, unique=True, response_model=ReadLevelLanguage)
 
     return levels
 
@@ -168,7 +171,7 @@ async def get_language_complete(*,
     - Language: Idioma.
     """
 
-    language: Language = await get_record_by_id(session, Language, language_id, options=[LanguageExtraField.get_field_value(field) for field in extra_fields])
+    language: Language = await get_record_by_id(session, Language, language_id, options=[LanguageExtraField.get_field_value(field) for field in extra_fields], response_model=ReadLanguageComplete)
 
     return language
 
@@ -191,7 +194,7 @@ async def get_language_level_complete(*,
     - LanguageLevel: Nivel de idioma.
     """
     
-    level: LanguageLevel = await get_record_by_id(session, LanguageLevel, language_level_id, options=[LanguageLevelExtraField.get_field_value(field) for field in extra_fields])
+    level: LanguageLevel = await get_record_by_id(session, LanguageLevel, language_level_id, options=[LanguageLevelExtraField.get_field_value(field) for field in extra_fields], response_model=ReadLevelLanguage)
 
     return level
 
@@ -199,43 +202,39 @@ async def get_language_level_complete(*,
 
 @language_route.get("/language-levels/{language_level_id}/", response_model=ReadLevel, dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_language_level(*,
-                            session: AsyncSession = Depends(get_session),
                             language_level_id: Annotated[UUID, LANGUAGE_LEVEL_ID]) -> LanguageLevel:
         
     """
-    Obtener un nivel de idioma por su id.
+    Obtener un nivel de idioma por su id desde la caché de catálogos.
     Solo para usuarios logueados.
 
     Args:
-    - session (AsyncSession, optional): Conexión a la base de datos. Defaults to Depends(get_session).
     - language_level_id (UUID): Id del nivel de idioma.
 
     Returns:
     - LanguageLevel: Nivel de idioma.
     """
 
-    level: LanguageLevel = await get_record_by_id(session, LanguageLevel, language_level_id)
+    level: LanguageLevel = await get_cached_record_by_id(LanguageLevel, language_level_id)
 
     return level
 
 @language_route.get("/{language_id}/", response_model=ReadLanguage, dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_language(*,
-                        session: AsyncSession = Depends(get_session),
                         language_id: Annotated[UUID, LANGUAGE_ID]) -> Language:
     
     """
-    Obtener un idioma por su id.
+    Obtener un idioma por su id desde la caché de catálogos.
     Solo para usuarios logueados.
 
     Args:
-    - session (AsyncSession, optional): Conexión a la base de datos. Defaults to Depends(get_session).
     - language_id (UUID): Id del idioma.
 
     Returns:
     - Language: Idioma.
     """
 
-    language: Language = await get_record_by_id(session, Language, language_id)
+    language: Language = await get_cached_record_by_id(Language, language_id)
 
     return language
 
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from api.utils.constants.http_exceptions import RESOURCE_NOT_FOUND_EXCEPTION
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.request_metrics import RequestMetrics
+
+
+async def is_local_request(request: Request) -> None:
+    """
+    Comprueba que la petición llega desde una de las direcciones de METRICS_ALLOWED_IPS.
+    Si no es así, se responde como si el endpoint no existiera.
+
+    Args:
+    - request (Request): Petición HTTP.
+    """
+
+    if not request.client or request.client.host not in CONFIG.METRICS_ALLOWED_IPS:
+        raise HTTPException(**RESOURCE_NOT_FOUND_EXCEPTION)
+
+
+metrics_route = APIRouter(tags=["metrics"], dependencies=[Depends(is_local_request)])
+
+@metrics_route.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> str:
+    """
+    Devuelve las métricas de las peticiones de todos los workers en el formato de texto de Prometheus.
+    Solo se puede acceder desde las direcciones locales indicadas en METRICS_ALLOWED_IPS.
+
+    Returns:
+    - str: Las métricas en formato Prometheus.
+    """
+
+    return RequestMetrics.render()
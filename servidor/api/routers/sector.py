@@ -1,34 +1,33 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 from uuid import UUID
 from api.database.database_models.models import Sector
 from api.database.connection import get_session
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, SECTOR_EXTRA_FIELD, SECTOR_ID, DEFAULT_LIMIT, DEFAULT_OFFSET, SECTOR_CATEGORY, SECTOR_SUBCATEGORY_KEYWORD, SECTOR_CATEGORY_KEYWORD
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, SECTOR_EXTRA_FIELD, SECTOR_ID, DEFAULT_LIMIT, DEFAULT_OFFSET, SECTOR_CATEGORY, SECTOR_SUBCATEGORY_KEYWORD, SECTOR_CATEGORY_KEYWORD
 from api.security.permissions import PermissionsManager
 from api.models.read_models import ReadSector, ReadSectorComplete, ReadSectorNoCategory
 from api.models.create_models import CreateSector
 from api.models.update_models import UpdateSector
 from api.models.partial_update_models import PartialUpdateSector
 from api.utils.functions.management_utils import endpoint_request_log
-from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id
+from api.utils.functions.database_utils import secure_commit, get_database_records, get_record_by_id, set_next_cursor_header, get_cached_records, get_cached_record_by_id
 from api.utils.functions.models_utils import update_model
 from api.models.enums.endpoints import SectorExtraField
+from api.utils.functions.conditional_cache import CATALOG_CACHE
 
 
 sector_route = APIRouter(prefix="/sectors", tags=["sectors"], dependencies=[Depends(endpoint_request_log)])
 
 @sector_route.get("/", response_model=list[ReadSector], response_model_exclude_unset=True, dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_sectors(
-        session: Annotated[AsyncSession, Depends(get_session)],
         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[Sector]:
     """
-    Devuelve todos los sectores.
+    Devuelve todos los sectores desde la caché de catálogos.
     Se debe estar logueado para acceder a este endpoint.
 
     Args:
-    - session (AsyncSession): La sesión de base de datos. Defaults to Depends(get_session).
     - limit (int, optional): Límite de registros devueltos. Defaults to 20.
     - offset (int, optional): Permite omitir un número específico de registros en el conjunto de resultados. Defaults to 0.
 
@@ -36,20 +35,18 @@ async def get_sectors(
     - list[Sector]: La lista de sectores o subcategorías.
     """
 
-    sectors = await get_database_records(session, Sector, limit=limit, offset=offset)
+    sectors = await get_cached_records(Sector, limit=limit, offset=offset)
     return sectors
 
-@sector_route.get("/categories/{category_keyword}/", response_model=list[str])
+@sector_route.get("/categories/{category_keyword}/", response_model=list[str], dependencies=[Depends(CATALOG_CACHE)])
 async def get_sector_categories(        
-        session: Annotated[AsyncSession, Depends(get_session)],
         category_keyword: Annotated[str, SECTOR_CATEGORY_KEYWORD],
         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[str]:
     """
-    Recibe una palabra y devuelve las categorías de sectores que empiezan por esa palabra.
+    Recibe una palabra y devuelve las categorías de sectores que empiezan por esa palabra. Se obtienen de la caché de catálogos.
 
     Args:
-    - session (AsyncSession): La sesión de base de datos. Defaults to Depends(get_session).
     - category_keyword (str): La palabra clave para buscar en la categoría del sector.
     - limit (int, optional): Límite de registros devueltos. Defaults to 20.
     - offset (int, optional): Permite omitir un número específico de registros en el conjunto de resultados. Defaults to 0.
@@ -58,21 +55,20 @@ async def get_sector_categories(
     - list[str]: La lista de categorías de sectores.
     """
 
-    categories = await get_database_records(session, Sector.category.distinct(), where=Sector.category.startswith(category_keyword), limit=limit, offset=offset, order_by=Sector.category.desc())
+    categories = await get_cached_records(Sector, field=lambda sector: sector.category, where=lambda sector: sector.category.startswith(category_keyword),
+                                          distinct=True, order_by=lambda category: category, desc=True, limit=limit, offset=offset)
     return categories
 
-@sector_route.get("/{category}/subcategories/{subcategory_keyword}/", response_model=list[ReadSectorNoCategory])
+@sector_route.get("/{category}/subcategories/{subcategory_keyword}/", response_model=list[ReadSectorNoCategory], dependencies=[Depends(CATALOG_CACHE)])
 async def get_sector_subcategories(        
-        session: Annotated[AsyncSession, Depends(get_session)],
         category: Annotated[str, SECTOR_CATEGORY],
         subcategory_keyword: Annotated[str, SECTOR_SUBCATEGORY_KEYWORD],
         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[ReadSectorNoCategory]:
     """
-    Recibe una palabra y devuelve las categorías de sectores que empiezan por esa palabra.
+    Recibe una palabra y devuelve las categorías de sectores que empiezan por esa palabra. Se obtienen de la caché de catálogos.
 
     Args:
-    - session (AsyncSession): La sesión de base de datos. Defaults to Depends(get_session).
     - category (str): La categoría del sector.
     - subcategory_keyword (str): La palabra clave para buscar en la subcategoría del sector.
     - limit (int, optional): Límite de registros devueltos. Defaults to 20.
@@ -82,30 +78,37 @@ async def get_sector_subcategories(
     - list[str]: La lista de categorías de sectores.
     """
 
-    subcategories = await get_database_records(session, Sector, where=(Sector.subcategory.startswith(subcategory_keyword), 
-                                                                    Sector.category == category), limit=limit, offset=offset, order_by=Sector.subcategory.desc())
+    subcategories = await get_cached_records(Sector, where=lambda sector: sector.subcategory.startswith(subcategory_keyword) and sector.category == category,
+                                             limit=limit, offset=offset, order_by=lambda sector: sector.subcategory, desc=True)
     return subcategories
 
 @sector_route.get("/admin/", response_model=list[ReadSectorComplete], response_model_exclude_defaults=True, dependencies=[Depends(PermissionsManager.is_admin)])
 async def get_sectors_complete(
+        response: Response,
         session: Annotated[AsyncSession, Depends(get_session)],
         limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
         offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+        cursor: Annotated[str | None, CURSOR] = None,
         extra_fields: Annotated[set[SectorExtraField], SECTOR_EXTRA_FIELD] = ()) -> list[Sector]:
     """
     Devuelve todos los sectores con todos sus campos. Solo accesible por administradores. Se pueden especificar los campos extra que se quieren obtener de las tablas relacionadas.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
     Se debe ser administrador para acceder a este endpoint.
 
     Args:
+    - response (Response): La respuesta del endpoint.
     - session (AsyncSession): La sesión de base de datos. Defaults to Depends(get_session).
     - limit (int, optional): Límite de registros devueltos. Defaults to 20.
     - offset (int, optional): Permite omitir un número específico de registros en el conjunto de resultados. Defaults to 0.
+    - cursor (str, optional): El cursor de la página a obtener. Por defecto es None.
     - extra_fields (set[SectorExtraField], optional): Los campos extra que se quieren obtener de las tablas relacionadas. Defaults to ().
 
     Returns:
     - list[Sector]: La lista de sectores con todos sus campos.
     """
-    sectors = await get_database_records(session, Sector, options=[SectorExtraField.get_field_value(field) for field in extra_fields], limit=limit, offset=offset, unique=True)
+    sectors, next_cursor = await get_database_records(session, Sector, options=[SectorExtraField.get_field_value(field) for field in extra_fields], limit=limit, offset=offset, unique=True, keyset=Sector.id, cursor=cursor, response_model=ReadSectorComplete)
+
+    set_next_cursor_header(response, next_cursor)
 
     return sectors
 
@@ -127,27 +130,25 @@ async def get_sector_complete(
     Returns:
     - Sector: El sector completo.
     """
-    sector = await get_record_by_id(session, Sector, sector_id, options=[SectorExtraField.get_field_value(field) for field in extra_fields])
+    sector = await get_record_by_id(session, Sector, sector_id, options=[SectorExtraField.get_field_value(field) for field in extra_fields], response_model=ReadSectorComplete)
 
     return sector
 
 
 @sector_route.get("/{sector_id}/", response_model=ReadSector, dependencies=[Depends(PermissionsManager.is_logged)])
 async def get_sector(*,
-                     session: Annotated[AsyncSession, Depends(get_session)],
                      sector_id: Annotated[UUID, SECTOR_ID]) -> Sector:
     """
-    Devuelve un sector en específico pasándole el id del sector.
+    Devuelve un sector en específico pasándole el id del sector. Se obtiene de la caché de catálogos.
     Se debe estar logueado para acceder a este endpoint.
 
     Args:
-    - session (AsyncSession): La sesión de base de datos. Defaults to Depends(get_session).
     - sector_id (int): El id del sector.
 
     Returns:
     - Sector: El sector.
     """
-    sector: Sector = await get_record_by_id(session, Sector, sector_id)
+    sector: Sector = await get_cached_record_by_id(Sector, sector_id)
 
     return sector
 
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Response, status, BackgroundTasks
 from typing import Annotated
 from uuid import UUID
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from api.database.connection import get_session
-from api.utils.functions.database_utils import secure_commit, get_database_records, get_user_by_id
+from api.utils.functions.database_utils import secure_commit, get_database_records, get_user_by_id, set_next_cursor_header
 from api.utils.functions.models_utils import update_model, get_address_from_db
 from api.security.security import TOKEN_URL, get_user_from_token, generate_token, authenticate_user
 from api.security.permissions import PermissionsManager
+from api.security.hash_crypt import encrypt_passwords
 from api.database.database_models.models import User
 from api.models.base_models import Token
 from api.models.read_models import ReadUserComplete
@@ -16,7 +17,7 @@ from api.models.create_models import CreateUser
 from api.models.update_models import UpdateUser
 from api.models.partial_update_models import PartialUpdateUser
 from api.models.enums.models import UserType, LogLevel
-from api.utils.constants.endpoints_params import LIMIT, OFFSET, USER_ID, DEFAULT_LIMIT, DEFAULT_OFFSET
+from api.utils.constants.endpoints_params import LIMIT, OFFSET, CURSOR, USER_ID, DEFAULT_LIMIT, DEFAULT_OFFSET
 from api.utils.functions.management_utils import print_log, endpoint_request_log
 from api.utils.constants.info_strings import USER_LOGIN, USER_TOKEN_RENEW
 
@@ -24,24 +25,31 @@ user_route = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(Pe
 login_route = APIRouter(tags=["login", "users"])
 
 @user_route.get("/",response_model=list[ReadUserComplete])
-async def get_users(session: Annotated[AsyncSession, Depends(get_session)], 
+async def get_users(response: Response,
+                    session: Annotated[AsyncSession, Depends(get_session)], 
                     limit: Annotated[int, LIMIT] = DEFAULT_LIMIT,
-                    offset: Annotated[int, OFFSET] = DEFAULT_OFFSET) -> list[User]:
+                    offset: Annotated[int, OFFSET] = DEFAULT_OFFSET,
+                    cursor: Annotated[str | None, CURSOR] = None) -> list[User]:
     """
-    Devuelve todos los usuarios registrados en la base de datos. Permite elegir la cantidad de usuarios devueltos y el offset para paginar los resultados.
+    Devuelve todos los usuarios registrados en la base de datos. Permite elegir la cantidad de usuarios devueltos y el offset o el cursor para paginar los resultados.
+    El cursor de la siguiente página se devuelve en la cabecera X-Next-Cursor.
     Solo los administradores pueden acceder a este endpoint.
     
     Args:
+    - response (Response): Respuesta del endpoint.
     - session (AsyncSession): Conexión a la base de datos.
     - limit (int | None): Límite de usuarios devueltos.
     - offset (int | None): Permite omitir un número específico de usuarios en el conjunto de resultados.
+    - cursor (str | None): Cursor de la página a obtener.
 
     Returns:
     - list[ReadUser]: Lista de usuarios registrados en la base de datos.
     """
 
     # se obtienen los usuarios
-    list_user: list[User] = await get_database_records(session, User, options=joinedload(User.address), limit=limit, offset=offset)
+    list_user, next_cursor = await get_database_records(session, User, options=joinedload(User.address), limit=limit, offset=offset, keyset=User.id, cursor=cursor)
+
+    set_next_cursor_header(response, next_cursor)
 
     return list_user
 
@@ -87,7 +95,7 @@ async def create_user(session:Annotated[AsyncSession, Depends(get_session)],
     address = await get_address_from_db(session, new_user.address)
     
     # se crea el usuario
-    new_database_user = User(**new_user.model_dump(), user_type=UserType.ADMIN, address=address)
+    new_database_user = User(**await encrypt_passwords(new_user.model_dump()), user_type=UserType.ADMIN, address=address)
 
     session.add(new_database_user)
     await secure_commit(session)
@@ -117,7 +125,7 @@ async def update_user(session:Annotated[AsyncSession, Depends(get_session)],
     user_to_update = await get_user_by_id(session, logged_user, user_id, options=joinedload(User.address))
     
     # se actualiza el usuario
-    update_model(user_to_update, update_user.model_dump())
+    update_model(user_to_update, await encrypt_passwords(update_user.model_dump()))
 
     # se comprueba si la dirección ya existe en la base de datos, si existe se devuelve la dirección que ya existe
     user_to_update.address = await get_address_from_db(session, update_user.address)
@@ -150,7 +158,7 @@ async def partial_update_user(session:Annotated[AsyncSession, Depends(get_sessio
     user_to_update = await get_user_by_id(session, logged_user, user_id, options=joinedload(User.address))
     
     # se quita los parámetros que no se quieren actualizar
-    new_user_data_no_unset = update_user.model_dump(exclude_unset=True)
+    new_user_data_no_unset = await encrypt_passwords(update_user.model_dump(exclude_unset=True))
     
     # se actualiza el usuario
     update_model(user_to_update, new_user_data_no_unset)
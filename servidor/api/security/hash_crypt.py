@@ -1,8 +1,17 @@
+from asyncio import Semaphore, get_running_loop
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import monotonic
+from typing import Any, Callable
 from passlib.context import CryptContext
+from api.utils.constants.error_strings import HASH_POOL_NOT_STARTED
 from api.utils.functions.env_config import CONFIG
 
 CRYPT_CONTEXT = CryptContext(schemes=[CONFIG.PASSWORD_CRYPT_SCHEME], deprecated="auto")
 
+class HashedString(str):
+    """Cadena que ya contiene un hash. El modelo User la guarda sin volver a encriptarla."""
+
 def encrypt_string(string: str) -> str:
     """
     Recibe una cadena de texto y devuelve su hash.
@@ -31,3 +40,143 @@ def verify_string_hash(plain_string: str, hashed_string: str) -> bool:
 
     result = CRYPT_CONTEXT.verify(plain_string, hashed_string)
     return result
+
+
+class HashPool:
+    """
+    Pool de procesos donde se calculan los hashes para no bloquear el bucle de eventos del worker.
+
+    El número de procesos y el número máximo de hashes en ejecución a la vez son configurables.
+    Las peticiones que superan el máximo esperan su turno y se cuentan en las métricas de la cola.
+    """
+
+    _pool: ProcessPoolExecutor | None = None
+    _semaphore: Semaphore | None = None
+
+    # métricas del pool
+    _waiting: int = 0
+    _running: int = 0
+    _completed: int = 0
+    _max_waiting: int = 0
+    _total_wait_time: float = 0.0
+
+    @classmethod
+    def start(cls) -> None:
+        """Crea el pool de procesos. Se usa spawn para no copiar el estado del worker en los procesos."""
+
+        cls._pool = ProcessPoolExecutor(max_workers=CONFIG.HASH_POOL_WORKERS, mp_context=get_context("spawn"))
+        cls._semaphore = Semaphore(CONFIG.HASH_MAX_CONCURRENCY)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Detiene el pool de procesos."""
+
+        pool, cls._pool = cls._pool, None
+
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    @classmethod
+    async def _run(cls, func: Callable, *args) -> Any:
+        """
+        Ejecuta una función en el pool de procesos respetando el máximo de ejecuciones a la vez.
+        La línea de comandos usa las funciones síncronas, por lo que el pool siempre debe estar iniciado.
+
+        Args:
+        - func (Callable): Función a ejecutar.
+        - args: Argumentos de la función.
+
+        Returns:
+        - Any: Resultado de la función.
+
+        Raises:
+        - RuntimeError: Si el pool no se ha iniciado.
+        """
+
+        # se falla en lugar de calcular el hash en el bucle de eventos, que bloquearía el resto de peticiones del worker
+        if cls._pool is None:
+            raise RuntimeError(HASH_POOL_NOT_STARTED)
+
+        # se registra la petición en la cola hasta que obtiene un hueco
+        cls._waiting += 1
+        cls._max_waiting = max(cls._max_waiting, cls._waiting)
+        start = monotonic()
+
+        try:
+            await cls._semaphore.acquire()
+        finally:
+            cls._waiting -= 1
+
+        cls._total_wait_time += monotonic() - start
+        cls._running += 1
+
+        try:
+            return await get_running_loop().run_in_executor(cls._pool, func, *args)
+        finally:
+            cls._running -= 1
+            cls._completed += 1
+            cls._semaphore.release()
+
+    @classmethod
+    def get_metrics(cls) -> dict[str, int | float]:
+        """
+        Devuelve las métricas del pool de procesos.
+
+        Returns:
+        - dict[str, int | float]: Hashes esperando, en ejecución, completados, máximo de hashes esperando a la vez
+          y tiempo total de espera en segundos.
+        """
+
+        return {
+            "waiting": cls._waiting,
+            "running": cls._running,
+            "completed": cls._completed,
+            "max_waiting": cls._max_waiting,
+            "total_wait_time": cls._total_wait_time,
+        }
+
+async def encrypt_string_async(string: str) -> HashedString:
+    """
+    Recibe una cadena de texto y devuelve su hash calculado en el pool de procesos.
+
+    Args:
+    - string (str): cadena sin encriptar.
+
+    Returns:
+    - HashedString: hash de la cadena.
+    """
+
+    return HashedString(await HashPool._run(encrypt_string, string))
+
+async def verify_string_hash_async(plain_string: str, hashed_string: str) -> bool:
+    """
+    Comprueba en el pool de procesos si la cadena de texto sin encriptar coincide con el hash.
+
+    Args:
+    - plain_string (str): cadena sin encriptar.
+    - hashed_string (str): cadena encriptada.
+
+    Returns:
+    - bool: True si la cadena de texto coincide con el hash, False si no coincide
+    """
+
+    return await HashPool._run(verify_string_hash, plain_string, hashed_string)
+
+async def encrypt_passwords(data: dict) -> dict:
+    """
+    Sustituye las contraseñas de los datos de un modelo, incluidas las de los modelos anidados, por su hash calculado en el pool de procesos.
+
+    Args:
+    - data (dict): datos del modelo.
+
+    Returns:
+    - dict: los mismos datos con las contraseñas encriptadas.
+    """
+
+    for key, value in data.items():
+        if isinstance(value, dict):
+            await encrypt_passwords(value)
+        elif key == "password" and isinstance(value, str):
+            data[key] = await encrypt_string_async(value)
+
+    return data
@@ -2,7 +2,7 @@ from re import match
 from typing import Annotated
 from jose import jwt
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends
+from fastapi import Depends, Request
 from starlette.background import BackgroundTask
 from datetime import datetime, timedelta
 from uuid import UUID
@@ -17,7 +17,7 @@ from api.utils.functions.management_utils import print_log
 from api.utils.exceptions import HTTPExceptionWithBackgroundTask
 from api.utils.constants.error_strings import PERMISSION_USER_NOT_FOUND, INVALID_TOKEN, INVALID_CREDENTIALS
 from api.utils.functions.env_config import CONFIG
-from api.security.hash_crypt import verify_string_hash
+from api.security.hash_crypt import verify_string_hash_async
 
 TOKEN_URL = CONFIG.TOKEN_URL
 OAUTH2_SCHEME = OAuth2PasswordBearer(tokenUrl=CONFIG.TOKEN_URL, auto_error=False)
@@ -47,21 +47,39 @@ def generate_token(user: User) -> Token:
 
     return token
 
-async def get_user_from_token(session: Annotated[AsyncSession, Depends(get_session)], token: Annotated[str, Depends(OAUTH2_SCHEME)]) -> User:
+class AuthContext:
     """
-    Recibe un token de seguridad y devuelve el usuario que corresponde al token de seguridad.
+    Contexto de autenticación de una petición.
+    Se crea una sola vez por petición y lo comparten el log de la petición, los permisos y los endpoints.
+
+    Atributos:
+    - user: Usuario autenticado o None si no se ha podido autenticar.
+    - error_log: Tarea en segundo plano que imprime el motivo por el que no se ha podido autenticar.
+    """
+
+    def __init__(self, user: User | None = None, error_log: BackgroundTask | None = None) -> None:
+        self.user = user
+        self.error_log = error_log
+
+async def get_auth_context(request: Request, session: Annotated[AsyncSession, Depends(get_session)], token: Annotated[str, Depends(OAUTH2_SCHEME)] = None) -> AuthContext:
+    """
+    Decodifica el token de seguridad y obtiene el usuario una sola vez por petición.
+    El contexto se guarda en el estado de la petición para que pueda reutilizarse fuera de las dependencias.
     
     Args:
+    - request (Request): Petición HTTP.
     - session (AsyncSession): Sesión de la base de datos.
     - token (str): Token de seguridad.
 
     Returns:
-    - User: Usuario que corresponde al token de seguridad.
-
-    Raises:
-    - HTTPException: No se ha podido autenticar el usuario.
+    - AuthContext: Contexto de autenticación de la petición.
     """
-    
+
+    # si ya se ha autenticado la petición, se devuelve el contexto guardado
+    context: AuthContext | None = getattr(request.state, "auth", None)
+    if context is not None:
+        return context
+
     try:
         # decodificamos el token
         payload = jwt.decode(token, CONFIG.SECRET_KEY, algorithms=[CONFIG.ALGORITHM])
@@ -69,40 +87,56 @@ async def get_user_from_token(session: Annotated[AsyncSession, Depends(get_sessi
         id: UUID = payload.get("sub")
 
     except Exception as exc:
-        # si no se ha podido decodificar el token, lanzamos una excepción y generamos un background task para imprimir el log del error
-        background = BackgroundTask(print_log, INVALID_TOKEN, log_level=LogLevel.ERROR, exc=exc)
-        raise HTTPExceptionWithBackgroundTask(**CREDENTIALS_EXCEPTION, background_task=background)
+        # si no se ha podido decodificar el token, generamos un background task para imprimir el log del error
+        context = AuthContext(error_log=BackgroundTask(print_log, INVALID_TOKEN, log_level=LogLevel.ERROR, exc=exc))
+
+    if context is None:
+        # obtenemos el usuario
+        user = await session.get(User, id)
+
+        # si el usuario no existe, generamos un background task para imprimir el log del error
+        if user is None:
+            context = AuthContext(error_log=BackgroundTask(print_log, PERMISSION_USER_NOT_FOUND, log_level=LogLevel.ERROR))
+        else:
+            context = AuthContext(user=user)
+
+    request.state.auth = context
     
-    # obtenemos el usuario
-    user = await session.get(User, id)
+    return context
 
-    # si el usuario no existe, lanzamos una excepción y generamos un background task para imprimir el log del error
-    if user is None:
-        background = BackgroundTask(print_log, PERMISSION_USER_NOT_FOUND, log_level=LogLevel.ERROR)
-        raise HTTPExceptionWithBackgroundTask(**CREDENTIALS_EXCEPTION, background_task=background)
+async def get_user_from_token(context: Annotated[AuthContext, Depends(get_auth_context)]) -> User:
+    """
+    Devuelve el usuario que corresponde al token de seguridad de la petición.
     
-    return user
+    Args:
+    - context (AuthContext): Contexto de autenticación de la petición.
+
+    Returns:
+    - User: Usuario que corresponde al token de seguridad.
+
+    Raises:
+    - HTTPException: No se ha podido autenticar el usuario.
+    """
+    
+    # si no se ha podido autenticar, lanzamos una excepción con el background task que imprime el log del error
+    if context.user is None:
+        raise HTTPExceptionWithBackgroundTask(**CREDENTIALS_EXCEPTION, background_task=context.error_log)
+    
+    return context.user
 
-async def get_user_from_token_or_none(session: Annotated[AsyncSession, Depends(get_session)], token: Annotated[str, Depends(OAUTH2_SCHEME)] = None) -> User | None:
+async def get_user_from_token_or_none(context: Annotated[AuthContext, Depends(get_auth_context)]) -> User | None:
     """
-    Recibe un token de seguridad y devuelve el usuario que corresponde al token de seguridad. A diferencia de get_user_from_token, si no se puede autenticar devuelve None. 
+    Devuelve el usuario que corresponde al token de seguridad de la petición. A diferencia de get_user_from_token, si no se puede autenticar devuelve None. 
     Utilizado cuando no es necesario autenticar al usuario pero se quiere autenticar si es posible.
     
     Args:
-    - session (AsyncSession): Sesión de la base de datos.
-    - token (str): Token de seguridad.
+    - context (AuthContext): Contexto de autenticación de la petición.
 
     Returns:
     - User: Usuario que corresponde al token de seguridad o None si no se ha podido autenticar.
     """
     
-    try:
-        # decodificamos el token
-        user = await get_user_from_token(session, token)
-    except:
-        return None
-    
-    return user
+    return context.user
 
 
 async def authenticate_user(session: AsyncSession, username: str, password: str) -> User | None:
@@ -133,7 +167,7 @@ async def authenticate_user(session: AsyncSession, username: str, password: str)
     user: User = result.scalar()
 
     # si el usuario no existe o la contraseña no es correcta, lanzamos una excepción y generamos un background task para imprimir el log del error
-    if not user or not verify_string_hash(password, user.password):
+    if not user or not await verify_string_hash_async(password, user.password):
         background = BackgroundTask(print_log, INVALID_CREDENTIALS, log_level=LogLevel.ERROR, username=username)
         raise HTTPExceptionWithBackgroundTask(**CREDENTIALS_EXCEPTION, background_task=background)
 
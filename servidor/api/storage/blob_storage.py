@@ -0,0 +1,451 @@
+import os, re, time
+from hashlib import sha256
+from abc import ABC, abstractmethod
+from asyncio import to_thread
+from typing import AsyncIterable, AsyncIterator
+from tempfile import mkstemp
+from api.utils.constants.error_strings import INVALID_BLOB_KEY, INVALID_BLOB_BACKEND
+from api.utils.functions.env_config import CONFIG
+
+class BlobStorage(ABC):
+    """
+    Almacén de archivos direccionado por contenido.
+
+    Cada archivo se identifica por el hash SHA-256 de su contenido, por lo que guardar dos veces el mismo archivo
+    solo lo almacena una vez. En la base de datos solo se guarda la clave del archivo.
+    Para añadir otro almacén se hereda de esta clase y se registra en BLOB_STORAGE_BACKENDS.
+    """
+
+    KEY_REGEX = re.compile(r"^[0-9a-f]{64}$")
+
+    @classmethod
+    def get_key(cls, data: bytes) -> str:
+        """
+        Devuelve la clave de un archivo, el hash SHA-256 de su contenido.
+
+        Args:
+        - data (bytes): Contenido del archivo.
+
+        Returns:
+        - str: La clave del archivo.
+        """
+
+        return sha256(data).hexdigest()
+
+    @classmethod
+    def check_key(cls, key: str) -> str:
+        """
+        Comprueba que la clave tiene el formato de un hash SHA-256 para que no se pueda usar para acceder a otras rutas.
+
+        Args:
+        - key (str): La clave del archivo.
+
+        Returns:
+        - str: La clave del archivo.
+
+        Raises:
+        - ValueError: Si la clave no es válida.
+        """
+
+        if not cls.KEY_REGEX.match(key):
+            raise ValueError(INVALID_BLOB_KEY.format(key=key))
+
+        return key
+
+    @classmethod
+    @abstractmethod
+    def from_config(cls) -> "BlobStorage":
+        """
+        Crea el almacén con la configuración de las variables de entorno.
+
+        Returns:
+        - BlobStorage: El almacén de archivos.
+        """
+
+    @abstractmethod
+    async def save(self, data: bytes) -> str:
+        """
+        Guarda un archivo si no existe ya uno con el mismo contenido.
+
+        Args:
+        - data (bytes): Contenido del archivo.
+
+        Returns:
+        - str: La clave del archivo.
+        """
+
+    @abstractmethod
+    async def save_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        """
+        Guarda un archivo a partir de sus fragmentos sin cargarlo entero en memoria, si no existe ya uno con el mismo contenido.
+        Si la lectura de los fragmentos lanza una excepción no se guarda nada.
+
+        Args:
+        - chunks (AsyncIterable[bytes]): Fragmentos del archivo.
+
+        Returns:
+        - str: La clave del archivo.
+        """
+
+    @abstractmethod
+    async def get_size(self, key: str) -> int:
+        """
+        Devuelve el tamaño en bytes de un archivo.
+
+        Args:
+        - key (str): La clave del archivo.
+
+        Returns:
+        - int: Tamaño del archivo.
+
+        Raises:
+        - FileNotFoundError: Si el archivo no existe.
+        """
+
+    @abstractmethod
+    def iter_chunks(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        """
+        Devuelve los fragmentos de BLOB_CHUNK_SIZE bytes de un archivo, o de la parte indicada, para enviarlo sin cargarlo entero en memoria.
+
+        Args:
+        - key (str): La clave del archivo.
+        - start (int): Primer byte que se devuelve.
+        - end (int | None): Byte siguiente al último que se devuelve, si es None se devuelve hasta el final.
+
+        Returns:
+        - AsyncIterator[bytes]: Los fragmentos del archivo.
+        """
+
+    def get_internal_path(self, key: str) -> str | None:
+        """
+        Devuelve la ruta de un archivo relativa a la raíz del almacén para que lo envíe directamente el proxy.
+        Los almacenes que no guardan los archivos en disco devuelven None y los archivos los envía la API.
+
+        Args:
+        - key (str): La clave del archivo.
+
+        Returns:
+        - str | None: Ruta relativa del archivo o None si el proxy no puede enviarlo.
+        """
+
+        return None
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """
+        Devuelve el contenido de un archivo.
+
+        Args:
+        - key (str): La clave del archivo.
+
+        Returns:
+        - bytes: Contenido del archivo.
+
+        Raises:
+        - FileNotFoundError: Si el archivo no existe.
+        """
+
+    @abstractmethod
+    async def delete(self, key: str, older_than: float | None = None) -> bool:
+        """
+        Elimina un archivo si existe.
+        Si se indica older_than, el archivo solo se elimina si tampoco se ha guardado en los últimos segundos indicados
+        al eliminarlo, para no perder un archivo que se acaba de volver a subir.
+
+        Args:
+        - key (str): La clave del archivo.
+        - older_than (float | None): Segundos desde el último guardado.
+
+        Returns:
+        - bool: True si se ha eliminado el archivo.
+        """
+
+    @abstractmethod
+    async def get_keys(self, older_than: float) -> list[str]:
+        """
+        Devuelve las claves de los archivos que no se han guardado en los últimos segundos indicados.
+
+        Args:
+        - older_than (float): Segundos desde el último guardado.
+
+        Returns:
+        - list[str]: Las claves de los archivos.
+        """
+
+
+class LocalBlobStorage(BlobStorage):
+    """
+    Almacén de archivos en un directorio local.
+    Los archivos se reparten en subdirectorios según los primeros caracteres de su clave (ab/cd/abcd...) para no acumular
+    todos los archivos en el mismo directorio.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        Inicializa el almacén.
+
+        Args:
+        - root (str): Directorio raíz del almacén.
+        """
+
+        self.root = root
+
+    @classmethod
+    def from_config(cls) -> "LocalBlobStorage":
+        """Crea el almacén en el directorio BLOB_STORAGE_PATH."""
+
+        return cls(CONFIG.BLOB_STORAGE_PATH)
+
+    def get_path(self, key: str) -> str:
+        """
+        Devuelve la ruta del archivo de una clave.
+
+        Args:
+        - key (str): La clave del archivo.
+
+        Returns:
+        - str: Ruta del archivo.
+        """
+
+        return os.path.join(self.root, self.get_internal_path(key))
+
+    def get_internal_path(self, key: str) -> str:
+        """
+        Devuelve la ruta de un archivo relativa a la raíz del almacén.
+
+        Args:
+        - key (str): La clave del archivo.
+
+        Returns:
+        - str: Ruta relativa del archivo.
+        """
+
+        key = self.check_key(key)
+
+        return f"{key[:2]}/{key[2:4]}/{key}"
+
+    def _create_temp_file(self) -> tuple[int, str]:
+        """Crea un archivo temporal en la raíz del almacén, en el mismo sistema de archivos para poder renombrarlo."""
+
+        os.makedirs(self.root, exist_ok=True)
+
+        return mkstemp(dir=self.root, suffix=".tmp")
+
+    def _touch(self, path: str) -> bool:
+        """Actualiza la fecha de un archivo para que no se elimine como huérfano. Devuelve False si el archivo no existe."""
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def _store_temp_file(self, temp_path: str, key: str) -> str:
+        """Mueve el archivo temporal a la ruta de su clave. El archivo se renombra para que nunca se lea a medias."""
+
+        path = self.get_path(key)
+
+        try:
+            # si el archivo ya existe, se actualiza su fecha para que no se elimine como huérfano
+            if self._touch(path):
+                os.remove(temp_path)
+                return key
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+
+        except BaseException:
+            self._remove_temp_file(temp_path)
+            raise
+
+        return key
+
+    def _remove_temp_file(self, temp_path: str) -> None:
+        """Elimina un archivo temporal si existe."""
+
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _save(self, data: bytes) -> str:
+        """Guarda el archivo."""
+
+        key = self.get_key(data)
+        path = self.get_path(key)
+
+        # si el archivo ya existe no hace falta escribirlo, se actualiza su fecha para que no se elimine como huérfano
+        if self._touch(path):
+            return key
+
+        descriptor, temp_path = self._create_temp_file()
+
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+
+        except BaseException:
+            self._remove_temp_file(temp_path)
+            raise
+
+        return self._store_temp_file(temp_path, key)
+
+    def _read(self, key: str) -> bytes:
+        """Lee el archivo."""
+
+        with open(self.get_path(key), "rb") as file:
+            return file.read()
+
+    def _delete(self, key: str, older_than: float | None) -> bool:
+        """
+        Elimina el archivo.
+        Si se indica older_than, el archivo se retira primero de su ruta y se comprueba su fecha después, por lo que
+        un guardado del mismo archivo o bien actualiza su fecha antes y el archivo se restaura, o bien ya no lo encuentra
+        y lo vuelve a escribir.
+        """
+
+        path = self.get_path(key)
+
+        try:
+            if older_than is None:
+                os.remove(path)
+                return True
+
+            removed_path = f"{path}.del"
+            os.replace(path, removed_path)
+
+        except FileNotFoundError:
+            return False
+
+        # el archivo se ha vuelto a guardar desde que se listó, se restaura salvo que ya se haya vuelto a escribir
+        if os.path.getmtime(removed_path) >= time.time() - older_than:
+            if not os.path.exists(path):
+                os.replace(removed_path, path)
+            else:
+                os.remove(removed_path)
+
+            return False
+
+        os.remove(removed_path)
+
+        return True
+
+    def _get_keys(self, older_than: float) -> list[str]:
+        """Recorre el directorio y devuelve las claves de los archivos anteriores a la fecha límite."""
+
+        limit = time.time() - older_than
+        keys = []
+
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if self.KEY_REGEX.match(name) and os.path.getmtime(os.path.join(directory, name)) < limit:
+                    keys.append(name)
+
+        return keys
+
+    # las operaciones de disco se ejecutan en un hilo para no bloquear el bucle de eventos
+
+    async def save(self, data: bytes) -> str:
+        """Guarda un archivo si no existe ya uno con el mismo contenido y devuelve su clave."""
+
+        return await to_thread(self._save, data)
+
+    async def save_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        """
+        Guarda un archivo a partir de sus fragmentos y devuelve su clave.
+        Cada fragmento se escribe en el archivo temporal a medida que llega y la clave se calcula a la vez.
+        """
+
+        descriptor, temp_path = await to_thread(self._create_temp_file)
+        file = os.fdopen(descriptor, "wb")
+        hasher = sha256()
+
+        try:
+            async for chunk in chunks:
+                hasher.update(chunk)
+                await to_thread(file.write, chunk)
+
+            await to_thread(file.close)
+
+        except BaseException:
+            file.close()
+            await to_thread(self._remove_temp_file, temp_path)
+            raise
+
+        return await to_thread(self._store_temp_file, temp_path, hasher.hexdigest())
+
+    async def get_size(self, key: str) -> int:
+        """Devuelve el tamaño en bytes de un archivo."""
+
+        return await to_thread(os.path.getsize, self.get_path(key))
+
+    async def iter_chunks(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        """Devuelve los fragmentos de BLOB_CHUNK_SIZE bytes de un archivo, o de la parte indicada."""
+
+        file = await to_thread(open, self.get_path(key), "rb")
+
+        try:
+            await to_thread(file.seek, start)
+            remaining = end - start if end is not None else None
+
+            while remaining is None or remaining > 0:
+                size = CONFIG.BLOB_CHUNK_SIZE if remaining is None else min(CONFIG.BLOB_CHUNK_SIZE, remaining)
+                chunk = await to_thread(file.read, size)
+
+                if not chunk:
+                    break
+
+                if remaining is not None:
+                    remaining -= len(chunk)
+
+                yield chunk
+
+        finally:
+            await to_thread(file.close)
+
+    async def read(self, key: str) -> bytes:
+        """Devuelve el contenido de un archivo."""
+
+        return await to_thread(self._read, key)
+
+    async def delete(self, key: str, older_than: float | None = None) -> bool:
+        """Elimina un archivo si existe y, si se indica older_than, si tampoco se ha guardado en los últimos segundos indicados."""
+
+        return await to_thread(self._delete, key, older_than)
+
+    async def get_keys(self, older_than: float) -> list[str]:
+        """Devuelve las claves de los archivos que no se han guardado en los últimos segundos indicados."""
+
+        return await to_thread(self._get_keys, older_than)
+
+
+# almacenes disponibles, se elige uno con la variable de entorno BLOB_STORAGE_BACKEND
+BLOB_STORAGE_BACKENDS: dict[str, type[BlobStorage]] = {
+    "local": LocalBlobStorage,
+}
+
+_blob_storage: BlobStorage | None = None
+
+def get_blob_storage() -> BlobStorage:
+    """
+    Devuelve el almacén de archivos configurado, creándolo la primera vez.
+
+    Returns:
+    - BlobStorage: El almacén de archivos.
+
+    Raises:
+    - ValueError: Si el almacén configurado no existe.
+    """
+
+    global _blob_storage
+
+    if _blob_storage is None:
+        backend = BLOB_STORAGE_BACKENDS.get(CONFIG.BLOB_STORAGE_BACKEND)
+
+        if backend is None:
+            raise ValueError(INVALID_BLOB_BACKEND.format(backend=CONFIG.BLOB_STORAGE_BACKEND, available=", ".join(BLOB_STORAGE_BACKENDS)))
+
+        _blob_storage = backend.from_config()
+
+    return _blob_storage
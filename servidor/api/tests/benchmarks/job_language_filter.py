@@ -0,0 +1,122 @@
+"""
+Compara en PostgreSQL las formas de filtrar las ofertas de trabajo por varios idiomas con una página de GET /jobs/.
+
+Se crean tablas temporales con las ofertas y sus idiomas, que desaparecen al cerrar la conexión, por lo que necesita
+la base de datos pero no modifica sus tablas. Los idiomas siguen una distribución de Zipf: el primero lo requiere
+la mitad de las ofertas y los últimos muy pocas.
+
+Se comparan el join anterior, que repite las ofertas y con dos idiomas no devuelve ninguna, las subconsultas
+agrupadas sobre job_language, un EXISTS por idioma y un array de ids de idiomas en la oferta con un índice GIN,
+que es la forma que usa el filtro a través del documento de búsqueda de las ofertas (job_search_doc).
+
+Uso:
+    python -m api.tests.benchmarks.job_language_filter [ofertas] [repeticiones]
+"""
+
+import sys
+import anyio
+from uuid import uuid4
+from time import perf_counter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from api.database.connection import engine, close_connection
+
+
+# número de idiomas del catálogo
+LANGUAGES = 20
+
+# tamaño de la página de ofertas
+PAGE_SIZE = 20
+
+# orden de las páginas de ofertas, por fecha de publicación usando el id como desempate
+PAGE_ORDER = f"ORDER BY job.publication_date DESC, job.id DESC LIMIT {PAGE_SIZE}"
+
+async def _create_tables(connection: AsyncConnection, count: int, language_ids: list[str]) -> None:
+    """Crea las tablas temporales con las ofertas, sus idiomas y sus índices."""
+
+    languages = ", ".join(f"('{language_id}'::uuid, {position})" for position, language_id in enumerate(language_ids, start=1))
+
+    for statement in (
+        "CREATE TEMP TABLE bench_language (id uuid PRIMARY KEY, position int)",
+        f"INSERT INTO bench_language VALUES {languages}",
+        "CREATE TEMP TABLE bench_job (id uuid PRIMARY KEY, publication_date date, language_ids uuid[])",
+        f"INSERT INTO bench_job (id, publication_date) SELECT gen_random_uuid(), current_date - (random() * 365)::int FROM generate_series(1, {count})",
+        "CREATE INDEX ON bench_job (publication_date DESC, id DESC)",
+        # misma clave primaria e índice por idioma que job_language
+        "CREATE TEMP TABLE bench_job_language (job_id uuid, language_id uuid, PRIMARY KEY (job_id, language_id))",
+        "INSERT INTO bench_job_language SELECT job.id, language.id FROM bench_job job JOIN bench_language language ON random() < 0.5 / language.position",
+        "CREATE INDEX ON bench_job_language (language_id, job_id)",
+        # array de idiomas mantenido en la oferta
+        "UPDATE bench_job job SET language_ids = coalesce((SELECT array_agg(language_id) FROM bench_job_language WHERE job_id = job.id), '{}')",
+        "CREATE INDEX ON bench_job USING GIN (language_ids)",
+        "ANALYZE bench_language",
+        "ANALYZE bench_job",
+        "ANALYZE bench_job_language",
+    ):
+        await connection.execute(text(statement))
+
+def _get_queries(first: str, second: str) -> dict[str, str]:
+    """Devuelve las consultas de cada forma de filtrar por los dos idiomas indicados."""
+
+    ids = f"'{first}'::uuid, '{second}'::uuid"
+    array = f"ARRAY[{ids}]"
+
+    return {
+        "join anterior, un idioma": f"SELECT DISTINCT job.id, job.publication_date FROM bench_job job JOIN bench_job_language jl ON jl.job_id = job.id WHERE jl.language_id = '{first}'::uuid {PAGE_ORDER}",
+        "join anterior, dos idiomas": f"SELECT DISTINCT job.id, job.publication_date FROM bench_job job JOIN bench_job_language jl ON jl.job_id = job.id WHERE jl.language_id = '{first}'::uuid AND jl.language_id = '{second}'::uuid {PAGE_ORDER}",
+        "semi-join agrupado, all": f"SELECT job.id FROM bench_job job WHERE job.id IN (SELECT job_id FROM bench_job_language WHERE language_id IN ({ids}) GROUP BY job_id HAVING count(*) = 2) {PAGE_ORDER}",
+        "semi-join, any": f"SELECT job.id FROM bench_job job WHERE job.id IN (SELECT job_id FROM bench_job_language WHERE language_id IN ({ids})) {PAGE_ORDER}",
+        "exists por idioma, all": (
+            "SELECT job.id FROM bench_job job WHERE "
+            f"EXISTS (SELECT 1 FROM bench_job_language WHERE job_id = job.id AND language_id = '{first}'::uuid) AND "
+            f"EXISTS (SELECT 1 FROM bench_job_language WHERE job_id = job.id AND language_id = '{second}'::uuid) {PAGE_ORDER}"
+        ),
+        "array con GIN, all": f"SELECT job.id FROM bench_job job WHERE job.language_ids @> {array} {PAGE_ORDER}",
+        "array con GIN, any": f"SELECT job.id FROM bench_job job WHERE job.language_ids && {array} {PAGE_ORDER}",
+    }
+
+async def _measure(connection: AsyncConnection, name: str, query: str, number: int) -> None:
+    """Muestra el número de filas y el mejor tiempo de una consulta."""
+
+    rows = len((await connection.execute(text(query))).all())
+    best = float("inf")
+
+    for _ in range(number):
+        start = perf_counter()
+        (await connection.execute(text(query))).all()
+        best = min(best, perf_counter() - start)
+
+    print(f"  {name:<30} {rows:>4} filas   {best * 1000:8.2f} ms")
+
+async def main(count: int = 100_000, number: int = 20) -> None:
+    """
+    Ejecuta las comparaciones.
+
+    Args:
+    - count (int): Número de ofertas.
+    - number (int): Número de repeticiones de cada medida.
+    """
+
+    language_ids = [str(uuid4()) for _ in range(LANGUAGES)]
+
+    try:
+        async with engine.connect() as connection:
+            await _create_tables(connection, count, language_ids)
+
+            print(f"{count} ofertas, {LANGUAGES} idiomas, página de {PAGE_SIZE} ofertas, mejor de {number} repeticiones")
+
+            # dos idiomas frecuentes y un idioma frecuente con uno poco frecuente
+            for title, first, second in (("idiomas frecuentes", 0, 1), ("idioma frecuente y poco frecuente", 0, LANGUAGES - 5)):
+                print(title)
+
+                for name, query in _get_queries(language_ids[first], language_ids[second]).items():
+                    await _measure(connection, name, query, number)
+
+            # las tablas temporales no se guardan
+            await connection.rollback()
+    finally:
+        await close_connection()
+
+
+if __name__ == "__main__":
+    anyio.run(main, *(int(arg) for arg in sys.argv[1:3]))
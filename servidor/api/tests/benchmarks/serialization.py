@@ -0,0 +1,154 @@
+"""
+Compara el tiempo de generar las respuestas de GET /jobs/ y GET /jobs/candidates/{job_id}/ con response_model y con render_records.
+
+Los registros se crean en memoria con la forma que devuelven las consultas, por lo que no necesita la base de datos.
+Se comprueba que las dos formas generan el mismo JSON.
+
+Uso:
+    python -m api.tests.benchmarks.serialization [registros] [repeticiones]
+"""
+
+import gc, sys
+import anyio
+from uuid import uuid4
+from datetime import date
+from time import perf_counter
+from collections import namedtuple
+from typing import Any, Callable
+from fastapi.routing import serialize_response
+from fastapi.responses import JSONResponse
+from fastapi._compat import ModelField
+from fastapi.utils import create_response_field
+from api.database.database_models.models import (
+    Job, JobLanguage, JobEducation, Candidate, User, Address, Sector, Language, LanguageLevel, Education, EducationLevel,
+    Experience, CandidateLanguage, CandidateEducation,
+)
+from api.models.enums.models import UserType, WorkSchedule
+from api.models.read_models import ReadJobComplete, ReadJobMinimal, ReadCandidateComplete, ReadCandidateMinimal
+from api.utils.functions.fast_json import render_records
+
+
+# filas de las consultas con los campos mínimos
+JobRow = namedtuple("JobRow", ("id", "title", "description", "province"))
+CandidateRow = namedtuple("CandidateRow", ("id", "name", "surname", "province", "skills", "availability"))
+
+def _get_address() -> Address:
+    """Crea una dirección."""
+
+    return Address(id=uuid4(), postal_code=28001, street="calle mayor 1", city="madrid", province="madrid")
+
+def _get_sector() -> Sector:
+    """Crea un sector."""
+
+    return Sector(id=uuid4(), category="informática", subcategory="desarrollo")
+
+def _get_education() -> Education:
+    """Crea una formación con su nivel."""
+
+    return Education(id=uuid4(), qualification="grado en informática", level=EducationLevel(id=uuid4(), name="grado", value=4), sector=None)
+
+def _get_language_levels(model: type[JobLanguage] | type[CandidateLanguage]) -> list[JobLanguage] | list[CandidateLanguage]:
+    """Crea dos idiomas con su nivel."""
+
+    return [
+        model(language=Language(id=uuid4(), name=name), language_level=LanguageLevel(id=uuid4(), name="b2", value=4))
+        for name in ("inglés", "francés")
+    ]
+
+def _get_jobs(count: int) -> list[Job]:
+    """Crea ofertas completas con sus relaciones."""
+
+    return [
+        Job(
+            id=uuid4(), title=f"oferta {i}", description="desarrollo de aplicaciones web con python", required_experience=12,
+            work_schedule=WorkSchedule.FULL_TIME, skills=["python", "sql", "docker"], publication_date=date(2024, 1, 1), active=True,
+            address=_get_address(), sector=_get_sector(), required_education=JobEducation(education=_get_education()),
+            language_list=_get_language_levels(JobLanguage),
+        )
+        for i in range(count)
+    ]
+
+def _get_candidates(count: int) -> list[Candidate]:
+    """Crea candidatos completos con sus relaciones."""
+
+    candidates = []
+
+    for i in range(count):
+        user = User(
+            id=uuid4(), user_type=UserType.CANDIDATE, username=f"candidato{i}", email=f"candidato{i}@fastjob.com",
+            name="nombre", surname="apellido", phone_numbers=[600000000], address=_get_address(),
+        )
+        experience = Experience(
+            id=uuid4(), company_name="empresa", job_position="programador", job_position_description="desarrollo de apis",
+            start_date=date(2020, 1, 1), end_date=date(2022, 1, 1), sector=_get_sector(),
+        )
+        candidates.append(Candidate(
+            user_id=user.id, user=user, skills=["python", "sql"], availability=[WorkSchedule.FULL_TIME],
+            experience_list=[experience], education_list=[CandidateEducation(education=_get_education(), completion_date=date(2019, 6, 1))],
+            language_list=_get_language_levels(CandidateLanguage),
+        ))
+
+    return candidates
+
+async def _render_response_model(records: list[Any], field: ModelField, **exclude: bool) -> bytes:
+    """Genera la respuesta como FastAPI con el campo del response_model de la ruta."""
+
+    content = await serialize_response(field=field, response_content=records, is_coroutine=True, **exclude)
+
+    return JSONResponse(content).body
+
+async def _measure(name: str, records: list[Any], response_model: Any, render: Callable[[], bytes], number: int, **exclude: bool) -> None:
+    """Comprueba que las dos formas generan el mismo JSON y muestra el mejor tiempo de cada una."""
+
+    # FastAPI crea el campo una vez al registrar la ruta
+    field = create_response_field(name="benchmark", type_=response_model, mode="serialization")
+    assert await _render_response_model(records, field, **exclude) == render(), name
+
+    baseline = fast = float("inf")
+
+    # como timeit, se desactiva el recolector de basura para que no altere las medidas
+    gc.collect()
+    gc.disable()
+
+    for _ in range(5):
+        start = perf_counter()
+        for _ in range(number):
+            await _render_response_model(records, field, **exclude)
+        baseline = min(baseline, (perf_counter() - start) / number)
+
+        start = perf_counter()
+        for _ in range(number):
+            render()
+        fast = min(fast, (perf_counter() - start) / number)
+
+    gc.enable()
+
+    print(f"{name:<40} response_model {baseline * 1000:8.2f} ms   render_records {fast * 1000:8.2f} ms   x{baseline / fast:.1f}")
+
+async def main(count: int = 100, number: int = 20) -> None:
+    """
+    Ejecuta las comparaciones.
+
+    Args:
+    - count (int): Número de registros de cada respuesta.
+    - number (int): Número de repeticiones de cada medida.
+    """
+
+    jobs = _get_jobs(count)
+    job_rows = [JobRow(job.id, job.title, job.description, job.address.province) for job in jobs]
+    candidates = _get_candidates(count)
+    candidate_rows = [CandidateRow(c.user.id, c.user.name, c.user.surname, c.user.address.province, c.skills, ["full_time"]) for c in candidates]
+
+    job_model = list[ReadJobComplete|ReadJobMinimal]
+    candidate_model = list[ReadCandidateMinimal|ReadCandidateComplete]
+
+    print(f"{count} registros por respuesta, {number} repeticiones")
+
+    await _measure("GET /jobs/", jobs, job_model, lambda: render_records(jobs, ReadJobComplete, exclude_none=True), number, exclude_none=True)
+    await _measure("GET /jobs/?minimal_fields=true", job_rows, job_model, lambda: render_records(job_rows, ReadJobMinimal, exclude_none=True), number, exclude_none=True)
+    await _measure("GET /jobs/candidates/{job_id}/", candidates, candidate_model, lambda: render_records(candidates, ReadCandidateComplete, exclude_defaults=True), number, exclude_defaults=True)
+    await _measure("GET /jobs/candidates/{job_id}/?minimal", candidate_rows, candidate_model, lambda: render_records(candidate_rows, ReadCandidateMinimal, exclude_defaults=True), number, exclude_defaults=True)
+
+
+if __name__ == "__main__":
+    anyio.run(main, *(int(arg) for arg in sys.argv[1:3]))
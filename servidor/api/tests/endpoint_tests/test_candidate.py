@@ -1,13 +1,18 @@
-import pytest, random
+import pytest, random, os, time
 from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.orm import contains_eager
 from api.tests.test_utils.db_manage_test import get_database_record
 from api.models.enums.models import UserType
-from api.database.database_models.models import User, Address, Candidate
+from api.database.database_models.models import User, Address, Candidate, CandidateSearchProfile
 from api.tests.test_utils.result_tests import check_request_data_saved, check_request_with_response
 from api.security.security import generate_token
 from api.tests.test_utils.db_manage_test import DATA
+from api.storage.blob_storage import LocalBlobStorage, get_blob_storage
+from api.utils.functions.env_config import CONFIG
+from api.utils.constants.http_exceptions import FILE_TOO_LARGE_EXCEPTION
+from api.tests.test_utils.accel_redirect import resolve_accel_redirect
+from api.tests.test_utils.query_budget import assert_query_budget
 
 
 @pytest.fixture(scope="module")
@@ -84,6 +89,73 @@ async def test_get_candidates(client: AsyncClient, test_consts: dict) -> None:
         candidate_from_response = next(filter(lambda u: u["user"]["id"] == candidate["user_id"], response_json))
         check_request_with_response(candidate, candidate_from_response)
 
+@pytest.mark.anyio
+async def test_get_candidates_page_size(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que una página de candidatos con sus listas tiene tantos candidatos como el límite aunque sus listas tengan varios elementos.
+    Los filtros no repiten candidatos, por lo que el límite se aplica a los candidatos y cada lista se carga con una sola sentencia para toda la página.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    limit = 2
+
+    # se realiza la petición HTTP comprobando el número de sentencias: usuario autenticado, candidatos y una por lista
+    with assert_query_budget(4):
+        response = await client.get(ENDPOINT, headers=headers, params={"extra_fields": ["language", "experiences"], "limit": limit})
+
+    # se comprueba que la respuesta es correcta
+    assert response.status_code == 200
+
+    # se comprueba que la página tiene el número de candidatos del límite sin repetir ninguno
+    ids = [candidate["user"]["id"] for candidate in response.json()]
+    assert len(ids) == len(set(ids)) == min(limit, len(test_consts["all_candidates"]))
+
+@pytest.mark.anyio
+async def test_get_candidates_filter_languages(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que el filtro de varios idiomas con su nivel mínimo devuelve los candidatos que tienen todos los idiomas sin repetirlos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    limit = len(test_consts["all_candidates"])
+
+    # se obtienen los candidatos con sus idiomas y se elige el que más idiomas tiene
+    response = await client.get(ENDPOINT, headers=headers, params={"extra_fields": ["language"], "limit": limit})
+    assert response.status_code == 200
+    candidate = max(response.json(), key=lambda candidate: len(candidate["language_list"]))
+
+    # se filtra por todos los idiomas del candidato, cada uno con su nivel como mínimo
+    params = {
+        "language": [language["language"]["name"] for language in candidate["language_list"]],
+        "language_level": [language["language_level"]["value"] for language in candidate["language_list"]],
+        "limit": limit
+    }
+    response = await client.get(ENDPOINT, headers=headers, params=params)
+
+    # se comprueba que la respuesta es correcta y que el candidato aparece una sola vez
+    assert response.status_code == 200
+    ids = [record["user"]["id"] for record in response.json()]
+    assert len(ids) == len(set(ids))
+    assert candidate["user"]["id"] in ids
+
 @pytest.mark.anyio
 async def test_get_candidate(client: AsyncClient, test_consts: dict) -> None:
     """
@@ -312,6 +384,203 @@ async def test_partial_update_candidate(client: AsyncClient, test_consts: dict)
                                              .options(contains_eager(Candidate.user).contains_eager(User.address)), only_one=True)
     check_request_data_saved(candidate, record=candidate_db, user_type=UserType.CANDIDATE)
 
+@pytest.mark.anyio
+async def test_candidate_search_profile_updated(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que los triggers actualizan el perfil de búsqueda de un candidato al modificarlo
+    y que el filtro de candidatos encuentra el candidato con sus nuevos datos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # se obtiene el candidato actualizado en las pruebas anteriores y su id
+    candidate: dict = test_consts["candidate"]
+    candidate_id = candidate["user_id"]
+
+    # se obtiene el perfil de búsqueda del candidato y se comprueba que tiene los datos actualizados
+    profile = await get_database_record(select(CandidateSearchProfile).where(CandidateSearchProfile.candidate_id == candidate_id), only_one=True)
+    assert profile.skills == candidate["skills"]
+
+    # se filtran los candidatos por las habilidades actualizadas y se comprueba que el candidato está en el resultado
+    response = await client.get(ENDPOINT, headers=headers, params={"skills": candidate["skills"], "limit": len(test_consts["all_candidates"])})
+    assert response.status_code == 200
+    assert candidate_id in [record["user"]["id"] for record in response.json()]
+
+@pytest.mark.anyio
+async def test_upload_candidate_curriculum(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba la subida y descarga del currículum de un candidato. El currículum se guarda en el almacén de archivos
+    y en la base de datos solo se guarda su clave.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # se obtiene el candidato de las constantes de prueba y su id
+    candidate_id = test_consts["candidate"]["user_id"]
+
+    # se crea un currículum de prueba
+    curriculum = b"%PDF-1.4\n% curriculum de prueba\n%%EOF"
+
+    # se realiza la petición HTTP para subir el currículum
+    response = await client.post(f"{ENDPOINT}{candidate_id}/curriculum/", headers=headers, files={"curriculum": ("cv.pdf", curriculum, "application/pdf")})
+
+    # se comprueba que la respuesta es correcta
+    assert response.status_code == 204
+
+    # se comprueba que en la base de datos solo se guarda la clave y que el archivo está en el almacén
+    candidate: Candidate = await get_database_record(select(Candidate).where(Candidate.user_id == candidate_id), only_one=True)
+    assert candidate.curriculum_key == get_blob_storage().get_key(curriculum)
+    assert await get_blob_storage().read(candidate.curriculum_key) == curriculum
+
+    # se realiza la petición HTTP para descargar el currículum
+    response = await client.get(f"{ENDPOINT}{candidate_id}/curriculum/", headers=headers)
+
+    # se comprueba que la respuesta es correcta y que el ETag es la clave del currículum
+    assert response.status_code == 200
+    assert response.content == curriculum
+    assert response.headers["etag"] == f'"{candidate.curriculum_key}"'
+    assert response.headers["content-length"] == str(len(curriculum))
+
+    # se comprueba que si el cliente ya tiene el currículum no se vuelve a enviar
+    response = await client.get(f"{ENDPOINT}{candidate_id}/curriculum/", headers={**headers, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+    assert not response.content
+
+    # se comprueba que se puede descargar una parte del currículum
+    response = await client.get(f"{ENDPOINT}{candidate_id}/curriculum/", headers={**headers, "Range": "bytes=5-9"})
+    assert response.status_code == 206
+    assert response.content == curriculum[5:10]
+    assert response.headers["content-range"] == f"bytes 5-9/{len(curriculum)}"
+
+    # se comprueba que un rango fuera del archivo no es válido
+    response = await client.get(f"{ENDPOINT}{candidate_id}/curriculum/", headers={**headers, "Range": f"bytes={len(curriculum)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(curriculum)}"
+
+@pytest.mark.anyio
+async def test_get_candidate_curriculum_accel_redirect(client: AsyncClient, test_consts: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que con CV_ACCEL_REDIRECT activo la API no envía el currículum y responde con la redirección interna de nginx.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    - monkeypatch (pytest.MonkeyPatch): Permite activar la redirección durante la prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # se obtiene el candidato de las constantes de prueba y su id
+    candidate_id = test_consts["candidate"]["user_id"]
+
+    # se sube un currículum de prueba
+    curriculum = b"%PDF-1.4\n% curriculum enviado por nginx\n%%EOF"
+    response = await client.post(f"{ENDPOINT}{candidate_id}/curriculum/", headers=headers, files={"curriculum": ("cv.pdf", curriculum, "application/pdf")})
+    assert response.status_code == 204
+
+    # se activa la redirección interna
+    monkeypatch.setattr(CONFIG, "CV_ACCEL_REDIRECT", True)
+
+    # se realiza la petición HTTP para descargar el currículum
+    response = await client.get(f"{ENDPOINT}{candidate_id}/curriculum/", headers=headers)
+
+    # se comprueba que la respuesta es correcta y que nginx enviaría el currículum subido
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+
+    with open(resolve_accel_redirect(response), "rb") as file:
+        assert file.read() == curriculum
+
+    # se comprueba que sin permisos no se redirige al archivo
+    response = await client.get(f"{ENDPOINT}{candidate_id}/curriculum/")
+    assert response.status_code == 401
+    assert "x-accel-redirect" not in response.headers
+
+@pytest.mark.anyio
+async def test_upload_candidate_curriculum_too_large(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que no se puede subir un currículum mayor que CV_MAX_SIZE y que no se modifica el currículum del candidato.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # se obtiene el candidato de las constantes de prueba y su id
+    candidate_id = test_consts["candidate"]["user_id"]
+    candidate: Candidate = await get_database_record(select(Candidate).where(Candidate.user_id == candidate_id), only_one=True)
+
+    # se crea un currículum de prueba que supera el tamaño máximo
+    curriculum = b"%PDF-1.4\n" + b"0" * CONFIG.CV_MAX_SIZE
+
+    # se realiza la petición HTTP para subir el currículum
+    response = await client.post(f"{ENDPOINT}{candidate_id}/curriculum/", headers=headers, files={"curriculum": ("cv.pdf", curriculum, "application/pdf")})
+
+    # se comprueba que la respuesta es correcta
+    assert response.status_code == FILE_TOO_LARGE_EXCEPTION["status_code"]
+    assert response.json()["detail"] == FILE_TOO_LARGE_EXCEPTION["detail"]
+
+    # se comprueba que el currículum del candidato no ha cambiado
+    candidate_db: Candidate = await get_database_record(select(Candidate).where(Candidate.user_id == candidate_id), only_one=True)
+    assert candidate_db.curriculum_key == candidate.curriculum_key
+
+@pytest.mark.anyio
+async def test_delete_orphan_curriculum_uploaded_again(tmp_path) -> None:
+    """
+    Prueba que un currículum huérfano que se vuelve a subir después de listarlo no se elimina,
+    ya que su fecha se vuelve a comprobar al eliminarlo.
+
+    Args:
+    - tmp_path (Path): Directorio temporal para el almacén.
+    """
+
+    # se crea un almacén de prueba
+    storage = LocalBlobStorage(str(tmp_path))
+    grace_seconds = 3600
+
+    # se guarda un currículum y se envejece su fecha para que se liste como huérfano
+    curriculum = b"%PDF-1.4\n% curriculum huerfano\n%%EOF"
+    key = await storage.save(curriculum)
+    old_time = time.time() - 2 * grace_seconds
+    os.utime(storage.get_path(key), (old_time, old_time))
+    assert key in await storage.get_keys(older_than=grace_seconds)
+
+    # se vuelve a subir el mismo currículum después de listarlo y se comprueba que no se elimina
+    assert await storage.save(curriculum) == key
+    assert not await storage.delete(key, older_than=grace_seconds)
+    assert await storage.read(key) == curriculum
+
+    # se comprueba que si no se vuelve a subir se elimina
+    os.utime(storage.get_path(key), (old_time, old_time))
+    assert await storage.delete(key, older_than=grace_seconds)
+    assert key not in await storage.get_keys(older_than=0)
+
 @pytest.mark.anyio
 async def test_delete_candidate(client: AsyncClient, test_consts: dict):
     """
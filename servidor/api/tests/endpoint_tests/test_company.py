@@ -8,6 +8,7 @@ from api.database.database_models.models import User, Address, Company
 from api.tests.test_utils.result_tests import check_request_data_saved, check_request_with_response
 from api.security.security import generate_token
 from api.tests.test_utils.db_manage_test import DATA
+from api.utils.functions.job_search_cache import JobSearchCache
 
 
 @pytest.fixture(scope="module")
@@ -316,12 +317,18 @@ async def test_delete_company(client: AsyncClient, test_consts: dict):
     company: dict = test_consts["delete_company"]
     company_id = company["user_id"]
 
+    # se obtiene la versión de la caché de búsqueda de ofertas
+    cache_version = JobSearchCache.get_version()
+
     # se realiza la petición HTTP
     response = await client.delete(f"{ENDPOINT}{company_id}/", headers=headers)
 
     # se comprueba que la respuesta es correcta
     assert response.status_code == 204
 
+    # se comprueba que se descartan las búsquedas guardadas, ya que las ofertas de la empresa se eliminan en cascada
+    assert JobSearchCache.get_version() > cache_version
+
     # se obtiene la empresa de la base de datos y se comprueba que no existe
     user = await get_database_record(select(Company).where(Company.user_id == company_id), only_one=True)
     assert user is None
@@ -0,0 +1,90 @@
+import pytest
+from asyncio import gather
+from httpx import AsyncClient
+from api.security.hash_crypt import HashPool, HashedString, encrypt_string, encrypt_string_async, verify_string_hash, verify_string_hash_async
+from api.utils.constants.error_strings import HASH_POOL_NOT_STARTED
+from api.utils.functions.env_config import CONFIG
+
+
+@pytest.mark.anyio
+async def test_hash_pool_hashes(client: AsyncClient) -> None:
+    """
+    Prueba que el pool de procesos encripta y verifica las contraseñas igual que las funciones síncronas.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP, inicia el servidor y con él el pool de procesos.
+    """
+
+    # se encripta una contraseña en el pool
+    hashed_string = await encrypt_string_async("contraseña de prueba")
+
+    # se comprueba que el hash no se vuelve a encriptar al guardarlo y que es válido
+    assert isinstance(hashed_string, HashedString)
+    assert verify_string_hash("contraseña de prueba", hashed_string)
+
+    # se comprueba que el pool verifica los hashes de las funciones síncronas
+    hashed_string = encrypt_string("contraseña de prueba")
+    assert await verify_string_hash_async("contraseña de prueba", hashed_string)
+    assert not await verify_string_hash_async("otra contraseña", hashed_string)
+
+
+@pytest.mark.anyio
+async def test_hash_pool_queue(client: AsyncClient) -> None:
+    """
+    Prueba que el pool no ejecuta más de HASH_MAX_CONCURRENCY hashes a la vez y que el resto esperan en la cola.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP, inicia el servidor y con él el pool de procesos.
+    """
+
+    hashed_string = encrypt_string("contraseña de prueba")
+    completed = HashPool.get_metrics()["completed"]
+
+    # se verifican a la vez más contraseñas de las que admite el pool
+    total = CONFIG.HASH_MAX_CONCURRENCY * 2
+    results = await gather(*(verify_string_hash_async("contraseña de prueba", hashed_string) for _ in range(total)))
+
+    # se comprueba que se han verificado todas y que las que superan el máximo han esperado
+    metrics = HashPool.get_metrics()
+    assert all(results)
+    assert metrics["completed"] - completed == total
+    assert metrics["max_waiting"] >= total - CONFIG.HASH_MAX_CONCURRENCY
+    assert metrics["waiting"] == 0 and metrics["running"] == 0
+
+
+@pytest.mark.anyio
+async def test_hash_pool_not_started(client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que sin el pool iniciado no se calcula el hash en el bucle de eventos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP, inicia el servidor y con él el pool de procesos.
+    - monkeypatch (pytest.MonkeyPatch): Permite quitar el pool durante la prueba.
+    """
+
+    monkeypatch.setattr(HashPool, "_pool", None)
+
+    with pytest.raises(RuntimeError, match=HASH_POOL_NOT_STARTED):
+        await encrypt_string_async("contraseña de prueba")
+
+
+@pytest.mark.anyio
+async def test_get_metrics_hash_pool(client: AsyncClient) -> None:
+    """
+    Prueba que el endpoint de métricas incluye las métricas del pool de procesos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    """
+
+    # se calcula un hash en el pool
+    await encrypt_string_async("contraseña de prueba")
+
+    # se obtienen las métricas
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+
+    # se comprueba que se incluyen los hashes calculados y la cola del pool
+    completed = next(line for line in response.text.splitlines() if line.startswith("fastjob_hash_pool_completed_total "))
+    assert float(completed.split()[-1]) > 0
+    assert any(line.startswith("fastjob_hash_pool_max_waiting ") for line in response.text.splitlines())
@@ -1,12 +1,21 @@
-import pytest, random
+import pytest, random, asyncio
+from json import loads
+from base64 import urlsafe_b64decode
+from datetime import date, timedelta
+from uuid import uuid4
 from httpx import AsyncClient
 from sqlalchemy import select
 from api.tests.test_utils.db_manage_test import get_database_record
 from api.models.enums.models import UserType
-from api.database.database_models.models import User, Job
+from api.database.database_models.models import User, Job, JobSearchDoc
 from api.tests.test_utils.result_tests import check_request_data_saved, check_request_with_response
 from api.security.security import generate_token
 from api.tests.test_utils.db_manage_test import DATA
+from api.tests.test_utils.query_budget import assert_query_budget
+from api.utils.constants.endpoints_params import NEXT_CURSOR_HEADER
+from api.utils.functions.entity_cache import EntityCache
+from api.utils.functions.database_utils import encode_cursor
+from api.loggs.loggers import INFO_LOGGER
 
 
 @pytest.fixture(scope="module")
@@ -88,6 +97,169 @@ async def test_get_jobs(client: AsyncClient, test_consts: dict) -> None:
         job_response = next(filter(lambda u: u["id"] == job["id"], response_json))
         check_request_with_response(job, job_response)
 
+@pytest.mark.anyio
+async def test_get_jobs_query_budget(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que obtener las ofertas de trabajo no supera el presupuesto de sentencias SQL.
+    Se obtiene el usuario autenticado, las ofertas con sus relaciones a uno en una sola sentencia y los idiomas de toda la página en otra.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # se realiza la petición HTTP comprobando el número de sentencias
+    with assert_query_budget(3):
+        response = await client.get(ENDPOINT, headers=headers)
+
+    # se comprueba que la respuesta es correcta
+    assert response.status_code == 200
+
+@pytest.mark.anyio
+async def test_get_jobs_filter_languages(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba el filtro de ofertas de trabajo por varios idiomas.
+    Con all se obtienen las ofertas que requieren todos los idiomas y con any las que requieren alguno de ellos, sin repetirlas.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    limit = len(test_consts["all_jobs"])
+
+    # se obtienen las ofertas con sus idiomas y se elige la que más idiomas requiere
+    response = await client.get(ENDPOINT, headers=headers, params={"limit": limit})
+    assert response.status_code == 200
+    job = max(response.json(), key=lambda job: len(job.get("language_list", [])))
+    languages = [language["language"]["id"] for language in job.get("language_list", [])]
+    assert languages
+
+    # se filtra por todos los idiomas de la oferta y por un idioma que no existe, que ninguna oferta requiere
+    for language_match, extra_language, expected in (("all", [], True), ("all", [str(uuid4())], False), ("any", [str(uuid4())], True)):
+        params = {"languages": languages + extra_language, "language_match": language_match, "limit": limit}
+        response = await client.get(ENDPOINT, headers=headers, params=params)
+
+        # se comprueba que la respuesta es correcta, que no se repiten ofertas y si la oferta está en el resultado
+        assert response.status_code == 200
+        ids = [record["id"] for record in response.json()]
+        assert len(ids) == len(set(ids))
+        assert (job["id"] in ids) == expected
+
+@pytest.mark.anyio
+async def test_get_job_languages_response_columns(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que obtener los idiomas de una oferta solo consulta las columnas y relaciones del modelo de la respuesta.
+    La oferta de cada idioma se carga por defecto, pero la respuesta no la incluye.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se obtiene una oferta con idiomas de la información de prueba
+    job_id = random.choice(DATA["JobLanguage"])["job_id"]
+
+    # se realiza la petición HTTP grabando las sentencias
+    with assert_query_budget(1) as recorder:
+        response = await client.get(f"{ENDPOINT}{job_id}/languages/")
+
+    # se comprueba que la respuesta es correcta
+    assert response.status_code == 200
+    assert all(set(language) == {"language", "language_level"} for language in response.json())
+
+    # se comprueba que no se consulta la oferta de los idiomas
+    assert not any(".title" in shape for shape in recorder.shapes), recorder.shapes
+
+@pytest.mark.anyio
+async def test_get_jobs_anonymous_cached(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que una búsqueda anónima repetida se obtiene de la caché de resultados sin consultar la base de datos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se realiza la búsqueda sin autenticación, con la provincia en mayúsculas para comprobar que se normaliza
+    province = test_consts["address"]["province"]
+    response = await client.get(ENDPOINT, params={"province": province.upper()})
+    assert response.status_code == 200
+
+    # se repite la búsqueda comprobando que no se ejecuta ninguna sentencia
+    with assert_query_budget(0):
+        cached_response = await client.get(ENDPOINT, params={"province": province.lower()})
+
+    # se comprueba que la respuesta es la misma
+    assert cached_response.status_code == 200
+    assert cached_response.json() == response.json()
+
+@pytest.mark.anyio
+async def test_get_jobs_next_cursor(client: AsyncClient) -> None:
+    """
+    Prueba que la cabecera con el cursor de la siguiente página se devuelve al obtener las ofertas de la base de datos y de la caché,
+    y que la siguiente página tiene otras ofertas.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = "/jobs/"
+
+    # se obtiene la primera página con una oferta, la segunda petición se obtiene de la caché
+    response = await client.get(ENDPOINT, params={"limit": 1, "minimal_fields": True})
+    cached_response = await client.get(ENDPOINT, params={"limit": 1, "minimal_fields": True})
+
+    # se comprueba que las dos respuestas tienen el cursor de la siguiente página
+    assert response.status_code == 200
+    assert response.headers[NEXT_CURSOR_HEADER]
+    assert cached_response.headers[NEXT_CURSOR_HEADER] == response.headers[NEXT_CURSOR_HEADER]
+
+    # se obtiene la siguiente página con el cursor
+    next_response = await client.get(ENDPOINT, params={"limit": 1, "minimal_fields": True, "cursor": response.headers[NEXT_CURSOR_HEADER]})
+
+    # se comprueba que la siguiente página tiene otra oferta
+    assert next_response.status_code == 200
+    assert next_response.json()[0]["id"] != response.json()[0]["id"]
+
+@pytest.mark.anyio
+async def test_get_jobs_invalid_cursor(client: AsyncClient) -> None:
+    """
+    Prueba que un cursor no válido devuelve un error de validación de los parámetros y no un error de la base de datos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = "/jobs/"
+
+    # se obtiene una página con un cursor que no es base64 y otra con un cursor con un número de valores distinto al de los campos de paginación
+    for cursor in ("no-es-un-cursor", "WzFd"):
+        response = await client.get(ENDPOINT, params={"limit": 1, "cursor": cursor})
+
+        # se comprueba que la respuesta es un error de validación
+        assert response.status_code == 422
+
 @pytest.mark.anyio
 async def test_get_job(client: AsyncClient, test_consts: dict) -> None:
     """
@@ -118,6 +290,150 @@ async def test_get_job(client: AsyncClient, test_consts: dict) -> None:
     assert response.status_code == 200
     check_request_with_response(job, response_json)
 
+@pytest.mark.anyio
+async def test_get_job_entity_cache(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que una oferta ya obtenida se devuelve desde la caché de entidades y solo se consulta su versión para el ETag.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se obtiene la oferta de trabajo de las constantes de prueba y su id
+    job = test_consts["job"]
+    job_id = job["id"]
+
+    # se realiza la petición HTTP para guardar la oferta en la caché
+    response = await client.get(f"{ENDPOINT}{job_id}/")
+    assert response.status_code == 200
+
+    # se repite la petición comprobando que solo se consulta la versión de la oferta
+    with assert_query_budget(1):
+        cached_response = await client.get(f"{ENDPOINT}{job_id}/")
+
+    # se comprueba que la respuesta es la misma
+    assert cached_response.status_code == 200
+    assert cached_response.json() == response.json()
+    check_request_with_response(job, cached_response.json())
+
+@pytest.mark.anyio
+async def test_get_job_not_modified(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que una petición repetida de una oferta de trabajo con su ETag responde 304 sin obtener la oferta,
+    solo con la sentencia que obtiene la versión de sus filas.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se obtiene la oferta de trabajo de las constantes de prueba y su id
+    job_id = test_consts["job"]["id"]
+
+    # se realiza la petición HTTP sin autenticación
+    response = await client.get(f"{ENDPOINT}{job_id}/")
+
+    # se comprueba que la respuesta tiene las cabeceras de caché
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == "public, no-cache"
+
+    # se repite la petición con el ETag comprobando el número de sentencias
+    with assert_query_budget(1):
+        not_modified = await client.get(f"{ENDPOINT}{job_id}/", headers={"If-None-Match": response.headers["etag"]})
+
+    # se comprueba que la respuesta no tiene cuerpo
+    assert not_modified.status_code == 304
+    assert not not_modified.content
+    assert not_modified.headers["etag"] == response.headers["etag"]
+
+@pytest.mark.anyio
+async def test_get_job_concurrent_requests_coalesced(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que las peticiones idénticas simultáneas de una oferta se atienden con una sola consulta y reciben la misma respuesta.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se obtiene la oferta de trabajo de las constantes de prueba y su id
+    job_id = test_consts["job"]["id"]
+
+    # se realizan las peticiones a la vez con el presupuesto de sentencias de una sola petición
+    with assert_query_budget(2):
+        responses = await asyncio.gather(*(client.get(f"{ENDPOINT}{job_id}/") for _ in range(10)))
+
+    # se comprueba que todas las respuestas son correctas e iguales
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.content for response in responses}) == 1
+
+@pytest.mark.anyio
+async def test_get_job_concurrent_requests_logged(client: AsyncClient, test_consts: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Prueba que las peticiones idénticas simultáneas de una oferta se registran todas en el log aunque se agrupen.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    - monkeypatch (pytest.MonkeyPatch): Permite capturar los logs durante la prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se obtiene la oferta de trabajo de las constantes de prueba y su id
+    job_id = test_consts["job"]["id"]
+
+    # se capturan los logs de información
+    messages = []
+    monkeypatch.setattr(INFO_LOGGER, "log", lambda level, message, *args, **kwargs: messages.append(message))
+
+    # se realizan las peticiones a la vez
+    responses = await asyncio.gather(*(client.get(f"{ENDPOINT}{job_id}/") for _ in range(10)))
+    assert all(response.status_code == 200 for response in responses)
+
+    # se comprueba que hay un log por cada petición
+    assert len([message for message in messages if f"GET EN {ENDPOINT}{job_id}/ " in message]) == 10
+
+@pytest.mark.anyio
+async def test_get_jobs_keywords_not_modified(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que una petición repetida de las palabras clave con el ETag de su contenido responde 304 sin cuerpo.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se obtiene la primera letra del título de la oferta de las constantes de prueba
+    keyword = test_consts["job"]["title"][0].lower()
+
+    # se realiza la petición HTTP
+    response = await client.get(f"{ENDPOINT}keywords/{keyword}/")
+    assert response.status_code == 200
+
+    # se repite la petición con el ETag
+    not_modified = await client.get(f"{ENDPOINT}keywords/{keyword}/", headers={"If-None-Match": response.headers["etag"]})
+
+    # se comprueba que la respuesta no tiene cuerpo
+    assert not_modified.status_code == 304
+    assert not not_modified.content
+    assert not_modified.headers["cache-control"] == response.headers["cache-control"]
+
 @pytest.mark.anyio
 async def test_create_job(client: AsyncClient, test_consts: dict) -> None:
     """
@@ -286,6 +602,104 @@ async def test_partial_update_job(client: AsyncClient, test_consts: dict) -> Non
     job_db = await get_database_record(select(Job).where(Job.id == job_id), only_one=True)
     check_request_data_saved(job, record=job_db)
 
+@pytest.mark.anyio
+async def test_update_job_invalidates_entity_cache(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que actualizar una oferta descarta su forma guardada en la caché de entidades
+    y que la siguiente petición de la oferta devuelve los datos actualizados.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # obtenemos los datos de la oferta de trabajo a actualizar y su id
+    job: dict = test_consts["job"]
+    job_id = job["id"]
+
+    # se realiza la petición HTTP para guardar la oferta en la caché
+    response = await client.get(f"{ENDPOINT}{job_id}/")
+    assert response.status_code == 200
+
+    # se actualiza la oferta
+    update_job = {"title": "cache actualizada"}
+    response = await client.patch(f"{ENDPOINT}{job_id}/", headers=headers, json=update_job)
+    assert response.status_code == 200
+    job.update(update_job)
+
+    # se comprueba que la oferta ya no está en la caché y que se obtiene de la base de datos con los datos actualizados
+    assert await EntityCache.get(Job, job_id) is None
+    updated_response = await client.get(f"{ENDPOINT}{job_id}/")
+    assert updated_response.status_code == 200
+    assert updated_response.json()["title"] == update_job["title"]
+
+@pytest.mark.anyio
+async def test_job_search_doc_updated(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que los triggers actualizan el documento de búsqueda de una oferta de trabajo al modificarla
+    y que el filtro de ofertas encuentra la oferta con sus nuevos datos.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['admin_token']}"}
+
+    # se obtiene la oferta de trabajo actualizada en las pruebas anteriores y su id
+    job: dict = test_consts["job"]
+    job_id = job["id"]
+
+    # se obtiene el documento de búsqueda de la oferta y se comprueba que tiene los datos actualizados
+    job_search_doc = await get_database_record(select(JobSearchDoc).where(JobSearchDoc.job_id == job_id), only_one=True)
+    assert job_search_doc.skills == job["skills"]
+
+    # se busca la oferta por el título actualizado y se comprueba que está en el resultado
+    response = await client.get(ENDPOINT, headers=headers, params={"keyword": job["title"], "active": False})
+    assert response.status_code == 200
+    assert job_id in [record["id"] for record in response.json()]
+
+@pytest.mark.anyio
+async def test_get_jobs_relevance_cursor_reference_date(client: AsyncClient, test_consts: dict) -> None:
+    """
+    Prueba que el orden por relevancia guarda en el cursor la fecha de la primera página y que las páginas siguientes
+    calculan la relevancia con esa fecha aunque haya cambiado el día.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    - test_consts (dict): Constantes de prueba.
+    """
+
+    # se obtiene la URL del endpoint
+    ENDPOINT = test_consts["endpoint"]
+
+    # se buscan las ofertas por el título de la oferta de las constantes de prueba ordenadas por relevancia
+    params = {"keyword": test_consts["job"]["title"], "sort": "relevance", "active": False, "limit": 1}
+
+    # se comprueba que el cursor de la primera página tiene la fecha actual
+    response = await client.get(ENDPOINT, params=params)
+    assert response.status_code == 200
+    assert loads(urlsafe_b64decode(response.headers[NEXT_CURSOR_HEADER]))[0] == date.today().isoformat()
+
+    # se crea un cursor de una primera página obtenida el día anterior, anterior a todas las ofertas
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    cursor = encode_cursor([yesterday, float("1e9"), "ffffffff-ffff-ffff-ffff-ffffffffffff"])
+
+    # se comprueba que la siguiente página mantiene la fecha del cursor
+    response = await client.get(ENDPOINT, params={**params, "cursor": cursor})
+    assert response.status_code == 200
+    assert loads(urlsafe_b64decode(response.headers[NEXT_CURSOR_HEADER]))[0] == yesterday
+
 @pytest.mark.anyio
 async def test_delete_job(client: AsyncClient, test_consts: dict):
     """
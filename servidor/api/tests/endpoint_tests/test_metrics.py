@@ -0,0 +1,58 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from api.main import app
+from api.utils.constants.http_exceptions import RESOURCE_NOT_FOUND_EXCEPTION
+
+
+@pytest.mark.anyio
+async def test_get_metrics(client: AsyncClient) -> None:
+    """
+    Prueba que el endpoint de métricas devuelve las métricas de las rutas solicitadas agrupadas por su plantilla.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    """
+
+    # se realiza una petición a un endpoint que consulta la base de datos
+    response = await client.get("/jobs/")
+    assert response.status_code == 200
+
+    # se obtienen las métricas
+    response = await client.get("/metrics")
+
+    # se comprueba que la respuesta es correcta
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    # se obtienen las líneas de la ruta de las ofertas
+    lines = [line for line in response.text.splitlines() if 'method="GET",route="/jobs/"' in line]
+
+    # se comprueba que la ruta tiene el histograma de latencia y los contadores de la base de datos y de la respuesta
+    assert any(line.startswith("fastjob_http_request_duration_seconds_bucket") for line in lines)
+    assert any(line.startswith("fastjob_http_requests_total") and 'status="200"' in line for line in lines)
+
+    statements = next(line for line in lines if line.startswith("fastjob_http_db_statements_total"))
+    response_bytes = next(line for line in lines if line.startswith("fastjob_http_response_bytes_total"))
+
+    assert float(statements.split()[-1]) > 0
+    assert float(response_bytes.split()[-1]) > 0
+
+
+@pytest.mark.anyio
+async def test_get_metrics_not_local(client: AsyncClient) -> None:
+    """
+    Prueba que el endpoint de métricas no responde a las peticiones que no llegan desde una dirección local.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP para realizar las peticiones.
+    """
+
+    # se crea un cliente con una dirección que no es local
+    transport = ASGITransport(app=app, client=("10.0.0.1", 12345))
+
+    async with AsyncClient(transport=transport, base_url="http://localhost:8000") as remote_client:
+        response = await remote_client.get("/metrics")
+
+    # se comprueba que se responde como si el endpoint no existiera
+    assert response.status_code == RESOURCE_NOT_FOUND_EXCEPTION["status_code"]
+    assert response.json()["detail"] == RESOURCE_NOT_FOUND_EXCEPTION["detail"]
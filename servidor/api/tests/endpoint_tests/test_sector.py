@@ -189,6 +189,12 @@ async def test_update_sector(client: AsyncClient, test_consts: dict) -> None:
     sector_db = await get_database_record(select(Sector).where(Sector.id == sector_id), only_one=True)
     check_request_data_saved(sector, record=sector_db)
 
+    # se obtiene el sector desde la caché de catálogos y se comprueba que se ha descartado la versión anterior
+    response = await client.get(f"{ENDPOINT}{sector_id}/", headers=headers)
+
+    assert response.status_code == 200
+    check_request_with_response(sector, response.json())
+
 
 @pytest.mark.anyio
 async def test_partial_update_education(client: AsyncClient, test_consts: dict) -> None:
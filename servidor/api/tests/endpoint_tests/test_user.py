@@ -1,4 +1,5 @@
 import re, pytest, random
+from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import AsyncClient
 from uuid import uuid4
 from sqlalchemy import select
@@ -232,6 +233,43 @@ async def test_renew_token(client: AsyncClient, test_consts: dict):
     assert json["token_type"] == "bearer"
     assert re.match(test_consts["JWT_REGEX"], json["access_token"])
 
+@pytest.mark.anyio
+async def test_user_lookup_once_per_request(client: AsyncClient, test_consts: dict, monkeypatch: pytest.MonkeyPatch):
+    """
+    Prueba que el usuario autenticado se obtiene una sola vez por petición.
+
+    El endpoint "/users/" depende del log de la petición y del permiso de administrador, que necesitan el usuario del token.
+    Se cuenta el número de veces que se obtiene un usuario por su id durante la petición y se espera que sea una.
+
+    Args:
+    - client (AsyncClient): Cliente HTTP asincrónico para realizar las solicitudes.
+    - test_consts (dict): Diccionario con constantes de prueba.
+    - monkeypatch (pytest.MonkeyPatch): Permite sustituir la obtención de registros por id durante la prueba.
+    """
+
+    ENDPOINT = test_consts["ENDPOINT"]
+
+    # se crea un diccionario con los datos de autenticación
+    headers={"Authorization": f"Bearer {test_consts['ADMIN_TOKEN']}"}
+
+    # se envuelve la obtención de registros por id para contar las búsquedas de usuarios
+    user_lookups = []
+    session_get = AsyncSession.get
+
+    async def counted_get(self, entity, *args, **kwargs):
+        if entity is User:
+            user_lookups.append(args[0] if args else None)
+        return await session_get(self, entity, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncSession, "get", counted_get)
+
+    # se realiza la petición HTTP
+    response = await client.get(ENDPOINT, headers=headers)
+
+    # se comprueba que la respuesta es correcta y que el usuario se ha obtenido una sola vez
+    assert response.status_code == 200
+    assert len(user_lookups) == 1
+
 @pytest.mark.anyio
 async def test_update_user(client: AsyncClient, test_consts: dict):
     """
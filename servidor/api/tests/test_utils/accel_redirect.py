@@ -0,0 +1,68 @@
+import os, re
+from urllib.parse import unquote
+from httpx import Response
+from api.utils.functions.env_config import CONFIG
+
+# configuración de nginx que atiende las redirecciones internas de los currículums
+NGINX_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "docker_files", "nginx", "curricula.conf")
+
+_LOCATION_REGEX = re.compile(r"location\s+(\S+)\s*\{(.*?)\}", re.DOTALL)
+_ALIAS_REGEX = re.compile(r"^\s*alias\s+(\S+);", re.MULTILINE)
+_INTERNAL_REGEX = re.compile(r"^\s*internal;", re.MULTILINE)
+
+
+def get_nginx_location() -> tuple[str, str]:
+    """
+    Devuelve la ubicación interna de los currículums y su directorio del archivo de configuración de nginx.
+
+    Returns:
+    - tuple[str, str]: La ubicación y el directorio que se envía en ella.
+    """
+
+    with open(NGINX_CONFIG_PATH, encoding="utf-8") as file:
+        match = _LOCATION_REGEX.search(file.read())
+
+    assert match, f"No hay ninguna ubicación en {NGINX_CONFIG_PATH}"
+
+    location, body = match.groups()
+    alias = _ALIAS_REGEX.search(body)
+
+    # se comprueba que la ubicación solo se puede usar con redirecciones internas
+    assert _INTERNAL_REGEX.search(body), f"La ubicación {location} no es interna"
+    assert alias, f"La ubicación {location} no tiene alias"
+
+    return location, alias.group(1)
+
+def resolve_accel_redirect(response: Response) -> str:
+    """
+    Simula a nginx con una respuesta con X-Accel-Redirect y devuelve la ruta del archivo que enviaría.
+    Comprueba que la redirección apunta a la ubicación interna de la configuración de nginx y que no sale del almacén.
+    El directorio de la ubicación se sustituye por BLOB_STORAGE_PATH, que es donde se monta el almacén en la API.
+
+    Uso:
+        path = resolve_accel_redirect(response)
+        assert open(path, "rb").read() == curriculum
+
+    Args:
+    - response (Response): Respuesta de la API.
+
+    Returns:
+    - str: Ruta del archivo en el almacén.
+    """
+
+    location, _ = get_nginx_location()
+    redirect = response.headers.get("x-accel-redirect")
+
+    # se comprueba que la API no envía el archivo y que la redirección coincide con la configuración de nginx
+    assert redirect, "La respuesta no tiene la cabecera X-Accel-Redirect"
+    assert not response.content, "La respuesta con X-Accel-Redirect no debe tener cuerpo"
+    assert location == CONFIG.CV_ACCEL_REDIRECT_LOCATION, f"La ubicación de nginx {location} no coincide con CV_ACCEL_REDIRECT_LOCATION"
+    assert redirect.startswith(location), f"La redirección {redirect} no está en la ubicación {location}"
+
+    root = os.path.realpath(CONFIG.BLOB_STORAGE_PATH)
+    path = os.path.realpath(os.path.join(root, unquote(redirect[len(location):])))
+
+    # se comprueba que la redirección no sale del almacén
+    assert path.startswith(root + os.sep), f"La redirección {redirect} sale del almacén"
+
+    return path
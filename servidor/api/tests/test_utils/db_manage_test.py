@@ -2,6 +2,7 @@ from api.database.connection import Base, get_session
 from api.database.database_models.models import *
 from api.tests.test_utils.data_json import DATA
 from api.models.enums.models import UserType
+from api.utils.functions.database_utils import notify_cache_changes
 
 async def create_test_data() -> None:
     """
@@ -109,8 +110,14 @@ async def save_database_record(record: Base) -> None:
         session.add(record)
         
         try:
+            # si el registro es de un catálogo, una oferta, una empresa o un candidato, se notifica a los workers para que descarten su caché
+            invalidate_caches = await notify_cache_changes(session)
+
             # se intenta hacer commit del registro
             await session.commit()
+
+            # se descarta la caché del worker actual sin esperar a la notificación
+            invalidate_caches()
             
         except Exception as exc:
             # si ocurre un error, se hace rollback del registro y se imprime un mensaje de error
@@ -0,0 +1,38 @@
+from typing import Iterator
+from contextlib import contextmanager
+from api.database.query_stats import record_queries, QueryRecorder
+from api.utils.functions.env_config import CONFIG
+
+
+@contextmanager
+def assert_query_budget(max_statements: int, max_repeated: int = CONFIG.N_PLUS_ONE_THRESHOLD - 1) -> Iterator[QueryRecorder]:
+    """
+    Comprueba que las peticiones realizadas dentro del bloque no superan un presupuesto de sentencias SQL.
+    También falla si alguna forma de sentencia se repite más de max_repeated veces, lo que suele indicar un problema N+1.
+
+    Uso:
+        with assert_query_budget(2):
+            response = await client.get(ENDPOINT)
+
+    Args:
+    - max_statements (int): Número máximo de sentencias de todas las peticiones del bloque.
+    - max_repeated (int): Número máximo de veces que se puede repetir la misma forma de sentencia.
+
+    Returns:
+    - Iterator[QueryRecorder]: El grabador con las sentencias de las peticiones.
+    """
+
+    with record_queries() as recorder:
+        yield recorder
+
+    # se comprueba que se ha grabado alguna petición para que la prueba no pase sin medir nada
+    assert recorder.requests, "No se ha grabado ninguna petición dentro del bloque"
+
+    shapes = "\n".join(f"{count}x {shape}" for shape, count in recorder.shapes.items())
+
+    # se comprueba que no se supera el presupuesto de sentencias
+    assert recorder.statements <= max_statements, f"{recorder.statements} sentencias > {max_statements} permitidas:\n{shapes}"
+
+    # se comprueba que ninguna sentencia se repite demasiadas veces
+    repeated = {shape: count for shape, count in recorder.shapes.items() if count > max_repeated}
+    assert not repeated, f"Sentencias repetidas más de {max_repeated} veces (N+1):\n{shapes}"
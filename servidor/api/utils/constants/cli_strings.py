@@ -55,6 +55,18 @@ EMPTY_CITY = "La ciudad no puede estar vacía. Vuelve a intentarlo."
 
 EMPTY_PROVINCE = "La provincia no puede estar vacía. Vuelve a intentarlo."
 
+############## MIGRATE CURRICULA ##############
+
+# INFO #
+MIGRATE_CURRICULA_MSG = """
+##### Migración de currículums CLI #####
+Moviendo los currículums de la base de datos al almacén de archivos...
+"""
+
+MIGRATE_CURRICULA_PROGRESS = "Currículums migrados: {count}"
+
+MIGRATE_CURRICULA_DONE = "Migración completada. Se han migrado {count} currículums."
+
 ############## DOCKER BUILD ##############
 
 # INFO #
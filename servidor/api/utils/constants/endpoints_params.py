@@ -8,6 +8,10 @@ OFFSET = Query(description="Permite omitir un número específico de registros e
 
 DEFAULT_OFFSET = 0
 
+CURSOR = Query(description="Cursor de la página a obtener. Se obtiene de la cabecera X-Next-Cursor de la página anterior. Si se indica, se ignora el offset.")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 USER_ID = Path(description="El ID del usuario.")
 
 SECTOR_ID = Path(description="El ID del sector.")
@@ -60,6 +64,8 @@ EDUCATION_EXTRA_FIELD = Query(description="Campos de las relaciones de la tabla
 
 EDUCATION_NAME_PARAM = Query(description="El nombre de la formación.")
 
+EDUCATION_NAMES_PARAM = Query(description="El nombre de la formación que debe tener el candidato. Se puede indicar varias veces y deben cumplirse todos.")
+
 EDUCATION_LEVEL_PARAM = Query(description="El valor del nivel de la formación. Debe ser un número mayor a 0.", gt=0)
 
 LANGUAGE_ID = Path(description="El ID del idioma.")
@@ -80,9 +86,9 @@ LANGUAGE_LEVEL_EXTRA_FIELD = Query(description="Campos de las relaciones de la t
 
 LANGUAGE_EXTRA_FIELD = Query(description="Campos de las relaciones de la tabla language que se quieren obtener. Se pueden especificar varios.")
 
-LANGUAGE_CANDIDATE = Query(description="El ID o el nombre del idioma que debe tener el candidato.")
+LANGUAGE_CANDIDATE = Query(description="El ID o el nombre del idioma que debe tener el candidato. Se puede indicar varias veces y deben cumplirse todos.")
 
-LANGUAGE_LEVEL_VALUE = Query(description="El valor del nivel de idioma. Debe ser un número mayor a 0.", gt=0)
+LANGUAGE_LEVEL_VALUES = Query(description="El valor mínimo del nivel de idioma. Se puede indicar varias veces y cada valor corresponde al idioma en la misma posición. Debe ser un número mayor a 0.")
 
 EXPERIENCE_MONTHS = Query(description="La cantidad de meses requeridos de experiencia del candidato. Debe ser un número mayor a 0.", gt=0)
 
@@ -104,10 +110,16 @@ JOB_ID = Path(description="El ID de la oferta de trabajo.")
 
 JOB_EXTRA_FIELD = Query(description="Campos de las relaciones de la tabla job que se quieren obtener. Se pueden especificar varios.")
 
-KEYWORD = Query(description="La palabra clave para buscar en las ofertas de trabajo.")
+KEYWORD = Query(description="Las palabras clave para buscar en el título y la descripción de las ofertas de trabajo. Admite frases entre comillas, \"or\" y palabras excluidas con \"-\".")
 
 JOB_ACTIVE = Query(description="Si se quiere obtener solo las ofertas de trabajo activas. Por defecto es verdadero.")
 
+LANGUAGE_JOB = Query(description="El ID o el nombre del idioma que requiere la oferta de trabajo. Se puede indicar varias veces.")
+
+LANGUAGE_MATCH = Query(description="Cómo se combinan los idiomas indicados. Por defecto es all (la oferta requiere todos los idiomas). any obtiene las ofertas que requieren alguno de ellos.")
+
+JOB_SORT = Query(description="El orden de las ofertas de trabajo. Por defecto es recent (fecha de publicación). relevance ordena por relevancia respecto a la palabra clave y solo se aplica si se indica keyword.")
+
 JOB_MINIMAL_FIELDS = Query(description="Si se quiere obtener solo los campos mínimos para listar las ofertas de trabajo. Por defecto es falso.")
 
 JOB_KEYWORD = Path(description="Palabras clave para buscar en las ofertas de trabajo.")
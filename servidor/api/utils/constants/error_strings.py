@@ -26,13 +26,15 @@ ERROR_RESPONSE_UNEXPECTED_ERROR = "Error: Algo salió mal. Por favor, inténtelo
 
 SECTOR_GET_PARAMS = "No se pueden usar los parámetros category_name y only_categories al mismo tiempo."
 
+INVALID_CURSOR = "Error: El cursor de paginación no es válido."
+
 INVALID_EXTRA_FIELDS = "Error: Parámetros de campos adicionales no válidos:\n {field}"
 
 INVALID_CANDIDATE_DIR_PARAMS = "Error: No se pueden usar los parámetros postal_code y province al mismo tiempo."
 
 INVALID_CANDIDATE_SECTOR_PARAMS = "Error: No se pueden usar los parámetros sector_category y sector_id al mismo tiempo."
 
-INVALID_CANDIDATE_LANGUAGE_PARAMS = "Error: No se pueden usar el parámetro language_level sin el parámetro language."
+INVALID_CANDIDATE_LANGUAGE_PARAMS = "Error: No se pueden usar más parámetros language_level que parámetros language."
 
 INVALID_EDUCATION_PARAMS = "Error: No se pueden usar los parámetros name con los parámetros level y sector."
 
@@ -43,6 +45,16 @@ INVALID_CONTENT_TYPE = "Error: Tipo de contenido no válido. URL: {url}"
 INVALID_FILE_TYPE = "Error: Tipo de archivo no válido. El archivo debe ser un PDF."
 
 SCHEDULER_ERROR = "Error: Algo salió mal en el planificador de tareas:\n {exc}"
+REFERENCE_CACHE_ERROR = "Error: No se pudo escuchar las notificaciones de la caché de catálogos, se consultará la base de datos:\n {exc}"
+JOB_SEARCH_CACHE_ERROR = "Error: No se pudo escuchar las notificaciones de la caché de búsqueda de ofertas, no se guardarán resultados:\n {exc}"
+ENTITY_CACHE_ERROR = "Error: No se pudo escuchar las notificaciones de la caché de entidades, se consultará la base de datos:\n {exc}"
+SLOW_QUERY = "Aviso: Sentencia lenta en {route} ({duration:.3f} segundos):\n {statement}"
+N_PLUS_ONE_QUERY = "Aviso: Posible problema N+1 en {route}, la misma sentencia se ha ejecutado {count} veces:\n {statement}"
+INVALID_BLOB_KEY = "Error: La clave de archivo {key} no es válida."
+INVALID_BLOB_BACKEND = "Error: El almacén de archivos {backend} no existe. Almacenes disponibles: {available}."
+ROW_PLAN_UNSUPPORTED_FIELD = "Error: El campo {field} del modelo de lectura {read_model} no es una columna ni una relación del modelo {model}."
+METRICS_WRITE_ERROR = "Error: No se pudieron guardar las métricas del worker, el endpoint /metrics solo incluirá las del worker que lo atienda:\n {exc}"
+HASH_POOL_NOT_STARTED = "Error: El pool de procesos de las contraseñas no se ha iniciado, no se calcula el hash en el bucle de eventos."
 
 # MENSAJES DE MANEJADORES DE EXCEPCIONES
 LOG_INVALID_PARAMS = """
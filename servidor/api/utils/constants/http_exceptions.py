@@ -31,6 +31,16 @@ RESOURCE_NOT_FOUND_EXCEPTION = {
     "detail": "Recurso no encontrado."
 }
 
+FILE_TOO_LARGE_EXCEPTION = {
+    "status_code": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    "detail": "El archivo supera el tamaño máximo permitido."
+}
+
+RANGE_NOT_SATISFIABLE_EXCEPTION = {
+    "status_code": status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+    "detail": "El rango solicitado no es válido para el archivo."
+}
+
 INTEGRATION_EXCEPTION = {
     JobCandidateConstraint.JOB_CANDIDATE_PK: {"status_code": status.HTTP_409_CONFLICT, "detail": "La clave primaria de Job_candidate ya existe."},
     JobCandidateConstraint.CANDIDATE_FK: {"status_code": status.HTTP_409_CONFLICT, "detail": "Se produjo un problema con la clave externa de candidate."},
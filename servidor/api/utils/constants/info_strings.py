@@ -1,6 +1,17 @@
 SERVER_STARTED = "Servidor iniciado"
 SERVER_STOPPED = "Servidor detenido"
 
+SCHEDULER_LEADER = "Este proceso es el líder de las tareas programadas"
+SCHEDULER_TASK_DONE = "Tarea programada {task} completada en {duration:.2f} segundos"
+
+ALERTS_SUPPRESSED = "Se han suprimido {count} alertas iguales desde el último envío"
+
+REFERENCE_CACHE_INVALIDATED = "Caché de catálogos descartada por cambios en {tables}"
+JOB_SEARCH_CACHE_INVALIDATED = "Caché de búsqueda de ofertas descartada por cambios en {tables}"
+ENTITY_CACHE_INVALIDATED = "Entidades descartadas de la caché por cambios: {keys}"
+
+ORPHAN_CURRICULA_DELETED = "Se han eliminado {count} currículums que no usa ningún candidato"
+
 USER_LOGIN = "SOLICITUD DE INICIO DE SESIÓN POR EL USUARIO {user_id}"
 USER_TOKEN_RENEW = "SOLICITUD DE RENOVACIÓN DE TOKEN POR EL USUARIO {user_id}"
 
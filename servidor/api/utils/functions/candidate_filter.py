@@ -1,18 +1,21 @@
 from uuid import UUID
 from typing import Annotated
 from fastapi import Depends
-from sqlalchemy import func, text, select
-from sqlalchemy.orm import contains_eager, defaultload
+from pydantic import PositiveInt
+from sqlalchemy import ColumnElement, Float, Integer, and_, or_, false, func, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import contains_eager
 from fastapi.exceptions import RequestValidationError
 from api.models.enums.models import WorkSchedule
 from api.models.base_models import QueryParams
+from api.models.read_models import ReadCandidateComplete
 from api.utils.functions.models_utils import GetJob
+from api.utils.functions.reference_cache import ReferenceCache
 from api.models.enums.endpoints import CandidateExtraField, JobCandidateExtraField
-from api.database.database_models.models import Job, CandidateEducation, Education, EducationLevel, SectorEducation, JobCandidate
-from api.database.database_models.models import Candidate, Address, Experience, Sector, User, Language, LanguageLevel, CandidateLanguage
+from api.database.database_models.models import Job, JobCandidate, Candidate, CandidateSearchProfile, Address, User
 from api.utils.constants.error_strings import INVALID_CANDIDATE_DIR_PARAMS, INVALID_CANDIDATE_LANGUAGE_PARAMS, INVALID_EDUCATION_PARAMS
 from api.utils.constants.endpoints_params import ADDRESS_POSTAL_CODE_QUERY, ADDRESS_PROVINCE, EXPERIENCE_MONTHS, RESOURCE_SECTOR, AVAILABILITY_PARAM, CANDIDATE_MINIMAL_FIELDS
-from api.utils.constants.endpoints_params import CANDIDATE_EXTRA_FIELD, LANGUAGE_CANDIDATE, LANGUAGE_LEVEL_VALUE, EDUCATION_NAME_PARAM, EDUCATION_LEVEL_PARAM, SKILLS_PARAM
+from api.utils.constants.endpoints_params import CANDIDATE_EXTRA_FIELD, LANGUAGE_CANDIDATE, LANGUAGE_LEVEL_VALUES, EDUCATION_NAMES_PARAM, EDUCATION_LEVEL_PARAM, SKILLS_PARAM
 
 def _get_uuid_or_str_lower(string: str | None) -> UUID | str | None:
     """
@@ -81,30 +84,32 @@ async def _get_direction_params(postal_code: Annotated[int | None, ADDRESS_POSTA
 
     # si se especifica el código postal, devuelve la condición
     if postal_code:
-        return Address.postal_code == postal_code
+        return CandidateSearchProfile.postal_code == postal_code
     
     # si se especifica la provincia, devuelve la condición
     if province:
-        return Address.province == province.lower()
+        return CandidateSearchProfile.province == province.lower()
 
 async def _get_experience_params(experience_months: Annotated[int | None, EXPERIENCE_MONTHS] = None,
                                  experience_sector: Annotated[str | UUID | None, RESOURCE_SECTOR] = None) -> dict | None:
     """
     Obtiene la cantidad de meses de experiencia y el sector de experiencia para filtrar candidatos.
+    El sector se resuelve a los ids de sus sectores en la caché de catálogos.
     
     Args:
     - experience_months (int, opcional): Los meses de experiencia requeridos.
     - experience_sector (UUID | str, opcional): El sector de experiencia requerido.
 
     Return:
-    - dict | None: Un diccionario con los meses de experiencia y el sector de experiencia, o None si no se especifica ninguno.
+    - dict | None: Un diccionario con los meses de experiencia y los ids de los sectores de experiencia, o None si no se especifica ninguno.
     """
     
     # si no se especifica ninguno, devuelve None
     if not experience_months and not experience_sector: return None
 
-    # convierte el sector de experiencia a UUID si es un UUID válido
-    experience_sector = _get_uuid_or_str_lower(experience_sector)
+    # convierte el sector de experiencia a UUID si es un UUID válido y obtiene los ids de sus sectores
+    if experience_sector:
+        experience_sector = await ReferenceCache.get_sector_ids(_get_uuid_or_str_lower(experience_sector))
 
     # devuelve el diccionario con los parámetros de experiencia
     experience = {
@@ -114,47 +119,50 @@ async def _get_experience_params(experience_months: Annotated[int | None, EXPERI
 
     return experience
 
-async def _get_language_params(language: Annotated[str | UUID | None, LANGUAGE_CANDIDATE] = None,
-                               language_level: Annotated[int | None, LANGUAGE_LEVEL_VALUE] = None) -> dict | None:
+async def _get_language_params(language: Annotated[list[str] | None, LANGUAGE_CANDIDATE] = None,
+                               language_level: Annotated[list[PositiveInt] | None, LANGUAGE_LEVEL_VALUES] = None) -> list[tuple[frozenset[UUID], int | None]] | None:
     """
     Obtiene los parámetros de idioma para filtrar candidatos.
+    Se pueden indicar varios idiomas y cada nivel corresponde al idioma en la misma posición. Los idiomas sin nivel no tienen nivel mínimo.
+    Los idiomas se resuelven a sus ids en la caché de catálogos.
 
     Args:
-    - language (str | UUID, optional): El idioma o el identificador UUID del idioma. Defaults to None.
-    - language_level (int, optional): El nivel de idioma. Defaults to None.
+    - language (list[str], optional): Los idiomas o los identificadores UUID de los idiomas. Defaults to None.
+    - language_level (list[int], optional): Los niveles mínimos de los idiomas. Defaults to None.
 
     Returns:
-    - dict | None: Los parámetros de idioma para filtrar candidatos o None si no se proporcionan los parámetros.
+    - list[tuple[frozenset[UUID], int | None]] | None: Las parejas de ids de idioma y nivel mínimo para filtrar candidatos o None si no se proporcionan los parámetros.
 
     Raises:
-    - RequestValidationError: Si no se proporciona el idioma pero se proporciona el nivel de idioma.
+    - RequestValidationError: Si se proporcionan más niveles de idioma que idiomas.
     """
-    
-    # si se proporciona el nivel de idioma pero no el idioma, devuelve un error
-    if not language and language_level: raise RequestValidationError([INVALID_CANDIDATE_LANGUAGE_PARAMS])
-    # si no se proporciona el idioma ni el nivel de idioma, devuelve None
-    if not language and not language_level: return None
-    
-    # convierte el idioma a UUID si es un UUID válido
-    language = _get_uuid_or_str_lower(language)
 
-    # devuelve el diccionario con los parámetros de idioma
-    language_params = {
-        "language": language,
-        "language_level": language_level
-    }
+    languages = language or []
+    levels = language_level or []
+
+    # si se proporciona un nivel de idioma sin su idioma, devuelve un error
+    if len(levels) > len(languages): raise RequestValidationError([INVALID_CANDIDATE_LANGUAGE_PARAMS])
+    # si no se proporciona ningún idioma, devuelve None
+    if not languages: return None
+
+    # obtiene los ids de cada idioma por su UUID o su nombre y los empareja con su nivel, los idiomas sin nivel no tienen mínimo
+    language_params = [
+        (await ReferenceCache.get_language_ids(_get_uuid_or_str_lower(name)), levels[index] if index < len(levels) else None)
+        for index, name in enumerate(languages)
+    ]
 
     return language_params
 
-async def _get_education_params(education_name: Annotated[str | None, EDUCATION_NAME_PARAM] = None,
+async def _get_education_params(education_name: Annotated[list[str] | None, EDUCATION_NAMES_PARAM] = None,
                                 education_level: Annotated[int | None, EDUCATION_LEVEL_PARAM] = None,
                                 education_sector: Annotated[str | UUID | None, RESOURCE_SECTOR] = None) -> dict | None:
     """
-    Obtiene el nombre de la formación, el nivel de formación y el sector de formación para filtrar candidatos.
-    No se pueden proporcionar el nombre de la formación junto con el nivel o el sector de formación.
+    Obtiene los nombres de las formaciones, el nivel de formación y el sector de formación para filtrar candidatos.
+    No se pueden proporcionar los nombres de las formaciones junto con el nivel o el sector de formación.
+    El sector se resuelve a los ids de sus sectores en la caché de catálogos.
 
     Args:
-    - education_name (str, optional): El nombre de la formación. Defaults to None.
+    - education_name (list[str], optional): Los nombres de las formaciones que debe tener el candidato. Defaults to None.
     - education_level (int, optional): El nivel de formación. Defaults to None.
     - education_sector (str | UUID, optional): El sector de formación. Defaults to None.
 
@@ -162,21 +170,22 @@ async def _get_education_params(education_name: Annotated[str | None, EDUCATION_
     - dict | None: Los parámetros de formación para filtrar candidatos o None si no se proporcionan parámetros.
 
     Raises:
-    - RequestValidationError: Si se proporciona el nombre de formación junto con el nivel o sector de formación.
+    - RequestValidationError: Si se proporcionan nombres de formación junto con el nivel o sector de formación.
     """
     
-    # si se proporciona el nombre de formación junto con el nivel o sector de formación, devuelve un error
+    # si se proporcionan nombres de formación junto con el nivel o sector de formación, devuelve un error
     if education_name and (education_level or education_sector): raise RequestValidationError([INVALID_EDUCATION_PARAMS])
 
     # si no se proporciona ninguno, devuelve None
     if not education_name and not education_level and not education_sector: return None
 
-    # convierte el sector de formación a UUID si es un UUID válido
-    education_sector = _get_uuid_or_str_lower(education_sector)
+    # convierte el sector de formación a UUID si es un UUID válido y obtiene los ids de sus sectores
+    if education_sector:
+        education_sector = await ReferenceCache.get_sector_ids(_get_uuid_or_str_lower(education_sector))
 
     # devuelve el diccionario con los parámetros de formación
     education_params = {
-        "education_name": education_name.lower() if education_name else None,
+        "education_names": [name.lower() for name in education_name] if education_name else None,
         "education_level": education_level,
         "education_sector": education_sector
     }
@@ -220,14 +229,9 @@ def _set_params_extra_field(query_params: QueryParams, extra_fields: set[Candida
     """
     # recorre los campos adicionales
     for field in extra_fields:
-        # obtiene los parámetros del campo adicional
-        param = CandidateExtraField.get_join_table(field)
-
-        # anade las tablas al join de los parámetros de consulta
-        query_params.add_join_list(param["joins"])
-
-        # anade a las options de los parámetros de consulta las opciones para recontruir el objeto
-        query_params.options.extend(param["options"])
+        # anade a las options de los parámetros de consulta la opción de carga del campo adicional.
+        # no se anade un join, ya que repetiría los candidatos, las listas se cargan con una sentencia para toda la página.
+        query_params.options.append(CandidateExtraField.get_page_value(field))
             
 
 def _set_params_dir(query_params: QueryParams, dir_condition: bool | None) -> None:
@@ -244,9 +248,38 @@ def _set_params_dir(query_params: QueryParams, dir_condition: bool | None) -> No
         query_params.where.append(dir_condition)
 
 
+def _get_json_level_condition(column: ColumnElement, ids: set[UUID] | frozenset[UUID], minimum: int | None) -> ColumnElement[bool]:
+    """
+    Obtiene la condición de un campo JSONB del perfil de búsqueda que guarda un valor por id (sector|idioma).
+    El candidato debe tener alguno de los ids y, si se indica el mínimo, el valor de alguno de ellos debe ser al menos el indicado.
+
+    Args:
+    - column (ColumnElement): El campo JSONB del perfil de búsqueda.
+    - ids (set[UUID] | frozenset[UUID]): Los ids que se buscan en el campo.
+    - minimum (int | None): El valor mínimo de alguno de los ids.
+
+    Returns:
+    - ColumnElement[bool]: La condición.
+    """
+
+    # si el sector o el idioma no existe el conjunto está vacío y no se obtiene ningún candidato
+    if not ids: return false()
+
+    keys = [str(id) for id in ids]
+
+    # el operador ?| usa el índice GIN del campo
+    condition = column.has_any(array(keys))
+
+    if minimum:
+        condition = and_(condition, or_(*(column[key].astext.cast(Integer) >= minimum for key in keys)))
+
+    return condition
+
+
 def _set_params_experience(query_params: QueryParams, experience_params: dict | None) -> None:
     """
     Establece en los parámetros de consulta los parámetros para filtrar por experiencia.
+    Los meses de experiencia totales y por sector se guardan en el perfil de búsqueda, por lo que no se suman las experiencias en cada consulta.
 
     Args:
     - query_params (QueryParams): Los parámetros de consulta de candidato.
@@ -259,101 +292,42 @@ def _set_params_experience(query_params: QueryParams, experience_params: dict |
     experience_months = experience_params.get("experience_months", None)
     experience_sector = experience_params.get("experience_sector", None)
 
-    # si se proporciona el sector de experiencia, creamos una subconsulta para obtener la suma de los meses de experiencia
-    if experience_months:
-        experience_months_sum = select(
-                Experience.candidate_id, 
-                func.sum(func.age(func.coalesce(Experience.end_date, text("CURRENT_DATE")), Experience.start_date)).label('total_experience')
-            ).group_by(Experience.candidate_id)
+    # si no se proporciona el sector de experiencia, se filtra por los meses de experiencia totales
+    if experience_sector is None:
+        query_params.where.append(CandidateSearchProfile.experience_months >= experience_months)
+        return
 
-    # si se proporciona el sector de experiencia, anade el sector de experiencia a los parámetros de consulta
-    if experience_sector:
-        # obtenemos el campo a usar como filtro dependiendo de si es un UUID o un string ( filtro por id o por categoría)
-        sector_field = Sector.id if isinstance(experience_sector, UUID) else Sector.category
+    sector_experience = CandidateSearchProfile.sector_experience_months
 
-        # si se ha proporcionado el número de meses de experiencia, se anade el filtro de sector de experiencia a la subconsulta
-        if experience_months:
-            experience_months_sum = experience_months_sum.join(Sector, Experience.sector_id == Sector.id).where(sector_field == experience_sector)
-            
-        # si no se ha proporcionado el número de meses de experiencia, se anade el filtro de sector de experiencia a los parámetros de consulta
-        else:
-            query_params.add_join_list(
-                (
-                    {
-                            "target": Experience,
-                            "onclause": Experience.candidate_id == Candidate.user_id
-                    },
-                    {
-                            "target": Sector,
-                            "onclause": Experience.sector_id == Sector.id
-                    }
-                )
-            )
-            
-            query_params.where.append(sector_field == experience_sector)
-
-    # si se ha proporcionado el número de meses de experiencia, anade el filtro de meses de experiencia a los parámetros de consulta
-    if experience_months:
+    # el candidato debe tener experiencia en alguno de los sectores
+    query_params.where.append(_get_json_level_condition(sector_experience, experience_sector, None))
 
-        # nombramos la subconsulta
-        experience_months_sum = experience_months_sum.alias('experience_sum')
-        
-        # anadimos la subconsulta a los joins de los parámetros de consulta
-        query_params.add_join({
-                            "target": experience_months_sum,
-                            "onclause": Candidate.user_id == experience_months_sum.c.candidate_id
-                        })
-        
-        # anade el filtro de meses de experiencia a los parámetros de consulta
-        query_params.where.append(experience_months_sum.c.total_experience >= text(f"interval '{experience_months} months'"))
+    # si se proporciona el número de meses de experiencia, la suma de los meses en los sectores debe alcanzarlo
+    if experience_months and experience_sector:
+        sector_months = [func.coalesce(sector_experience[str(sector_id)].astext.cast(Float), 0) for sector_id in experience_sector]
+        query_params.where.append(sum(sector_months[1:], sector_months[0]) >= experience_months)
 
 
-
-def _set_params_language(query_params: QueryParams, language_params: dict | None) -> None:
+def _set_params_language(query_params: QueryParams, language_params: list[tuple[frozenset[UUID], int | None]] | None) -> None:
     """
     Establece los parámetros de idioma en los parámetros de consulta.
+    El candidato debe tener todos los idiomas con al menos su nivel, que se comprueban en el nivel máximo de cada idioma del perfil de búsqueda.
 
     Args:
     - query_params (QueryParams): Los parámetros de consulta para filtrar candidatos.
-    - language_params (dict | None): Los parámetros de idioma para filtrar candidatos.
+    - language_params (list[tuple[frozenset[UUID], int | None]] | None): Las parejas de ids de idioma y nivel mínimo para filtrar candidatos.
     """
     # si no se proporcionan parámetros de idioma, termina la función
     if not language_params: return
 
-    # obtiene los parámetros de idioma
-    language = language_params.get("language")
-    language_level = language_params.get("language_level", None)
-
-    # obtenemos el campo a usar como filtro dependiendo de si es un UUID o un string ( filtro por id o por nombre)
-    language_field = Language.id if isinstance(language, UUID) else Language.name
-
-    # anade los joins de idioma a los parámetros de consulta
-    query_params.add_join_list((
-                        {
-                            "target": CandidateLanguage,
-                            "onclause": CandidateLanguage.candidate_id == Candidate.user_id
-                        },
-                        {
-                            "target": Language,
-                            "onclause": CandidateLanguage.language_id == Language.id
-                        }
-                    ))
-    # anade el filtro de idioma a los parámetros de consulta
-    query_params.where.append(language_field == language)
-
-    #  si se proporciona el nivel de idioma, anade el filtro de nivel de idioma a los parámetros de consulta
-    if language_level:
-        # anade el join de nivel de idioma a los parámetros de consulta y el filtro de nivel de idioma
-        query_params.add_join({
-                        "target": LanguageLevel,
-                        "onclause": CandidateLanguage.language_level_id == LanguageLevel.id
-                    })
-        query_params.where.append(LanguageLevel.value >= language_level)
+    for language_ids, language_level in language_params:
+        query_params.where.append(_get_json_level_condition(CandidateSearchProfile.language_levels, language_ids, language_level))
 
 
 def _set_params_education(query_params: QueryParams, education_params: dict | None) -> None:
     """
     Establece los parámetros de formación en los parámetros de consulta.
+    El nivel de formación más alto, el de cada sector y las cualificaciones de las formaciones se guardan en el perfil de búsqueda.
 
     Args:
     - query_params (QueryParams): Los parámetros de consulta para filtrar candidatos.
@@ -364,52 +338,22 @@ def _set_params_education(query_params: QueryParams, education_params: dict | No
     if not education_params: return
 
     # obtiene los parámetros de formación
-    education_name = education_params.get("education_name", None)
+    education_names = education_params.get("education_names", None) or []
     education_level = education_params.get("education_level", None)
     education_sector = education_params.get("education_sector", None)
 
-    # anade los joins de formación a los parámetros de consulta
-    query_params.add_join_list((        
-        {
-            "target": CandidateEducation,
-            "onclause": CandidateEducation.candidate_id == Candidate.user_id
-        },
-        {
-            "target": Education,
-            "onclause": CandidateEducation.education_id == Education.id
-        }
-    ))
+    # si se proporcionan nombres de formación, el candidato debe tener una cualificación que contenga cada nombre
+    for education_name in education_names:
+        qualifications = func.unnest(CandidateSearchProfile.education_qualifications).table_valued("qualification")
+        query_params.where.append(select(qualifications.c.qualification).where(qualifications.c.qualification.contains(education_name)).exists())
 
-    # si se proporciona el nombre de formación, anade el filtro de nombre de formación a los parámetros de consulta
-    if education_name:
-        query_params.where.append(Education.qualification.contains(education_name))
-
-    # si se proporciona el nivel de formación, anade el join de nivel de formación a los parámetros de consulta y el filtro de nivel de formación
-    if education_level:
-        query_params.add_join(
-            {
-                "target": EducationLevel,
-                "onclause": Education.level_id == EducationLevel.id
-            }
-        )
-        query_params.where.append(EducationLevel.value >= education_level)
-
-    # si se proporciona el sector de formación, anade el join de sector de formación a los parámetros de consulta y el filtro de sector de formación
-    if education_sector:
-        # obtenemos el campo a usar como filtro dependiendo de si es un UUID o un string ( filtro por id o por categoría)
-        education_sector_field = Sector.id if isinstance(education_sector, UUID) else Sector.category
-
-        query_params.add_join_list((
-            {
-                "target": SectorEducation,
-                "onclause": Education.id == SectorEducation.education_id
-            },
-            {
-                "target": Sector,
-                "onclause": SectorEducation.sector_id == Sector.id
-            }
-        ))
-        query_params.where.append(education_sector_field == education_sector)
+    # si se proporciona el sector de formación, una formación del sector debe tener al menos el nivel indicado
+    if education_sector is not None:
+        query_params.where.append(_get_json_level_condition(CandidateSearchProfile.education_sector_levels, education_sector, education_level))
+
+    # si solo se proporciona el nivel de formación, el nivel más alto del candidato debe ser al menos el indicado
+    elif education_level:
+        query_params.where.append(CandidateSearchProfile.education_level_value >= education_level)
 
 def _set_params_skills_and_availability(query_params: QueryParams, skills_and_availability_params: dict | None) -> None:
     """
@@ -429,18 +373,18 @@ def _set_params_skills_and_availability(query_params: QueryParams, skills_and_av
 
     # si se proporcionan habilidades, anade el filtro de habilidades a los parámetros de consulta
     if skills:
-        query_params.where.append(Candidate.skills.contains(skills))
+        query_params.where.append(CandidateSearchProfile.skills.contains(skills))
 
     # si se proporciona disponibilidad, anade el filtro de disponibilidad a los parámetros de consulta
     if availability:
-        query_params.where.append(Candidate.availability.contains(availability))
+        query_params.where.append(CandidateSearchProfile.availability.contains([availability]))
 
 
 async def get_candidate_filter_params(
                                     extra_fields_params: Annotated[set, Depends(_get_extra_fields)],
                                     direction_params: Annotated[bool | None, Depends(_get_direction_params)],
                                     experience_params: Annotated[dict | None, Depends(_get_experience_params)],
-                                    language_params: Annotated[dict | None, Depends(_get_language_params)],
+                                    language_params: Annotated[list | None, Depends(_get_language_params)],
                                     education_params: Annotated[dict, Depends(_get_education_params)],
                                     skills_and_availability_params: Annotated[dict, Depends(_get_skills_and_availability_params)],
                                     minimal_fields: Annotated[bool, CANDIDATE_MINIMAL_FIELDS] = False) -> dict:
@@ -451,7 +395,7 @@ async def get_candidate_filter_params(
     - extra_fields_params (set): Conjunto de campos adicionales para incluir en la consulta.
     - direction_params (bool | None): Dirección de los candidatos a filtrar.
     - experience_params (dict | None): Parámetros de experiencia para filtrar los candidatos.
-    - language_params (dict | None): Parámetros de idioma para filtrar los candidatos.
+    - language_params (list | None): Parejas de idioma y nivel mínimo para filtrar los candidatos.
     - education_params (dict): Parámetros de formación para filtrar los candidatos.
     - skills_and_availability_params (dict): Parámetros de habilidades y disponibilidad para filtrar los candidatos.
     - minimal_fields (bool, optional): Si se deben incluir los campos mínimos. Por defecto False.
@@ -460,20 +404,26 @@ async def get_candidate_filter_params(
     - dict: Los parámetros finales de la consulta.
     """
     # si se especifica que se deben incluir los campos mínimos, se establecen los campos mínimos
-    fields = (Candidate,) if not minimal_fields else (User.id, User.name, User.surname, Address.province, Candidate.skills, Candidate.availability)
+    fields = (Candidate,) if not minimal_fields else (User.id, User.name, User.surname, CandidateSearchProfile.province, Candidate.skills, Candidate.availability)
     # si se especifica que se deben incluir los campos mínimos, se excluyen los campos de las relaciones
-    exclude = "options" if minimal_fields else None
+    exclude = {"options"} if minimal_fields else None
                     
-    # se crea el objeto de parámetros de consulta
+    # se crea el objeto de parámetros de consulta.
+    # los filtros se aplican sobre el perfil de búsqueda del candidato y los joins del perfil, usuario y dirección son a uno,
+    # por lo que cada candidato es una sola fila y el límite se aplica directamente a los candidatos.
     query_params = QueryParams(
         fields=fields,
         scalar=not minimal_fields,
-        unique=not minimal_fields,
+        unique=False,
         options = [contains_eager(Candidate.user).contains_eager(User.address)]
     )
 
-    # anadimos los joins de las tablas usuario y dirección ya que siempre se necesitan
+    # anadimos los joins del perfil de búsqueda y de las tablas usuario y dirección ya que siempre se necesitan
     query_params.add_join_list((
+                {
+                    "target": CandidateSearchProfile,
+                    "onclause": Candidate.user_id == CandidateSearchProfile.candidate_id
+                },
                 {
                     "target": User,
                     "onclause": Candidate.user_id == User.id
@@ -497,12 +447,16 @@ async def get_candidate_filter_params(
     # se obtiene el diccionario con los parámetros de consulta excluyendo los parámetros por defecto y el campo options si se especifica que se deben incluir los campos mínimos
     final_query_params = query_params.model_dump(exclude_defaults=True, exclude=exclude)
 
+    # los candidatos completos solo cargan las columnas y relaciones de ReadCandidateComplete.
+    if not minimal_fields:
+        final_query_params["response_model"] = ReadCandidateComplete
+
     return final_query_params
 
 async def get_candidate_applied(extra_fields_params: Annotated[set, Depends(_get_extra_fields_applied_candidates)],
                                direction_params: Annotated[bool | None, Depends(_get_direction_params)],
                                experience_params: Annotated[dict | None, Depends(_get_experience_params)],
-                               language_params: Annotated[dict | None, Depends(_get_language_params)],
+                               language_params: Annotated[list | None, Depends(_get_language_params)],
                                education_params: Annotated[dict, Depends(_get_education_params)],
                                skills_and_availability_params: Annotated[dict, Depends(_get_skills_and_availability_params)],
                                job: Annotated[Job, Depends(GetJob(False))],
@@ -515,7 +469,7 @@ async def get_candidate_applied(extra_fields_params: Annotated[set, Depends(_get
     - extra_fields_params (set): Conjunto de campos adicionales aplicados a los candidatos.
     - direction_params (bool | None): Parámetro de dirección de búsqueda de candidatos.
     - experience_params (dict | None): Parámetros de experiencia de búsqueda de candidatos.
-    - language_params (dict | None): Parámetros de idioma de búsqueda de candidatos.
+    - language_params (list | None): Parejas de idioma y nivel mínimo de búsqueda de candidatos.
     - education_params (dict): Parámetros de formación de búsqueda de candidatos.
     - skills_and_availability_params (dict): Parámetros de habilidades y disponibilidad de búsqueda de candidatos.
 
@@ -539,8 +493,8 @@ async def get_candidate_applied(extra_fields_params: Annotated[set, Depends(_get
     # anade el filtro de la oferta a los parámetros de consulta
     query_params["where"].append(JobCandidate.job_id == job.id)
 
-    # anade el orden de los parámetros de consulta para que los candidatos se ordenen por fecha de inscripción
-    query_params["order"] = (JobCandidate.inscription_date.desc())
+    # anade los campos de paginación para que los candidatos se ordenen por fecha de inscripción, usando el id del candidato como desempate
+    query_params["keyset"] = (JobCandidate.inscription_date, Candidate.user_id)
 
     return query_params
     
\ No newline at end of file
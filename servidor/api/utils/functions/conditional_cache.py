@@ -0,0 +1,272 @@
+from uuid import UUID
+from hashlib import sha256
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Annotated, Awaitable, Callable
+from fastapi import Depends, Request, Response, status
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+from api.database.connection import get_session
+from api.database.database_models.models import Base, Job, JobEducation, JobLanguage, Address
+from api.utils.exceptions import HTTPExceptionWithBackgroundTask
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.reference_cache import ReferenceCache
+
+# versión de los datos de una respuesta y fecha de su última modificación, si se conoce
+CacheVersion = tuple[str, float | None]
+
+
+def get_weak_etag(data: bytes) -> str:
+    """
+    Devuelve un ETag débil con el hash de los datos indicados.
+
+    Args:
+    - data (bytes): Datos de los que se calcula el ETag.
+
+    Returns:
+    - str: El ETag.
+    """
+
+    return f'W/"{sha256(data).hexdigest()[:32]}"'
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    Comprueba si la cabecera If-None-Match o If-Range incluye el ETag indicado. Los ETag débiles se comparan sin su prefijo.
+
+    Args:
+    - header (str | None): Valor de la cabecera.
+    - etag (str): El ETag de la respuesta.
+
+    Returns:
+    - bool: True si la cabecera incluye el ETag, False en caso contrario.
+    """
+
+    if not header:
+        return False
+
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+def _is_not_modified_since(header: str | None, last_modified: float | None) -> bool:
+    """Comprueba si los datos no se han modificado desde la fecha de la cabecera If-Modified-Since."""
+
+    if not header or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+    # la fecha de la cabecera no tiene fracciones de segundo
+    return int(last_modified) <= since
+
+
+class ConditionalCache:
+    """
+    Dependencia que añade la cabecera Cache-Control a una respuesta y responde 304 si el cliente ya tiene sus datos.
+
+    Si la ruta tiene una función de versión, el ETag se calcula con la URL y la versión de los datos antes de ejecutar el endpoint,
+    por lo que una petición repetida no consulta los datos ni genera la respuesta.
+    Si no la tiene, o la versión no se conoce, ConditionalCacheMiddleware calcula el ETag con el hash del cuerpo de la respuesta
+    y solo se ahorra su envío.
+    """
+
+    # clave del estado de la petición que indica al middleware que debe calcular el ETag
+    STATE_KEY = "conditional_cache"
+
+    def __init__(self, cache_control: str, version: Callable[[Request, AsyncSession], Awaitable[CacheVersion | None]] | None = None) -> None:
+        """
+        Inicializa la dependencia.
+
+        Args:
+        - cache_control (str): Valor de la cabecera Cache-Control de la ruta.
+        - version (Callable, optional): Función que devuelve la versión de los datos de la petición. Defaults to None.
+        """
+
+        self.cache_control = cache_control
+        self.version = version
+
+    async def __call__(self, request: Request, response: Response, session: Annotated[AsyncSession, Depends(get_session)]) -> None:
+        """
+        Añade las cabeceras de caché a la respuesta.
+
+        Args:
+        - request (Request): Petición HTTP.
+        - response (Response): Respuesta del endpoint.
+        - session (AsyncSession): Sesión de base de datos, la misma que usa el endpoint.
+
+        Raises:
+        - HTTPExceptionWithBackgroundTask: Con el código 304 si el cliente ya tiene los datos.
+        """
+
+        response.headers["Cache-Control"] = self.cache_control
+
+        version = await self.version(request, session) if self.version else None
+
+        if version is None:
+            setattr(request.state, self.STATE_KEY, True)
+            return
+
+        data_version, last_modified = version
+
+        headers = {
+            "Cache-Control": self.cache_control,
+            "ETag": get_weak_etag(f"{request.url.path}?{request.url.query}|{data_version}".encode()),
+        }
+
+        if last_modified is not None:
+            headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+        response.headers.update(headers)
+
+        # If-Modified-Since solo se tiene en cuenta si el cliente no envía If-None-Match
+        if_none_match = request.headers.get("if-none-match")
+
+        if etag_matches(if_none_match, headers["ETag"]) or (if_none_match is None and _is_not_modified_since(request.headers.get("if-modified-since"), last_modified)):
+            raise HTTPExceptionWithBackgroundTask(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+class ConditionalCacheMiddleware:
+    """
+    Middleware que calcula el ETag de las respuestas de las rutas con ConditionalCache sin versión.
+    El cuerpo de la respuesta se guarda hasta terminar para calcular su hash y, si coincide con If-None-Match, se responde 304 sin cuerpo.
+    """
+
+    # cabeceras que describen el cuerpo y no se envían en la respuesta 304
+    BODY_HEADERS = (b"content-length", b"content-type")
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Inicializa el middleware.
+
+        Args:
+        - app (ASGIApp): La aplicación que atiende las peticiones.
+        """
+
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Atiende la petición y añade el ETag a la respuesta si la ruta lo requiere."""
+
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        start: Message | None = None
+        body: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            """Guarda la respuesta de las rutas con ConditionalCache y la envía con su ETag al terminar."""
+
+            nonlocal start
+
+            # la dependencia ya se ha ejecutado al empezar la respuesta, por lo que el estado indica si se debe calcular el ETag
+            if message["type"] == "http.response.start":
+                if message["status"] == status.HTTP_200_OK and scope.get("state", {}).get(ConditionalCache.STATE_KEY):
+                    start = message
+                    return
+
+                return await send(message)
+
+            if start is None:
+                return await send(message)
+
+            body.append(message.get("body", b""))
+
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            etag = get_weak_etag(content)
+            MutableHeaders(raw=start["headers"])["ETag"] = etag
+
+            if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+                headers = [(name, value) for name, value in start["headers"] if name.lower() not in self.BODY_HEADERS]
+                await send({"type": "http.response.start", "status": status.HTTP_304_NOT_MODIFIED, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start)
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# versiones de los datos de las rutas
+
+def _get_row_version(model: type[Base]) -> ColumnElement:
+    """Devuelve la versión de la fila de una tabla. PostgreSQL cambia la columna de sistema xmin en cada modificación de la fila."""
+
+    return literal_column(f"{model.__tablename__}.xmin::text")
+
+async def get_catalog_version(request: Request, session: AsyncSession) -> CacheVersion | None:
+    """
+    Devuelve la versión de los catálogos de la caché. No consulta la base de datos.
+
+    Args:
+    - request (Request): Petición HTTP.
+    - session (AsyncSession): Sesión de base de datos.
+
+    Returns:
+    - CacheVersion | None: La versión o None si los catálogos no se guardan en la caché.
+    """
+
+    return await ReferenceCache.get_version()
+
+async def get_job_version(request: Request, session: AsyncSession) -> CacheVersion | None:
+    """
+    Devuelve la versión de una oferta con las versiones de las filas de la oferta, su dirección, su formación y sus idiomas,
+    y la versión de los catálogos, de los que se obtienen el sector y los nombres de la formación y los idiomas.
+
+    Args:
+    - request (Request): Petición HTTP.
+    - session (AsyncSession): Sesión de base de datos.
+
+    Returns:
+    - CacheVersion | None: La versión o None si la oferta no existe o los catálogos no se guardan en la caché.
+    """
+
+    try:
+        job_id = UUID(request.path_params["job_id"])
+    except (KeyError, ValueError):
+        return None
+
+    catalog_version = await ReferenceCache.get_version()
+
+    if catalog_version is None:
+        return None
+
+    languages_version = (
+        select(func.string_agg(_get_row_version(JobLanguage), aggregate_order_by(literal_column("','"), JobLanguage.language_id)))
+        .where(JobLanguage.job_id == Job.id)
+        .scalar_subquery()
+    )
+
+    statement = (
+        select(_get_row_version(Job), _get_row_version(Address), _get_row_version(JobEducation), languages_version)
+        .select_from(Job)
+        .join(Address, Address.id == Job.address_id)
+        .outerjoin(JobEducation, JobEducation.job_id == Job.id)
+        .where(Job.id == job_id)
+    )
+
+    row = (await session.execute(statement)).first()
+
+    # si la oferta no existe, el endpoint devuelve el error
+    if row is None:
+        return None
+
+    return ",".join(value or "" for value in row) + f"|{catalog_version[0]}", None
+
+
+# cabeceras de caché de las rutas públicas
+
+# la oferta se revalida en cada petición, la versión se obtiene con una consulta más ligera que la de la oferta
+JOB_CACHE = ConditionalCache("public, no-cache", version=get_job_version)
+CATALOG_CACHE = ConditionalCache(f"public, max-age={CONFIG.CATALOG_CACHE_MAX_AGE}", version=get_catalog_version)
+JOB_KEYWORD_CACHE = ConditionalCache(f"public, max-age={CONFIG.JOB_KEYWORD_CACHE_MAX_AGE}")
+ADDRESS_CACHE = ConditionalCache(f"public, max-age={CONFIG.ADDRESS_CACHE_MAX_AGE}")
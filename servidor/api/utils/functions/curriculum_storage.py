@@ -0,0 +1,237 @@
+from typing import Any, AsyncIterator
+from urllib.parse import quote
+from fastapi import HTTPException, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.engine import Row
+from api.database.connection import session_maker
+from api.database.database_models.models import Candidate
+from api.storage.blob_storage import BlobStorage, get_blob_storage
+from api.utils.constants.http_exceptions import FILE_TOO_LARGE_EXCEPTION, RANGE_NOT_SATISFIABLE_EXCEPTION
+from api.utils.constants.cli_strings import MIGRATE_CURRICULA_MSG, MIGRATE_CURRICULA_PROGRESS, MIGRATE_CURRICULA_DONE
+from api.utils.constants.info_strings import ORPHAN_CURRICULA_DELETED
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.conditional_cache import etag_matches
+from api.utils.functions.management_utils import print_log, LogLevel
+
+
+# los currículums se pueden cambiar, por lo que el navegador debe revalidarlos con su ETag antes de usar su copia
+_CURRICULUM_CACHE_CONTROL = "private, no-cache"
+
+async def read_upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    """
+    Devuelve los fragmentos de BLOB_CHUNK_SIZE bytes de un archivo subido para guardarlo sin cargarlo entero en memoria.
+
+    Args:
+    - upload (UploadFile): Archivo subido.
+
+    Returns:
+    - AsyncIterator[bytes]: Los fragmentos del archivo.
+
+    Raises:
+    - HTTPException: Si el archivo supera CV_MAX_SIZE bytes.
+    """
+
+    # si se conoce el tamaño del archivo se rechaza antes de leerlo
+    if upload.size is not None and upload.size > CONFIG.CV_MAX_SIZE:
+        raise HTTPException(**FILE_TOO_LARGE_EXCEPTION)
+
+    size = 0
+
+    while chunk := await upload.read(CONFIG.BLOB_CHUNK_SIZE):
+        size += len(chunk)
+
+        # se comprueba el tamaño mientras se lee, así se deja de guardar en cuanto se supera el máximo
+        if size > CONFIG.CV_MAX_SIZE:
+            raise HTTPException(**FILE_TOO_LARGE_EXCEPTION)
+
+        yield chunk
+
+def _get_byte_range(request: Request, etag: str, size: int) -> tuple[int, int] | None:
+    """
+    Devuelve el rango de bytes solicitado en la cabecera Range.
+    Solo se atienden los rangos simples de bytes, con los rangos múltiples o mal formados se devuelve el archivo completo.
+
+    Args:
+    - request (Request): Petición HTTP.
+    - etag (str): ETag del currículum.
+    - size (int): Tamaño del currículum en bytes.
+
+    Returns:
+    - tuple[int, int] | None: Primer y último byte del rango o None si se debe devolver el archivo completo.
+
+    Raises:
+    - HTTPException: Si el rango empieza después del final del archivo.
+    """
+
+    range_header = request.headers.get("range")
+
+    # si el currículum ha cambiado desde que se descargó la parte anterior se devuelve completo
+    if not range_header or ("if-range" in request.headers and not etag_matches(request.headers["if-range"], etag)):
+        return None
+
+    unit, _, byte_range = range_header.partition("=")
+    first, separator, last = byte_range.strip().partition("-")
+
+    if unit.strip().lower() != "bytes" or not separator or "," in byte_range:
+        return None
+
+    try:
+        # bytes=inicio-fin o bytes=inicio-
+        if first:
+            start = int(first)
+            end = int(last) if last else None
+
+        # bytes=-n, los últimos n bytes
+        else:
+            start = max(size - int(last), 0)
+            end = None
+
+    except ValueError:
+        return None
+
+    if end is not None and end < start:
+        return None
+
+    if start >= size:
+        raise HTTPException(**RANGE_NOT_SATISFIABLE_EXCEPTION, headers={"Content-Range": f"bytes */{size}"})
+
+    return start, size - 1 if end is None else min(end, size - 1)
+
+def _get_accel_redirect_response(internal_path: str) -> Response:
+    """
+    Devuelve una respuesta vacía con la cabecera X-Accel-Redirect para que nginx envíe el archivo desde el disco.
+    nginx atiende la ruta interna CV_ACCEL_REDIRECT_LOCATION, calcula el ETag y responde a las cabeceras Range e If-None-Match.
+
+    Args:
+    - internal_path (str): Ruta del archivo relativa a la raíz del almacén.
+
+    Returns:
+    - Response: Respuesta con la redirección interna.
+    """
+
+    headers = {
+        "X-Accel-Redirect": CONFIG.CV_ACCEL_REDIRECT_LOCATION.rstrip("/") + "/" + quote(internal_path),
+        "Cache-Control": _CURRICULUM_CACHE_CONTROL,
+    }
+
+    return Response(headers=headers, media_type='application/pdf')
+
+async def get_curriculum_response(request: Request, record: Row[Any]) -> Response:
+    """
+    Devuelve la respuesta con el currículum de un candidato.
+    El currículum se envía por fragmentos desde el almacén de archivos, con su clave como ETag para responder 304 si el
+    cliente ya lo tiene y con soporte para descargar una parte con la cabecera Range.
+    Si CV_ACCEL_REDIRECT está activo y el almacén guarda los archivos en disco, el archivo lo envía nginx.
+    Si el currículum no se ha migrado al almacén de archivos, se devuelve el guardado en la base de datos.
+
+    Args:
+    - request (Request): Petición HTTP.
+    - record (Row): Fila con la clave del currículum y el currículum de la base de datos.
+
+    Returns:
+    - Response: Currículum del candidato.
+    """
+
+    curriculum_key, curriculum = record
+    storage = get_blob_storage()
+
+    if curriculum_key and CONFIG.CV_ACCEL_REDIRECT:
+        internal_path = storage.get_internal_path(curriculum_key)
+
+        if internal_path is not None:
+            return _get_accel_redirect_response(internal_path)
+
+    if curriculum_key:
+        size = await storage.get_size(curriculum_key)
+        etag = f'"{curriculum_key}"'
+    else:
+        size = len(curriculum)
+        etag = f'"{BlobStorage.get_key(curriculum)}"'
+
+    headers = {"ETag": etag, "Cache-Control": _CURRICULUM_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = _get_byte_range(request, etag, size)
+    start, end = byte_range or (0, size - 1)
+    status_code = status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK
+
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    if not curriculum_key:
+        return Response(curriculum[start:end + 1], status_code=status_code, headers=headers, media_type='application/pdf')
+
+    return StreamingResponse(storage.iter_chunks(curriculum_key, start, end + 1), status_code=status_code, headers=headers, media_type='application/pdf')
+
+async def delete_orphan_curricula() -> None:
+    """
+    Elimina del almacén los currículums que no usa ningún candidato. Se ejecuta como tarea programada.
+    Solo se eliminan los archivos guardados hace más de BLOB_ORPHAN_GRACE_HOURS horas para no eliminar
+    un currículum subido cuyo candidato todavía no se ha guardado. La fecha se vuelve a comprobar al eliminar cada archivo,
+    ya que una subida del mismo currículum solo actualiza la fecha del archivo y guarda su clave después de la consulta.
+    """
+
+    storage = get_blob_storage()
+    grace_seconds = CONFIG.BLOB_ORPHAN_GRACE_HOURS * 3600
+
+    keys = await storage.get_keys(older_than=grace_seconds)
+
+    if not keys:
+        return
+
+    async with session_maker() as session:
+        used_keys = set((await session.execute(
+            select(Candidate.curriculum_key).where(Candidate.curriculum_key.in_(keys)).distinct()
+        )).scalars().all())
+
+    orphan_keys = [key for key in keys if key not in used_keys]
+
+    deleted = 0
+    for key in orphan_keys:
+        deleted += await storage.delete(key, older_than=grace_seconds)
+
+    if deleted:
+        print_log(ORPHAN_CURRICULA_DELETED, LogLevel.INFO, count=deleted)
+
+async def migrate_curricula() -> None:
+    """
+    Mueve los currículums guardados en la base de datos al almacén de archivos.
+    Se procesan por lotes de BLOB_MIGRATION_BATCH_SIZE candidatos y cada lote se confirma por separado,
+    por lo que el comando se puede interrumpir y volver a ejecutar.
+    """
+
+    storage = get_blob_storage()
+    migrated = 0
+
+    print(MIGRATE_CURRICULA_MSG)
+
+    while True:
+        async with session_maker() as session:
+            records = (await session.execute(
+                select(Candidate.user_id, Candidate.curriculum)
+                .where(Candidate.curriculum.is_not(None))
+                .order_by(Candidate.user_id)
+                .limit(CONFIG.BLOB_MIGRATION_BATCH_SIZE)
+            )).all()
+
+            if not records:
+                break
+
+            for user_id, curriculum in records:
+                key = await storage.save(curriculum)
+
+                # se guarda la clave y se vacía la columna de la base de datos, salvo que el candidato haya subido otro currículum mientras tanto
+                await session.execute(
+                    update(Candidate).where(Candidate.user_id == user_id, Candidate.curriculum.is_not(None)).values(curriculum_key=key, curriculum=None)
+                )
+
+            await session.commit()
+
+        migrated += len(records)
+        print(MIGRATE_CURRICULA_PROGRESS.format(count=migrated))
+
+    print(MIGRATE_CURRICULA_DONE.format(count=migrated))
@@ -1,19 +1,31 @@
 from re import sub
+from json import dumps, loads
+from base64 import urlsafe_b64encode, urlsafe_b64decode
 from uuid import UUID
-from typing import Any, Sequence
-from sqlalchemy import select, Row
+from typing import Any, Callable, Sequence
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_, inspect, Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql._typing import _ColumnsClauseArgument as ColumnsClauseArgument, _ColumnExpressionOrStrLabelArgument as ColumnArgument
 from starlette.background import BackgroundTask
 from collections.abc import Iterable
+from api.utils.constants.endpoints_params import NEXT_CURSOR_HEADER
 from api.utils.constants.http_exceptions import INTEGRATION_EXCEPTION, RESOURCE_NOT_FOUND_EXCEPTION, DEFAULT_EXCEPTION
 from api.utils.functions.management_utils import print_log
 from api.models.enums.models import LogLevel
 from api.database.database_models.models import Base, User
-from api.utils.constants.error_strings import RESOURCE_NOT_FOUND, UNKNOWN_QUERY_ERROR, RESOURCES_NOT_FOUND
+from api.utils.constants.error_strings import RESOURCE_NOT_FOUND, UNKNOWN_QUERY_ERROR, RESOURCES_NOT_FOUND, INVALID_CURSOR
 from api.utils.exceptions import DatabaseException, ResourceNotFoundException
+from api.utils.functions.reference_cache import ReferenceCache
+from api.utils.functions.job_search_cache import JobSearchCache
+from api.utils.functions.entity_cache import EntityCache
+from api.utils.functions.row_reader import RowPlan, get_row_plan, build_rows
+from api.utils.functions.load_options import get_load_options
 
 
 def _iterable_param(param):
@@ -66,6 +78,98 @@ def _raise_not_found(log_message: str, **kwargs) -> None:
     # Se lanza la excepción.
     raise ResourceNotFoundException(error_message=log_message, http_response=RESOURCE_NOT_FOUND_EXCEPTION, background_task=background)
 
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Codifica los valores de los campos de paginación del último registro en un cursor opaco.
+
+    Args:
+    - values (Sequence[Any]): Valores de los campos de paginación.
+
+    Returns:
+    - str: Cursor codificado en base64.
+    """
+
+    # los valores que no son serializables (fechas, UUID) se convierten a string.
+    return urlsafe_b64encode(dumps(list(values), default=str).encode()).decode()
+
+def decode_cursor(cursor: str, keyset: Sequence[ColumnArgument]) -> tuple:
+    """
+    Decodifica un cursor y convierte sus valores al tipo de los campos de paginación.
+
+    Args:
+    - cursor (str): Cursor codificado.
+    - keyset (Sequence[ColumnArgument]): Campos de paginación.
+
+    Returns:
+    - tuple: Valores de los campos de paginación.
+
+    Raises:
+    - RequestValidationError: Si el cursor no es válido.
+    """
+
+    try:
+        values = loads(urlsafe_b64decode(cursor.encode()))
+
+        # el cursor debe tener un valor por cada campo de paginación.
+        if not isinstance(values, list) or len(values) != len(keyset):
+            raise ValueError(cursor)
+
+        decoded_values = []
+        for field, value in zip(keyset, values):
+            python_type = field.type.python_type
+
+            # las fechas se recuperan desde su formato iso, el resto de tipos desde su constructor.
+            if hasattr(python_type, "fromisoformat"):
+                decoded_values.append(python_type.fromisoformat(value))
+            else:
+                decoded_values.append(python_type(value))
+
+        return tuple(decoded_values)
+
+    except Exception:
+        raise RequestValidationError([INVALID_CURSOR])
+
+def set_next_cursor_header(response: Response, next_cursor: str | None) -> None:
+    """
+    Añade a la respuesta la cabecera con el cursor de la siguiente página si existe.
+
+    Args:
+    - response (Response): Respuesta del endpoint.
+    - next_cursor (str | None): Cursor de la siguiente página.
+    """
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+async def notify_cache_changes(session: AsyncSession) -> Callable[[], None]:
+    """
+    Notifica a los workers los cambios pendientes de la sesión en las cachés en memoria para que descarten su copia.
+    La notificación se envía dentro de la transacción, por lo que se debe llamar antes del commit.
+
+    Args:
+    - session (AsyncSession): Sesión de la base de datos.
+
+    Returns:
+    - Callable[[], None]: Función que descarta la caché del worker actual, se llama después del commit.
+    """
+
+    # si se modifica algún catálogo, oferta, empresa o candidato, se notifica a los workers para que descarten su caché.
+    reference_changed = await ReferenceCache.notify_changes(session)
+    job_search_changed = await JobSearchCache.notify_changes(session)
+    entity_keys = await EntityCache.notify_changes(session)
+
+    def invalidate() -> None:
+        """Descarta la caché del worker actual sin esperar a la notificación."""
+
+        if reference_changed:
+            ReferenceCache.invalidate()
+        if job_search_changed:
+            JobSearchCache.invalidate()
+        if entity_keys:
+            EntityCache.invalidate(entity_keys)
+
+    return invalidate
 
 async def secure_commit(session: AsyncSession) -> None:
     """
@@ -81,9 +185,15 @@ async def secure_commit(session: AsyncSession) -> None:
     """
 
     try:
+        # se notifican los cambios de las cachés en la misma transacción
+        invalidate_caches = await notify_cache_changes(session)
+
         # Se realiza el commit.
         await session.commit()
 
+        # se descarta la caché del worker actual sin esperar a la notificación.
+        invalidate_caches()
+
     except IntegrityError as e:
         # Se realiza el rollback. 
         await session.rollback()
@@ -135,6 +245,45 @@ async def secure_commit(session: AsyncSession) -> None:
         raise DatabaseException(error_message=str(e), http_response=DEFAULT_EXCEPTION, background_task=background)
 
 
+async def _load_page(session: AsyncSession, model: Base, rows: Sequence[Row[Any]], options: Sequence[ExecutableOption] | None, plan: RowPlan | None) -> list[Any]:
+    """
+    Carga los registros de una página de claves primarias en el mismo orden que la página.
+    Se consultan por su clave primaria sin los joins de los filtros, por lo que sus relaciones a muchos se cargan completas
+    con la estrategia de las options o la del modelo.
+
+    Args:
+    - session (AsyncSession): Sesión de la base de datos.
+    - model (Base): Modelo de los registros.
+    - rows (Sequence[Row]): Filas de la página con la clave primaria en la primera columna.
+    - options (Sequence | None): Opciones de carga de los registros.
+    - plan (RowPlan | None): Plan de lectura por filas. Si se indica, los registros se leen por filas y se ignoran las options.
+
+    Returns:
+    - list[Any]: Los registros de la página.
+    """
+
+    primary_key = inspect(model).primary_key[0]
+    ids = [row[0] for row in rows]
+
+    # posición de cada registro en la página para devolverlos en el orden de la paginación
+    position = {record_id: index for index, record_id in enumerate(ids)}
+
+    if plan:
+        page = (await session.execute(plan.get_statement().where(primary_key.in_(ids)))).all()
+        page.sort(key=lambda row: position[row[plan.primary_key[0]]])
+
+        return await build_rows(session, plan, page)
+
+    statement = select(model).where(primary_key.in_(ids))
+
+    if options:
+        statement = statement.options(*options)
+
+    key = inspect(model).get_property_by_column(primary_key).key
+    records = (await session.execute(statement)).unique().scalars().all()
+
+    return sorted(records, key=lambda record: position[getattr(record, key)])
+
 async def get_database_records(session: AsyncSession, 
                                *fields: ColumnsClauseArgument,
                                froms: Sequence[Base] | Base = None,
@@ -166,13 +315,26 @@ async def get_database_records(session: AsyncSession,
     - **kwargs: Argumentos adicionales.
         - distinct (bool, optional): Indica si se deben obtener registros únicos. Defaults to False.
         - limit (int, optional): Límite de registros a obtener. Defaults to None.
-        - offset (int, optional): Desplazamiento de registros a obtener. Defaults to None.
+        - offset (int, optional): Desplazamiento de registros a obtener. Se ignora si se indica un cursor. Defaults to None.
+        - keyset (Sequence, optional): Campos de paginación por cursor. El último debe ser único. Si se indica, los registros se ordenan de forma descendente por estos campos
+          y se devuelve una tupla con los registros y el cursor de la siguiente página. Defaults to None.
+        - cursor (str, optional): Cursor de la página a obtener. Solo se usa junto a keyset. Defaults to None.
         - unique (bool, optional): Indica si se deben obtener registros únicos. Defaults to False.
         - scalar (bool, optional): Indica si se deben devolver los registros como escalares. Defaults to True.
         - result_list (bool, optional): Indica si se deben devolver los registros como una lista. Defaults to True. En caso de ser False, se devolverá un único registro.
+        - read_model (type[BaseModel], optional): Modelo de lectura de los registros. Si se indica, fields debe ser un único modelo de la base de datos
+          y en lugar de cargar sus registros del ORM se consultan solo las columnas del modelo de lectura y se devuelven objetos con __slots__
+          con su forma (ver RowPlan). Las options se ignoran, las relaciones se cargan según el modelo de lectura. Defaults to None.
+        - response_model (type[BaseModel], optional): Modelo de lectura de la respuesta. Si se indica, fields debe ser un único modelo de la base de datos
+          y se añaden a las options las opciones de carga que obtienen solo sus columnas y relaciones (ver get_load_options). Defaults to None.
+        - paginate_ids (bool, optional): Indica si la consulta se hace en dos fases. Si se indica, fields debe ser un único modelo de la base de datos con una clave primaria simple.
+          Primero se obtiene la página de claves primarias distintas con los joins, los filtros, el orden y la paginación, y después sus registros por clave primaria
+          con las options, que deben ser opciones de carga y no contains_eager. Así el límite se aplica a registros y no a las filas que multiplican los joins
+          a muchos, y las relaciones a muchos se cargan completas. Si se indica unique, la primera fase usa DISTINCT para no repetir claves. Defaults to False.
 
     Returns:
     - Sequence[Row[Any]] | Sequence[Any] | Row[Any] | Any | None: Registros obtenidos.
+    - tuple[Sequence[Any], str | None]: Registros obtenidos y cursor de la siguiente página si se indica keyset.
 
     Raises:
     - DatabaseException: Excepción de recurso no encontrado.
@@ -195,9 +357,35 @@ async def get_database_records(session: AsyncSession,
         scalar = kwargs.get('scalar', True)
         result_list = kwargs.get('result_list', True)
         distinct = kwargs.get('distinct', False)
-
-        # Se crea la consulta inicial con los campos a obtener.
-        statement = select(*fields)
+        keyset = _iterable_param(kwargs.get('keyset', None))
+        cursor = kwargs.get('cursor', None)
+        read_model = kwargs.get('read_model', None)
+        response_model = kwargs.get('response_model', None)
+        paginate_ids = kwargs.get('paginate_ids', False)
+
+        # si se indica un modelo de lectura, se usa su plan de lectura por filas en lugar de los registros del ORM.
+        plan = get_row_plan(fields[0], read_model) if read_model else None
+
+        # si se indica el modelo de la respuesta, solo se cargan sus columnas y relaciones.
+        if response_model and not plan:
+            options = (*(options or ()), *get_load_options(fields[0], response_model))
+
+        # si se pagina por cursor, el orden lo determinan los campos de paginación.
+        if keyset:
+            order_by = tuple(field.desc() for field in keyset)
+
+            # si se ha indicado un cursor, se obtienen los registros posteriores al último de la página anterior.
+            if cursor:
+                where = (*(where or ()), tuple_(*keyset) < tuple_(*decode_cursor(cursor, keyset)))
+                offset = None
+
+        # Se crea la consulta inicial con los campos a obtener. Si se pagina por cursor, se añaden los campos de paginación para generar el siguiente cursor.
+        # si se pagina por claves primarias, la primera fase solo obtiene la clave primaria y los campos de orden, que deben estar en la consulta para usar DISTINCT.
+        if paginate_ids:
+            order_fields = keyset or tuple(getattr(field, "element", field) for field in order_by or ())
+            statement = select(inspect(fields[0]).primary_key[0], *order_fields)
+        else:
+            statement = select(*fields, *(keyset or ())) if not plan else plan.get_statement(*(keyset or ()))
 
         # si existen joins, se añaden a la consulta.
         if joins:
@@ -205,16 +393,16 @@ async def get_database_records(session: AsyncSession,
             for join in joins:
                 statement = statement.join(**join)
 
-        # si se ha indicado que se deben obtener registros únicos, se añade la opción.
-        if distinct:
+        # si se ha indicado que se deben obtener registros únicos, se añade la opción. Los joins a muchos pueden repetir las claves de la página.
+        if distinct or (paginate_ids and unique):
             statement = statement.distinct()
 
         # si se han indicado las tablas, se añaden a la consulta.
         if froms:
             statement = statement.select_from(*froms)
     
-        # si se han indicado las opciones, se añaden a la consulta.
-        if options:
+        # si se han indicado las opciones, se añaden a la consulta. Las filas del plan no usan las opciones de carga del ORM y la página de claves las usa al cargar sus registros.
+        if options and not plan and not paginate_ids:
             statement = statement.options(*options)
 
         # si se han indicado las condiciones, se añaden a la consulta.
@@ -244,12 +432,12 @@ async def get_database_records(session: AsyncSession,
         # Se ejecuta la consulta.
         result = await session.execute(statement)
 
-        # si se han indicado registros únicos, aplicamos el filtro.
-        if unique:
+        # si se han indicado registros únicos, aplicamos el filtro. Las filas del plan se filtran al convertirlas.
+        if unique and not plan and not paginate_ids:
             result = result.unique()
 
-        # si se han indicado registros escalares, aplicamos el filtro.
-        if scalar:
+        # si se han indicado registros escalares, aplicamos el filtro. Si se pagina por cursor, los campos de paginación se extraen de cada fila.
+        if scalar and not keyset and not plan and not paginate_ids:
             result = result.scalars()
 
         # si se ha indicado que se deben devolver los registros como una lista, obtenemos todos los registros.
@@ -260,7 +448,25 @@ async def get_database_records(session: AsyncSession,
             if len(records) < 1:
                 _raise_not_found(RESOURCES_NOT_FOUND, resource_type=statement.get_final_froms(), query=statement)
 
-            return records
+            # si se pagina por cursor, se obtiene el cursor de la siguiente página.
+            if keyset:
+                # solo existe siguiente página si se ha completado la página actual.
+                next_cursor = encode_cursor(records[-1][-len(keyset):]) if limit and len(records) == limit else None
+
+                # si se han indicado registros escalares, se descartan los campos de paginación.
+                if scalar and not plan and not paginate_ids:
+                    records = [record[0] for record in records]
+
+            # si se pagina por claves primarias, se cargan los registros de la página.
+            if paginate_ids:
+                records = await _load_page(session, fields[0], records, options, plan)
+
+            # si se usa el plan, se convierten las filas en los objetos del modelo de lectura.
+            elif plan:
+                records = await build_rows(session, plan, records, unique)
+
+            # si se pagina por cursor, se devuelven los registros junto al cursor de la siguiente página.
+            return (records, next_cursor) if keyset else records
         
         # si no se ha indicado que se deben devolver los registros como una lista, obtenemos un único registro.
         record = result.one_or_none()
@@ -269,15 +475,106 @@ async def get_database_records(session: AsyncSession,
         if record is None:
             _raise_not_found(RESOURCES_NOT_FOUND, resource_type=statement.get_final_froms(), query=statement)
 
+        if paginate_ids:
+            record, = await _load_page(session, fields[0], (record,), options, plan)
+
+        elif plan:
+            record, = await build_rows(session, plan, (record,))
+
         return record
     
     except DatabaseException as exc:
         raise exc
+
+    # un cursor no válido es un error de los parámetros de la petición y no de la consulta.
+    except RequestValidationError as exc:
+        raise exc
     
     except Exception as exc:
         _raise_exception(exc)
 
-async def get_record_by_id(session: AsyncSession, model: Base, record_id: UUID, options: Sequence[ExecutableOption] | ExecutableOption = None) -> Base:
+async def get_cached_records(model: Base,
+                       field: Callable[[Any], Any] = None,
+                       where: Callable[[Any], bool] = None,
+                       order_by: Callable[[Any], Any] = None,
+                       desc: bool = False,
+                       distinct: bool = False,
+                       limit: int = None,
+                       offset: int = None) -> list[Any]:
+    """
+    Obtiene los registros de un catálogo de la caché que cumplen con las condiciones indicadas.
+    Equivale a get_database_records para los catálogos que se mantienen en memoria.
+
+    Args:
+    - model (Base): Modelo del catálogo.
+    - field (Callable, optional): Función que obtiene el campo a devolver de cada registro. Defaults to None.
+    - where (Callable, optional): Función que indica si un registro cumple las condiciones. Defaults to None.
+    - order_by (Callable, optional): Función que obtiene el valor por el que ordenar los registros. Defaults to None.
+    - desc (bool, optional): Indica si el orden es descendente. Defaults to False.
+    - distinct (bool, optional): Indica si se deben obtener valores únicos. Defaults to False.
+    - limit (int, optional): Límite de registros a obtener. Defaults to None.
+    - offset (int, optional): Desplazamiento de registros a obtener. Defaults to None.
+
+    Returns:
+    - list[Any]: Registros obtenidos.
+
+    Raises:
+    - ResourceNotFoundException: Si no se obtiene ningún registro.
+    """
+
+    records = await ReferenceCache.get(model)
+
+    # se filtran los registros.
+    if where:
+        records = [record for record in records if where(record)]
+
+    # se obtiene el campo indicado de cada registro.
+    if field:
+        records = [field(record) for record in records]
+
+    # se eliminan los valores repetidos manteniendo el orden.
+    if distinct:
+        records = list(dict.fromkeys(records))
+
+    # se ordenan los registros.
+    if order_by:
+        records = sorted(records, key=order_by, reverse=desc)
+
+    # se aplica el desplazamiento y el límite.
+    offset = offset or 0
+    records = records[offset:offset + limit] if limit else records[offset:]
+
+    # si no se han obtenido registros, se lanza una excepción.
+    if len(records) < 1:
+        _raise_not_found(RESOURCES_NOT_FOUND, resource_type=model.__name__, query=ReferenceCache.CHANNEL)
+
+    return records
+
+async def get_cached_record_by_id(model: Base, record_id: UUID) -> Base:
+    """
+    Obtiene un registro de un catálogo de la caché por su id.
+
+    Args:
+    - model (Base): Modelo del catálogo.
+    - record_id (UUID): Id del registro a obtener.
+
+    Returns:
+    - Base: Registro obtenido.
+
+    Raises:
+    - ResourceNotFoundException: Si el registro no existe.
+    """
+
+    record = next((record for record in await ReferenceCache.get(model) if record.id == record_id), None)
+
+    # si no se ha obtenido un registro, se lanza una excepción.
+    if record is None:
+        _raise_not_found(RESOURCE_NOT_FOUND, resource_id=record_id, resource_type=model.__name__)
+
+    return record
+
+async def get_record_by_id(session: AsyncSession, model: Base, record_id: UUID, options: Sequence[ExecutableOption] | ExecutableOption = None,
+                           response_model: type[BaseModel] = None) -> Base:
     """
     Obtiene un registro de la base de datos por su id.
 
@@ -286,6 +583,7 @@ async def get_record_by_id(session: AsyncSession, model: Base, record_id: UUID,
     - model (Base): Modelo de la base de datos.
     - record_id (UUID): Id del registro a obtener.
     - options (Sequence, optional): Campos adicionales a cargar. Por defecto ().
+    - response_model (type[BaseModel], optional): Modelo de lectura de la respuesta. Si se indica, solo se cargan sus columnas y relaciones. Por defecto None.
 
     Returns:
     - Base: Registro obtenido.
@@ -296,6 +594,10 @@ async def get_record_by_id(session: AsyncSession, model: Base, record_id: UUID,
 
     # Se convierte en una tupla si no lo es.
     options = _iterable_param(options)
+
+    # si se indica el modelo de la respuesta, solo se cargan sus columnas y relaciones.
+    if response_model:
+        options = (*(options or ()), *get_load_options(model, response_model))
     
     try:
         # intentamos obtener el registro.
@@ -311,6 +613,34 @@ async def get_record_by_id(session: AsyncSession, model: Base, record_id: UUID,
 
     return record
 
+async def get_entity_response(session: AsyncSession, model: Base, record_id: UUID, options: Sequence[ExecutableOption] | ExecutableOption = None) -> Response:
+    """
+    Obtiene la respuesta del endpoint de detalle de una oferta, una empresa o un candidato.
+    La entidad se obtiene de EntityCache y, si no está, de la base de datos con get_record_by_id y se guarda en la caché.
+    La respuesta se genera directamente desde la forma de lectura guardada, sin los valores por defecto como en los endpoints de detalle.
+
+    Args:
+    - session (AsyncSession): Sesión de base de datos.
+    - model (Base): Modelo de la entidad.
+    - record_id (UUID): Id de la entidad.
+    - options (Sequence, optional): Relaciones a cargar para obtener la forma de lectura. Por defecto None.
+
+    Returns:
+    - Response: Respuesta con la entidad en JSON.
+
+    Raises:
+    - ResourceNotFoundException: Si la entidad no existe.
+    """
+
+    entity = await EntityCache.get(model, record_id)
+
+    if entity is None:
+        # se obtiene la versión antes de la consulta para no guardar la entidad si cambia mientras tanto
+        version = EntityCache.get_version()
+        record = await get_record_by_id(session, model, record_id, options=options, response_model=EntityCache.READ_MODELS[model])
+        entity = EntityCache.set(record, version)
+
+    return Response(entity.model_dump_json(exclude_defaults=True), media_type=JSONResponse.media_type)
 
 
 async def get_user_by_id(session: AsyncSession, logged_user: User, user_id: UUID, options: Sequence[ExecutableOption] | ExecutableOption = ()) -> User:
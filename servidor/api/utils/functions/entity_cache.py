@@ -0,0 +1,254 @@
+import os, time, socket
+from uuid import UUID
+from typing import Iterable
+from collections import OrderedDict
+from pydantic import BaseModel
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from asyncpg import Connection
+from api.database.database_models.models import Base, Job, JobLanguage, JobEducation, Company, Candidate, User, Address
+from api.models.read_models import ReadJobComplete, ReadCompanyComplete, ReadCandidateComplete
+from api.utils.constants.error_strings import ENTITY_CACHE_ERROR
+from api.utils.constants.info_strings import ENTITY_CACHE_INVALIDATED
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.management_utils import print_log, LogLevel
+from api.utils.functions.notified_cache import NotifiedCache
+from api.utils.functions.reference_cache import ReferenceCache
+from api.utils.functions.request_metrics import RequestMetrics
+
+class EntityCache(NotifiedCache):
+    """
+    Caché en memoria de las ofertas, empresas y candidatos con la forma completa que devuelven sus endpoints de detalle.
+
+    Cada entidad se guarda con su tabla y su id como clave durante ENTITY_CACHE_TTL segundos.
+    Como máximo se guardan ENTITY_CACHE_SIZE entidades, al superarlo se descarta la usada hace más tiempo.
+    Las entidades solo se guardan al leerlas. Los endpoints que crean o actualizan una entidad no guardan su nueva forma,
+    ya que otra escritura posterior de la misma entidad podría terminar antes y quedaría sobrescrita por una forma obsoleta.
+    secure_commit descarta las entidades modificadas en el worker y notifica sus claves a los demás workers para que las descarten.
+    Los cambios en las direcciones, los catálogos o los usuarios eliminados descartan todas las entidades,
+    ya que pueden afectar a muchas de ellas.
+    """
+
+    CHANNEL = "entity_cache"
+
+    # forma de lectura de cada entidad
+    READ_MODELS: dict[type[Base], type[BaseModel]] = {
+        Job: ReadJobComplete,
+        Company: ReadCompanyComplete,
+        Candidate: ReadCandidateComplete,
+    }
+
+    # entidades a las que pertenece cada modelo modificado y atributo con el id de la entidad
+    ENTITY_KEYS: dict[type[Base], tuple[tuple[type[Base], str]]] = {
+        Job: ((Job, "id"),),
+        JobLanguage: ((Job, "job_id"),),
+        JobEducation: ((Job, "job_id"),),
+        Company: ((Company, "user_id"),),
+        Candidate: ((Candidate, "user_id"),),
+        User: ((Company, "id"), (Candidate, "id")),
+    }
+
+    # las direcciones y los catálogos forman parte de varias entidades
+    WATCHED_MODELS = (*ENTITY_KEYS, Address, *ReferenceCache.WATCHED_MODELS)
+
+    LISTEN_ERROR = ENTITY_CACHE_ERROR
+    INVALIDATED_INFO = ENTITY_CACHE_INVALIDATED
+
+    # clave que descarta todas las entidades
+    ALL_KEYS = "*"
+
+    # tamaño máximo del mensaje de las notificaciones de PostgreSQL, si se supera se descartan todas las entidades
+    MAX_PAYLOAD_SIZE = 7900
+
+    _entries: OrderedDict[str, tuple[float, BaseModel]] = OrderedDict()
+    _version: int = 0
+
+    @staticmethod
+    def get_key(model: type[Base], record_id: UUID) -> str:
+        """
+        Devuelve la clave de una entidad.
+
+        Args:
+        - model (type[Base]): Modelo de la entidad.
+        - record_id (UUID): Id de la entidad.
+
+        Returns:
+        - str: La clave de la entidad.
+        """
+
+        return f"{model.__tablename__}:{record_id}"
+
+    @staticmethod
+    def _get_instance_id() -> str:
+        """Devuelve el identificador del worker, con el que se ignoran sus propias notificaciones."""
+
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @classmethod
+    def invalidate(cls, keys: Iterable[str] | None = None) -> None:
+        """
+        Descarta entidades del worker.
+
+        Args:
+        - keys (Iterable[str] | None): Claves de las entidades a descartar. Si es None o contiene ALL_KEYS se descartan todas.
+        """
+
+        cls._version += 1
+
+        keys = None if keys is None else set(keys)
+
+        if keys is None or cls.ALL_KEYS in keys:
+            cls._entries.clear()
+            return
+
+        for key in keys:
+            cls._entries.pop(key, None)
+
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Devuelve la versión actual de la caché. Se obtiene antes de consultar la base de datos y se pasa a set
+        para no guardar una entidad obtenida antes de un cambio.
+
+        Returns:
+        - int: La versión de la caché.
+        """
+
+        return cls._version
+
+    @classmethod
+    async def get(cls, model: type[Base], record_id: UUID) -> BaseModel | None:
+        """
+        Devuelve la forma de lectura guardada de una entidad y registra el acierto o el fallo en las métricas.
+
+        Args:
+        - model (type[Base]): Modelo de la entidad.
+        - record_id (UUID): Id de la entidad.
+
+        Returns:
+        - BaseModel | None: La entidad o None si no está guardada, ha caducado o no se pueden recibir las notificaciones de cambio.
+        """
+
+        entity = await cls._get(cls.get_key(model, record_id))
+
+        RequestMetrics.record_cache(model.__tablename__, entity is not None)
+
+        return entity
+
+    @classmethod
+    async def _get(cls, key: str) -> BaseModel | None:
+        """Devuelve la entidad guardada con la clave indicada si sigue siendo válida."""
+
+        # sin notificaciones no se sabe si otro worker ha cambiado la entidad
+        if not await cls._listen():
+            return None
+
+        entry = cls._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, entity = entry
+
+        if expires_at <= time.monotonic():
+            del cls._entries[key]
+            return None
+
+        # se marca como usada recientemente
+        cls._entries.move_to_end(key)
+
+        return entity
+
+    @classmethod
+    def _on_notification(cls, connection: Connection, pid: int, channel: str, payload: str) -> None:
+        """Descarta las entidades de la notificación salvo que la haya enviado este worker, que ya las ha descartado."""
+
+        instance_id, _, keys = payload.partition("|")
+
+        if instance_id == cls._get_instance_id():
+            return
+
+        cls.invalidate(keys.split(","))
+        print_log(cls.INVALIDATED_INFO, LogLevel.INFO, keys=keys)
+
+    @classmethod
+    async def notify_changes(cls, session: AsyncSession) -> set[str]:
+        """
+        Si la sesión tiene cambios pendientes en alguna entidad, envía a los workers las claves de las entidades modificadas
+        dentro de su transacción. La notificación solo llega a los workers si se realiza el commit.
+
+        Args:
+        - session (AsyncSession): La sesión de base de datos.
+
+        Returns:
+        - set[str]: Las claves de las entidades modificadas, vacío si no se modifica ninguna.
+        """
+
+        keys = cls._get_changed_keys(session)
+
+        if not keys:
+            return keys
+
+        payload = ",".join(sorted(keys))
+
+        if len(payload) > cls.MAX_PAYLOAD_SIZE:
+            keys = {cls.ALL_KEYS}
+            payload = cls.ALL_KEYS
+
+        await session.execute(select(func.pg_notify(cls.CHANNEL, f"{cls._get_instance_id()}|{payload}")))
+
+        return keys
+
+    @classmethod
+    def _get_changed_keys(cls, session: AsyncSession) -> set[str]:
+        """Devuelve las claves de las entidades afectadas por los cambios pendientes de la sesión."""
+
+        keys = set()
+
+        for record in (*session.new, *session.dirty, *session.deleted):
+            if not isinstance(record, cls.WATCHED_MODELS):
+                continue
+
+            # al eliminar un usuario se eliminan en cascada sus ofertas, que no están en la sesión
+            if type(record) not in cls.ENTITY_KEYS or (isinstance(record, (User, Company)) and record in session.deleted):
+                return {cls.ALL_KEYS}
+
+            for model, attribute in cls.ENTITY_KEYS[type(record)]:
+                record_id = getattr(record, attribute)
+
+                # los registros nuevos sin id todavía no pueden estar en la caché
+                if record_id is not None:
+                    keys.add(cls.get_key(model, record_id))
+
+        return keys
+
+    # se define al final de la clase para que su nombre no oculte el tipo set en las anotaciones de los demás métodos
+    @classmethod
+    def set(cls, record: Base, version: int) -> BaseModel:
+        """
+        Guarda la forma de lectura de una entidad y la devuelve.
+
+        Args:
+        - record (Base): Registro de la entidad con sus relaciones cargadas.
+        - version (int): Versión de la caché obtenida antes de consultar la base de datos.
+
+        Returns:
+        - BaseModel: La forma de lectura de la entidad.
+        """
+
+        model = type(record)
+        entity = cls.READ_MODELS[model].model_validate(record, from_attributes=True)
+
+        # si se ha recibido un cambio durante la consulta, la entidad puede estar obsoleta y no se guarda
+        if version != cls._version or cls._listener is None:
+            return entity
+
+        key = cls.get_key(model, record.user_id if model in (Company, Candidate) else record.id)
+
+        cls._entries[key] = (time.monotonic() + CONFIG.ENTITY_CACHE_TTL, entity)
+        cls._entries.move_to_end(key)
+
+        while len(cls._entries) > CONFIG.ENTITY_CACHE_SIZE:
+            cls._entries.popitem(last=False)
+
+        return entity
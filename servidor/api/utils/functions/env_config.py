@@ -1,4 +1,4 @@
-import os
+import os, tempfile
 from pydantic import model_validator
 from pydantic_core import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -47,6 +47,34 @@ class _Settings(BaseSettings):
     GUNICORN_ACCESS_LOG: str | None = None
     GUNICORN_ERROR_LOG: str | None = None
     SCHEDULER_INTERVAL: int = 10
+    SCHEDULER_JITTER: int = 60
+    HASH_POOL_WORKERS: int = 2
+    HASH_MAX_CONCURRENCY: int = 4
+    LOG_MAX_BYTES: int = 10485760
+    LOG_BACKUP_COUNT: int = 5
+    LOG_BATCH_SIZE: int = 100
+    LOG_FLUSH_INTERVAL: float = 1.0
+    ALERT_DEDUP_SECONDS: int = 300
+    SLOW_QUERY_THRESHOLD: float = 0.5
+    N_PLUS_ONE_THRESHOLD: int = 5
+    BLOB_STORAGE_BACKEND: str = "local"
+    BLOB_STORAGE_PATH: str = "/var/lib/fastjob/blobs"
+    BLOB_ORPHAN_GRACE_HOURS: int = 24
+    BLOB_MIGRATION_BATCH_SIZE: int = 100
+    BLOB_CHUNK_SIZE: int = 65536
+    CV_MAX_SIZE: int = 5242880
+    CV_ACCEL_REDIRECT: bool = False
+    CV_ACCEL_REDIRECT_LOCATION: str = "/protected-curricula/"
+    JOB_SEARCH_CACHE_TTL: float = 30.0
+    JOB_SEARCH_CACHE_SIZE: int = 256
+    ENTITY_CACHE_TTL: float = 300.0
+    ENTITY_CACHE_SIZE: int = 2048
+    CATALOG_CACHE_MAX_AGE: int = 3600
+    JOB_KEYWORD_CACHE_MAX_AGE: int = 300
+    ADDRESS_CACHE_MAX_AGE: int = 86400
+    METRICS_FOLDER: str = os.path.join(tempfile.gettempdir(), "fastjob_metrics")
+    METRICS_WRITE_INTERVAL: float = 5.0
+    METRICS_ALLOWED_IPS: list[str] = ["127.0.0.1", "::1"]
 
     @model_validator(mode='after')
     def log_path(self):
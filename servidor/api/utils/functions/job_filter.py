@@ -1,19 +1,24 @@
 from uuid import UUID
+from datetime import date
 from typing import Annotated
-from fastapi import Depends
-from sqlalchemy import or_
-from sqlalchemy.orm import contains_eager
+from fastapi import Depends, Request
+from sqlalchemy import Date, Float, func, literal, type_coerce
+from sqlalchemy.dialects.postgresql import websearch_to_tsquery
 from fastapi.exceptions import RequestValidationError
 from api.models.base_models import QueryParams
-from api.database.database_models.models import Job
-from api.database.database_models.models import Address, Sector, Language, Education, EducationLevel, JobLanguage, JobEducation
+from api.models.read_models import ReadJobComplete
+from api.database.database_models.models import Job, JobSearchDoc
+from api.models.enums.endpoints import JobSort, LanguageMatch
+from api.models.metadata.constants import TEXT_SEARCH_CONFIG, RELEVANCE_FRESHNESS_DAYS
+from api.utils.functions.reference_cache import ReferenceCache
+from api.utils.functions.database_utils import decode_cursor
 from api.utils.constants.error_strings import INVALID_EDUCATION_PARAMS_FOR_JOBS, INVALID_CANDIDATE_SECTOR_PARAMS
-from api.utils.constants.endpoints_params import KEYWORD, LANGUAGE_CANDIDATE, SECTOR_CATEGORY_QUERY, EDUCATION_NAME_PARAM, SECTOR_ID_QUERY, ADDRESS_PROVINCE, EDUCATION_LEVEL_VALUE_PARAM, JOB_ACTIVE, JOB_MINIMAL_FIELDS
+from api.utils.constants.endpoints_params import KEYWORD, LANGUAGE_JOB, LANGUAGE_MATCH, SECTOR_CATEGORY_QUERY, EDUCATION_NAME_PARAM, SECTOR_ID_QUERY, ADDRESS_PROVINCE, EDUCATION_LEVEL_VALUE_PARAM, JOB_ACTIVE, JOB_MINIMAL_FIELDS, JOB_SORT, CURSOR
 
 async def _get_sector_params(sector_category: Annotated[str | None, SECTOR_CATEGORY_QUERY] = None,
-                             sector_id: Annotated[UUID | None, SECTOR_ID_QUERY] = None) -> str | None:
+                             sector_id: Annotated[UUID | None, SECTOR_ID_QUERY] = None) -> set[UUID] | None:
     """
-    Obtiene los parámetros del sector para la consulta.
+    Obtiene los ids de los sectores para la consulta resolviendo la categoría o el id en la caché de catálogos.
     No se pueden pasar ambos parámetros.
 
     Args:
@@ -21,7 +26,7 @@ async def _get_sector_params(sector_category: Annotated[str | None, SECTOR_CATEG
     - sector_id (UUID | None): El ID del sector.
 
     Returns:
-    - str | None: Los parámetros del sector.
+    - set[UUID] | None: Los ids de los sectores.
 
     Raises:
     - RequestValidationError: Si se pasan ambos parámetros.
@@ -30,13 +35,13 @@ async def _get_sector_params(sector_category: Annotated[str | None, SECTOR_CATEG
     # Si se pasan ambos parámetros, se lanza una excepción.
     if sector_category and sector_id: raise RequestValidationError([INVALID_CANDIDATE_SECTOR_PARAMS])
     
-    # Si se pasa la categoría del sector, se devuelve la categoría.
+    # Si se pasa la categoría del sector, se devuelven los ids de sus sectores.
     if sector_category:
-        return sector_category
+        return await ReferenceCache.get_sector_ids(sector_category)
     
-    # Si se pasa el ID del sector, se devuelve el ID.
+    # Si se pasa el ID del sector, se devuelve el ID si existe.
     if sector_id:
-        return sector_id
+        return await ReferenceCache.get_sector_ids(sector_id)
     
 async def _get_province_param(province: Annotated[str | None, ADDRESS_PROVINCE] = None) -> str | None:
     """
@@ -98,61 +103,53 @@ async def _get_education_params(education_name: Annotated[str | None, EDUCATION_
 
     return education_params
  
-async def _get_language_params(languages: Annotated[set[str | UUID], LANGUAGE_CANDIDATE] = ()) -> set[str | UUID] | None:
+async def _get_language_params(languages: Annotated[set[str], LANGUAGE_JOB] = ()) -> set[frozenset[UUID]] | None:
     """
-    Obtiene los parámetros de idioma para filtrar candidatos.
+    Obtiene los ids de los idiomas para la consulta resolviendo cada id o nombre en la caché de catálogos.
 
     Args:
-    - language (str | UUID, optional): El idioma o el identificador UUID del idioma. Defaults to None.
+    - languages (set[str], optional): Los ids o los nombres de los idiomas. Defaults to ().
 
     Returns:
-    - str | UUID | None: El identificador UUID del idioma o el nombre del idioma en minúsculas.
+    - set[frozenset[UUID]] | None: Los ids de cada idioma indicado, vacío si el idioma no existe, o None si no se indica ningún idioma.
+      El mismo idioma indicado por id y por nombre se cuenta una sola vez.
     """
     
     # Si no se pasa ningún parámetro, se devuelve None.
     if not languages: return None
 
-    # Se crea un conjunto vacío para almacenar los parámetros de idioma.
+    # Se crea un conjunto vacío para almacenar los ids de cada idioma.
     final_languages = set()
 
     # Se recorren los parámetros de idioma.
     for language in languages:
-        # Si el parámetro es un UUID válido, se añade al conjunto de parámetros de idioma.
+        # Si el parámetro es un UUID válido, se busca por id.
         try:
-            final_languages.add(UUID(language))
-        # Si no es un UUID válido, se añade el nombre del idioma en minúsculas al conjunto de parámetros de idioma.
-        except:
-            final_languages.add(language.lower())
+            language = UUID(language)
+        # Si no es un UUID válido, se busca por el nombre del idioma en minúsculas.
+        except ValueError:
+            language = language.lower()
 
-    return languages
+        final_languages.add(await ReferenceCache.get_language_ids(language))
 
+    return final_languages
 
-def _set_sector_filter_query(query_params: QueryParams, sector_param: str | UUID | None) -> None:
+
+def _set_sector_filter_query(query_params: QueryParams, sector_param: set[UUID] | None) -> None:
     """
     Establece los parámetros de consulta para filtrar por sector.
+    Los sectores ya están resueltos a sus ids, por lo que no es necesario unir la tabla de sectores.
 
     Args:
     - query_params (QueryParams): Los parámetros de consulta.
-    - sector_param (str | UUID | None): El parámetro de sector.
+    - sector_param (set[UUID] | None): Los ids de los sectores.
     """
 
     # Si no se pasa ningún parámetro, termina la función.
-    if not sector_param: return
-
-    # se anade al join el sector.
-    query_params.add_join({
-        "target": Sector,
-        "onclause": Sector.id == Job.sector_id
-    })
-
-    # se anade las opciones de loading para reconstruir el objeto.
-    query_params.options.append(contains_eager(Job.sector))
+    if sector_param is None: return
 
-    # obtenemos el campo de sector a filtrar.
-    sector_field = Sector.id if isinstance(sector_param, UUID) else Sector.category
-
-    # se anade el filtro de sector.
-    query_params.where.append(sector_field == sector_param)
+    # se anade el filtro de sector. Si la categoría no existe el conjunto está vacío y no se obtiene ninguna oferta.
+    query_params.where.append(JobSearchDoc.sector_id.in_(sector_param))
 
 def _set_province_filter_query(query_params: QueryParams, province_param: str | None) -> None:
     """
@@ -166,37 +163,74 @@ def _set_province_filter_query(query_params: QueryParams, province_param: str |
     # Si no se pasa ningún parámetro, termina la función.
     if not province_param: return
 
-    # se anade al join la dirección.
-    query_params.add_join({
-        "target": Address,
-        "onclause": Address.id == Job.address_id
-    })
+    # se anade el filtro de provincia.
+    query_params.where.append(JobSearchDoc.province == province_param)
 
-    # se anade las opciones de loading para reconstruir el objeto.
-    query_params.options.append(contains_eager(Job.address))
 
-    # se anade el filtro de provincia.
-    query_params.where.append(Address.province == province_param)
+def _get_relevance_keyset(search_query, reference_date: date) -> list:
+    """
+    Devuelve los campos de paginación del orden por relevancia.
+    La relevancia es el ranking de la búsqueda multiplicado por un impulso para las ofertas más recientes, que se calcula
+    respecto a la fecha de referencia. La fecha es el primer campo para que se guarde en el cursor.
+
+    Args:
+    - search_query: La consulta de texto completo.
+    - reference_date (date): La fecha respecto a la que se calcula el impulso.
+
+    Returns:
+    - list: La fecha de referencia, la relevancia y el id de la oferta.
+    """
+
+    reference = literal(reference_date, Date)
+
+    # se calcula el impulso por frescura, que va de 2 para las ofertas de la fecha de referencia a 1 para las más antiguas.
+    freshness_boost = 1 + 1 / (1 + (reference - JobSearchDoc.publication_date) / float(RELEVANCE_FRESHNESS_DAYS))
 
+    # se calcula la relevancia de la oferta multiplicando el ranking de la búsqueda por el impulso por frescura.
+    relevance = type_coerce(func.ts_rank(JobSearchDoc.search_vector, search_query) * freshness_boost, Float)
 
-def _set_keyword_filter_query(query_params: QueryParams, keyword_param: str | None) -> None:
+    # se usa el id de la oferta como desempate.
+    return [reference, relevance, JobSearchDoc.job_id]
+
+def _set_keyword_filter_query(query_params: QueryParams, keyword_param: str | None, sort: JobSort, cursor: str | None) -> None:
     """
-    Establece el filtro de palabra clave en la consulta.
+    Establece el filtro de palabra clave en la consulta usando la búsqueda de texto completo sobre el título y la descripción.
+    Admite varias palabras, frases entre comillas, "or" y palabras excluidas con "-".
+    Si se ordena por relevancia, se ordena por el ranking de la búsqueda con un impulso para las ofertas más recientes.
+    El impulso de todas las páginas se calcula respecto a la fecha de la primera, que se guarda en el cursor, para que
+    un cambio de día entre páginas no cambie la relevancia de las ofertas y se salten o repitan ofertas.
 
     Args:
     - query_params (QueryParams): Los parámetros de la consulta.
     - keyword_param (str | None): El parámetro de palabra clave.
+    - sort (JobSort): El orden de las ofertas de trabajo.
+    - cursor (str | None): El cursor de la página a obtener.
     """
 
     # Si no se pasa ningún parámetro, termina la función.
     if not keyword_param: return
 
-    # se anade el filtro de palabra clave. Que el título o la descripción contengan la palabra clave.
-    query_params.where.append(or_(Job.title.contains(keyword_param), Job.description.contains(keyword_param)))
+    # se convierte la palabra clave en una consulta de texto completo.
+    search_query = websearch_to_tsquery(TEXT_SEARCH_CONFIG, keyword_param)
+
+    # se anade el filtro de palabra clave. Que el vector de búsqueda del título y la descripción coincida con la consulta.
+    query_params.where.append(JobSearchDoc.search_vector.bool_op("@@")(search_query))
+
+    # si no se ordena por relevancia, termina la función.
+    if sort != JobSort.RELEVANCE: return
+
+    # la primera página usa la fecha actual y las siguientes la fecha de referencia de su cursor.
+    keyset = _get_relevance_keyset(search_query, date.today())
+
+    if cursor:
+        keyset = _get_relevance_keyset(search_query, decode_cursor(cursor, keyset)[0])
+
+    query_params.keyset = keyset
 
 def _set_education_filter_query(query_params: QueryParams, education_params: dict | None) -> None:
     """
     Establece los parámetros de consulta para filtrar por educación.
+    Las ofertas sin formación requerida no tienen cualificación ni nivel, por lo que no cumplen ninguno de los filtros.
 
     Args:
     - query_params (QueryParams): Los parámetros de consulta.
@@ -210,126 +244,143 @@ def _set_education_filter_query(query_params: QueryParams, education_params: dic
     education_name = education_params.get("education_name", None)
     education_level = education_params.get("education_level", None)
 
-    # Se anade al join la educación.
-    query_params.add_join_list((
-        {
-            "target": JobEducation,
-            "onclause": JobEducation.job_id == Job.id,
-        },
-        {
-            "target": Education,
-            "onclause": Education.id == JobEducation.education_id
-        },
-        {
-            "target": EducationLevel,
-            "onclause": EducationLevel.id == Education.level_id
-        }
-    ))
-
-    # Se anaden las opciones de loading para reconstruir el objeto.
-    query_params.options.append(contains_eager(Job.required_education).contains_eager(JobEducation.education).contains_eager(Education.level))
-
     # si se ha pasado el nombre de la educación, se anade el filtro de nombre de educación.
     if education_name:
-        query_params.where.append(Education.qualification.contains(education_name))
+        query_params.where.append(JobSearchDoc.education_qualification.contains(education_name))
     
     # si se ha pasado el nivel de educación, se anade el filtro de nivel de educación.
     if education_level:
-        query_params.where.append(EducationLevel.value <= education_level)
+        query_params.where.append(JobSearchDoc.education_level_value <= education_level)
 
-def _set_language_filter_query(query_params: QueryParams, language_params: set[str | UUID] | None) -> None:
+def _set_language_filter_query(query_params: QueryParams, language_params: set[frozenset[UUID]] | None, language_match: LanguageMatch) -> None:
     """
     Establece la consulta de filtro de idioma en los parámetros de consulta.
+    Los ids de los idiomas de la oferta se guardan en un array de su documento de búsqueda con un índice GIN.
 
     Args:
     - query_params (QueryParams): Los parámetros de consulta.
-    - language_params (set[str | UUID] | None): Los parámetros de idioma.
+    - language_params (set[frozenset[UUID]] | None): Los ids de cada idioma indicado.
+    - language_match (LanguageMatch): Si la oferta debe requerir todos los idiomas o alguno de ellos.
     """
     
     # Si no se pasa ningún parámetro, termina la función.
     if not language_params: return
-    
-    # Se anade al join el idioma.
-    query_params.add_join_list((
-        {
-            "target": JobLanguage,
-            "onclause": JobLanguage.job_id == Job.id
-        },
-        {
-            "target": Language,
-            "onclause": Language.id == JobLanguage.language_id
-        }
-    ))
-    
-    # Se anaden las opciones de loading para reconstruir el objeto.
-    query_params.options.append(contains_eager(Job.language_list).contains_eager(JobLanguage.language))
-    
-    # Se obtiene el campo de idioma a filtrar.
-    language_field = Language.id if isinstance(language_params, UUID) else Language.name
-    
-    # Se anade el filtro de idioma.
-    for param in language_params:
-        query_params.where.append(language_field == param)
+
+    # si la oferta debe requerir todos los idiomas, debe tener alguno de los ids de cada idioma.
+    # si algún idioma no existe no tiene ids y no se obtiene ninguna oferta.
+    if language_match == LanguageMatch.ALL:
+        query_params.where.extend(JobSearchDoc.language_ids.overlap(list(language_ids)) for language_ids in language_params)
+        return
+
+    # si basta con alguno de los idiomas, la oferta debe tener alguno de los ids de todos los idiomas.
+    query_params.where.append(JobSearchDoc.language_ids.overlap(list(frozenset().union(*language_params))))
 
 
 async def get_job_filter_params(
-                                sector: Annotated[str | None, Depends(_get_sector_params)],
+                                sector: Annotated[set[UUID] | None, Depends(_get_sector_params)],
                                 province: Annotated[str | None, Depends(_get_province_param)],
                                 keyword: Annotated[str | None, Depends(_get_keyword_param)],
                                 education: Annotated[dict | None, Depends(_get_education_params)],
-                                language: Annotated[set[str|UUID]|None, Depends(_get_language_params)],
+                                language: Annotated[set[frozenset[UUID]]|None, Depends(_get_language_params)],
+                                language_match: Annotated[LanguageMatch, LANGUAGE_MATCH] = LanguageMatch.ALL,
                                 active: Annotated[bool, JOB_ACTIVE] = True,
-                                minimal_fields: Annotated[bool, JOB_MINIMAL_FIELDS] = False) -> dict:
+                                minimal_fields: Annotated[bool, JOB_MINIMAL_FIELDS] = False,
+                                sort: Annotated[JobSort, JOB_SORT] = JobSort.RECENT,
+                                cursor: Annotated[str | None, CURSOR] = None) -> dict:
     """
     Obtiene los parámetros de filtro para la búsqueda de ofertas de empleo.
     
     Args:
-    - sector (str | None): El sector de los empleos a filtrar.
+    - sector (set[UUID] | None): Los ids de los sectores de los empleos a filtrar.
     - province (str | None): La provincia de los empleos a filtrar.
     - keyword (str | None): La palabra clave para buscar en los empleos.
     - education (dict | None): El nivel de educación requerido para los empleos.
-    - language (set[str|UUID] | None): El idioma requerido para los empleos.
+    - language (set[frozenset[UUID]] | None): Los ids de los idiomas requeridos para los empleos.
+    - language_match (LanguageMatch, optional): Si los empleos deben requerir todos los idiomas o alguno de ellos. Defaults to LanguageMatch.ALL.
     - active (bool, optional): Indica si se deben filtrar solo los empleos activos. Defaults to True.
     - minimal_fields (bool, optional): Indica si se deben devolver solo los campos mínimos de los empleos. Defaults to False.
+    - sort (JobSort, optional): El orden de los empleos. Defaults to JobSort.RECENT.
+    - cursor (str | None, optional): El cursor de la página a obtener, la relevancia se calcula con su fecha de referencia. Defaults to None.
 
     Returns:
     - dict: Los parámetros de filtro para la búsqueda de empleos.
     """
     
-    # Si se piden los campos mínimos, se establecen los campos mínimos y se excluyen las opciones de loading.
-    fields = (Job,) if not minimal_fields else (Job.id, Job.title, Job.description, Address.province)
-    exclude = "options" if minimal_fields else None
+    # Si se piden los campos mínimos, se establecen los campos mínimos, la provincia se obtiene del documento de búsqueda.
+    fields = (Job,) if not minimal_fields else (Job.id, Job.title, Job.description, JobSearchDoc.province)
 
     # Se crean los parámetros de consulta.
+    # los filtros y el orden usan solo el documento de búsqueda de la oferta, que tiene una fila por oferta,
+    # por lo que el límite se aplica directamente a las ofertas en la misma sentencia que las lee.
     query_params = QueryParams(
         fields = fields, 
         scalar = not minimal_fields,
-        unique = not minimal_fields  
+        unique = False,
+        # por defecto se ordena por fecha de publicación usando el id de la oferta como desempate.
+        keyset = [JobSearchDoc.publication_date, JobSearchDoc.job_id]
     )
 
-    # si se piden los campos mínimos, se anade al join la dirección. Ya que se usa la provincia.
-    if minimal_fields:
-        query_params.add_join({
-            "target": Address,
-            "onclause": Address.id == Job.address_id
-        })
+    # se anade al join el documento de búsqueda de la oferta.
+    query_params.add_join({
+        "target": JobSearchDoc,
+        "onclause": JobSearchDoc.job_id == Job.id
+    })
 
     # establece los parámetros de consulta pasando los parámetros obtenidos a las funciones correspondientes
     _set_sector_filter_query(query_params, sector)
     _set_province_filter_query(query_params, province)
-    _set_keyword_filter_query(query_params, keyword)
+    _set_keyword_filter_query(query_params, keyword, sort, cursor)
     _set_education_filter_query(query_params, education)
-    _set_language_filter_query(query_params, language)
+    _set_language_filter_query(query_params, language, language_match)
 
     # si solo se quieren los empleos activos, se anade el filtro de empleos activos.
     if active:
-        query_params.where.append(Job.active == active)
+        query_params.where.append(JobSearchDoc.active == active)
 
     # se obtienen los parámetros de consulta.
-    final_query = query_params.model_dump(exclude_defaults=True, exclude=exclude)
+    final_query = query_params.model_dump(exclude_defaults=True)
+
+    # las ofertas completas se leen por filas con la forma de ReadJobComplete sin cargar los registros del ORM.
+    if not minimal_fields:
+        final_query["read_model"] = ReadJobComplete
 
     return final_query
 
+async def get_job_search_key(
+                            request: Request,
+                            sector: Annotated[set[UUID] | None, Depends(_get_sector_params)],
+                            province: Annotated[str | None, Depends(_get_province_param)],
+                            keyword: Annotated[str | None, Depends(_get_keyword_param)],
+                            education: Annotated[dict | None, Depends(_get_education_params)],
+                            language: Annotated[set[frozenset[UUID]]|None, Depends(_get_language_params)],
+                            language_match: Annotated[LanguageMatch, LANGUAGE_MATCH] = LanguageMatch.ALL,
+                            active: Annotated[bool, JOB_ACTIVE] = True,
+                            minimal_fields: Annotated[bool, JOB_MINIMAL_FIELDS] = False,
+                            sort: Annotated[JobSort, JOB_SORT] = JobSort.RECENT) -> tuple | None:
+    """
+    Obtiene la clave de la búsqueda de ofertas para la caché de resultados con los filtros ya normalizados,
+    por lo que las búsquedas equivalentes, como la misma provincia en mayúsculas o el mismo sector por id o por categoría, comparten clave.
+    Los filtros se obtienen de las mismas dependencias que get_job_filter_params, que FastAPI solo ejecuta una vez por petición.
+
+    Args:
+    - request (Request): Petición HTTP.
+    - sector, province, keyword, education, language, language_match, active, minimal_fields, sort: Los filtros de get_job_filter_params.
 
+    Returns:
+    - tuple | None: La clave de la búsqueda o None si la petición está autenticada, ya que solo se guardan las búsquedas anónimas.
+    """
 
-    
\ No newline at end of file
+    if "authorization" in request.headers:
+        return None
+
+    return (
+        frozenset(sector) if sector is not None else None,
+        province,
+        keyword,
+        tuple(sorted(education.items())) if education else None,
+        frozenset(language) if language else None,
+        language_match if language else None,
+        active,
+        minimal_fields,
+        sort,
+    )
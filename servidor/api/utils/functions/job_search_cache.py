@@ -0,0 +1,105 @@
+import time
+from typing import Any, Hashable
+from collections import OrderedDict
+from api.database.database_models.models import Job, JobLanguage, JobEducation, Address, Company, User
+from api.utils.constants.error_strings import JOB_SEARCH_CACHE_ERROR
+from api.utils.constants.info_strings import JOB_SEARCH_CACHE_INVALIDATED
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.notified_cache import NotifiedCache
+from api.utils.functions.reference_cache import ReferenceCache
+
+class JobSearchCache(NotifiedCache):
+    """
+    Caché en memoria de los resultados de la búsqueda anónima de ofertas (GET /jobs/).
+
+    Cada resultado se guarda con la clave de los filtros normalizados y la página solicitada durante JOB_SEARCH_CACHE_TTL segundos.
+    Como máximo se guardan JOB_SEARCH_CACHE_SIZE resultados, al superarlo se descarta el usado hace más tiempo.
+    Cualquier cambio en las ofertas, sus idiomas, su formación, las direcciones o los catálogos descarta todos los resultados,
+    al igual que eliminar un usuario o una empresa.
+    """
+
+    CHANNEL = "job_search_cache"
+
+    # las direcciones y los catálogos forman parte de las ofertas devueltas
+    WATCHED_MODELS = (Job, JobLanguage, JobEducation, Address, *ReferenceCache.WATCHED_MODELS)
+
+    # al eliminar un usuario o una empresa se eliminan en cascada sus ofertas, que no están en la sesión
+    DELETED_MODELS = (User, Company)
+
+    LISTEN_ERROR = JOB_SEARCH_CACHE_ERROR
+    INVALIDATED_INFO = JOB_SEARCH_CACHE_INVALIDATED
+
+    _entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+    _version: int = 0
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Descarta todos los resultados del worker."""
+
+        cls._version += 1
+        cls._entries.clear()
+
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Devuelve la versión actual de la caché. Se obtiene antes de consultar la base de datos y se pasa a set
+        para no guardar un resultado obtenido antes de un cambio.
+
+        Returns:
+        - int: La versión de la caché.
+        """
+
+        return cls._version
+
+    @classmethod
+    async def get(cls, key: Hashable) -> Any | None:
+        """
+        Devuelve el resultado guardado de una búsqueda.
+
+        Args:
+        - key (Hashable): Clave de la búsqueda.
+
+        Returns:
+        - Any | None: El resultado o None si no está guardado, ha caducado o no se pueden recibir las notificaciones de cambio.
+        """
+
+        # sin notificaciones no se sabe si otro worker ha cambiado las ofertas
+        if not await cls._listen():
+            return None
+
+        entry = cls._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= time.monotonic():
+            del cls._entries[key]
+            return None
+
+        # se marca como usado recientemente
+        cls._entries.move_to_end(key)
+
+        return value
+
+    @classmethod
+    def set(cls, key: Hashable, value: Any, version: int) -> None:
+        """
+        Guarda el resultado de una búsqueda.
+
+        Args:
+        - key (Hashable): Clave de la búsqueda.
+        - value (Any): El resultado.
+        - version (int): Versión de la caché obtenida antes de consultar la base de datos.
+        """
+
+        # si se ha recibido un cambio durante la consulta, el resultado puede estar obsoleto y no se guarda
+        if version != cls._version or cls._listener is None:
+            return
+
+        cls._entries[key] = (time.monotonic() + CONFIG.JOB_SEARCH_CACHE_TTL, value)
+        cls._entries.move_to_end(key)
+
+        while len(cls._entries) > CONFIG.JOB_SEARCH_CACHE_SIZE:
+            cls._entries.popitem(last=False)
@@ -0,0 +1,122 @@
+from functools import lru_cache
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import ColumnProperty, defaultload, lazyload, load_only
+from sqlalchemy.sql.base import ExecutableOption
+from api.database.database_models.models import Base
+from api.utils.functions.row_reader import _get_nested_model
+
+
+# estrategias de carga que consultan la relación aunque no se use
+EAGER_STRATEGIES = ("joined", "selectin", "subquery", "immediate")
+
+def _get_column_property(model: type[Base], name: str) -> ColumnProperty | None:
+    """
+    Devuelve la columna del modelo que corresponde a un campo, directamente o a través de una propiedad híbrida.
+
+    Args:
+    - model (type[Base]): Modelo de la base de datos.
+    - name (str): Nombre del campo.
+
+    Returns:
+    - ColumnProperty | None: La columna o None si el campo no es una columna del modelo.
+    """
+
+    mapper = inspect(model)
+
+    if name in mapper.column_attrs:
+        return mapper.column_attrs[name]
+
+    # las propiedades híbridas del modelo devuelven la columna privada que guardan, por ejemplo Job.title es Job._title
+    if isinstance(mapper.all_orm_descriptors.get(name), hybrid_property):
+        column = getattr(getattr(model, name), "property", None)
+
+        if isinstance(column, ColumnProperty):
+            return column
+
+    return None
+
+def _get_options(model: type[Base], read_model: type[BaseModel], path: tuple[type[Base], ...]) -> list[ExecutableOption]:
+    """
+    Crea las opciones de carga de un modelo y de sus relaciones con la forma de un modelo de lectura.
+
+    Args:
+    - model (type[Base]): Modelo de la base de datos.
+    - read_model (type[BaseModel]): Modelo de lectura.
+    - path (tuple[type[Base], ...]): Modelos de la ruta de relaciones hasta el modelo, para no recorrer ciclos.
+
+    Returns:
+    - list[ExecutableOption]: Las opciones de carga.
+    """
+
+    mapper = inspect(model)
+    columns = set()
+    relationships = {}
+    restricted = True
+
+    for name, field in read_model.model_fields.items():
+        relationship = mapper.relationships.get(name)
+
+        if relationship is not None:
+            relationships[name] = (relationship, _get_nested_model(field.annotation))
+            continue
+
+        column = _get_column_property(model, name)
+
+        # si un campo no es una columna ni una relación puede usar cualquier atributo, por lo que no se restringe el modelo
+        if column is None:
+            restricted = False
+            continue
+
+        columns.add(column.key)
+
+    options = []
+
+    if restricted:
+        # las columnas locales de las relaciones se conservan para poder cargarlas sin consultas adicionales
+        for relationship, _ in relationships.values():
+            columns.update(mapper.get_property_by_column(column).key for column in relationship.local_columns)
+
+        options.append(load_only(*(getattr(model, name) for name in sorted(columns)), raiseload=False))
+
+        # las relaciones que el modelo de lectura no usa no se cargan
+        options.extend(
+            lazyload(getattr(model, relationship.key))
+            for relationship in mapper.relationships
+            if relationship.key not in relationships and relationship.lazy in EAGER_STRATEGIES
+        )
+
+    for relationship, nested_model in relationships.values():
+        target = relationship.mapper.class_
+
+        if nested_model is None or target in path:
+            continue
+
+        child_options = _get_options(target, nested_model, (*path, target))
+
+        if child_options:
+            options.append(defaultload(getattr(model, relationship.key)).options(*child_options))
+
+    return options
+
+@lru_cache(maxsize=None)
+def get_load_options(model: type[Base], read_model: type[BaseModel]) -> tuple[ExecutableOption, ...]:
+    """
+    Devuelve las opciones de carga de un modelo de la base de datos para obtener solo lo que devuelve un modelo de lectura.
+    Se crean una sola vez por pareja de modelos.
+
+    De cada modelo se cargan solo las columnas de los campos del modelo de lectura, su clave primaria y las claves de sus relaciones,
+    y sus relaciones con carga por defecto que el modelo de lectura no usa dejan de cargarse. Las relaciones que sí usa mantienen
+    su estrategia de carga, o la de las opciones de la consulta, y se restringen con su modelo de lectura.
+    Si un campo del modelo de lectura no es una columna ni una relación, su modelo se carga completo.
+
+    Args:
+    - model (type[Base]): Modelo de la base de datos.
+    - read_model (type[BaseModel]): Modelo de lectura.
+
+    Returns:
+    - tuple[ExecutableOption, ...]: Las opciones de carga.
+    """
+
+    return tuple(_get_options(model, read_model, (model,)))
@@ -1,5 +1,5 @@
 from typing import Annotated
-from fastapi import BackgroundTasks, Depends, Request
+from fastapi import Depends, Request
 from api.models.enums.models import LogLevel
 from api.loggs.loggers import ERROR_LOGGER, INFO_LOGGER
 from api.models.enums.models import LogLevel
@@ -38,14 +38,13 @@ def print_log(message: str, log_level: LogLevel, recursive: bool = False, **extr
 # import en esta línea para evitar circular imports
 from api.security.security import get_user_from_token_or_none
 
-async def endpoint_request_log(request: Request, background_tasks: BackgroundTasks, logged_user: Annotated[User, Depends(get_user_from_token_or_none)]) -> None:
+async def endpoint_request_log(request: Request, logged_user: Annotated[User, Depends(get_user_from_token_or_none)]) -> None:
     """
-    Crea una tarea en segundo plano para guardar en un log la petición a un endpoint.
+    Guarda en un log la petición a un endpoint. El log solo se añade a la cola de logs, que se escribe en segundo plano.
     Puede recibir el usuario loggeado para incluir su id en el log, si no se recibe, se incluirá "No Auth".
 
     Args:
     - request (Request): Petición HTTP.
-    - background_tasks (BackgroundTasks): Tareas en segundo plano.
     - logged_user (User): Usuario loggeado.
     """
 
@@ -59,5 +58,8 @@ async def endpoint_request_log(request: Request, background_tasks: BackgroundTas
     if logged_user:
         USER_ID = logged_user.id
 
-    # Se crea una tarea en segundo plano para guardar en un log la petición a un endpoint
-    background_tasks.add_task(print_log, RESOURCE_REQUEST, LogLevel.INFO, user_id=USER_ID, http_method=METHOD, resource_url=URL)
\ No newline at end of file
+    # se guarda el id en el estado de la petición para que SingleFlightMiddleware registre las peticiones agrupadas con ella
+    request.state.log_user_id = USER_ID
+
+    # Se guarda en un log la petición a un endpoint
+    print_log(RESOURCE_REQUEST, LogLevel.INFO, user_id=USER_ID, http_method=METHOD, resource_url=URL)
\ No newline at end of file
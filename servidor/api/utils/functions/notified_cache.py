@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from asyncpg import connect, Connection
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.database.database_models.models import Base
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.management_utils import print_log, LogLevel
+
+class NotifiedCache(ABC):
+    """
+    Base de las cachés en memoria que se invalidan con las notificaciones de la base de datos.
+
+    Cada worker mantiene su propia copia y escucha el canal CHANNEL en una conexión propia.
+    Cuando secure_commit guarda cambios en alguno de los modelos WATCHED_MODELS, se envía una notificación en la misma
+    transacción y todos los workers descartan su copia.
+    Si se pierde la conexión de escucha, la caché deja de usarse hasta que se recupera para no servir datos obsoletos.
+    Las clases hijas definen el canal, los modelos vigilados, los mensajes de log y el método invalidate.
+    También pueden definir los modelos cuya eliminación invalida la caché porque elimina en cascada registros vigilados
+    que no están en la sesión.
+    """
+
+    CHANNEL: str
+
+    # modelos cuyas modificaciones invalidan la caché
+    WATCHED_MODELS: tuple[type[Base]] = ()
+
+    # modelos cuya eliminación invalida la caché
+    DELETED_MODELS: tuple[type[Base]] = ()
+
+    # mensajes de log de error al escuchar el canal y de invalidación por una notificación
+    LISTEN_ERROR: str
+    INVALIDATED_INFO: str
+
+    _listener: Connection | None = None
+
+    @classmethod
+    async def _listen(cls) -> bool:
+        """
+        Abre la conexión que escucha el canal de notificaciones si no está abierta.
+
+        Returns:
+        - bool: True si se está escuchando el canal, False en caso contrario.
+        """
+
+        if cls._listener and not cls._listener.is_closed():
+            return True
+
+        try:
+            listener = await connect(host=CONFIG.DATABASE_IP, port=CONFIG.DATABASE_PORT, database=CONFIG.DATABASE_NAME,
+                                     user=CONFIG.DATABASE_USERNAME, password=CONFIG.DATABASE_PASSWORD)
+            listener.add_termination_listener(cls._on_listener_closed)
+            await listener.add_listener(cls.CHANNEL, cls._on_notification)
+
+        except Exception as exc:
+            print_log(cls.LISTEN_ERROR, LogLevel.ERROR, exc=exc)
+            return False
+
+        # las notificaciones perdidas mientras no se escuchaba se desconocen, por lo que se descarta la copia actual
+        cls._listener = listener
+        cls.invalidate()
+
+        return True
+
+    @classmethod
+    def _on_notification(cls, connection: Connection, pid: int, channel: str, payload: str) -> None:
+        """Descarta la copia de la caché al recibir una notificación de cambio."""
+
+        cls.invalidate()
+        print_log(cls.INVALIDATED_INFO, LogLevel.INFO, tables=payload)
+
+    @classmethod
+    def _on_listener_closed(cls, connection: Connection) -> None:
+        """Descarta la copia de la caché si se cierra la conexión de escucha."""
+
+        cls._listener = None
+        cls.invalidate()
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Cierra la conexión de escucha y descarta la copia de la caché."""
+
+        listener, cls._listener = cls._listener, None
+        cls.invalidate()
+
+        if listener:
+            await listener.close()
+
+    @classmethod
+    @abstractmethod
+    def invalidate(cls) -> None:
+        """Descarta la copia de la caché del worker."""
+
+    @classmethod
+    async def notify_changes(cls, session: AsyncSession) -> bool:
+        """
+        Si la sesión tiene cambios pendientes en algún modelo vigilado, envía la notificación de cambio dentro de su transacción.
+        La notificación solo llega a los workers si se realiza el commit.
+
+        Args:
+        - session (AsyncSession): La sesión de base de datos.
+
+        Returns:
+        - bool: True si la sesión modifica algún modelo vigilado, False en caso contrario.
+        """
+
+        tables = cls._get_changed_tables(session)
+
+        if not tables:
+            return False
+
+        await session.execute(select(func.pg_notify(cls.CHANNEL, ",".join(sorted(tables)))))
+
+        return True
+
+    @classmethod
+    def _get_changed_tables(cls, session: AsyncSession) -> set[str]:
+        """Devuelve los nombres de las tablas vigiladas modificadas y de las tablas eliminadas que invalidan la caché."""
+
+        tables = {record.__tablename__ for record in (*session.new, *session.dirty, *session.deleted) if isinstance(record, cls.WATCHED_MODELS)}
+        tables.update(record.__tablename__ for record in session.deleted if isinstance(record, cls.DELETED_MODELS))
+
+        return tables
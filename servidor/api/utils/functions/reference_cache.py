@@ -0,0 +1,179 @@
+import time
+from uuid import UUID
+from hashlib import sha256
+from asyncio import Lock
+from sqlalchemy import select, inspect
+from api.database.connection import session_maker
+from api.database.database_models.models import Base, Sector, SectorEducation, Language, LanguageLevel, Education, EducationLevel
+from api.utils.constants.error_strings import REFERENCE_CACHE_ERROR
+from api.utils.constants.info_strings import REFERENCE_CACHE_INVALIDATED
+from api.utils.functions.notified_cache import NotifiedCache
+
+class ReferenceCache(NotifiedCache):
+    """
+    Caché en memoria de los catálogos de la aplicación (sectores, idiomas, niveles de idioma, niveles de formación y formaciones).
+
+    Los catálogos se cargan al iniciar el servidor y se sirven desde memoria en los endpoints de lectura.
+    Cuando se modifica un catálogo, todos los workers descartan su copia, que se vuelve a cargar en la siguiente lectura.
+    """
+
+    CHANNEL = "reference_cache"
+
+    # modelos que se guardan en la caché
+    MODELS: tuple[type[Base]] = (Sector, Language, LanguageLevel, EducationLevel, Education)
+
+    # modelos cuyas modificaciones invalidan la caché, la relación entre formación y sector forma parte de la formación
+    WATCHED_MODELS: tuple[type[Base]] = (*MODELS, SectorEducation)
+
+    LISTEN_ERROR = REFERENCE_CACHE_ERROR
+    INVALIDATED_INFO = REFERENCE_CACHE_INVALIDATED
+
+    _catalogs: dict[type[Base], list[Base]] | None = None
+    _version: int = 0
+    _digest: str | None = None
+    _loaded_at: float | None = None
+    _lock: Lock = Lock()
+
+    @classmethod
+    async def _load(cls) -> dict[type[Base], list[Base]]:
+        """
+        Obtiene todos los catálogos de la base de datos.
+
+        Returns:
+        - dict[type[Base], list[Base]]: Los registros de cada catálogo.
+        """
+
+        async with session_maker() as session:
+            return {model: list((await session.execute(select(model))).unique().scalars().all()) for model in cls.MODELS}
+
+    @classmethod
+    async def start(cls) -> None:
+        """Empieza a escuchar el canal de notificaciones y carga los catálogos."""
+
+        await cls._get_catalogs()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Descarta la copia de los catálogos del worker. Se volverán a cargar en la siguiente lectura."""
+
+        cls._version += 1
+        cls._catalogs = None
+        cls._digest = None
+        cls._loaded_at = None
+
+    @classmethod
+    async def _get_catalogs(cls) -> dict[type[Base], list[Base]]:
+        """
+        Devuelve los catálogos de la caché, cargándolos si se han descartado.
+        Si no se puede escuchar el canal de notificaciones, se obtienen de la base de datos sin guardarlos.
+
+        Returns:
+        - dict[type[Base], list[Base]]: Los registros de cada catálogo.
+        """
+
+        if cls._catalogs is not None:
+            return cls._catalogs
+
+        async with cls._lock:
+            # otra petición puede haber cargado los catálogos mientras se esperaba el bloqueo
+            if cls._catalogs is not None:
+                return cls._catalogs
+
+            if not await cls._listen():
+                return await cls._load()
+
+            version = cls._version
+            catalogs = await cls._load()
+
+            # si se ha recibido una notificación durante la carga, los datos pueden estar obsoletos y no se guardan
+            if version == cls._version:
+                cls._catalogs = catalogs
+                cls._digest = cls._get_digest(catalogs)
+                cls._loaded_at = time.time()
+
+            return catalogs
+
+    @staticmethod
+    def _get_digest(catalogs: dict[type[Base], list[Base]]) -> str:
+        """
+        Devuelve el hash del contenido de los catálogos. Las filas se ordenan para que todos los workers obtengan el mismo hash
+        con los mismos datos, aunque la base de datos los devuelva en otro orden.
+        """
+
+        digest = sha256()
+
+        for model, records in catalogs.items():
+            attributes = [attribute.key for attribute in inspect(model).column_attrs]
+            rows = sorted(repr(tuple(getattr(record, attribute) for attribute in attributes)) for record in records)
+
+            digest.update(model.__tablename__.encode())
+            digest.update("\n".join(rows).encode())
+
+        return digest.hexdigest()
+
+    @classmethod
+    async def get_version(cls) -> tuple[str, float] | None:
+        """
+        Devuelve la versión de los catálogos de la caché, el hash de su contenido y el instante en que se cargaron.
+        Se usa para responder 304 a las peticiones que ya tienen los catálogos sin volver a generar la respuesta.
+
+        Returns:
+        - tuple[str, float] | None: El hash y la fecha de carga o None si los catálogos no se guardan en la caché.
+        """
+
+        await cls._get_catalogs()
+
+        digest, loaded_at = cls._digest, cls._loaded_at
+
+        if digest is None or loaded_at is None:
+            return None
+
+        return digest, loaded_at
+
+    @classmethod
+    async def get(cls, model: type[Base]) -> list[Base]:
+        """
+        Devuelve todos los registros de un catálogo.
+
+        Args:
+        - model (type[Base]): El modelo del catálogo.
+
+        Returns:
+        - list[Base]: Los registros del catálogo.
+        """
+
+        return (await cls._get_catalogs())[model]
+
+    @classmethod
+    async def get_language_ids(cls, language: str | UUID) -> frozenset[UUID]:
+        """
+        Devuelve los ids de los idiomas que coinciden con el id o el nombre indicado.
+
+        Args:
+        - language (str | UUID): El id o el nombre del idioma.
+
+        Returns:
+        - frozenset[UUID]: Los ids de los idiomas.
+        """
+
+        if isinstance(language, UUID):
+            return frozenset(record.id for record in await cls.get(Language) if record.id == language)
+
+        return frozenset(record.id for record in await cls.get(Language) if record.name == language)
+
+    @classmethod
+    async def get_sector_ids(cls, sector: str | UUID) -> set[UUID]:
+        """
+        Devuelve los ids de los sectores que coinciden con el id o la categoría indicada.
+
+        Args:
+        - sector (str | UUID): El id o la categoría del sector.
+
+        Returns:
+        - set[UUID]: Los ids de los sectores.
+        """
+
+        if isinstance(sector, UUID):
+            return {record.id for record in await cls.get(Sector) if record.id == sector}
+
+        return {record.id for record in await cls.get(Sector) if record.category == sector}
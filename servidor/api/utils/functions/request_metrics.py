@@ -0,0 +1,380 @@
+import os, json
+from time import perf_counter
+from asyncio import Task, CancelledError, create_task, sleep
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+from api.database.query_stats import RequestStats, start_request_stats, stop_request_stats
+from api.security.hash_crypt import HashPool
+from api.utils.constants.error_strings import METRICS_WRITE_ERROR
+from api.utils.functions.env_config import CONFIG
+from api.utils.functions.management_utils import print_log, LogLevel
+
+class RequestMetrics:
+    """
+    Métricas de las peticiones agrupadas por método y plantilla de ruta (por ejemplo /jobs/{job_id}/).
+
+    Por cada ruta se guarda un histograma de la latencia, el número de sentencias SQL, el tiempo en la base de datos,
+    las filas devueltas, los bytes de las respuestas y el número de peticiones por código de estado.
+    Además, se guardan los aciertos y fallos de las cachés que los registran con record_cache y las métricas del pool de hashes.
+    Cada worker guarda sus métricas en un archivo de la carpeta de métricas y el endpoint /metrics suma los archivos
+    de todos los workers, ya que cada petición lo atiende un worker distinto.
+    """
+
+    # límites superiores en segundos de los intervalos del histograma de latencia
+    BUCKETS: tuple[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    # ruta de las peticiones que no coinciden con ningún endpoint, así las URL inventadas no crean series nuevas
+    UNMATCHED_ROUTE = "<unmatched>"
+
+    _routes: dict[tuple[str, str], dict] = {}
+    _caches: dict[str, dict[str, int]] = {}
+    _writer: Task | None = None
+    _folder: str | None = None
+
+    @classmethod
+    def _get_route(cls, method: str, route: str) -> dict:
+        """Devuelve las métricas de una ruta, creándolas si no existen."""
+
+        key = (method, route)
+
+        if key not in cls._routes:
+            cls._routes[key] = {
+                "buckets": [0] * len(cls.BUCKETS),
+                "latency": 0.0,
+                "count": 0,
+                "statements": 0,
+                "db_time": 0.0,
+                "rows": 0,
+                "response_bytes": 0,
+                "statuses": {},
+            }
+
+        return cls._routes[key]
+
+    @classmethod
+    def record(cls, method: str, route: str, status: int, latency: float, response_bytes: int, stats: RequestStats) -> None:
+        """
+        Añade una petición a las métricas de su ruta.
+
+        Args:
+        - method (str): Método HTTP.
+        - route (str): Plantilla de la ruta.
+        - status (int): Código de estado de la respuesta.
+        - latency (float): Duración de la petición en segundos.
+        - response_bytes (int): Bytes del cuerpo de la respuesta.
+        - stats (RequestStats): Contadores de la base de datos de la petición.
+        """
+
+        metrics = cls._get_route(method, route)
+
+        for index, limit in enumerate(cls.BUCKETS):
+            if latency <= limit:
+                metrics["buckets"][index] += 1
+                break
+
+        metrics["latency"] += latency
+        metrics["count"] += 1
+        metrics["statements"] += stats.statements
+        metrics["db_time"] += stats.db_time
+        metrics["rows"] += stats.rows
+        metrics["response_bytes"] += response_bytes
+        metrics["statuses"][str(status)] = metrics["statuses"].get(str(status), 0) + 1
+
+    @classmethod
+    def record_cache(cls, cache: str, hit: bool) -> None:
+        """
+        Añade un acierto o un fallo a las métricas de una caché.
+
+        Args:
+        - cache (str): Nombre de la caché.
+        - hit (bool): True si el dato estaba en la caché, False en caso contrario.
+        """
+
+        counters = cls._caches.setdefault(cache, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+    @classmethod
+    def _get_snapshot(cls) -> str:
+        """Devuelve las métricas del worker en formato JSON."""
+
+        routes = [{"method": method, "route": route, **metrics} for (method, route), metrics in cls._routes.items()]
+
+        return json.dumps({"routes": routes, "caches": cls._caches, "hash_pool": HashPool.get_metrics()})
+
+    @classmethod
+    def _write_snapshot(cls, snapshot: str) -> None:
+        """Guarda las métricas del worker en su archivo. Se escribe en un archivo temporal para que nunca se lea a medias."""
+
+        path = os.path.join(cls._folder, f"{os.getpid()}.json")
+
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            file.write(snapshot)
+
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    async def _write_periodically(cls) -> None:
+        """
+        Guarda las métricas del worker cada METRICS_WRITE_INTERVAL segundos.
+        El archivo es pequeño y se escribe en el bucle de eventos para que nunca coincida con la escritura del endpoint.
+        """
+
+        while True:
+            await sleep(CONFIG.METRICS_WRITE_INTERVAL)
+
+            try:
+                cls._write_snapshot(cls._get_snapshot())
+            except OSError as exc:
+                print_log(METRICS_WRITE_ERROR, LogLevel.ERROR, exc=exc)
+
+    @classmethod
+    def clear_folder(cls) -> None:
+        """Elimina los archivos de métricas de una ejecución anterior del servidor. Se llama antes de iniciar los workers."""
+
+        if not os.path.isdir(CONFIG.METRICS_FOLDER):
+            return
+
+        for name in os.listdir(CONFIG.METRICS_FOLDER):
+            if name.endswith((".json", ".tmp")):
+                os.remove(os.path.join(CONFIG.METRICS_FOLDER, name))
+
+    @classmethod
+    def start(cls) -> None:
+        """Crea la carpeta de métricas e inicia la escritura periódica de las métricas del worker."""
+
+        try:
+            os.makedirs(CONFIG.METRICS_FOLDER, exist_ok=True)
+        except OSError as exc:
+            # sin carpeta el endpoint solo devuelve las métricas del worker que atiende la petición
+            print_log(METRICS_WRITE_ERROR, LogLevel.ERROR, exc=exc)
+            return
+
+        cls._folder = CONFIG.METRICS_FOLDER
+        cls._writer = create_task(cls._write_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Detiene la escritura periódica y guarda las métricas finales del worker, que se siguen sumando tras su parada."""
+
+        writer, cls._writer = cls._writer, None
+
+        if writer:
+            writer.cancel()
+            try:
+                await writer
+            except CancelledError:
+                pass
+
+        if cls._folder:
+            try:
+                cls._write_snapshot(cls._get_snapshot())
+            except OSError as exc:
+                print_log(METRICS_WRITE_ERROR, LogLevel.ERROR, exc=exc)
+
+    @classmethod
+    def _load_snapshots(cls) -> list[dict]:
+        """
+        Devuelve las métricas de todos los workers. El worker actual guarda antes las suyas para devolverlas actualizadas.
+
+        Returns:
+        - list[dict]: Las métricas de cada worker.
+        """
+
+        snapshot = cls._get_snapshot()
+
+        if not cls._folder:
+            return [json.loads(snapshot)]
+
+        try:
+            cls._write_snapshot(snapshot)
+            names = [name for name in os.listdir(cls._folder) if name.endswith(".json")]
+        except OSError as exc:
+            print_log(METRICS_WRITE_ERROR, LogLevel.ERROR, exc=exc)
+            return [json.loads(snapshot)]
+
+        snapshots = []
+
+        for name in names:
+            try:
+                with open(os.path.join(cls._folder, name), encoding="utf-8") as file:
+                    snapshots.append(json.load(file))
+            # el archivo de un worker puede desaparecer si se limpia la carpeta
+            except (OSError, ValueError):
+                continue
+
+        return snapshots
+
+    @classmethod
+    def _merge(cls, snapshots: list[dict]) -> dict[tuple[str, str], dict]:
+        """Suma las métricas de la misma ruta de todos los workers."""
+
+        merged = {}
+
+        for snapshot in (route for worker in snapshots for route in worker["routes"]):
+            key = (snapshot["method"], snapshot["route"])
+
+            if key not in merged:
+                merged[key] = {**snapshot, "buckets": list(snapshot["buckets"]), "statuses": dict(snapshot["statuses"])}
+                continue
+
+            metrics = merged[key]
+            metrics["buckets"] = [total + value for total, value in zip(metrics["buckets"], snapshot["buckets"])]
+
+            for field in ("latency", "count", "statements", "db_time", "rows", "response_bytes"):
+                metrics[field] += snapshot[field]
+
+            for status, count in snapshot["statuses"].items():
+                metrics["statuses"][status] = metrics["statuses"].get(status, 0) + count
+
+        return merged
+
+    @classmethod
+    def _merge_caches(cls, snapshots: list[dict]) -> dict[str, dict[str, int]]:
+        """Suma los aciertos y fallos de la misma caché de todos los workers."""
+
+        merged = {}
+
+        for worker in snapshots:
+            for cache, counters in worker["caches"].items():
+                totals = merged.setdefault(cache, {"hits": 0, "misses": 0})
+                for result, count in counters.items():
+                    totals[result] += count
+
+        return merged
+
+    @classmethod
+    def _merge_hash_pools(cls, snapshots: list[dict]) -> dict[str, int | float]:
+        """Suma las métricas del pool de hashes de todos los workers. El máximo de hashes esperando es el mayor de los workers."""
+
+        merged = {"waiting": 0, "running": 0, "completed": 0, "max_waiting": 0, "total_wait_time": 0.0}
+
+        for worker in snapshots:
+            for field, value in worker.get("hash_pool", {}).items():
+                merged[field] = max(merged[field], value) if field == "max_waiting" else merged[field] + value
+
+        return merged
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        """Devuelve las etiquetas de una serie en formato Prometheus, escapando las barras, las comillas y los saltos de línea."""
+
+        escaped = []
+        for name, value in labels.items():
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{name}="{value}"')
+
+        return "{" + ",".join(escaped) + "}"
+
+    @classmethod
+    def render(cls) -> str:
+        """
+        Devuelve las métricas de todos los workers en el formato de texto de Prometheus.
+
+        Returns:
+        - str: Las métricas en formato Prometheus.
+        """
+
+        snapshots = cls._load_snapshots()
+        merged = sorted(cls._merge(snapshots).items())
+
+        lines = [
+            "# HELP fastjob_http_requests_total Peticiones atendidas.",
+            "# TYPE fastjob_http_requests_total counter",
+        ]
+        for (method, route), metrics in merged:
+            for status, count in sorted(metrics["statuses"].items()):
+                lines.append(f"fastjob_http_requests_total{cls._labels(method=method, route=route, status=status)} {count}")
+
+        lines += [
+            "# HELP fastjob_http_request_duration_seconds Duración de las peticiones.",
+            "# TYPE fastjob_http_request_duration_seconds histogram",
+        ]
+        for (method, route), metrics in merged:
+            cumulative = 0
+            for limit, count in zip(cls.BUCKETS, metrics["buckets"]):
+                cumulative += count
+                lines.append(f"fastjob_http_request_duration_seconds_bucket{cls._labels(method=method, route=route, le=limit)} {cumulative}")
+
+            lines.append(f"fastjob_http_request_duration_seconds_bucket{cls._labels(method=method, route=route, le='+Inf')} {metrics['count']}")
+            lines.append(f"fastjob_http_request_duration_seconds_sum{cls._labels(method=method, route=route)} {metrics['latency']}")
+            lines.append(f"fastjob_http_request_duration_seconds_count{cls._labels(method=method, route=route)} {metrics['count']}")
+
+        counters = (
+            ("fastjob_http_db_statements_total", "Sentencias SQL ejecutadas por las peticiones.", "statements"),
+            ("fastjob_http_db_duration_seconds_total", "Tiempo de las peticiones en la base de datos.", "db_time"),
+            ("fastjob_http_db_rows_total", "Filas devueltas o modificadas por las sentencias de las peticiones.", "rows"),
+            ("fastjob_http_response_bytes_total", "Bytes del cuerpo de las respuestas.", "response_bytes"),
+        )
+
+        for name, description, field in counters:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+            for (method, route), metrics in merged:
+                lines.append(f"{name}{cls._labels(method=method, route=route)} {metrics[field]}")
+
+        lines += [
+            "# HELP fastjob_cache_requests_total Consultas a las cachés en memoria por resultado.",
+            "# TYPE fastjob_cache_requests_total counter",
+        ]
+        for cache, counters in sorted(cls._merge_caches(snapshots).items()):
+            lines.append(f"fastjob_cache_requests_total{cls._labels(cache=cache, result='hit')} {counters['hits']}")
+            lines.append(f"fastjob_cache_requests_total{cls._labels(cache=cache, result='miss')} {counters['misses']}")
+
+        hash_pool = cls._merge_hash_pools(snapshots)
+        hash_pool_metrics = (
+            ("fastjob_hash_pool_waiting", "gauge", "Hashes de contraseñas esperando un hueco en el pool.", "waiting"),
+            ("fastjob_hash_pool_running", "gauge", "Hashes de contraseñas en ejecución en el pool.", "running"),
+            ("fastjob_hash_pool_completed_total", "counter", "Hashes de contraseñas calculados en el pool.", "completed"),
+            ("fastjob_hash_pool_max_waiting", "gauge", "Máximo de hashes de contraseñas esperando a la vez en un worker.", "max_waiting"),
+            ("fastjob_hash_pool_wait_seconds_total", "counter", "Tiempo de espera de los hashes de contraseñas en la cola del pool.", "total_wait_time"),
+        )
+
+        for name, metric_type, description, field in hash_pool_metrics:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}", f"{name} {hash_pool[field]}"]
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Middleware que mide cada petición HTTP y la añade a las métricas de su ruta."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Inicializa el middleware.
+
+        Args:
+        - app (ASGIApp): La aplicación que atiende las peticiones.
+        """
+
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Atiende la petición midiendo su duración, sus sentencias SQL y los bytes de la respuesta."""
+
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats, token = start_request_stats(scope)
+        response = {"status": 500, "bytes": 0}
+        start = perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            """Guarda el código de estado y cuenta los bytes de la respuesta."""
+
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        finally:
+            latency = perf_counter() - start
+            stop_request_stats(token)
+
+            # FastAPI guarda en el scope la ruta que ha atendido la petición
+            route = scope.get("route")
+            route_path = getattr(route, "path", RequestMetrics.UNMATCHED_ROUTE)
+
+            RequestMetrics.record(scope["method"], route_path, response["status"], latency, response["bytes"], stats)
@@ -0,0 +1,253 @@
+from types import NoneType, UnionType
+from typing import Any, Sequence, Union, get_args, get_origin
+from functools import lru_cache
+from operator import itemgetter
+from collections import defaultdict
+from dataclasses import make_dataclass
+from pydantic import BaseModel
+from sqlalchemy import Row, Select, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import RelationshipProperty, aliased
+from sqlalchemy.orm.util import AliasedClass
+from api.database.database_models.models import Base
+from api.utils.constants.error_strings import ROW_PLAN_UNSUPPORTED_FIELD
+
+
+def _get_nested_model(annotation: Any) -> type[BaseModel] | None:
+    """
+    Devuelve el modelo de lectura de un campo que contiene otro modelo o una lista de modelos.
+
+    Args:
+    - annotation (Any): Tipo del campo.
+
+    Returns:
+    - type[BaseModel] | None: El modelo de lectura o None si el campo no contiene un modelo.
+    """
+
+    # se quitan los Optional y las listas
+    while get_origin(annotation) in (Union, UnionType, list):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        annotation = args[0]
+
+    return annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+
+
+class RowPlan:
+    """
+    Plan de lectura por filas de un modelo de la base de datos con la forma de un modelo de lectura.
+
+    En lugar de cargar los registros del ORM, se consultan solo las columnas que usa el modelo de lectura y las filas se
+    convierten en objetos con __slots__ sin pasar por el identity map ni la unidad de trabajo de la sesión.
+    Las relaciones a uno se obtienen en la misma consulta con un join a un alias de su tabla y las relaciones a muchos
+    con una consulta por relación para todos los registros de la página. Las relaciones con lazy="noload" no se cargan,
+    como en el ORM.
+    """
+
+    def __init__(self, model: type[Base], read_model: type[BaseModel], entity: type[Base] | AliasedClass | None = None, columns: list | None = None) -> None:
+        """
+        Crea el plan de un modelo y sus relaciones.
+
+        Args:
+        - model (type[Base]): Modelo de la base de datos.
+        - read_model (type[BaseModel]): Modelo de lectura con la forma de los objetos.
+        - entity (type[Base] | AliasedClass | None): Alias del modelo en la consulta. Si es None, el modelo es la raíz de la consulta.
+        - columns (list | None): Columnas de la consulta, compartidas con el plan de la raíz. Si es None, se crea la lista.
+
+        Raises:
+        - ValueError: Si un campo del modelo de lectura no existe en el modelo de la base de datos.
+        """
+
+        mapper = inspect(model)
+
+        self.model = model
+        self.entity = entity if entity is not None else model
+        self.columns = columns if columns is not None else []
+        self.joins = []
+        self.fields: list[tuple[str, int]] = []
+        self.to_one: list[tuple[str, RowPlan]] = []
+        self.to_many: list[tuple[str, RowPlan, int, Any, Any]] = []
+        self.empty: list[tuple[str, bool]] = []
+        self._indexes: dict[str, int] = {}
+
+        # la clave primaria indica si existe el registro de una relación a uno y agrupa sus relaciones a muchos
+        self.primary_key = [self._add_column(mapper.get_property_by_column(column).key) for column in mapper.primary_key]
+
+        for name, field in read_model.model_fields.items():
+            relationship = mapper.relationships.get(name)
+
+            if relationship is None:
+                # solo se pueden consultar las columnas y las propiedades híbridas, que tienen una expresión SQL
+                if name not in mapper.column_attrs and not isinstance(mapper.all_orm_descriptors.get(name), hybrid_property):
+                    raise ValueError(ROW_PLAN_UNSUPPORTED_FIELD.format(field=name, read_model=read_model.__name__, model=model.__name__))
+
+                self.fields.append((name, self._add_column(name)))
+                continue
+
+            nested_model = _get_nested_model(field.annotation)
+
+            # las relaciones que el ORM no carga se devuelven vacías
+            if relationship.lazy == "noload" or nested_model is None:
+                self.empty.append((name, relationship.uselist))
+                continue
+
+            if relationship.uselist:
+                self.to_many.append(self._get_collection(relationship, nested_model))
+            else:
+                self.to_one.append((name, self._get_reference(relationship, nested_model)))
+
+        # los campos del objeto se ordenan como se construyen: columnas, relaciones a uno, relaciones vacías y relaciones a muchos
+        names = [name for name, _ in self.fields] + [name for name, _ in self.to_one] + [name for name, _ in self.empty] + [name for name, *_ in self.to_many]
+        self.dto = make_dataclass(f"{read_model.__name__}Row", names, slots=True)
+
+        # itemgetter devuelve un valor en lugar de una tupla si solo hay una columna
+        indexes = [index for _, index in self.fields]
+        self._get_values = itemgetter(*indexes) if len(indexes) > 1 else lambda row: tuple(row[index] for index in indexes)
+
+    def _add_column(self, name: str) -> int:
+        """Añade a la consulta una columna del modelo si no está ya y devuelve su posición en la fila."""
+
+        if name not in self._indexes:
+            self._indexes[name] = len(self.columns)
+            self.columns.append(getattr(self.entity, name))
+
+        return self._indexes[name]
+
+    def _get_reference(self, relationship: RelationshipProperty, nested_model: type[BaseModel]) -> "RowPlan":
+        """Crea el plan de una relación a uno, que se obtiene en la misma consulta con un join a un alias de su tabla."""
+
+        target = relationship.mapper.class_
+        alias = aliased(target)
+        plan = RowPlan(target, nested_model, alias, self.columns)
+
+        # el registro de la relación puede no existir, por lo que se usa un join externo
+        self.joins.append(getattr(self.entity, relationship.key).of_type(alias))
+        self.joins.extend(plan.joins)
+
+        return plan
+
+    def _get_collection(self, relationship: RelationshipProperty, nested_model: type[BaseModel]) -> tuple[str, "RowPlan", int, Any, Any]:
+        """
+        Crea el plan de una relación a muchos, que se obtiene en otra consulta con los registros de toda la página.
+        Devuelve el nombre del campo, el plan, la posición en la fila de la columna local, la columna remota y el orden.
+        """
+
+        (local_column, remote_column), = relationship.local_remote_pairs
+
+        local_index = self._add_column(inspect(self.model).get_property_by_column(local_column).key)
+        plan = RowPlan(relationship.mapper.class_, nested_model)
+
+        return relationship.key, plan, local_index, remote_column, relationship.order_by
+
+    def get_statement(self, *extra_columns: Any) -> Select:
+        """
+        Devuelve la consulta de las columnas del plan con los joins de sus relaciones a uno.
+
+        Args:
+        - extra_columns (Any): Columnas que se añaden al final de cada fila, por ejemplo las de paginación.
+
+        Returns:
+        - Select: La consulta.
+        """
+
+        statement = select(*self.columns, *extra_columns)
+
+        for join in self.joins:
+            statement = statement.outerjoin(join)
+
+        return statement
+
+    def build(self, row: Row[Any], pending: defaultdict[Any, list] | None = None) -> Any:
+        """
+        Convierte una fila en el objeto del plan y en los de sus relaciones a uno.
+
+        Args:
+        - row (Row): Fila de la consulta.
+        - pending (defaultdict | None): Objetos cuyas relaciones a muchos se deben cargar, agrupados por plan.
+
+        Returns:
+        - Any: El objeto o None si el registro de la relación no existe.
+        """
+
+        # en un join externo sin registro todas las columnas son nulas, la clave primaria de un registro nunca lo es
+        if row[self.primary_key[0]] is None:
+            return None
+
+        dto = self.dto(
+            *self._get_values(row),
+            *(plan.build(row, pending) for _, plan in self.to_one),
+            *([] if uselist else None for _, uselist in self.empty),
+            *([] for _ in self.to_many),
+        )
+
+        if self.to_many and pending is not None:
+            pending[self].append((dto, row))
+
+        return dto
+
+
+@lru_cache(maxsize=None)
+def get_row_plan(model: type[Base], read_model: type[BaseModel]) -> RowPlan:
+    """
+    Devuelve el plan de lectura por filas de un modelo con la forma de un modelo de lectura. Se crea una sola vez por pareja de modelos.
+
+    Args:
+    - model (type[Base]): Modelo de la base de datos.
+    - read_model (type[BaseModel]): Modelo de lectura.
+
+    Returns:
+    - RowPlan: El plan de lectura.
+    """
+
+    return RowPlan(model, read_model)
+
+async def build_rows(session: AsyncSession, plan: RowPlan, rows: Sequence[Row[Any]], unique: bool = False) -> list[Any]:
+    """
+    Convierte las filas de la consulta de un plan en sus objetos y carga sus relaciones a muchos con una consulta por relación.
+
+    Args:
+    - session (AsyncSession): Sesión de base de datos.
+    - plan (RowPlan): Plan de lectura de las filas.
+    - rows (Sequence[Row]): Filas de la consulta del plan.
+    - unique (bool): Si se descartan las filas repetidas del mismo registro, como unique() en el ORM.
+
+    Returns:
+    - list[Any]: Los objetos de las filas.
+    """
+
+    pending = defaultdict(list)
+    records = []
+    keys = set()
+
+    for row in rows:
+        # los joins de los filtros pueden repetir un registro, se conserva la primera fila como hace unique() en el ORM
+        if unique:
+            key = tuple(row[index] for index in plan.primary_key)
+
+            if key in keys:
+                continue
+
+            keys.add(key)
+
+        records.append(plan.build(row, pending))
+
+    # se cargan las relaciones a muchos de todos los objetos a la vez, incluidas las de los objetos de esas relaciones
+    while pending:
+        parent_plan, parents = pending.popitem()
+
+        for name, child_plan, local_index, remote_column, order_by in parent_plan.to_many:
+            keys = {row[local_index] for _, row in parents}
+            statement = child_plan.get_statement(remote_column).where(remote_column.in_(keys))
+
+            if order_by:
+                statement = statement.order_by(*order_by)
+
+            children = defaultdict(list)
+
+            for row in (await session.execute(statement)).all():
+                children[row[-1]].append(child_plan.build(row, pending))
+
+            for dto, row in parents:
+                getattr(dto, name).extend(children.get(row[local_index], ()))
+
+    return records
@@ -4,6 +4,7 @@ from typing import Self, Any
 from api.main import app
 from api.utils.constants.error_strings import LOG_FOLDER_CREATE_PERMISSION_DENIED
 from api.utils.functions.env_config import CONFIG
+from api.utils.functions.request_metrics import RequestMetrics
 from api.utils.constants.cli_strings import WINDOWS_NOT_SUPPORTED
 
 # Se comprueba si el sistema operativo es Windows
@@ -86,4 +87,7 @@ def run_server() -> None:
         'loglevel': CONFIG.GUNICORN_LOG_LEVEL
     }
 
+    # se eliminan las métricas de la ejecución anterior antes de iniciar los workers
+    RequestMetrics.clear_folder()
+
     _App(app, options).run()
\ No newline at end of file
@@ -1,35 +1,165 @@
-from typing import Callable, Self
+from typing import Callable
+from functools import wraps
+from time import monotonic
+from datetime import datetime, timezone
+from asyncpg import connect, Connection
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import func as sql_func
+from sqlalchemy.dialects.postgresql import insert
+from api.database.connection import session_maker
+from api.database.database_models.models import ScheduledTask
 from api.utils.constants.error_strings import SCHEDULER_ERROR
+from api.utils.constants.info_strings import SCHEDULER_LEADER, SCHEDULER_TASK_DONE
+from api.utils.functions.env_config import CONFIG
 from api.utils.functions.management_utils import print_log, LogLevel
 
 class AsyncSchedulerManager:
-    """Manejador de tareas programadas."""
-    
-    _instance: AsyncIOScheduler = AsyncIOScheduler()
+    """
+    Manejador de tareas programadas.
+
+    Cada worker de la API tiene su propio planificador, pero solo el worker que obtiene el bloqueo
+    consultivo de la base de datos (líder) ejecuta las tareas. El bloqueo se mantiene en una conexión
+    dedicada mientras el worker siga vivo, si se pierde otro worker lo obtiene en su siguiente ejecución.
+    La conexión se abre fuera del pool de las peticiones, ya que devolverla al pool no libera el bloqueo de sesión.
+    """
+
+    LEADER_LOCK_NAME = "fastjob_scheduler_leader"
+
+    # coalesce junta las ejecuciones perdidas en una sola y max_instances evita ejecuciones solapadas
+    _instance: AsyncIOScheduler = AsyncIOScheduler(job_defaults={"coalesce": True, "max_instances": 1})
+    _leader_connection: Connection | None = None
+
+    @classmethod
+    async def _is_leader(cls) -> bool:
+        """
+        Comprueba si el proceso es el líder de las tareas programadas, intentando obtener el bloqueo si no lo es.
+
+        Returns:
+        - bool: True si el proceso es el líder, False en caso contrario.
+        """
+
+        # si ya somos líderes se comprueba que la conexión que mantiene el bloqueo sigue viva
+        if cls._leader_connection:
+            try:
+                await cls._leader_connection.fetchval("SELECT 1")
+                return True
+            except Exception:
+                await cls._release_leader()
+
+        connection = await connect(host=CONFIG.DATABASE_IP, port=CONFIG.DATABASE_PORT, database=CONFIG.DATABASE_NAME,
+                                   user=CONFIG.DATABASE_USERNAME, password=CONFIG.DATABASE_PASSWORD)
+
+        try:
+            # fuera de una transacción la conexión es autocommit, por lo que el bloqueo de sesión no deja una transacción abierta
+            is_leader = await connection.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", cls.LEADER_LOCK_NAME)
+        except Exception:
+            await connection.close()
+            raise
+
+        if not is_leader:
+            await connection.close()
+            return False
+
+        cls._leader_connection = connection
+        print_log(SCHEDULER_LEADER, LogLevel.INFO)
+
+        return True
+
+    @classmethod
+    async def _release_leader(cls) -> None:
+        """Libera el bloqueo de líder y cierra la conexión que lo mantiene."""
+
+        connection, cls._leader_connection = cls._leader_connection, None
+
+        if not connection:
+            return
+
+        try:
+            await connection.execute("SELECT pg_advisory_unlock(hashtext($1))", cls.LEADER_LOCK_NAME)
+            await connection.close()
+        except Exception:
+            # si la conexión falla se cierra sin esperar al servidor, que libera el bloqueo al terminar la sesión
+            connection.terminate()
 
     @staticmethod
-    def _try_function(func: Callable) -> Callable:
-        """Función de prueba."""
+    async def _save_task_run(name: str, started_at: datetime, duration: float, error: str | None) -> None:
+        """
+        Guarda el resultado de la ejecución de una tarea programada.
+
+        Args:
+        - name (str): Nombre de la tarea.
+        - started_at (datetime): Fecha de inicio de la ejecución.
+        - duration (float): Duración de la ejecución en segundos.
+        - error (str | None): Error de la ejecución si ha fallado.
+        """
+
+        values = {
+            "name": name,
+            "last_started_at": started_at,
+            "last_duration": duration,
+            "last_error": error,
+        }
+
+        # la fecha del último éxito solo se actualiza si no hay error
+        if not error:
+            values["last_success_at"] = sql_func.now()
+
+        query = insert(ScheduledTask).values(**values)
+        query = query.on_conflict_do_update(index_elements=[ScheduledTask.name], set_={
+            key: query.excluded[key] for key in values if key != "name"
+        })
+
+        async with session_maker() as session:
+            await session.execute(query)
+            await session.commit()
+
+    @classmethod
+    def _leader_task(cls, func: Callable) -> Callable:
+        """
+        Envuelve la tarea para que solo se ejecute en el líder, registrando su duración y sus errores.
+
+        Args:
+        - func (Callable): Función a ejecutar.
+
+        Returns:
+        - Callable: Función envoltorio.
+        """
 
-        # envolvemos la función en un try-except
+        @wraps(func)
         async def wrapper(*args, **kwargs):
             """Función envoltorio."""
 
             try:
-                print("asdadasdfsafasfa")
-                await func(*args, **kwargs)
+                if not await cls._is_leader():
+                    return
+
+                started_at = datetime.now(timezone.utc)
+                start = monotonic()
+                error = None
+
+                try:
+                    await func(*args, **kwargs)
+                except Exception as exc:
+                    error = repr(exc)
+                    print_log(SCHEDULER_ERROR, LogLevel.ERROR, exc=exc)
+
+                duration = monotonic() - start
+                await cls._save_task_run(func.__name__, started_at, duration, error)
+
+                if not error:
+                    print_log(SCHEDULER_TASK_DONE, LogLevel.INFO, task=func.__name__, duration=duration)
+
             except Exception as exc:
                 print_log(SCHEDULER_ERROR, LogLevel.ERROR, exc=exc)
 
         # devolvemos la función envoltorio
         return wrapper
 
-    
     @classmethod
     def add_job(cls, func: Callable, *args, **kwargs) -> None:
         """
-        Añade una tarea programada.
+        Añade una tarea programada. Por defecto se añade un retardo aleatorio a cada ejecución
+        y se identifica la tarea por el nombre de la función.
 
         Args:
         - func: Función a ejecutar (Callable).
@@ -37,9 +167,11 @@ class AsyncSchedulerManager:
         - kwargs: Argumentos de la función (dict).
         """
 
-        func_with_try = cls._try_function(func)
+        kwargs.setdefault("id", func.__name__)
+        kwargs.setdefault("replace_existing", True)
+        kwargs.setdefault("jitter", CONFIG.SCHEDULER_JITTER)
 
-        cls._instance.add_job(func_with_try, *args, **kwargs)
+        cls._instance.add_job(cls._leader_task(func), *args, **kwargs)
 
     @classmethod
     def start(cls) -> None:
@@ -48,7 +180,8 @@ class AsyncSchedulerManager:
         cls._instance.start()
 
     @classmethod
-    def shutdown(cls) -> None:
-        """Detiene el manejador de tareas programadas."""
+    async def shutdown(cls) -> None:
+        """Detiene el manejador de tareas programadas y libera el bloqueo de líder."""
 
         cls._instance.shutdown()
+        await cls._release_leader()
@@ -0,0 +1,150 @@
+from asyncio import Future, get_running_loop, shield
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.routing import Match
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+from api.utils.constants.info_strings import RESOURCE_REQUEST
+from api.utils.functions.management_utils import print_log, LogLevel
+
+
+async def single_flight() -> None:
+    """
+    Dependencia que marca una ruta GET para que SingleFlightMiddleware agrupe sus peticiones idénticas simultáneas.
+    No hace nada, el middleware la busca en las dependencias de las rutas.
+    Solo se debe usar en rutas de lectura cuya respuesta no depende del cliente más allá de las cabeceras de KEY_HEADERS.
+    """
+
+
+class SingleFlightMiddleware:
+    """
+    Middleware que agrupa las peticiones GET idénticas que llegan mientras otra igual se está atendiendo.
+
+    La primera petición se atiende con normalidad y su respuesta se guarda. Las peticiones con la misma ruta, los mismos
+    parámetros y las mismas cabeceras de KEY_HEADERS, que incluyen la autenticación, esperan a que termine y reciben
+    una copia de la respuesta sin ejecutar sus dependencias ni usar una conexión de la base de datos.
+    Como no ejecutan endpoint_request_log, se registran en el log con el usuario de la petición que se ha atendido,
+    que es el mismo porque comparten la cabecera de autenticación.
+    Cada worker agrupa sus propias peticiones y solo se agrupan las rutas con la dependencia single_flight.
+    """
+
+    # cabeceras que pueden cambiar la respuesta, las peticiones solo se agrupan si coinciden
+    KEY_HEADERS = (
+        b"authorization", b"cookie", b"origin", b"accept", b"accept-encoding",
+        b"if-none-match", b"if-modified-since", b"range", b"if-range",
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Inicializa el middleware.
+
+        Args:
+        - app (ASGIApp): La aplicación que atiende las peticiones.
+        """
+
+        self.app = app
+        self._routes: list[APIRoute] | None = None
+        # cada petición en curso se resuelve con sus mensajes y el usuario de su log, o con None si ha fallado
+        self._flights: dict[tuple, Future] = {}
+
+    def _get_routes(self, scope: Scope) -> list[APIRoute]:
+        """Devuelve las rutas con la dependencia single_flight. Se buscan en la primera petición, cuando ya se han añadido todas."""
+
+        if self._routes is None:
+            self._routes = [
+                route for route in scope["app"].routes
+                if isinstance(route, APIRoute) and any(dependency.dependency is single_flight for dependency in route.dependencies)
+            ]
+
+        return self._routes
+
+    def _match_route(self, scope: Scope) -> Scope | None:
+        """
+        Devuelve los datos de la ruta que atiende la petición si se deben agrupar sus peticiones.
+
+        Args:
+        - scope (Scope): Scope ASGI de la petición.
+
+        Returns:
+        - Scope | None: Los datos que el enrutador añade al scope o None si la ruta no agrupa sus peticiones.
+        """
+
+        # se comprueban primero las rutas que agrupan sus peticiones, así el resto de peticiones no recorre todas las rutas
+        if not any(route.matches(scope)[0] == Match.FULL for route in self._get_routes(scope)):
+            return None
+
+        # la petición la atiende la primera ruta que coincide, como en el enrutador, por ejemplo /jobs/admin/ antes que /jobs/{job_id}/
+        for route in scope["app"].routes:
+            match, child_scope = route.matches(scope)
+
+            if match == Match.FULL:
+                return child_scope if route in self._routes else None
+
+        return None
+
+    def _get_key(self, scope: Scope) -> tuple:
+        """Devuelve la clave de la petición con su ruta, sus parámetros y las cabeceras que pueden cambiar la respuesta."""
+
+        headers = tuple(sorted((name, value) for name, value in scope["headers"] if name.lower() in self.KEY_HEADERS))
+
+        return scope["path"], scope["query_string"], headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Atiende la petición o espera a la petición idéntica que se está atendiendo y envía su respuesta."""
+
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        child_scope = self._match_route(scope)
+
+        if child_scope is None:
+            return await self.app(scope, receive, send)
+
+        key = self._get_key(scope)
+        flight = self._flights.get(key)
+
+        if flight is not None:
+            # se protege la espera para que cancelar una petición no cancele la respuesta del resto
+            result = await shield(flight)
+
+            # si la petición que se estaba atendiendo ha fallado, la petición se atiende con normalidad
+            if result is None:
+                return await self.app(scope, receive, send)
+
+            messages, log_user_id = result
+
+            # se registra la petición como lo haría la dependencia endpoint_request_log de su ruta
+            if log_user_id is not None:
+                print_log(RESOURCE_REQUEST, LogLevel.INFO, user_id=log_user_id, http_method=scope["method"], resource_url=Request(scope).url.path)
+
+            # se añade la ruta al scope para que las métricas cuenten la petición en su ruta
+            scope.update(child_scope)
+
+            for message in messages:
+                await send(message)
+
+            return
+
+        flight = get_running_loop().create_future()
+        self._flights[key] = flight
+        messages: list[Message] = []
+        completed = False
+
+        async def send_wrapper(message: Message) -> None:
+            """Guarda los mensajes de la respuesta y los envía."""
+
+            nonlocal completed
+
+            messages.append(message)
+
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                completed = True
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        finally:
+            # las peticiones que lleguen a partir de ahora se atienden de nuevo para no devolver datos antiguos
+            del self._flights[key]
+            flight.set_result((messages, scope.get("state", {}).get("log_user_id")) if completed else None)
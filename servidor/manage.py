@@ -13,6 +13,10 @@ AVAILABLE_COMMANDS = {
         "import": "api.utils.functions.create_admin",
         "function": "create_admin"
     },
+    "migratecurricula": {
+        "import": "api.utils.functions.curriculum_storage",
+        "function": "migrate_curricula"
+    },
     "dockerbuild": {
         "import": "api.utils.functions.docker_build",
         "function": "docker_build"